@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark reports from run_benchmarks.py.
+
+A stage regresses when its wall time grows by more than --threshold
+(relative) and by more than --min-delta-ms (absolute, so that sub-millisecond
+stages do not flag on noise), or when its peak memory grows by more than
+--memory-threshold. Exits with status 1 if any stage regressed.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+@dataclass
+class StageComparison:
+    """Baseline and current measurements of one stage of one case."""
+    case: str
+    stage: str
+    baseline_time_s: float
+    current_time_s: float
+    baseline_memory_mb: float
+    current_memory_mb: float
+    time_regressed: bool
+    memory_regressed: bool
+
+    @property
+    def time_change(self) -> float:
+        return relative_change(self.baseline_time_s, self.current_time_s)
+
+    @property
+    def memory_change(self) -> float:
+        return relative_change(self.baseline_memory_mb, self.current_memory_mb)
+
+
+def relative_change(baseline: float, current: float) -> float:
+    if baseline <= 0:
+        return 0.0 if current <= 0 else float("inf")
+    return (current - baseline) / baseline
+
+
+def load_report(path: Path) -> dict[str, Any]:
+    report = json.loads(path.read_text())
+    return {result["case"]: result for result in report["results"]}
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float,
+    memory_threshold: float,
+    min_delta_ms: float,
+) -> tuple[list[StageComparison], list[str]]:
+    """
+    Compare the stages of every case present in both reports.
+
+    Returns:
+        Comparisons, and the names of cases only present in one report
+    """
+    comparisons = []
+    for case in sorted(baseline.keys() & current.keys()):
+        baseline_stages = baseline[case]["stages"]
+        current_stages = current[case]["stages"]
+        for stage in baseline_stages.keys() & current_stages.keys():
+            before = baseline_stages[stage]
+            after = current_stages[stage]
+            delta_ms = (after["wall_time_s"] - before["wall_time_s"]) * 1000
+            comparisons.append(StageComparison(
+                case=case,
+                stage=stage,
+                baseline_time_s=before["wall_time_s"],
+                current_time_s=after["wall_time_s"],
+                baseline_memory_mb=before["peak_memory_mb"],
+                current_memory_mb=after["peak_memory_mb"],
+                time_regressed=(
+                    relative_change(before["wall_time_s"], after["wall_time_s"]) > threshold
+                    and delta_ms > min_delta_ms
+                ),
+                memory_regressed=(
+                    relative_change(before["peak_memory_mb"], after["peak_memory_mb"]) > memory_threshold
+                ),
+            ))
+    unmatched = sorted(baseline.keys() ^ current.keys())
+    return comparisons, unmatched
+
+
+def print_table(comparisons: list[StageComparison], show_all: bool) -> None:
+    rows = [c for c in comparisons if show_all or c.time_regressed or c.memory_regressed]
+    if not rows:
+        return
+    print(f"{'case':<24} {'stage':<40} {'time (ms)':>21} {'memory (MB)':>21}")
+    for c in rows:
+        time_flag = " !" if c.time_regressed else ""
+        memory_flag = " !" if c.memory_regressed else ""
+        print(
+            f"{c.case:<24} {c.stage:<40} "
+            f"{c.baseline_time_s * 1000:>8.1f} -> {c.current_time_s * 1000:>8.1f}{time_flag:<2} "
+            f"{c.baseline_memory_mb:>8.1f} -> {c.current_memory_mb:>8.1f}{memory_flag:<2}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag regressions between two benchmark reports")
+    parser.add_argument("baseline", type=Path, help="Saved baseline report")
+    parser.add_argument("current", type=Path, help="Report to check")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="Allowed relative wall time increase (default: 0.2 = 20%%)",
+    )
+    parser.add_argument(
+        "--memory-threshold", type=float, default=0.2,
+        help="Allowed relative peak memory increase (default: 0.2 = 20%%)",
+    )
+    parser.add_argument(
+        "--min-delta-ms", type=float, default=5.0,
+        help="Ignore wall time increases smaller than this (default: 5 ms)",
+    )
+    parser.add_argument("--all", action="store_true", help="Print every stage, not only regressions")
+    args = parser.parse_args()
+
+    comparisons, unmatched = compare_reports(
+        load_report(args.baseline),
+        load_report(args.current),
+        args.threshold,
+        args.memory_threshold,
+        args.min_delta_ms,
+    )
+    print_table(comparisons, args.all)
+    for case in unmatched:
+        print(f"Skipped {case}: not present in both reports")
+
+    regressions = [c for c in comparisons if c.time_regressed or c.memory_regressed]
+    if regressions:
+        print(f"{len(regressions)} of {len(comparisons)} stages regressed")
+        sys.exit(1)
+    print(f"No regressions in {len(comparisons)} stages")
+
+
+if __name__ == "__main__":
+    main()
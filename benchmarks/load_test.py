@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Quvis API Load Test
+
+Drives quvis.api.fastapi_app with concurrent circuit generation requests
+drawn from a weighted mix of playground configurations, and reports per
+endpoint throughput and p50/p95/p99 latency for every concurrency level.
+
+While generations run, /api/health is polled at a fixed interval: its
+latency shows how long the event loop is blocked by request handling. Peak
+RSS of the server processes is sampled alongside.
+
+The app can be driven in this process (ASGI calls, no network), in a
+uvicorn server started for the run, or at an already running server. The
+request schedule is derived from --seed, so two runs with the same
+arguments send the same requests in the same order.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+import quvis
+from run_benchmarks import git_commit
+
+REPORT_VERSION = 1
+GENERATE_ENDPOINT = "POST /api/generate-circuit"
+HEALTH_ENDPOINT = "GET /api/health"
+
+
+@dataclass
+class MixEntry:
+    """One playground configuration of a request mix."""
+    name: str
+    weight: int
+    request: dict[str, Any]
+
+
+def _entry(name: str, weight: int, **request: Any) -> MixEntry:
+    return MixEntry(name, weight, request)
+
+
+MIXES: dict[str, list[MixEntry]] = {
+    "light": [
+        _entry("qft-8-grid", 1, algorithm="qft", num_qubits=8, topology="grid"),
+        _entry("ghz-16-line", 1, algorithm="ghz", num_qubits=16, topology="line"),
+    ],
+    "default": [
+        _entry("qft-16-grid", 4, algorithm="qft", num_qubits=16, topology="grid"),
+        _entry("ghz-32-line", 3, algorithm="ghz", num_qubits=32, topology="line"),
+        _entry("qaoa-24-heavy_hex", 2, algorithm="qaoa", num_qubits=24, topology="heavy_hex", reps=1),
+        _entry("qft-64-grid", 1, algorithm="qft", num_qubits=64, topology="grid"),
+    ],
+    "heavy": [
+        _entry("qft-64-grid", 2, algorithm="qft", num_qubits=64, topology="grid"),
+        _entry("qft-128-grid", 1, algorithm="qft", num_qubits=128, topology="grid"),
+        _entry("qaoa-64-heavy_hex", 1, algorithm="qaoa", num_qubits=64, topology="heavy_hex", reps=2),
+    ],
+}
+
+
+@dataclass
+class RequestResult:
+    endpoint: str
+    config: str | None
+    status: int
+    latency_s: float
+    response_bytes: int
+
+
+class InProcessTransport:
+    """Calls the ASGI app directly, in this process and event loop."""
+
+    label = "inprocess"
+
+    def __init__(self):
+        from quvis.api.fastapi_app import app
+
+        # The app configures INFO logging; per-request (and per transpiler
+        # pass) logs would dominate the output
+        logging.getLogger().setLevel(logging.WARNING)
+        self.app = app
+
+    def pids(self) -> list[int]:
+        return [os.getpid()]
+
+    async def request(self, method: str, path: str, body: Any = None) -> tuple[int, int]:
+        payload = json.dumps(body).encode() if body is not None else b""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", b"loadtest"),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80),
+        }
+        request_sent = False
+        response_done = asyncio.Event()
+        status = 0
+        size = 0
+
+        async def receive() -> dict[str, Any]:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                # Yield as a socket read would, so that other requests and
+                # the health prober can interleave
+                await asyncio.sleep(0)
+                return {"type": "http.request", "body": payload, "more_body": False}
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict[str, Any]) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        await self.app(scope, receive, send)
+        response_done.set()
+        return status, size
+
+    def close(self) -> None:
+        pass
+
+
+class HttpTransport:
+    """Minimal HTTP/1.1 client, one connection per request."""
+
+    label = "http"
+
+    def __init__(self, url: str, server_pid: int | None = None):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.server_pid = server_pid
+
+    def pids(self) -> list[int]:
+        return [self.server_pid] if self.server_pid else []
+
+    async def request(self, method: str, path: str, body: Any = None) -> tuple[int, int]:
+        payload = json.dumps(body).encode() if body is not None else b""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            head = (
+                f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Connection: close\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n\r\n"
+            )
+            writer.write(head.encode() + payload)
+            await writer.drain()
+            status_line = await reader.readline()
+            # Connection: close, so the response ends at EOF
+            response = await reader.read()
+            return int(status_line.split()[1]), len(response)
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    def close(self) -> None:
+        pass
+
+
+class UvicornTransport(HttpTransport):
+    """Starts a uvicorn server for the run and talks to it over HTTP."""
+
+    label = "uvicorn"
+
+    def __init__(self, workers: int, env: dict[str, str] | None = None):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "quvis.api.fastapi_app:app",
+                "--host", "127.0.0.1", "--port", str(port),
+                "--workers", str(workers), "--log-level", "warning",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env={**os.environ, **(env or {})},
+        )
+        super().__init__(f"http://127.0.0.1:{port}", self.process.pid)
+        self._wait_until_ready()
+
+    def _wait_until_ready(self, timeout_s: float = 60.0) -> None:
+        deadline = time.monotonic() + timeout_s
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {self.process.returncode}")
+            try:
+                status, _ = asyncio.run(self.request("GET", "/api/health"))
+                if status == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        self.close()
+        raise RuntimeError("uvicorn did not become ready in time")
+
+    def close(self) -> None:
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def _process_tree_rss(pid: int) -> list[int]:
+    """RSS in bytes of a process and all its descendants."""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+        rss = []
+        for process in processes:
+            try:
+                rss.append(process.memory_info().rss)
+            except psutil.NoSuchProcess:
+                pass
+        return rss
+
+    # Linux fallback without psutil
+    rss = []
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            status = Path(f"/proc/{current}/status").read_text()
+            rss.extend(
+                int(line.split()[1]) * 1024 for line in status.splitlines() if line.startswith("VmRSS:")
+            )
+            for task in Path(f"/proc/{current}/task").iterdir():
+                pending.extend(int(child) for child in (task / "children").read_text().split())
+        except (OSError, ValueError):
+            continue
+    return rss
+
+
+class RssSampler:
+    """Samples the RSS of server processes in a background thread."""
+
+    def __init__(self, pids: Callable[[], list[int]], interval_s: float = 0.05):
+        self.pids = pids
+        self.interval_s = interval_s
+        self.peak_total = 0
+        self.peak_process = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            rss = [r for pid in self.pids() for r in _process_tree_rss(pid)]
+            if rss:
+                self.peak_total = max(self.peak_total, sum(rss))
+                self.peak_process = max(self.peak_process, max(rss))
+            self._stop.wait(self.interval_s)
+
+    def __enter__(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def latency_stats(results: list[RequestResult], wall_time_s: float) -> dict[str, Any]:
+    """Count, throughput and latency percentiles (ms) of a set of requests."""
+    latencies = sorted(r.latency_s * 1000 for r in results)
+    ok = sum(1 for r in results if 200 <= r.status < 300)
+    stats: dict[str, Any] = {
+        "requests": len(results),
+        "ok": ok,
+        "errors": len(results) - ok,
+        "throughput_rps": round(ok / wall_time_s, 3) if wall_time_s > 0 else None,
+    }
+    if latencies:
+        stats.update({
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2),
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+        })
+    return stats
+
+
+def build_schedule(mix: list[MixEntry], num_requests: int, seed: int, concurrency: int) -> list[MixEntry]:
+    """The requests of one level, in submission order."""
+    rng = random.Random(seed * 1_000_003 + concurrency)
+    return rng.choices(mix, weights=[entry.weight for entry in mix], k=num_requests)
+
+
+async def timed_request(
+    transport, endpoint: str, config: str | None, body: Any = None, start: float | None = None
+) -> RequestResult:
+    """Send one request; latency is measured from `start` (default: now)."""
+    method, path = endpoint.split(" ", 1)
+    start = time.perf_counter() if start is None else start
+    try:
+        status, size = await transport.request(method, path, body)
+    except OSError:
+        status, size = 0, 0
+    return RequestResult(endpoint, config, status, time.perf_counter() - start, size)
+
+
+async def run_level(
+    transport,
+    schedule: list[MixEntry],
+    concurrency: int,
+    health_interval_s: float,
+) -> tuple[list[RequestResult], list[RequestResult], float]:
+    """
+    Send the schedule with `concurrency` requests in flight, polling health.
+
+    Returns:
+        Generation results, health results and the wall time in seconds
+    """
+    queue: asyncio.Queue[MixEntry] = asyncio.Queue()
+    for entry in schedule:
+        queue.put_nowait(entry)
+    generation: list[RequestResult] = []
+    health: list[RequestResult] = []
+    load_done = asyncio.Event()
+    load_end: float | None = None
+
+    async def worker() -> None:
+        while not queue.empty():
+            entry = queue.get_nowait()
+            generation.append(await timed_request(transport, GENERATE_ENDPOINT, entry.name, entry.request))
+
+    async def prober() -> None:
+        # Probes are due at fixed times and timed from when they were due,
+        # so a blocked event loop (in this process or the server's) shows up
+        # as latency instead of as probes that were never sent. Probes that
+        # fell due during the load are still sent once it ends.
+        due = time.perf_counter()
+        while load_end is None or due <= load_end:
+            delay = due - time.perf_counter()
+            if delay > 0 and not load_done.is_set():
+                try:
+                    await asyncio.wait_for(load_done.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            health.append(await timed_request(transport, HEALTH_ENDPOINT, None, start=due))
+            due += health_interval_s
+
+    start = time.perf_counter()
+    probe = asyncio.create_task(prober())
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    load_end = time.perf_counter()
+    wall_time_s = load_end - start
+    load_done.set()
+    await probe
+    return generation, health, wall_time_s
+
+
+def run_load_test(transport, mix: list[MixEntry], args: argparse.Namespace) -> list[dict[str, Any]]:
+    if args.warmup:
+        print("Warming up...")
+        warmup = [entry for entry in mix for _ in range(args.warmup)]
+        asyncio.run(run_level(transport, warmup, 1, args.health_interval))
+
+    levels = []
+    for concurrency in args.concurrency:
+        schedule = build_schedule(mix, args.requests, args.seed, concurrency)
+        print(f"Concurrency {concurrency}: {len(schedule)} requests... ", end="", flush=True)
+        with RssSampler(transport.pids) as rss:
+            generation, health, wall_time_s = asyncio.run(
+                run_level(transport, schedule, concurrency, args.health_interval)
+            )
+
+        configs = {
+            entry.name: latency_stats([r for r in generation if r.config == entry.name], wall_time_s)
+            for entry in mix
+        }
+        level = {
+            "concurrency": concurrency,
+            "wall_time_s": round(wall_time_s, 3),
+            "endpoints": {
+                GENERATE_ENDPOINT: latency_stats(generation, wall_time_s),
+                HEALTH_ENDPOINT: latency_stats(health, wall_time_s),
+            },
+            "configs": configs,
+            "peak_rss_mb": round(rss.peak_total / (1024 * 1024), 1) if rss.peak_total else None,
+            "peak_worker_rss_mb": round(rss.peak_process / (1024 * 1024), 1) if rss.peak_process else None,
+        }
+        levels.append(level)
+
+        generate = level["endpoints"][GENERATE_ENDPOINT]
+        health_stats = level["endpoints"][HEALTH_ENDPOINT]
+        print(
+            f"{generate['throughput_rps']} req/s, p95 {generate.get('p95_ms')} ms, "
+            f"health p99 {health_stats.get('p99_ms')} ms, {generate['errors']} errors"
+        )
+    return levels
+
+
+def load_mix(args: argparse.Namespace) -> list[MixEntry]:
+    if args.mix_file:
+        return [MixEntry(**entry) for entry in json.loads(args.mix_file.read_text())]
+    return MIXES[args.mix]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the quvis API")
+    parser.add_argument(
+        "--mode", choices=["inprocess", "uvicorn", "url"], default="inprocess",
+        help="Call the app in this process, in a uvicorn server started for the run, "
+             "or at --url (default: inprocess)",
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server for --mode url")
+    parser.add_argument("--server-pid", type=int, help="PID of the --url server, to sample its RSS")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --mode uvicorn")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="default", help="Request mix (default: default)")
+    parser.add_argument(
+        "--mix-file", type=Path,
+        help='JSON list of {"name", "weight", "request"} entries; overrides --mix',
+    )
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4, 16],
+        help="Requests in flight, one level per value (default: 1 4 16)",
+    )
+    parser.add_argument("--requests", type=int, default=32, help="Generation requests per level (default: 32)")
+    parser.add_argument(
+        "--health-interval", type=float, default=0.05,
+        help="Seconds between /api/health probes (default: 0.05)",
+    )
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured requests per mix entry (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the request schedule (default: 0)")
+    parser.add_argument(
+        "--cache-entries", type=int, default=0,
+        help="Stage cache entries of the server for --mode inprocess and uvicorn (default: 0, so "
+             "repeated configurations are generated again rather than served from the cache)",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=Path("bench-results/load-test.json"),
+        help="Where to write the JSON report",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    mix = load_mix(args)
+
+    cache_env = {"QUVIS_STAGE_CACHE_ENTRIES": str(args.cache_entries)}
+    if args.mode == "inprocess":
+        # Read when the app module is imported
+        os.environ.update(cache_env)
+        transport = InProcessTransport()
+    elif args.mode == "uvicorn":
+        transport = UvicornTransport(args.workers, cache_env)
+    else:
+        transport = HttpTransport(args.url, args.server_pid)
+
+    try:
+        levels = run_load_test(transport, mix, args)
+    finally:
+        transport.close()
+
+    report = {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "quvis": quvis.__version__,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "mode": transport.label,
+        "workers": args.workers if args.mode == "uvicorn" else None,
+        "seed": args.seed,
+        "cache_entries": args.cache_entries if args.mode != "url" else None,
+        "requests_per_level": args.requests,
+        "health_interval_s": args.health_interval,
+        "mix": [asdict(entry) for entry in mix],
+        "levels": levels,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Load test report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Quvis Runtime Benchmarks
+
+Times quvis's own processing stages (not compilation quality) over a matrix
+of algorithms, sizes and topologies, and writes the results as JSON for
+compare_benchmarks.py.
+
+Every stage is run --repeat times with tracemalloc off to measure wall time,
+then once more under tracemalloc to measure its peak Python heap use.
+Topology and layout caches are cleared before each run so that every
+measurement covers the cold path a new request takes.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import qiskit
+from qiskit import QuantumCircuit, transpile
+
+import quvis
+from quvis import (
+    CircuitGenerationConfig,
+    PlaygroundAPI,
+    Visualizer,
+    VisualizationConfig,
+    analyze_routing_overhead,
+    extract_operations_per_slice,
+    extract_routing_operations_per_slice,
+)
+from quvis.enums import AlgorithmType, TopologyType
+from quvis.factories import CircuitFactory, TopologyFactory
+
+REPORT_VERSION = 1
+BASIS_GATES = ["id", "rz", "sx", "x", "cx", "swap"]
+
+# Qubit counts per preset; "full" includes 1000-qubit cases, which take
+# long to transpile
+PRESETS: dict[str, list[int]] = {
+    "quick": [16, 64],
+    "standard": [16, 64, 256],
+    "full": [16, 64, 256, 1000],
+}
+DEFAULT_ALGORITHMS = ["qft", "ghz", "qaoa"]
+DEFAULT_TOPOLOGIES = ["line", "grid", "heavy_hex"]
+
+STAGES = [
+    "extract_operations_per_slice",
+    "extract_routing_operations_per_slice",
+    "analyze_routing_overhead",
+    "visualizer_process_circuit",
+    "playground_generate_visualization_data",
+    "serialization",
+]
+
+
+@dataclass
+class BenchmarkCase:
+    """One point of the benchmark matrix."""
+    algorithm: AlgorithmType
+    num_qubits: int
+    topology: TopologyType
+    optimization_level: int = 1
+
+    @property
+    def name(self) -> str:
+        return f"{self.algorithm.value}-{self.num_qubits}-{self.topology.value}"
+
+    def config(self) -> CircuitGenerationConfig:
+        return CircuitGenerationConfig(
+            algorithm=self.algorithm,
+            num_qubits=self.num_qubits,
+            physical_qubits=self.num_qubits,
+            topology=self.topology,
+            optimization_level=self.optimization_level,
+        )
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """
+    Time fn over `repeat` runs, then measure its peak traced memory once.
+
+    Returns:
+        Minimum and median wall time in seconds and peak memory in MB
+    """
+    times = []
+    for _ in range(repeat):
+        TopologyFactory.clear_cache()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    TopologyFactory.clear_cache()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "wall_time_s": min(times),
+        "wall_time_median_s": statistics.median(times),
+        "peak_memory_mb": round((peak - baseline) / (1024 * 1024), 3),
+    }
+
+
+def run_case(case: BenchmarkCase, repeat: int, visualizer: Visualizer) -> dict[str, Any]:
+    """Benchmark every stage of one matrix point."""
+    config = case.config()
+    circuit = CircuitFactory.create(config)
+    coupling_map = TopologyFactory.create(case.topology, config.physical_qubits)
+    transpiled: QuantumCircuit = transpile(
+        circuit,
+        basis_gates=BASIS_GATES,
+        optimization_level=config.optimization_level,
+        coupling_map=coupling_map,
+    )
+    decomposed = circuit.decompose()
+    visualization_config = VisualizationConfig(
+        algorithm_name=case.name, topology_type=case.topology.value
+    )
+    # Stage caches would serve every run after the first
+    api = PlaygroundAPI(cache_entries=0)
+    payload = api.generate_visualization_data(config)
+
+    stage_fns: dict[str, Callable[[], Any]] = {
+        "extract_operations_per_slice": lambda: extract_operations_per_slice(transpiled),
+        "extract_routing_operations_per_slice": lambda: extract_routing_operations_per_slice(transpiled),
+        "analyze_routing_overhead": lambda: analyze_routing_overhead(decomposed, transpiled),
+        "visualizer_process_circuit": lambda: visualizer._process_circuit(
+            transpiled, visualization_config, coupling_map
+        ),
+        "playground_generate_visualization_data": lambda: api.generate_visualization_data(config),
+        "serialization": lambda: json.dumps(payload, separators=(",", ":")),
+    }
+
+    stages = {}
+    for stage in STAGES:
+        print(f"  {stage}... ", end="", flush=True)
+        stages[stage] = measure(stage_fns[stage], repeat)
+        print(
+            f"{stages[stage]['wall_time_s'] * 1000:.1f} ms, "
+            f"{stages[stage]['peak_memory_mb']:.1f} MB"
+        )
+
+    return {
+        "case": case.name,
+        "algorithm": case.algorithm.value,
+        "num_qubits": case.num_qubits,
+        "topology": case.topology.value,
+        "optimization_level": case.optimization_level,
+        "num_slices": len(payload["circuits"][1]["circuit_info"]["compiled_interaction_graph_ops_per_slice"]),
+        "transpiled_gates": len(transpiled.data),
+        "payload_bytes": len(json.dumps(payload, separators=(",", ":"))),
+        "stages": stages,
+    }
+
+
+def git_commit() -> str | None:
+    """Current commit hash, if run from a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark quvis processing stages")
+    parser.add_argument(
+        "--preset", choices=sorted(PRESETS), default="standard",
+        help="Qubit counts to benchmark (default: standard)",
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+",
+        help="Explicit qubit counts; overrides --preset",
+    )
+    parser.add_argument(
+        "--algorithms", nargs="+", default=DEFAULT_ALGORITHMS,
+        choices=[a.value for a in AlgorithmType],
+    )
+    parser.add_argument(
+        "--topologies", nargs="+", default=DEFAULT_TOPOLOGIES,
+        choices=[t.value for t in TopologyType if t not in (TopologyType.MODULAR, TopologyType.CUSTOM)],
+    )
+    parser.add_argument("--optimization-level", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (default: 3)")
+    parser.add_argument(
+        "--output", type=Path, default=Path("bench-results/python-benchmarks.json"),
+        help="Where to write the JSON report",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    sizes = args.sizes or PRESETS[args.preset]
+    cases = [
+        BenchmarkCase(AlgorithmType(algorithm), num_qubits, TopologyType(topology), args.optimization_level)
+        for algorithm in args.algorithms
+        for num_qubits in sizes
+        for topology in args.topologies
+    ]
+
+    # The visualizer is only used for _process_circuit; it never launches
+    visualizer = Visualizer(auto_open_browser=False)
+
+    results = []
+    for i, case in enumerate(cases, start=1):
+        print(f"[{i}/{len(cases)}] {case.name}")
+        results.append(run_case(case, args.repeat, visualizer))
+
+    report = {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "quvis": quvis.__version__,
+        "qiskit": qiskit.__version__,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Benchmark report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
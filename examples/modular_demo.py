@@ -9,6 +9,8 @@ from qiskit import QuantumCircuit
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../quvis/core/src')))
 
 from quvis.api.visualizer import Visualizer
+from quvis.enums import LinkPolicy, TopologyType
+from quvis.factories import TopologyFactory
 
 def create_modular_demo():
     print("Creating modular circuit demo (GHZ 20 qubits on 4 cores x 5 qubits)...")
@@ -25,57 +27,20 @@ def create_modular_demo():
     qc.measure_all()
     
     # 2. Define Coupling Map
-    coupling_map = []
-    
-    # Intra-core: All-to-All
-    print("Generating all-to-all intra-core connections...")
-    for c in range(num_cores):
-        offset = c * qubits_per_core
-        for i in range(qubits_per_core):
-            for j in range(i + 1, qubits_per_core):
-                coupling_map.append([offset + i, offset + j])
-                coupling_map.append([offset + j, offset + i]) # Undirected usually represented by both or sorted
-                
-    # Inter-core: 2D Grid (2x2)
+    # Intra-core: All-to-All, Inter-core: 2D Grid (2x2)
     # Core 0 -- Core 1
     #   |        |
     # Core 2 -- Core 3
-    print("Generating 2D grid inter-core connections...")
-    inter_core_links = []
-    
-    # Layout of cores:
-    # 0 1
-    # 2 3
-    
-    # Connections (using arbitrary qubits for links, e.g., last of one to first of other)
-    # 0-1
-    link_0_1 = [4, 5] # Core 0 last -> Core 1 first
-    inter_core_links.append(link_0_1)
-    coupling_map.append(link_0_1)
-    
-    # 0-2
-    link_0_2 = [4, 10] # Core 0 last -> Core 2 first
-    inter_core_links.append(link_0_2)
-    coupling_map.append(link_0_2)
-    
-    # 1-3
-    link_1_3 = [9, 15] # Core 1 last -> Core 3 first
-    inter_core_links.append(link_1_3)
-    coupling_map.append(link_1_3)
-    
-    # 2-3
-    link_2_3 = [14, 15] # Core 2 last -> Core 3 first
-    inter_core_links.append(link_2_3)
-    coupling_map.append(link_2_3)
-
-    coupling_map_dict = {
-        "num_qubits": num_qubits,
-        "num_cores": num_cores,
-        "qubits_per_core": qubits_per_core,
-        "global_topology": "Grid",
-        "inter_core_links": inter_core_links,
-        "coupling_map": coupling_map
-    }
+    # Links connect the last qubit of one core to the first qubit of the other
+    print("Generating modular coupling map...")
+    modular_topology = TopologyFactory.create_modular(
+        num_qubits,
+        num_cores=num_cores,
+        intra_core_topology=TopologyType.FULL,
+        global_topology=TopologyType.GRID,
+        link_policy=LinkPolicy.BOUNDARY,
+    )
+    coupling_map_dict = modular_topology.to_coupling_map_dict()
     
     # Initialize Visualizer
     viz = Visualizer()
@@ -6,6 +6,8 @@ import os
 from math import ceil, sqrt
 
 from quvis.api.visualizer import Visualizer
+from quvis.enums import LinkPolicy, TopologyType
+from quvis.factories import TopologyFactory
 
 def create_qft_circuit(n_qubits):
     """Creates a Quantum Fourier Transform circuit."""
@@ -19,59 +21,18 @@ def create_grid_topology(rows, cols):
 
 def create_modular_grid_topology(num_cores, qubits_per_core):
     """
-    Creates a coupling map for a modular architecture.
+    Creates a modular architecture.
     
     Intra-core: Grid topology
-    Inter-core: Ring topology (connecting last qubit of core i to first qubit of core i+1)
+    Inter-core: Ring topology (connecting last qubit of one core to first qubit of the next)
     """
-    edges = []
-    inter_core_links = []
-    
-    # Grid dimensions within each core
-    core_rows = int(sqrt(qubits_per_core))
-    core_cols = ceil(qubits_per_core / core_rows)
-    
-    # Intra-core connections (Grid)
-    for core in range(num_cores):
-        core_offset = core * qubits_per_core
-        for r in range(core_rows):
-            for c in range(core_cols):
-                u_local = r * core_cols + c
-                if u_local >= qubits_per_core:
-                    continue
-                u = core_offset + u_local
-                
-                # Connect to right neighbor
-                if c + 1 < core_cols:
-                    v_local = r * core_cols + (c + 1)
-                    if v_local < qubits_per_core:
-                        v = core_offset + v_local
-                        edges.append([u, v])
-                        edges.append([v, u])
-                
-                # Connect to bottom neighbor
-                if r + 1 < core_rows:
-                    v_local = (r + 1) * core_cols + c
-                    if v_local < qubits_per_core:
-                        v = core_offset + v_local
-                        edges.append([u, v])
-                        edges.append([v, u])
-
-    # Inter-core connections (Ring of Cores)
-    for core in range(num_cores):
-        core_offset = core * qubits_per_core
-        next_core = (core + 1) % num_cores
-        next_core_offset = next_core * qubits_per_core
-        
-        # Connect last qubit of current core to first qubit of next core
-        u = core_offset + qubits_per_core - 1
-        v = next_core_offset
-        
-        edges.append([u, v])
-        edges.append([v, u]) # Bidirectional
-        inter_core_links.append([u, v])
-
-    return edges, inter_core_links
+    return TopologyFactory.create_modular(
+        num_cores * qubits_per_core,
+        num_cores=num_cores,
+        intra_core_topology=TopologyType.GRID,
+        global_topology=TopologyType.RING,
+        link_policy=LinkPolicy.BOUNDARY,
+    )
 
 def main():
     n_qubits = 500
@@ -115,26 +76,17 @@ def main():
     print(f"\nScenario 3: Modular Architecture ({n_cores} cores x {qubits_per_core} qubits)")
     
     qc_modular_base = create_qft_circuit(n_qubits)
-    modular_edges, inter_core_links = create_modular_grid_topology(n_cores, qubits_per_core)
-    modular_coupling_map = CouplingMap(modular_edges)
+    modular_topology = create_modular_grid_topology(n_cores, qubits_per_core)
     
     print("Transpiling to Modular Grid...")
     qc_modular_transpiled = transpile(
         qc_modular_base,
-        coupling_map=modular_coupling_map,
+        coupling_map=modular_topology.coupling_map,
         optimization_level=1
     )
     
     # Construct the definition dictionary for Visualizer
-    modular_def = {
-        "coupling_map": modular_edges,
-        "num_qubits": n_qubits,
-        "num_cores": n_cores,
-        "qubits_per_core": qubits_per_core,
-        "global_topology": "Ring",
-        "inter_core_links": inter_core_links,
-        "topology_type": "modular_grid"
-    }
+    modular_def = modular_topology.to_coupling_map_dict()
 
     viz.add_circuit(
         qc_modular_transpiled,
@@ -32,9 +32,19 @@ from .compiler.utils import (
     CompiledCircuitInfo,
     extract_operations_per_slice,
     extract_routing_operations_per_slice,
-    analyze_routing_overhead
+    analyze_routing_overhead,
+    analyze_inter_core_traffic,
+    compute_qubit_statistics,
+    count_circuit_metrics,
+    CircuitMetrics,
+    InterCoreAnalysis,
+    QubitStatistics
 )
-from .enums import AlgorithmType, TopologyType
+from .compiler.fingerprint import circuit_fingerprint
+from .compiler.scheduling import GateDurations, CircuitSchedule, schedule_operations
+from .compiler.timeline import TimelinePyramid, build_timeline_pyramid
+from .compiler.layout import LayoutParameters, compute_device_layout
+from .enums import AlgorithmType, TopologyType, LinkPolicy, DetailLevel, BestOfMetric
 from .config import CircuitGenerationConfig, VisualizationConfig
 
 __version__ = "v0.28.0"
@@ -52,16 +62,33 @@ __all__ = [
     "RoutingCircuitInfo",
     "DeviceInfo",
     "ModularInfo",
+    "InterCoreAnalysis",
+    "CircuitMetrics",
+    "QubitStatistics",
+    "GateDurations",
+    "CircuitSchedule",
+    "TimelinePyramid",
+    "LayoutParameters",
     "VisualizationData",
     
     # Utilities
     "extract_operations_per_slice",
     "extract_routing_operations_per_slice", 
     "analyze_routing_overhead",
+    "analyze_inter_core_traffic",
+    "compute_qubit_statistics",
+    "count_circuit_metrics",
+    "schedule_operations",
+    "build_timeline_pyramid",
+    "compute_device_layout",
+    "circuit_fingerprint",
     
     # Enums
     "AlgorithmType",
     "TopologyType",
+    "LinkPolicy",
+    "DetailLevel",
+    "BestOfMetric",
 
     # Config
     "CircuitGenerationConfig",
@@ -0,0 +1,557 @@
+"""
+Cost-based admission control for circuit generation.
+
+A CostModel predicts the runtime and peak memory of a generation request
+from its algorithm, qubit count, topology, optimization level and detail
+level. It is fitted from sweep results and benchmark reports. The
+AdmissionController uses the predictions and the current load to run a
+request now, queue it, or reject it with a retry hint. Small interactive
+requests take a fast lane that heavy requests cannot fill.
+
+## Fitting a cost model
+
+```bash
+# Measure the cost of full playground data in fresh worker processes
+python -m quvis.sweep --algorithms qft ghz qaoa --sizes 16 64 256 \\
+    --topologies line grid heavy_hex --optimization-levels 0 1 2 3 \\
+    --detail full --workers 2 --results cost-sweep.jsonl
+
+python -m quvis.api.admission cost-sweep.jsonl bench-results/python-benchmarks.json \\
+    --output quvis/core/src/quvis/api/cost_model.json
+```
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import statistics
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import numpy as np
+
+from ..config import CircuitGenerationConfig
+from ..enums import DetailLevel
+
+# Create module logger
+logger = logging.getLogger(__name__)
+
+DEFAULT_COST_MODEL_PATH = Path(__file__).with_name("cost_model.json")
+
+# Ridge penalty of the fit; the category offsets overlap, so the least
+# squares problem alone is singular
+_RIDGE = 1e-3
+
+
+@dataclass
+class CostEstimate:
+    """Predicted cost of one request."""
+    runtime_s: float
+    memory_mb: float
+
+    def __add__(self, other: "CostEstimate") -> "CostEstimate":
+        return CostEstimate(self.runtime_s + other.runtime_s, self.memory_mb + other.memory_mb)
+
+
+@dataclass
+class CostRecord:
+    """Measured cost of one configuration, the training data of a CostModel."""
+    algorithm: str | None
+    num_qubits: int
+    topology: str
+    optimization_level: int
+    detail: str
+    runtime_s: float
+    memory_mb: float | None = None  # Peak memory above the process baseline, if measured
+
+
+def load_cost_records(path: str | Path) -> list[CostRecord]:
+    """
+    Read measured costs from a sweep results file or a benchmark report.
+
+    Sweep results (JSON lines, from python -m quvis.sweep) give runtime and,
+    when run with a fresh worker per point, memory as peak RSS above the
+    worker's starting RSS. Benchmark reports (JSON, from
+    benchmarks/run_benchmarks.py) give the runtime and traced peak memory
+    of the playground stage, which generates full data.
+    """
+    path = Path(path)
+    records = []
+    if path.suffix == ".jsonl":
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("status") != "ok":
+                    continue
+                config = record["config"]
+                memory_mb = None
+                if record.get("peak_rss_mb") is not None and record.get("start_rss_mb") is not None:
+                    memory_mb = max(record["peak_rss_mb"] - record["start_rss_mb"], 0.0)
+                records.append(CostRecord(
+                    algorithm=config["algorithm"],
+                    num_qubits=config["num_qubits"],
+                    topology=config["topology"],
+                    optimization_level=config["optimization_level"],
+                    detail=record.get("detail", DetailLevel.SUMMARY.value),
+                    runtime_s=record["wall_time_s"],
+                    memory_mb=memory_mb,
+                ))
+    else:
+        report = json.loads(path.read_text())
+        for result in report["results"]:
+            stage = result["stages"]["playground_generate_visualization_data"]
+            records.append(CostRecord(
+                algorithm=result["algorithm"],
+                num_qubits=result["num_qubits"],
+                topology=result["topology"],
+                optimization_level=result["optimization_level"],
+                detail=DetailLevel.FULL.value,
+                runtime_s=stage["wall_time_s"],
+                memory_mb=stage["peak_memory_mb"],
+            ))
+    return records
+
+
+@dataclass
+class LogLinearFit:
+    """
+    Log-space linear model of one cost.
+
+    log(cost) = intercept[algorithm]
+                + (slope[algorithm] + level_slope[level]) * log2(num_qubits)
+                + topology offset + optimization level offset + detail offset
+
+    Transpiling at higher optimization levels grows faster with the circuit
+    size, hence the per-level slope.
+
+    Categories missing from the training data take the largest fitted value
+    of their kind, so predictions for them err on the expensive side.
+    """
+    intercept: dict[str, float]
+    slope: dict[str, float]
+    level_slope: dict[str, float]
+    topology: dict[str, float]
+    optimization_level: dict[str, float]
+    detail: dict[str, float]
+    sigma: float  # Standard deviation of the log residuals
+    floor: float  # Smallest cost measured
+
+    @classmethod
+    def fit(cls, features: list[tuple[str, int, str, int, str]], values: list[float]) -> "LogLinearFit":
+        """Fit by ridge regression on (algorithm, qubits, topology, level, detail) features."""
+        algorithms = sorted({f[0] for f in features})
+        topologies = sorted({f[2] for f in features})
+        levels = sorted({str(f[3]) for f in features})
+        details = sorted({f[4] for f in features})
+
+        columns: dict[tuple[str, str], int] = {}
+        for kind, names in (
+            ("intercept", algorithms), ("slope", algorithms), ("level_slope", levels),
+            ("topology", topologies), ("optimization_level", levels), ("detail", details),
+        ):
+            for name in names:
+                columns[(kind, name)] = len(columns)
+
+        x = np.zeros((len(features), len(columns)))
+        for row, (algorithm, num_qubits, topology, level, detail) in enumerate(features):
+            x[row, columns[("intercept", algorithm)]] = 1.0
+            x[row, columns[("slope", algorithm)]] = math.log2(num_qubits)
+            x[row, columns[("level_slope", str(level))]] = math.log2(num_qubits)
+            x[row, columns[("topology", topology)]] = 1.0
+            x[row, columns[("optimization_level", str(level))]] = 1.0
+            x[row, columns[("detail", detail)]] = 1.0
+        floor = max(min(values), 1e-6)
+        y = np.log(np.maximum(values, floor))
+
+        weights = np.linalg.solve(x.T @ x + _RIDGE * np.eye(len(columns)), x.T @ y)
+        residuals = y - x @ weights
+        coefficients: dict[str, dict[str, float]] = {
+            kind: {} for kind in (
+                "intercept", "slope", "level_slope", "topology", "optimization_level", "detail"
+            )
+        }
+        for (kind, name), column in columns.items():
+            coefficients[kind][name] = float(weights[column])
+        return cls(
+            **coefficients,
+            sigma=float(np.sqrt(np.mean(residuals ** 2))),
+            floor=float(floor),
+        )
+
+    def predict(
+        self,
+        algorithm: str | None,
+        num_qubits: int,
+        topology: str,
+        optimization_level: int,
+        detail: str,
+        quantile: float = 0.5,
+    ) -> float:
+        """Predicted cost, at the given quantile of the residual distribution."""
+        def coefficient(values: dict[str, float], name: str | None) -> float:
+            return values[name] if name in values else max(values.values())
+
+        slope = coefficient(self.slope, algorithm) + coefficient(self.level_slope, str(optimization_level))
+        log_cost = (
+            coefficient(self.intercept, algorithm)
+            + slope * math.log2(max(num_qubits, 1))
+            + coefficient(self.topology, topology)
+            + coefficient(self.optimization_level, str(optimization_level))
+            + coefficient(self.detail, detail)
+            + statistics.NormalDist().inv_cdf(quantile) * self.sigma
+        )
+        return max(math.exp(log_cost), self.floor)
+
+
+@dataclass
+class CostModel:
+    """Predicts the runtime and peak memory of circuit generation requests."""
+    runtime: LogLinearFit
+    memory: LogLinearFit
+    num_records: int
+    quantile: float = 0.9  # Predictions err on the expensive side
+
+    @classmethod
+    def fit(cls, records: list[CostRecord], quantile: float = 0.9) -> "CostModel":
+        """
+        Fit a cost model to measured costs.
+
+        Raises:
+            ValueError: If there are no records, or none with memory
+        """
+        # Records without an algorithm (uploads) or a memory measurement
+        # are left out of the fits they cannot inform
+        Features = tuple[str, int, str, int, str]
+        runtime_features: list[Features] = []
+        runtimes: list[float] = []
+        memory_features: list[Features] = []
+        memories: list[float] = []
+        for r in records:
+            if r.algorithm is None:
+                continue
+            row = (r.algorithm, r.num_qubits, r.topology, r.optimization_level, r.detail)
+            runtime_features.append(row)
+            runtimes.append(r.runtime_s)
+            if r.memory_mb is not None:
+                memory_features.append(row)
+                # Memory below 1 MB is measurement noise
+                memories.append(max(r.memory_mb, 1.0))
+        if not runtime_features or not memory_features:
+            raise ValueError("Fitting a cost model needs records with runtime and memory")
+
+        return cls(
+            runtime=LogLinearFit.fit(runtime_features, runtimes),
+            memory=LogLinearFit.fit(memory_features, memories),
+            num_records=len(runtime_features),
+            quantile=quantile,
+        )
+
+    def estimate(self, config: CircuitGenerationConfig, detail: DetailLevel | str = DetailLevel.FULL) -> CostEstimate:
+        """Predicted cost of generating a configuration."""
+        features = (
+            config.algorithm.value if config.algorithm is not None else None,
+            config.num_qubits,
+            config.topology.value,
+            config.optimization_level,
+            DetailLevel(detail).value,
+        )
+        return CostEstimate(
+            runtime_s=self.runtime.predict(*features, quantile=self.quantile),
+            memory_mb=self.memory.predict(*features, quantile=self.quantile),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CostModel":
+        return cls(
+            runtime=LogLinearFit(**data["runtime"]),
+            memory=LogLinearFit(**data["memory"]),
+            num_records=data["num_records"],
+            quantile=data.get("quantile", 0.9),
+        )
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_COST_MODEL_PATH) -> "CostModel":
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+class AdmissionRejected(Exception):
+    """A request was not admitted; status_code is 429 or 503."""
+
+    def __init__(self, status_code: int, message: str, retry_after_s: float | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.retry_after_s = retry_after_s
+
+    def headers(self) -> dict[str, str]:
+        """Retry-After header, in whole seconds, if retrying can succeed."""
+        if self.retry_after_s is None:
+            return {}
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after_s)))}
+
+
+@dataclass
+class AdmissionPolicy:
+    """Capacity limits of an AdmissionController."""
+    slots: int  # Heavy requests running at once
+    memory_budget_mb: float  # Predicted memory of running heavy requests
+    fast_lane_slots: int = 4
+    fast_lane_runtime_s: float = 1.0  # Requests predicted below both limits take the fast lane
+    fast_lane_memory_mb: float = 256.0
+    max_queue: int = 32  # Heavy requests waiting at once
+    max_queue_wait_s: float = 120.0  # Longest predicted wait a request is queued for
+    max_runtime_s: float = 900.0  # Longest predicted runtime admitted at all
+
+    @classmethod
+    def from_environment(cls) -> "AdmissionPolicy":
+        """
+        Policy sized for this machine.
+
+        QUVIS_ADMISSION_SLOTS (default: the CPUs available) and
+        QUVIS_ADMISSION_MEMORY_MB (default: half the physical memory)
+        override the heavy lane capacity.
+        """
+        if hasattr(os, "sched_getaffinity"):
+            cpus = len(os.sched_getaffinity(0))
+        else:
+            cpus = os.cpu_count() or 1
+        try:
+            physical_mb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024 * 1024)
+        except (AttributeError, ValueError, OSError):  # Not available on Windows
+            physical_mb = 8192.0
+        return cls(
+            slots=int(os.environ.get("QUVIS_ADMISSION_SLOTS", cpus)),
+            memory_budget_mb=float(os.environ.get("QUVIS_ADMISSION_MEMORY_MB", physical_mb / 2)),
+        )
+
+
+@dataclass
+class Ticket:
+    """An admitted request."""
+    estimate: CostEstimate
+    lane: str  # "fast" or "heavy"
+    queued_at: float
+    admitted_at: float | None = None
+    future: asyncio.Future | None = field(default=None, repr=False)
+
+    @property
+    def waited_s(self) -> float:
+        return (self.admitted_at or time.monotonic()) - self.queued_at
+
+
+class AdmissionController:
+    """
+    Admits generation requests by their predicted cost.
+
+    Requests predicted to be small take the fast lane, with its own slots,
+    so they never wait behind heavy ones. Heavy requests run while slots and
+    the memory budget allow; otherwise they queue, shortest predicted
+    runtime first, with time spent waiting counted against the runtime so
+    long requests are not starved. Requests that could never run are
+    rejected with 503, and requests that would wait longer than
+    max_queue_wait_s, or find the queue full, with 429 and a Retry-After
+    from the predicted wait.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, cost_model: CostModel, policy: AdmissionPolicy):
+        self.cost_model = cost_model
+        self.policy = policy
+        self._running: list[Ticket] = []
+        self._queue: list[Ticket] = []
+        self._fast_running = 0
+        self._fast_queue: list[Ticket] = []
+        self.admitted = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def admit(self, estimate: CostEstimate) -> AsyncIterator[Ticket]:
+        """
+        Hold a slot for the duration of the block.
+
+        Raises:
+            AdmissionRejected: If the request is not admitted
+        """
+        ticket = await self._acquire(estimate)
+        try:
+            yield ticket
+        finally:
+            self._release(ticket)
+
+    def status(self) -> dict[str, Any]:
+        """Current load, for monitoring."""
+        return {
+            "running": len(self._running),
+            "queued": len(self._queue),
+            "fast_lane_running": self._fast_running,
+            "fast_lane_queued": len(self._fast_queue),
+            "memory_in_use_mb": round(self._memory_in_use(), 1),
+            "predicted_wait_s": round(self._predicted_wait(len(self._queue)), 1),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "policy": asdict(self.policy),
+        }
+
+    async def _acquire(self, estimate: CostEstimate) -> Ticket:
+        policy = self.policy
+        now = time.monotonic()
+        if estimate.runtime_s <= policy.fast_lane_runtime_s and estimate.memory_mb <= policy.fast_lane_memory_mb:
+            ticket = Ticket(estimate, "fast", now)
+            if self._fast_running < policy.fast_lane_slots and not self._fast_queue:
+                self._fast_running += 1
+                return self._admitted(ticket)
+            self._fast_queue.append(ticket)
+            return await self._wait(ticket, self._fast_queue)
+
+        if estimate.runtime_s > policy.max_runtime_s or estimate.memory_mb > policy.memory_budget_mb:
+            self.rejected += 1
+            raise AdmissionRejected(
+                503,
+                f"Request is predicted to take {estimate.runtime_s:.0f} s and {estimate.memory_mb:.0f} MB, "
+                f"more than this server accepts ({policy.max_runtime_s:.0f} s, "
+                f"{policy.memory_budget_mb:.0f} MB); use fewer qubits, a lower optimization level "
+                f"or detail=summary",
+            )
+
+        ticket = Ticket(estimate, "heavy", now)
+        if not self._queue and self._fits(estimate):
+            self._running.append(ticket)
+            return self._admitted(ticket)
+
+        position = sum(1 for queued in self._queue if self._priority(queued, now) <= estimate.runtime_s)
+        predicted_wait = self._predicted_wait(position)
+        if len(self._queue) >= policy.max_queue or predicted_wait > policy.max_queue_wait_s:
+            self.rejected += 1
+            raise AdmissionRejected(
+                429,
+                f"Server busy: {len(self._running)} requests running and {len(self._queue)} queued, "
+                f"predicted wait {predicted_wait:.0f} s",
+                retry_after_s=predicted_wait,
+            )
+        self._queue.append(ticket)
+        logger.info(
+            f"⏳ Queued request predicted at {estimate.runtime_s:.1f} s, {estimate.memory_mb:.0f} MB "
+            f"({len(self._queue)} waiting)"
+        )
+        return await self._wait(ticket, self._queue)
+
+    async def _wait(self, ticket: Ticket, queue: list[Ticket]) -> Ticket:
+        ticket.future = asyncio.get_running_loop().create_future()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket in queue:
+                queue.remove(ticket)
+            elif ticket.admitted_at is not None:
+                # Admitted as the client went away
+                self._release(ticket)
+            raise
+        return ticket
+
+    def _admitted(self, ticket: Ticket) -> Ticket:
+        ticket.admitted_at = time.monotonic()
+        self.admitted += 1
+        return ticket
+
+    def _release(self, ticket: Ticket) -> None:
+        if ticket.lane == "fast":
+            self._fast_running -= 1
+            while self._fast_queue and self._fast_running < self.policy.fast_lane_slots:
+                self._fast_running += 1
+                self._wake(self._fast_queue.pop(0))
+            return
+
+        if ticket in self._running:
+            self._running.remove(ticket)
+        while self._queue:
+            now = time.monotonic()
+            head = min(self._queue, key=lambda queued: self._priority(queued, now))
+            # Requests behind the head do not skip it, so a request waiting
+            # for memory is not starved by smaller ones
+            if not self._fits(head.estimate):
+                break
+            self._queue.remove(head)
+            self._running.append(head)
+            self._wake(head)
+
+    def _wake(self, ticket: Ticket) -> None:
+        self._admitted(ticket)
+        if ticket.future is not None and not ticket.future.done():
+            ticket.future.set_result(None)
+
+    def _fits(self, estimate: CostEstimate) -> bool:
+        return (
+            len(self._running) < self.policy.slots
+            and self._memory_in_use() + estimate.memory_mb <= self.policy.memory_budget_mb
+        )
+
+    def _memory_in_use(self) -> float:
+        return sum(ticket.estimate.memory_mb for ticket in self._running)
+
+    @staticmethod
+    def _priority(ticket: Ticket, now: float) -> float:
+        """Queue order: shortest predicted runtime first, aged by the time waited."""
+        return ticket.estimate.runtime_s - (now - ticket.queued_at)
+
+    def _predicted_wait(self, position: int) -> float:
+        """Predicted wait of a request queued behind `position` others."""
+        now = time.monotonic()
+        remaining = sum(
+            max(ticket.estimate.runtime_s - (now - (ticket.admitted_at or now)), 0.0)
+            for ticket in self._running
+        )
+        ahead = sorted(self._queue, key=lambda queued: self._priority(queued, now))[:position]
+        if len(self._running) < self.policy.slots and not ahead:
+            # Waiting for memory only; the soonest running request to finish
+            return min(
+                (max(t.estimate.runtime_s - (now - (t.admitted_at or now)), 0.0) for t in self._running),
+                default=0.0,
+            )
+        return (remaining + sum(ticket.estimate.runtime_s for ticket in ahead)) / self.policy.slots
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fit a cost model for admission control from sweep results and benchmark reports."
+    )
+    parser.add_argument(
+        "results", nargs="+", type=Path,
+        help="Sweep results (.jsonl) and benchmark reports (.json).",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=DEFAULT_COST_MODEL_PATH, help="Where to write the model."
+    )
+    parser.add_argument(
+        "--quantile", type=float, default=0.9,
+        help="Quantile of the residuals the predictions are made at (default: 0.9).",
+    )
+    args = parser.parse_args()
+
+    records = [record for path in args.results for record in load_cost_records(path)]
+    model = CostModel.fit(records, quantile=args.quantile)
+    model.save(args.output)
+    print(
+        f"Fitted on {model.num_records} records: runtime within x{math.exp(model.runtime.sigma):.2f}, "
+        f"memory within x{math.exp(model.memory.sigma):.2f} (one standard deviation); "
+        f"written to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
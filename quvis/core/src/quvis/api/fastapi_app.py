@@ -5,18 +5,31 @@ This module provides a REST API for quantum circuit generation and visualization
 """
 
 import logging
+import os
 from typing import Any
 from contextlib import asynccontextmanager
+from dataclasses import replace
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import uvicorn
 
 
-from .playground import PlaygroundAPI
-from ..enums import AlgorithmType, TopologyType
+from .admission import (
+    DEFAULT_COST_MODEL_PATH,
+    AdmissionController,
+    AdmissionPolicy,
+    AdmissionRejected,
+    CostEstimate,
+    CostModel,
+)
+from .playground import MAX_COMPARISON_VARIANTS, PlaygroundAPI
+from .uploads import MAX_UPLOAD_BYTES, ResultCache, load_circuit, upload_cache_key
+from ..enums import AlgorithmType, BestOfMetric, CircuitFormat, DetailLevel, TopologyType, LinkPolicy
 from ..config import CircuitGenerationConfig
+from ..compiler.scheduling import GateDurations
 
 logging.basicConfig(
     level=logging.INFO,
@@ -65,6 +78,46 @@ class CircuitGenerationRequest(BaseModel):
         description="Number of repetitions for QAOA algorithm",
         examples=[2]
     )
+    num_cores: int | None = Field(
+        None,
+        ge=1,
+        le=64,
+        description="Number of cores for the modular topology",
+        examples=[4]
+    )
+    intra_core_topology: str | None = Field(
+        None,
+        description="Topology inside each core for the modular topology: line, ring, grid, full",
+        examples=[TopologyType.GRID.value]
+    )
+    global_topology: str | None = Field(
+        None,
+        description="Topology between cores for the modular topology: line, ring, grid, full",
+        examples=[TopologyType.RING.value]
+    )
+    link_policy: str | None = Field(
+        None,
+        description=f"Inter-core link placement: {', '.join([p.value for p in LinkPolicy])}",
+        examples=[LinkPolicy.BOUNDARY.value]
+    )
+    gate_durations: dict[str, float | dict[str, float]] | None = Field(
+        None,
+        description="Gate durations in ns by gate name; when set, ASAP/ALAP schedules are returned "
+                    "(an empty object uses the default durations). Optional qubit_overrides and "
+                    "edge_overrides objects set durations on single qubits and edges, keyed by "
+                    "'gate|qubit' and 'gate|qubit|qubit'",
+        examples=[{"cx": 300.0, "sx": 35.0, "qubit_overrides": {"x|2": 50.0}, "edge_overrides": {"cx|0|1": 250.0}}]
+    )
+    detail: str = Field(
+        DetailLevel.FULL.value,
+        description="full: renderable per-slice data; summary: only circuit_stats and routing_analysis, "
+                    "much cheaper for large circuits",
+        examples=[DetailLevel.SUMMARY.value]
+    )
+    timeline_pyramid: bool = Field(
+        False,
+        description="Also return a multi-resolution timeline pyramid of per-slice aggregates with each circuit"
+    )
 
     class Config:
         json_schema_extra = {
@@ -78,6 +131,29 @@ class CircuitGenerationRequest(BaseModel):
         }
 
 
+class CompilationComparisonRequest(CircuitGenerationRequest):
+    """Request model for the compilation comparison endpoint; optimization_level is ignored."""
+
+    optimization_levels: list[int] = Field(
+        [0, 1, 2, 3],
+        min_length=1,
+        description="Qiskit transpiler optimization levels to compare",
+        examples=[[0, 1, 2, 3]]
+    )
+    seeds: list[int] | None = Field(
+        None,
+        min_length=1,
+        description=f"Transpiler seeds to compare at every level (at most {MAX_COMPARISON_VARIANTS} "
+                    "level and seed pairs in total); omitted lets the transpiler pick",
+        examples=[[1, 2, 3]]
+    )
+    best_of: str | None = Field(
+        None,
+        description=f"Return only the best compiled variant by: {', '.join([m.value for m in BestOfMetric])}",
+        examples=[BestOfMetric.SWAPS.value]
+    )
+
+
 class CircuitGenerationResponse(BaseModel):
     """Response model for circuit generation."""
 
@@ -87,6 +163,13 @@ class CircuitGenerationResponse(BaseModel):
     error_message: str | None = None
 
 
+class CompilationComparisonResponse(CircuitGenerationResponse):
+    """Response model for compilation comparison: the logical view, then the compiled views."""
+
+    variants: list[dict[str, Any]]
+    best: dict[str, Any] | None = None
+
+
 class ErrorResponse(BaseModel):
     """Error response model."""
 
@@ -108,7 +191,12 @@ async def lifespan(app: FastAPI):
     """Manage application startup and shutdown."""
     logger.info("🚀 Starting Quvis FastAPI Backend")
     logger.info("✓ PlaygroundAPI initialized")
+    logger.info(
+        f"✓ Admission control: {admission_controller.policy.slots} slots, "
+        f"{admission_controller.policy.memory_budget_mb:.0f} MB budget"
+    )
     yield
+    playground_api.close()
     logger.info("👋 Shutting down Quvis FastAPI Backend")
 
 
@@ -137,8 +225,107 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize PlaygroundAPI
-playground_api = PlaygroundAPI()
+# Initialize PlaygroundAPI; its stage caches let UI parameter changes reuse
+# the circuit and logical view (QUVIS_STAGE_CACHE_ENTRIES=0 disables them,
+# QUVIS_STAGE_CACHE_MB bounds the estimated size of each stage)
+playground_api = PlaygroundAPI(
+    cache_entries=int(os.environ.get("QUVIS_STAGE_CACHE_ENTRIES", 16)),
+    cache_bytes=int(float(os.environ.get("QUVIS_STAGE_CACHE_MB", 256)) * 1024 * 1024),
+    # Large device layouts take seconds; clients lay those out until they are ready
+    background_layouts=True,
+)
+
+# Generated data of uploaded circuits, by upload content hash and options
+upload_cache = ResultCache(
+    max_bytes=int(float(os.environ.get("QUVIS_UPLOAD_CACHE_MB", 256)) * 1024 * 1024)
+)
+
+# Admits generation requests by their predicted cost; QUVIS_COST_MODEL
+# overrides the bundled model (fit one with python -m quvis.api.admission)
+admission_controller = AdmissionController(
+    CostModel.load(os.environ.get("QUVIS_COST_MODEL", DEFAULT_COST_MODEL_PATH)),
+    AdmissionPolicy.from_environment(),
+)
+
+
+def _topology_params(
+    num_cores: int | None,
+    intra_core_topology: str | None,
+    global_topology: str | None,
+    link_policy: str | None,
+) -> dict[str, Any]:
+    """Modular topology parameters that were set."""
+    return {
+        key: value
+        for key, value in {
+            "num_cores": num_cores,
+            "intra_core_topology": intra_core_topology,
+            "global_topology": global_topology,
+            "link_policy": link_policy,
+        }.items()
+        if value is not None
+    }
+
+
+def _generation_config(request: CircuitGenerationRequest) -> CircuitGenerationConfig:
+    """Configuration object of a circuit generation request."""
+    # Set physical qubits to num_qubits if not provided
+    physical_qubits = request.physical_qubits or request.num_qubits
+
+    # Prepare kwargs for algorithm-specific parameters
+    kwargs = {"optimization_level": request.optimization_level}
+    if request.reps is not None:
+        kwargs["reps"] = request.reps
+
+    # Modular topology parameters
+    topology_params = _topology_params(
+        request.num_cores,
+        request.intra_core_topology,
+        request.global_topology,
+        request.link_policy,
+    )
+
+    return CircuitGenerationConfig(
+        algorithm=AlgorithmType(request.algorithm),
+        num_qubits=request.num_qubits,
+        physical_qubits=request.physical_qubits or request.num_qubits,
+        topology=TopologyType(request.topology),
+        optimization_level=request.optimization_level,
+        algorithm_params=kwargs,
+        topology_params=topology_params,
+        gate_durations=(
+            GateDurations.from_dict(request.gate_durations)
+            if request.gate_durations is not None else None
+        ),
+        timeline_pyramid=request.timeline_pyramid,
+    )
+
+
+def _rejected(e: AdmissionRejected) -> HTTPException:
+    """HTTP error of a request that was not admitted."""
+    logger.warning(f"🚦 Request not admitted: {e.message}")
+    return HTTPException(status_code=e.status_code, detail=e.message, headers=e.headers())
+
+
+async def _read_upload(request: Request, max_bytes: int) -> bytes:
+    """Read a request body as it streams in, rejecting it once it exceeds max_bytes."""
+    content_length = request.headers.get("content-length")
+    if content_length is not None:
+        try:
+            declared = int(content_length)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+        if declared > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Upload exceeds {max_bytes} bytes")
+
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Upload exceeds {max_bytes} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
 
 
 # Routes
@@ -163,13 +350,21 @@ async def health_check():
     )
 
 
+@app.get("/api/admission", response_model=dict)
+async def admission_status():
+    """Load and capacity of the admission controller."""
+    return admission_controller.status()
+
+
 @app.post(
     "/api/generate-circuit",
     response_model=CircuitGenerationResponse,
     responses={
         200: {"description": "Circuit generated successfully"},
         400: {"model": ErrorResponse, "description": "Invalid request parameters"},
+        429: {"model": ErrorResponse, "description": "Server busy; retry after the Retry-After header"},
         500: {"model": ErrorResponse, "description": "Circuit generation failed"},
+        503: {"model": ErrorResponse, "description": "Request predicted to exceed the server's capacity"},
     }
 )
 async def generate_circuit(request: CircuitGenerationRequest):
@@ -178,6 +373,8 @@ async def generate_circuit(request: CircuitGenerationRequest):
 
     This endpoint creates both logical and compiled versions of a quantum circuit
     based on the specified algorithm, topology, and optimization parameters.
+    Requests are admitted by their predicted cost: they may be queued, or
+    rejected with 429 (busy, see Retry-After) or 503 (too large).
     """
     try:
         logger.info(
@@ -186,26 +383,15 @@ async def generate_circuit(request: CircuitGenerationRequest):
             f"topology={request.topology}"
         )
 
-        # Set physical qubits to num_qubits if not provided
-        physical_qubits = request.physical_qubits or request.num_qubits
-
-        # Prepare kwargs for algorithm-specific parameters
-        kwargs = {"optimization_level": request.optimization_level}
-        if request.reps is not None:
-            kwargs["reps"] = request.reps
-
-        # Create configuration object
-        config = CircuitGenerationConfig(
-            algorithm=AlgorithmType(request.algorithm),
-            num_qubits=request.num_qubits,
-            physical_qubits=request.physical_qubits or request.num_qubits,
-            topology=TopologyType(request.topology),
-            optimization_level=request.optimization_level,
-            algorithm_params=kwargs
-        )
+        config = _generation_config(request)
+        detail = DetailLevel(request.detail)
 
-        # Generate circuit data
-        result = playground_api.generate_visualization_data(config)
+        # Generate circuit data once admitted, in a worker thread so that
+        # queued requests and health checks are not blocked
+        async with admission_controller.admit(admission_controller.cost_model.estimate(config, detail)):
+            result = await run_in_threadpool(
+                playground_api.generate_visualization_data, config, detail=detail
+            )
 
         logger.info("✅ Circuit generated successfully")
 
@@ -215,6 +401,8 @@ async def generate_circuit(request: CircuitGenerationRequest):
             generation_successful=True
         )
 
+    except AdmissionRejected as e:
+        raise _rejected(e)
     except ValueError as e:
         logger.error(f"❌ Validation error: {e}")
         raise HTTPException(
@@ -229,6 +417,188 @@ async def generate_circuit(request: CircuitGenerationRequest):
         )
 
 
+@app.post(
+    "/api/circuits/upload",
+    response_model=CircuitGenerationResponse,
+    responses={
+        200: {"description": "Circuit visualized successfully"},
+        400: {"model": ErrorResponse, "description": "Unparseable circuit or invalid parameters"},
+        413: {"model": ErrorResponse, "description": "Upload too large"},
+        429: {"model": ErrorResponse, "description": "Server busy; retry after the Retry-After header"},
+        500: {"model": ErrorResponse, "description": "Circuit generation failed"},
+        503: {"model": ErrorResponse, "description": "Request predicted to exceed the server's capacity"},
+    }
+)
+async def upload_circuit(
+    request: Request,
+    response: Response,
+    topology: str = Query(
+        ..., description=f"Device topology: {', '.join([t.value for t in TopologyType])}"
+    ),
+    physical_qubits: int | None = Query(
+        None, ge=2, le=1000,
+        description="Number of physical qubits for device topology (defaults to the circuit's qubits)"
+    ),
+    optimization_level: int = Query(1, ge=0, le=3, description="Qiskit transpiler optimization level"),
+    circuit_format: str | None = Query(
+        None, alias="format",
+        description=f"Upload format: {', '.join([f.value for f in CircuitFormat])} (detected if omitted)"
+    ),
+    num_cores: int | None = Query(None, ge=1, le=64, description="Number of cores for the modular topology"),
+    intra_core_topology: str | None = Query(None, description="Topology inside each core"),
+    global_topology: str | None = Query(None, description="Topology between cores"),
+    link_policy: str | None = Query(None, description="Inter-core link placement"),
+    detail: str = Query(DetailLevel.FULL.value, description="full or summary (statistics only)"),
+    timeline_pyramid: bool = Query(False, description="Also return a multi-resolution timeline pyramid"),
+):
+    """
+    Visualize a user circuit uploaded as OpenQASM 2, OpenQASM 3 or QPY.
+
+    The circuit is the raw request body; generation parameters are query
+    parameters. The response has the same logical and compiled circuits as
+    /api/generate-circuit. Results are cached by the SHA-256 of the upload
+    (returned in X-Content-SHA256) and the parameters, so repeated uploads
+    are served without transpiling again (X-Cache: hit).
+    """
+    data = await _read_upload(request, MAX_UPLOAD_BYTES)
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty upload")
+
+    topology_params = _topology_params(num_cores, intra_core_topology, global_topology, link_policy)
+    options = {
+        "topology": topology,
+        "physical_qubits": physical_qubits,
+        "optimization_level": optimization_level,
+        "format": circuit_format,
+        "detail": detail,
+        "timeline_pyramid": timeline_pyramid,
+        "topology_params": topology_params,
+    }
+    content_hash, cache_key = upload_cache_key(data, options)
+    response.headers["X-Content-SHA256"] = content_hash
+
+    result: dict[str, Any]
+    cached = upload_cache.get(cache_key)
+    if cached is not None:
+        result = cached
+        logger.info(f"📥 Upload {content_hash[:12]} served from cache")
+        response.headers["X-Cache"] = "hit"
+    else:
+        logger.info(f"📥 Received circuit upload {content_hash[:12]} ({len(data)} bytes), topology={topology}")
+
+        try:
+            # Parsing and transpiling are CPU bound; keep the event loop free
+            circuit = await run_in_threadpool(
+                load_circuit, data, CircuitFormat(circuit_format) if circuit_format else None
+            )
+            if physical_qubits is not None and physical_qubits < circuit.num_qubits:
+                raise ValueError(
+                    f"physical_qubits ({physical_qubits}) is smaller than the circuit ({circuit.num_qubits} qubits)"
+                )
+            config = CircuitGenerationConfig(
+                algorithm=None,
+                num_qubits=circuit.num_qubits,
+                physical_qubits=physical_qubits or circuit.num_qubits,
+                topology=TopologyType(topology),
+                optimization_level=optimization_level,
+                algorithm_params={"optimization_level": optimization_level},
+                topology_params=topology_params,
+                timeline_pyramid=timeline_pyramid,
+            )
+            detail_level = DetailLevel(detail)
+            # Admitted once the circuit size is known
+            async with admission_controller.admit(admission_controller.cost_model.estimate(config, detail_level)):
+                result = await run_in_threadpool(
+                    playground_api.generate_visualization_data, config, circuit, detail_level
+                )
+        except AdmissionRejected as e:
+            raise _rejected(e)
+        except ValueError as e:
+            logger.error(f"❌ Validation error: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.error(f"❌ Circuit upload failed: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail=f"Circuit generation failed: {str(e)}")
+
+        upload_cache.put(cache_key, result)
+        response.headers["X-Cache"] = "miss"
+        logger.info("✅ Uploaded circuit generated successfully")
+
+    return CircuitGenerationResponse(
+        circuits=result["circuits"],
+        total_circuits=result["total_circuits"],
+        generation_successful=True
+    )
+
+
+@app.post(
+    "/api/compare-compilations",
+    response_model=CompilationComparisonResponse,
+    responses={
+        200: {"description": "Compilations compared successfully"},
+        400: {"model": ErrorResponse, "description": "Invalid request parameters"},
+        429: {"model": ErrorResponse, "description": "Server busy; retry after the Retry-After header"},
+        500: {"model": ErrorResponse, "description": "Circuit generation failed"},
+        503: {"model": ErrorResponse, "description": "Request predicted to exceed the server's capacity"},
+    }
+)
+async def compare_compilations(request: CompilationComparisonRequest):
+    """
+    Compare compilations of one circuit across optimization levels and seeds.
+
+    The circuit, device and logical view are built once and the variants are
+    transpiled in parallel. The response holds the logical view followed by
+    one compiled view per variant (or only the best one with best_of), and
+    the depth, SWAP and gate counts of every variant.
+    """
+    logger.info(
+        f"📥 Received compilation comparison request: "
+        f"algorithm={request.algorithm}, qubits={request.num_qubits}, "
+        f"topology={request.topology}, levels={request.optimization_levels}, seeds={request.seeds}"
+    )
+    try:
+        config = _generation_config(request)
+        detail = DetailLevel(request.detail)
+        seeds: list[int | None] = list(request.seeds) if request.seeds else [None]
+        # The variants run at once, so their memory adds up
+        estimate = sum(
+            (
+                admission_controller.cost_model.estimate(replace(config, optimization_level=level), detail)
+                for level in dict.fromkeys(request.optimization_levels)
+                for _ in dict.fromkeys(seeds)
+            ),
+            start=CostEstimate(0.0, 0.0),
+        )
+        async with admission_controller.admit(estimate):
+            # Transpiling blocks while waiting for the workers; keep the event loop free
+            result = await run_in_threadpool(
+                playground_api.compare_compilations,
+                config,
+                optimization_levels=request.optimization_levels,
+                seeds=seeds,
+                best_of=BestOfMetric(request.best_of) if request.best_of is not None else None,
+                detail=detail,
+            )
+    except AdmissionRejected as e:
+        raise _rejected(e)
+    except ValueError as e:
+        logger.error(f"❌ Validation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Compilation comparison failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Circuit generation failed: {str(e)}")
+
+    logger.info(f"✅ Compared {len(result['variants'])} compilations")
+
+    return CompilationComparisonResponse(
+        circuits=result["circuits"],
+        total_circuits=result["total_circuits"],
+        variants=result["variants"],
+        best=result.get("best"),
+        generation_successful=True
+    )
+
+
 if __name__ == "__main__":
 
     uvicorn.run(
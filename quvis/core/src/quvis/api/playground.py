@@ -5,29 +5,109 @@ This module provides the backend for the interactive playground mode,
 generating quantum circuits on-demand based on user selections.
 """
 
-import sys, json, os, argparse, logging
+import sys, json, os, argparse, logging, time, hashlib
+import copy
+import multiprocessing
+import threading
+from collections.abc import Sequence
 from typing import Any 
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from qiskit import QuantumCircuit
 from qiskit.transpiler import CouplingMap as QiskitCouplingMap
 from qiskit import transpile
-from dataclasses import asdict
+from dataclasses import asdict, replace
 from ..compiler.utils import (
     extract_operations_per_slice,
     extract_routing_operations_per_slice,
     analyze_routing_overhead,
+    analyze_inter_core_traffic,
+    compute_qubit_statistics,
+    count_circuit_metrics,
+    summarize_routing_overhead,
     LogicalCircuitInfo,
     CompiledCircuitInfo,
     RoutingCircuitInfo,
     DeviceInfo,
+    ModularInfo,
+    CircuitMetrics,
 )
-from ..enums import AlgorithmType, TopologyType
+from ..compiler.fingerprint import circuit_fingerprint
+from ..compiler.layout import LayoutParameters
+from ..compiler.scheduling import schedule_operations
+from ..compiler.timeline import build_timeline_pyramid
+from ..enums import AlgorithmType, BestOfMetric, DetailLevel, TopologyType
 from ..config import CircuitGenerationConfig
 from ..factories import CircuitFactory, TopologyFactory
+from .uploads import ResultCache
 
 # Create module logger
 logger = logging.getLogger(__name__)
 
+BASIS_GATES = ["id", "rz", "sx", "x", "cx", "swap"]
+
+# Largest number of (optimization level, seed) pairs in one comparison
+MAX_COMPARISON_VARIANTS = 16
+
+
+def _stage_key(*parts: Any) -> str:
+    """Cache key of a pipeline stage from the inputs it depends on."""
+    return hashlib.sha256("\n".join(map(repr, parts)).encode()).hexdigest()
+
+
+def _available_cpus() -> int:
+    """CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    """
+    Start method of comparison workers.
+
+    Forking a process that has already transpiled can deadlock the child in
+    the transpiler's native thread pool, so workers are forked from a clean
+    server process where the platform supports it.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _compile_variant(
+    circuit: QuantumCircuit,
+    coupling_map: QiskitCouplingMap,
+    modular_info: ModularInfo | None,
+    config: CircuitGenerationConfig,
+    logical_metrics: CircuitMetrics,
+    seed: int | None,
+    detail: DetailLevel | None,
+) -> tuple[dict[str, Any] | None, QuantumCircuit | None, CircuitMetrics, float]:
+    """
+    Transpile one comparison variant; runs in a worker process.
+
+    Returns:
+        The compiled view at the given detail level, or instead the transpiled
+        circuit if detail is None; its metrics; and the transpile time
+    """
+    start = time.perf_counter()
+    transpiled_circuit = transpile(
+        circuit,
+        basis_gates=BASIS_GATES,
+        optimization_level=config.optimization_level,
+        coupling_map=coupling_map,
+        seed_transpiler=seed)
+    elapsed = time.perf_counter() - start
+    compiled_metrics = count_circuit_metrics(transpiled_circuit)
+    if detail is None:
+        return None, transpiled_circuit, compiled_metrics, elapsed
+    view = PlaygroundAPI()._compiled_variant_view(
+        circuit, transpiled_circuit, compiled_metrics, logical_metrics,
+        coupling_map, modular_info, config, seed, detail,
+    )
+    return view, None, compiled_metrics, elapsed
+
 
 class PlaygroundAPI:
     """
@@ -35,61 +115,372 @@ class PlaygroundAPI:
     for the interactive playground mode.
     """
 
-    def __init__(self):
-        """Initialize the Playground API."""
-        pass
+    def __init__(
+        self,
+        cache_entries: int = 16,
+        cache_bytes: int = 256 * 1024 * 1024,
+        workers: int | None = None,
+        background_layouts: bool = False,
+    ):
+        """
+        Initialize the Playground API.
+
+        Args:
+            cache_entries: Entries kept per pipeline stage cache (circuits,
+                logical views and compiled views); 0 disables caching
+            cache_bytes: Estimated bytes kept per pipeline stage cache, so a
+                few views of large circuits cannot exhaust memory
+            workers: Size of the process pool shared by compare_compilations
+                calls (default: the CPU count)
+            background_layouts: Compute device layouts that take seconds in
+                the background and leave them to the client until they are
+                ready, instead of waiting for them
+        """
+        # Each stage is keyed by the inputs it depends on, so changing the
+        # topology or optimization level only recomputes the compiled view
+        self.circuit_cache = ResultCache(max_entries=cache_entries, max_bytes=cache_bytes)
+        self.logical_cache = ResultCache(max_entries=cache_entries, max_bytes=cache_bytes)
+        self.compiled_cache = ResultCache(max_entries=cache_entries, max_bytes=cache_bytes)
+        # Started on first use and reused, since starting worker processes
+        # and importing the transpiler in them costs more than most variants
+        self.workers = workers or _available_cpus()
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        self.background_layouts = background_layouts
 
     def generate_visualization_data(
         self,
-        config: CircuitGenerationConfig
+        config: CircuitGenerationConfig,
+        circuit: QuantumCircuit | None = None,
+        detail: DetailLevel | str = DetailLevel.FULL,
     ) -> dict[str, Any]:
         """
         Generate visualization data for a quantum circuit.
 
+        Circuits, logical views and compiled views are cached per stage:
+        circuits by algorithm and algorithm parameters, logical views by
+        circuit fingerprint, and compiled views by fingerprint and the full
+        configuration.
+
         Args:
             config: Configuration object containing all generation parameters.
+            circuit: Circuit to visualize instead of building config.algorithm,
+                e.g. one uploaded by the user
+            detail: "full" for renderable data, or "summary" for only
+                circuit_stats and routing_analysis, counted without building
+                per-slice operations (no schedule or inter-core analysis)
 
         Returns:
             Dictionary containing visualization data in library_multi format
         """
+        detail = DetailLevel(detail)
 
-        circuit = self._create_circuit(config)
-        coupling_map = self._create_coupling_map(config.topology, config.physical_qubits)
-
-        basis_gates = ["id", "rz", "sx", "x", "cx", "swap"]
+        if circuit is None:
+            if config.algorithm is None:
+                raise ValueError("Either an algorithm or a circuit is required")
+            circuit, fingerprint = self._circuit_stage(config)
+        else:
+            fingerprint = circuit_fingerprint(circuit)
+        coupling_map, modular_info = self._create_device(config)
+        basis_gates = BASIS_GATES
 
         logger.info("Processing circuit for playground visualization...")
 
         # Process logical circuit
         logger.info("Processing logical circuit...")
-        logical_circuit_data = self._process_logical_circuit(circuit, config)
+        logical_key = self._logical_key(fingerprint, config, detail)
+        cached_logical = self.logical_cache.get(logical_key)
+        if cached_logical is None:
+            decomposed_circuit = circuit.decompose()
+            logical_metrics = count_circuit_metrics(decomposed_circuit)
+            logical_circuit_data = self._logical_view(
+                circuit, decomposed_circuit, logical_metrics, config, detail
+            )
+            self.logical_cache.put(logical_key, (logical_circuit_data, logical_metrics))
+        else:
+            logger.info("   ✓ Logical circuit served from cache")
+            logical_circuit_data, logical_metrics = cached_logical
+            logical_circuit_data = self._named_logical_view(logical_circuit_data, circuit, config)
 
         # Process compiled circuit
         logger.info("Processing compiled circuit...")
-        compiled_circuit_data = self._process_compiled_circuit(
-            circuit,
-            coupling_map,
-            basis_gates,
-            config,
-        )
-
+        compiled_key = _stage_key(fingerprint, config, detail)
+        compiled_circuit_data = self.compiled_cache.get(compiled_key)
+        if compiled_circuit_data is None:
+            if detail == DetailLevel.SUMMARY:
+                transpiled_circuit = self._transpile(circuit, coupling_map, basis_gates, config)
+                compiled_metrics = count_circuit_metrics(transpiled_circuit)
+                logger.info(
+                    f"   ✓ Depth {logical_metrics.depth} -> {compiled_metrics.depth}, "
+                    f"{compiled_metrics.swaps} SWAP gates"
+                )
+                compiled_circuit_data = self._summarize_compiled(
+                    circuit, transpiled_circuit, compiled_metrics, logical_metrics, coupling_map, config
+                )
+            else:
+                compiled_circuit_data = self._process_compiled_circuit(
+                    circuit,
+                    coupling_map,
+                    basis_gates,
+                    config,
+                    modular_info,
+                    logical_metrics=logical_metrics,
+                )
+            self.compiled_cache.put(compiled_key, compiled_circuit_data)
+        else:
+            logger.info("   ✓ Compiled circuit served from cache")
+
+        # Deep copies, so callers can modify views without touching the caches
+        compiled_circuit_data = copy.deepcopy(compiled_circuit_data)
         result = {
-            "circuits": [logical_circuit_data, compiled_circuit_data],
+            "circuits": [copy.deepcopy(logical_circuit_data), compiled_circuit_data],
             "total_circuits": 2,
         }
+        if detail == DetailLevel.SUMMARY:
+            result["detail"] = DetailLevel.SUMMARY.value
+        else:
+            self._attach_layout(compiled_circuit_data)
 
         logger.info("Playground circuit generation completed successfully!")
         logger.info("Generated logical and compiled versions")
 
         return result
 
+    def clear_caches(self) -> None:
+        """Drop all cached circuits and views."""
+        self.circuit_cache.clear()
+        self.logical_cache.clear()
+        self.compiled_cache.clear()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        """The shared comparison process pool, started on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+            return self._pool
+
+    def close(self) -> None:
+        """Shut down the comparison process pool, if it was started."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def compare_compilations(
+        self,
+        config: CircuitGenerationConfig,
+        optimization_levels: Sequence[int] = (0, 1, 2, 3),
+        seeds: Sequence[int | None] = (None,),
+        best_of: BestOfMetric | str | None = None,
+        detail: DetailLevel | str = DetailLevel.FULL,
+        circuit: QuantumCircuit | None = None,
+        workers: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Compile one circuit at several optimization levels and seeds.
+
+        The circuit, device and logical view are built once. The variants are
+        transpiled and processed in parallel in the shared process pool while the
+        logical view is processed, so the wall time is that of the slowest
+        variant rather than the sum.
+
+        Args:
+            config: Generation parameters; config.optimization_level is ignored
+            optimization_levels: Transpiler optimization levels to compare
+            seeds: Transpiler seeds to compare at every level; None lets the
+                transpiler pick one
+            best_of: Return only the compiled view of the best variant by this
+                metric, instead of one view per variant
+            detail: "full" or "summary", as in generate_visualization_data
+            circuit: Circuit to compile instead of building config.algorithm
+            workers: 1 transpiles in this process; otherwise the variants run
+                in the shared pool, at most one per worker process
+
+        Returns:
+            The logical view followed by the compiled views in "circuits", and
+            the metrics of every variant in "variants". With best_of, "best"
+            holds the metric and the index of the kept variant in "variants".
+        """
+        detail = DetailLevel(detail)
+        best_of = BestOfMetric(best_of) if best_of is not None else None
+
+        # Each (level, seed) pair once, in request order
+        variants = list(dict.fromkeys(
+            (level, seed) for level in optimization_levels for seed in seeds
+        ))
+        if not variants:
+            raise ValueError("At least one optimization level and seed are required")
+        if len(variants) > MAX_COMPARISON_VARIANTS:
+            raise ValueError(
+                f"{len(variants)} variants requested; at most {MAX_COMPARISON_VARIANTS} are supported"
+            )
+        invalid_levels = sorted({level for level, _ in variants if level not in range(4)})
+        if invalid_levels:
+            raise ValueError(f"Invalid optimization levels {invalid_levels}; expected 0 to 3")
+
+        if circuit is None:
+            if config.algorithm is None:
+                raise ValueError("Either an algorithm or a circuit is required")
+            circuit, fingerprint = self._circuit_stage(config)
+        else:
+            fingerprint = circuit_fingerprint(circuit)
+        coupling_map, modular_info = self._create_device(config)
+
+        workers = min(workers or self.workers, self.workers, len(variants))
+        logger.info(f"🔧 Comparing {len(variants)} compilations on {workers} worker(s)...")
+
+        logical_key = self._logical_key(fingerprint, config, detail)
+        cached_logical = self.logical_cache.get(logical_key)
+        if cached_logical is None:
+            decomposed_circuit = circuit.decompose()
+            logical_metrics = count_circuit_metrics(decomposed_circuit)
+        else:
+            logical_metrics = cached_logical[1]
+
+        def logical_view() -> dict[str, Any]:
+            if cached_logical is not None:
+                logger.info("   ✓ Logical circuit served from cache")
+                return copy.deepcopy(self._named_logical_view(cached_logical[0], circuit, config))
+            view = self._logical_view(circuit, decomposed_circuit, logical_metrics, config, detail)
+            self.logical_cache.put(logical_key, (view, logical_metrics))
+            return copy.deepcopy(view)
+
+        # Workers build the compiled views, except for best-of where only the
+        # winner's view is built, here, from the transpiled circuits
+        tasks = [
+            (circuit, coupling_map, modular_info, self._variant_config(config, level),
+             logical_metrics, seed, None if best_of is not None else detail)
+            for level, seed in variants
+        ]
+        if workers == 1:
+            logical_circuit_data = logical_view()
+            compiled = [_compile_variant(*task) for task in tasks]
+        else:
+            executor = self._executor()
+            futures = [executor.submit(_compile_variant, *task) for task in tasks]
+            # Process the logical circuit while the workers transpile
+            logical_circuit_data = logical_view()
+            compiled = [future.result() for future in futures]
+
+        variant_metrics = [
+            {
+                "optimization_level": level,
+                "seed": seed,
+                "depth": metrics.depth,
+                "swap_count": metrics.swaps,
+                "transpiled_gates": metrics.op_count,
+                "transpile_time_s": round(elapsed, 3),
+            }
+            for (level, seed), (_, _, metrics, elapsed) in zip(variants, compiled)
+        ]
+
+        result: dict[str, Any] = {}
+        if best_of is None:
+            compiled_circuits_data = [view for view, _, _, _ in compiled if view is not None]
+        else:
+            best = min(
+                range(len(variants)), key=lambda i: self._best_of_key(compiled[i][2], best_of)
+            )
+            result["best"] = {"metric": best_of.value, "index": best}
+            logger.info(
+                f"   ✓ Best by {best_of.value}: optimization level {variants[best][0]}, "
+                f"seed {variants[best][1]}"
+            )
+            _, transpiled_circuit, compiled_metrics, _ = compiled[best]
+            compiled_circuits_data = [self._compiled_variant_view(
+                circuit, transpiled_circuit, compiled_metrics, logical_metrics,
+                coupling_map, modular_info, tasks[best][3], variants[best][1], detail,
+            )]
+
+        if detail == DetailLevel.FULL:
+            for view in compiled_circuits_data:
+                self._attach_layout(view)
+
+        logger.info("Compilation comparison completed successfully!")
+
+        return {
+            "circuits": [logical_circuit_data, *compiled_circuits_data],
+            "total_circuits": 1 + len(compiled_circuits_data),
+            "variants": variant_metrics,
+            **result,
+            "detail": detail.value,
+        }
+
+    def _compiled_variant_view(
+        self,
+        circuit: QuantumCircuit,
+        transpiled_circuit: QuantumCircuit,
+        compiled_metrics: CircuitMetrics,
+        logical_metrics: CircuitMetrics,
+        coupling_map: QiskitCouplingMap,
+        modular_info: ModularInfo | None,
+        config: CircuitGenerationConfig,
+        seed: int | None,
+        detail: DetailLevel,
+    ) -> dict[str, Any]:
+        """Compiled view of one comparison variant, labelled with its level and seed."""
+        if detail == DetailLevel.SUMMARY:
+            view = self._summarize_compiled(
+                circuit, transpiled_circuit, compiled_metrics, logical_metrics, coupling_map, config
+            )
+        else:
+            view = self._process_compiled_circuit(
+                circuit, coupling_map, BASIS_GATES, config, modular_info,
+                transpiled_circuit=transpiled_circuit, logical_metrics=logical_metrics,
+            )
+        label = f"opt {config.optimization_level}"
+        if seed is not None:
+            label += f", seed {seed}"
+        view["algorithm_name"] = f"{self._circuit_name(circuit, config)} (Compiled, {label})"
+        view["optimization_level"] = config.optimization_level
+        view["seed"] = seed
+        return view
+
+    def _attach_layout(self, view: dict[str, Any]) -> None:
+        """
+        Add the precomputed device layout to a full compiled view.
+
+        Layouts are memoized per device rather than cached with the views,
+        so a layout computed in the background reaches later responses.
+        """
+        device_info = view["device_info"]
+        # Modular devices are laid out core by core on the client
+        if device_info["modular_info"] is not None:
+            return
+        num_qubits = device_info["num_qubits_on_device"]
+        coupling_map = device_info["connectivity_graph_coupling_map"]
+        if self.background_layouts:
+            positions = TopologyFactory.layout_for_coupling_map_nowait(num_qubits, coupling_map)
+        else:
+            positions = TopologyFactory.layout_for_coupling_map(num_qubits, coupling_map)
+        if positions is not None:
+            device_info["layout_positions"] = positions.tolist()
+            device_info["layout_parameters"] = asdict(LayoutParameters())
+
+    @staticmethod
+    def _best_of_key(metrics: CircuitMetrics, best_of: BestOfMetric) -> tuple[int, int, int]:
+        """Sort key of a variant; the smallest is the best."""
+        if best_of == BestOfMetric.SWAPS:
+            return metrics.swaps, metrics.depth, metrics.op_count
+        return metrics.depth, metrics.swaps, metrics.op_count
+
+    @staticmethod
+    def _variant_config(config: CircuitGenerationConfig, optimization_level: int) -> CircuitGenerationConfig:
+        """The configuration of one comparison variant."""
+        algorithm_params = dict(config.algorithm_params)
+        if "optimization_level" in algorithm_params:
+            algorithm_params["optimization_level"] = optimization_level
+        return replace(config, optimization_level=optimization_level, algorithm_params=algorithm_params)
+
     def _process_logical_circuit(
         self,
         circuit: QuantumCircuit,
         config: CircuitGenerationConfig,
+        decomposed_circuit: QuantumCircuit | None = None,
     ) -> dict[str, Any]:
         """Process the logical version of the circuit."""
-        decomposed_circuit = circuit.decompose()
+        if decomposed_circuit is None:
+            decomposed_circuit = circuit.decompose()
         logical_operations_per_slice = extract_operations_per_slice(decomposed_circuit)
         logger.info(
             f"   ✓ Extracted {len(logical_operations_per_slice)} time slices from logical circuit"
@@ -105,12 +496,16 @@ class PlaygroundAPI:
             connectivity_graph_coupling_map=[],
         )
 
-        return {
+        qubit_statistics = compute_qubit_statistics(
+            logical_operations_per_slice, decomposed_circuit.num_qubits
+        )
+        result = {
             "circuit_info": asdict(logical_info),
             "device_info": asdict(device_info),
-            "algorithm_name": f"{config.algorithm.value.upper()} (Logical)",
+            "algorithm_name": f"{self._circuit_name(circuit, config)} (Logical)",
             "circuit_type": "logical",
             "algorithm_params": config.algorithm_params,
+            "qubit_statistics": asdict(qubit_statistics),
             "circuit_stats": {
                 "original_gates": len(circuit.data),
                 "depth": len(logical_operations_per_slice),
@@ -118,23 +513,37 @@ class PlaygroundAPI:
             },
         }
 
+        if config.gate_durations is not None:
+            result["schedule"] = asdict(schedule_operations(
+                logical_operations_per_slice, decomposed_circuit.num_qubits, config.gate_durations
+            ))
+
+        if config.timeline_pyramid:
+            result["timeline_pyramid"] = asdict(build_timeline_pyramid(
+                logical_operations_per_slice, decomposed_circuit.num_qubits
+            ))
+
+        return result
+
     def _process_compiled_circuit(
         self,
         circuit: QuantumCircuit,
         coupling_map: QiskitCouplingMap,
         basis_gates: list[str],
         config: CircuitGenerationConfig,
+        modular_info: ModularInfo | None = None,
+        transpiled_circuit: QuantumCircuit | None = None,
+        logical_metrics: CircuitMetrics | None = None,
     ) -> dict[str, Any]:
-        """Process the compiled version of the circuit."""
-        logger.info(
-            f"🔧 Transpiling for optimization level {config.optimization_level}..."
-        )
+        """
+        Process the compiled version of the circuit.
 
-        transpiled_circuit = transpile(
-            circuit,
-            basis_gates=basis_gates,
-            optimization_level=config.optimization_level,
-            coupling_map=coupling_map)
+        transpiled_circuit skips transpilation, and logical_metrics (of the
+        decomposed circuit) skips slicing the logical circuit again for the
+        routing analysis.
+        """
+        if transpiled_circuit is None:
+            transpiled_circuit = self._transpile(circuit, coupling_map, basis_gates, config)
         logger.info(
             f"   ✓ Transpilation complete: {len(transpiled_circuit.data)} gates total"
         )
@@ -149,9 +558,14 @@ class PlaygroundAPI:
             f"   ✓ Found {routing_result.swaps} SWAP gates for qubit routing"
         )
 
-        routing_analysis = analyze_routing_overhead(
-            circuit.decompose(), transpiled_circuit
-        )
+        if logical_metrics is None:
+            routing_analysis = analyze_routing_overhead(
+                circuit.decompose(), transpiled_circuit
+            )
+        else:
+            routing_analysis = summarize_routing_overhead(
+                logical_metrics, count_circuit_metrics(transpiled_circuit)
+            )
         logger.info(
             f"   ✓ Routing overhead: {routing_analysis['routing_overhead_percentage']:.1f}%"
         )
@@ -168,19 +582,27 @@ class PlaygroundAPI:
             routing_depth=routing_result.routing_depth,
         )
 
+        # The layout is attached to each response by _attach_layout
         device_info = DeviceInfo(
             num_qubits_on_device=coupling_map.size(),
             connectivity_graph_coupling_map=list(coupling_map.get_edges()),
+            modular_info=modular_info,
         )
 
-        return {
+        qubit_statistics = compute_qubit_statistics(
+            compiled_operations_per_slice,
+            transpiled_circuit.num_qubits,
+            device_info.connectivity_graph_coupling_map,
+        )
+        result = {
             "circuit_info": asdict(compiled_info),
             "routing_info": asdict(routing_info),
             "device_info": asdict(device_info),
-            "algorithm_name": f"{config.algorithm.value.upper()} (Compiled)",
+            "algorithm_name": f"{self._circuit_name(circuit, config)} (Compiled)",
             "circuit_type": "compiled",
             "algorithm_params": config.algorithm_params,
             "routing_analysis": routing_analysis,
+            "qubit_statistics": asdict(qubit_statistics),
             "circuit_stats": {
                 "original_gates": len(circuit.data),
                 "transpiled_gates": len(transpiled_circuit.data),
@@ -190,12 +612,169 @@ class PlaygroundAPI:
             },
         }
 
+        if modular_info is not None:
+            inter_core_analysis = analyze_inter_core_traffic(
+                compiled_operations_per_slice, modular_info, transpiled_circuit.num_qubits
+            )
+            logger.info(
+                f"   ✓ Inter-core operations: {inter_core_analysis.inter_core_ops}"
+            )
+            result["inter_core_analysis"] = asdict(inter_core_analysis)
+
+        if config.gate_durations is not None:
+            schedule = schedule_operations(
+                compiled_operations_per_slice, transpiled_circuit.num_qubits, config.gate_durations
+            )
+            logger.info(
+                f"   ✓ Scheduled duration: {schedule.total_duration:.0f} {schedule.unit}"
+            )
+            result["schedule"] = asdict(schedule)
+
+        if config.timeline_pyramid:
+            result["timeline_pyramid"] = asdict(build_timeline_pyramid(
+                compiled_operations_per_slice,
+                transpiled_circuit.num_qubits,
+                device_info.connectivity_graph_coupling_map,
+            ))
+
+        return result
+
+    def _summarize_logical(
+        self,
+        circuit: QuantumCircuit,
+        decomposed_circuit: QuantumCircuit,
+        logical_metrics: CircuitMetrics,
+        config: CircuitGenerationConfig,
+    ) -> dict[str, Any]:
+        """Summary of the logical version of the circuit."""
+        return {
+            "device_info": {"num_qubits_on_device": decomposed_circuit.num_qubits},
+            "algorithm_name": f"{self._circuit_name(circuit, config)} (Logical)",
+            "circuit_type": "logical",
+            "algorithm_params": config.algorithm_params,
+            "detail": DetailLevel.SUMMARY.value,
+            "circuit_stats": {
+                "original_gates": len(circuit.data),
+                "depth": logical_metrics.depth,
+                "qubits": decomposed_circuit.num_qubits,
+            },
+        }
+
+    def _summarize_compiled(
+        self,
+        circuit: QuantumCircuit,
+        transpiled_circuit: QuantumCircuit,
+        compiled_metrics: CircuitMetrics,
+        logical_metrics: CircuitMetrics,
+        coupling_map: QiskitCouplingMap,
+        config: CircuitGenerationConfig,
+    ) -> dict[str, Any]:
+        """Summary of the compiled version of the circuit."""
+        return {
+            "device_info": {"num_qubits_on_device": coupling_map.size()},
+            "algorithm_name": f"{self._circuit_name(circuit, config)} (Compiled)",
+            "circuit_type": "compiled",
+            "algorithm_params": config.algorithm_params,
+            "detail": DetailLevel.SUMMARY.value,
+            "routing_analysis": summarize_routing_overhead(logical_metrics, compiled_metrics),
+            "circuit_stats": {
+                "original_gates": len(circuit.data),
+                "transpiled_gates": len(transpiled_circuit.data),
+                "depth": compiled_metrics.depth,
+                "qubits": transpiled_circuit.num_qubits,
+                "swap_count": compiled_metrics.swaps,
+            },
+        }
+
+    def _circuit_stage(self, config: CircuitGenerationConfig) -> tuple[QuantumCircuit, str]:
+        """The circuit of config.algorithm and its fingerprint, built once per algorithm parameters."""
+        # Callers copy the optimization level into algorithm_params; it does
+        # not change the circuit
+        algorithm_params = {
+            key: value for key, value in config.algorithm_params.items()
+            if key != "optimization_level"
+        }
+        key = _stage_key(config.algorithm, config.num_qubits, sorted(algorithm_params.items()))
+        cached = self.circuit_cache.get(key)
+        if cached is not None:
+            logger.info("   ✓ Circuit served from cache")
+            return cached
+        circuit = self._create_circuit(config)
+        cached = (circuit, circuit_fingerprint(circuit))
+        self.circuit_cache.put(key, cached)
+        return cached
+
+    @staticmethod
+    def _logical_key(fingerprint: str, config: CircuitGenerationConfig, detail: DetailLevel) -> str:
+        """Cache key of a logical view; independent of the device and optimization level."""
+        return _stage_key(fingerprint, config.gate_durations, config.timeline_pyramid, detail)
+
+    def _logical_view(
+        self,
+        circuit: QuantumCircuit,
+        decomposed_circuit: QuantumCircuit,
+        logical_metrics: CircuitMetrics,
+        config: CircuitGenerationConfig,
+        detail: DetailLevel,
+    ) -> dict[str, Any]:
+        """Logical view of the circuit at the given detail level."""
+        if detail == DetailLevel.SUMMARY:
+            return self._summarize_logical(circuit, decomposed_circuit, logical_metrics, config)
+        return self._process_logical_circuit(circuit, config, decomposed_circuit)
+
+    def _named_logical_view(
+        self,
+        view: dict[str, Any],
+        circuit: QuantumCircuit,
+        config: CircuitGenerationConfig,
+    ) -> dict[str, Any]:
+        """Copy of a cached logical view with the name and parameters of this request."""
+        return {
+            **view,
+            "algorithm_name": f"{self._circuit_name(circuit, config)} (Logical)",
+            "algorithm_params": config.algorithm_params,
+        }
+
+    def _transpile(
+        self,
+        circuit: QuantumCircuit,
+        coupling_map: QiskitCouplingMap,
+        basis_gates: list[str],
+        config: CircuitGenerationConfig,
+    ) -> QuantumCircuit:
+        """Transpile the circuit for the device at the configured optimization level."""
+        logger.info(
+            f"🔧 Transpiling for optimization level {config.optimization_level}..."
+        )
+        return transpile(
+            circuit,
+            basis_gates=basis_gates,
+            optimization_level=config.optimization_level,
+            coupling_map=coupling_map)
+
+    def _circuit_name(self, circuit: QuantumCircuit, config: CircuitGenerationConfig) -> str:
+        """Display name: the algorithm, or the name of a user-supplied circuit."""
+        if config.algorithm is None:
+            return circuit.name
+        return config.algorithm.value.upper()
+
     def _create_circuit(
         self, config: CircuitGenerationConfig
     ) -> QuantumCircuit:
         """Create a quantum circuit based on algorithm type."""
         return CircuitFactory.create(config)
 
+    def _create_device(
+        self, config: CircuitGenerationConfig
+    ) -> tuple[QiskitCouplingMap, ModularInfo | None]:
+        """Create the coupling map of the configured device, and its core layout if modular."""
+        if config.topology == TopologyType.MODULAR:
+            modular_topology = TopologyFactory.create_modular_from_params(
+                config.physical_qubits, config.topology_params
+            )
+            return modular_topology.coupling_map, modular_topology.modular_info
+        return self._create_coupling_map(config.topology, config.physical_qubits), None
+
     def _create_coupling_map(self, topology: str, physical_qubits: int) -> QiskitCouplingMap:
         """Create a coupling map using Qiskit's built-in topology generators."""
         return TopologyFactory.create(TopologyType(topology), physical_qubits)
@@ -206,7 +785,8 @@ class PlaygroundAPI:
 
 
 def generate_playground_circuit(
-    algorithm: str, num_qubits: int, physical_qubits: int , topology: str,  **kwargs
+    algorithm: str, num_qubits: int, physical_qubits: int , topology: str,
+    topology_params: dict[str, Any] | None = None, **kwargs
 ) -> dict[str, Any]:
     """
     High-level function to generate a playground circuit.
@@ -216,7 +796,8 @@ def generate_playground_circuit(
         num_qubits=num_qubits,
         physical_qubits=physical_qubits,
         topology=TopologyType(topology),
-        algorithm_params=kwargs
+        algorithm_params=kwargs,
+        topology_params=topology_params or {},
     )
     api = PlaygroundAPI()
     return api.generate_visualization_data(config)
@@ -241,6 +822,18 @@ def main():
     parser.add_argument(
         "--optimization-level", type=int, default=1, help="The optimization level."
     )
+    parser.add_argument(
+        "--num-cores", type=int, help="Number of cores for the modular topology."
+    )
+    parser.add_argument(
+        "--intra-core-topology", type=str, help="Topology inside each core for the modular topology."
+    )
+    parser.add_argument(
+        "--global-topology", type=str, help="Topology between cores for the modular topology."
+    )
+    parser.add_argument(
+        "--link-policy", type=str, help="Inter-core link placement for the modular topology."
+    )
     parser.add_argument(
         "--verbose", action="store_true", help="Enable verbose logging."
     )
@@ -261,6 +854,17 @@ def main():
         )
 
         kwargs = {"optimization_level": args.optimization_level}
+
+        topology_params = {
+            key: value
+            for key, value in {
+                "num_cores": args.num_cores,
+                "intra_core_topology": args.intra_core_topology,
+                "global_topology": args.global_topology,
+                "link_policy": args.link_policy,
+            }.items()
+            if value is not None
+        }
         
         config = CircuitGenerationConfig(
             algorithm=AlgorithmType(args.algorithm),
@@ -268,7 +872,8 @@ def main():
             physical_qubits=args.physical_qubits or args.num_qubits,
             topology=TopologyType(args.topology),
             optimization_level=args.optimization_level,
-            algorithm_params=kwargs # Assuming other kwargs might be added later via parser
+            algorithm_params=kwargs, # Assuming other kwargs might be added later via parser
+            topology_params=topology_params,
         )
 
         result = api.generate_visualization_data(config)
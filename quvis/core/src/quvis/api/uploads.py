@@ -0,0 +1,173 @@
+"""
+User circuit uploads for the FastAPI backend.
+
+Parses OpenQASM 2, OpenQASM 3 and QPY payloads into QuantumCircuits and
+caches generated visualization data by the content hash of the upload, so
+uploading the same file again with the same options skips transpilation.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import pickle
+import re
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from qiskit import QuantumCircuit, qasm2, qasm3, qpy
+from qiskit.exceptions import MissingOptionalLibraryError
+
+from ..enums import CircuitFormat
+
+# Create module logger
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+MAX_UPLOAD_QUBITS = 1000
+
+_QPY_MAGIC = b"QISKIT"
+_QASM_VERSION = re.compile(rb"^\s*OPENQASM\s+(\d+)", re.MULTILINE)
+_QASM_COMMENT = re.compile(rb"//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+def detect_circuit_format(data: bytes) -> CircuitFormat:
+    """
+    Detect the format of an uploaded circuit from its contents.
+
+    Raises:
+        ValueError: If the data is neither QPY nor OpenQASM with a version header
+    """
+    if data.startswith(_QPY_MAGIC):
+        return CircuitFormat.QPY
+    match = _QASM_VERSION.search(_QASM_COMMENT.sub(b"", data))
+    if match is None:
+        raise ValueError("Unrecognized circuit format: expected QPY or an OPENQASM 2/3 header")
+    return CircuitFormat.QASM3 if match.group(1) == b"3" else CircuitFormat.QASM2
+
+
+def load_circuit(data: bytes, circuit_format: CircuitFormat | None = None) -> QuantumCircuit:
+    """
+    Parse an uploaded circuit.
+
+    Args:
+        data: Raw upload
+        circuit_format: Format of the data; detected from the contents if None
+
+    Returns:
+        The parsed circuit
+
+    Raises:
+        ValueError: If the data cannot be parsed, holds more or less than one
+            circuit, or exceeds MAX_UPLOAD_QUBITS
+    """
+    circuit_format = circuit_format or detect_circuit_format(data)
+    try:
+        if circuit_format == CircuitFormat.QPY:
+            circuits = qpy.load(io.BytesIO(data))
+            if len(circuits) != 1:
+                raise ValueError(f"QPY upload must contain exactly one circuit, found {len(circuits)}")
+            circuit = circuits[0]
+            if not isinstance(circuit, QuantumCircuit):
+                raise ValueError("QPY upload must contain a QuantumCircuit")
+        else:
+            text = data.decode("utf-8")
+            if circuit_format == CircuitFormat.QASM3:
+                circuit = qasm3.loads(text)
+            else:
+                circuit = qasm2.loads(text, custom_instructions=qasm2.LEGACY_CUSTOM_INSTRUCTIONS)
+    except MissingOptionalLibraryError as e:
+        raise ValueError(f"{circuit_format.value} uploads are not supported by this server: {e.message}")
+    except UnicodeDecodeError:
+        raise ValueError("OpenQASM uploads must be UTF-8 text")
+    except ValueError:
+        raise
+    except Exception as e:
+        # Parsers raise their own exception types for malformed input
+        raise ValueError(f"Could not parse {circuit_format.value} circuit: {e}")
+
+    if circuit.num_qubits == 0:
+        raise ValueError("Uploaded circuit has no qubits")
+    if circuit.num_qubits > MAX_UPLOAD_QUBITS:
+        raise ValueError(
+            f"Uploaded circuit has {circuit.num_qubits} qubits; at most {MAX_UPLOAD_QUBITS} are supported"
+        )
+    return circuit
+
+
+def upload_cache_key(data: bytes, options: dict[str, Any]) -> tuple[str, str]:
+    """
+    Cache key of an upload and the options it is visualized with.
+
+    Returns:
+        SHA-256 of the upload, and the key combining it with the options
+    """
+    content_hash = hashlib.sha256(data).hexdigest()
+    canonical = json.dumps(options, sort_keys=True, separators=(",", ":"), default=str)
+    return content_hash, f"{content_hash}:{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of generated visualization data or stage results.
+
+    Bounded by entry count and by the estimated size of the entries, the
+    length of their pickled form, since one view of a large circuit can
+    outweigh many small ones.
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Entries kept at most
+            max_bytes: Estimated bytes kept at most; larger results are not cached
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def estimate_bytes(result: Any) -> int:
+        """Estimated memory held by a cached result."""
+        return len(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, result: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        size = self.estimate_bytes(result)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            if size > self.max_bytes:
+                logger.info(f"Result of {size} bytes exceeds the {self.max_bytes} byte cache budget; not cached")
+                return
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        """Estimated bytes held by the cached results."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
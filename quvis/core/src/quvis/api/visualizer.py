@@ -8,12 +8,17 @@ the visualization with tabs for each circuit.
 """
 
 import os
+import copy
 import json
+import pickle
+import hashlib
 import logging
+import threading
 import subprocess
+from collections import OrderedDict
 from typing import Any
 from pathlib import Path
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, replace
 
 from qiskit import QuantumCircuit
 from qiskit.transpiler import CouplingMap
@@ -21,14 +26,24 @@ from qiskit.transpiler import CouplingMap
 from ..compiler.utils import (
     extract_operations_per_slice,
     extract_routing_operations_per_slice,
+    analyze_inter_core_traffic,
+    compute_qubit_statistics,
+    count_circuit_metrics,
     LogicalCircuitInfo,
     CompiledCircuitInfo,
     RoutingCircuitInfo,
     DeviceInfo,
     ModularInfo,
+    InterCoreAnalysis,
+    QubitStatistics,
 )
-from ..enums import TopologyType
+from ..compiler.fingerprint import circuit_fingerprint
+from ..compiler.layout import LayoutParameters
+from ..compiler.scheduling import CircuitSchedule, schedule_operations
+from ..compiler.timeline import TimelinePyramid, build_timeline_pyramid
+from ..enums import DetailLevel, TopologyType
 from ..config import VisualizationConfig
+from ..factories import TopologyFactory
 
 # Create module logger
 logger = logging.getLogger(__name__)
@@ -68,6 +83,10 @@ class CircuitVisualizationData:
     algorithm_params: dict[str, Any]
     circuit_stats: CircuitStats
     routing_info: RoutingCircuitInfo | None = None
+    qubit_statistics: QubitStatistics | None = None
+    timeline_pyramid: TimelinePyramid | None = None
+    inter_core_analysis: InterCoreAnalysis | None = None
+    schedule: CircuitSchedule | None = None
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -81,10 +100,65 @@ class CircuitVisualizationData:
         }
         if self.routing_info is not None:
             result["routing_info"] = asdict(self.routing_info)
+        if self.qubit_statistics is not None:
+            result["qubit_statistics"] = asdict(self.qubit_statistics)
+        if self.timeline_pyramid is not None:
+            result["timeline_pyramid"] = asdict(self.timeline_pyramid)
+        if self.inter_core_analysis is not None:
+            result["inter_core_analysis"] = asdict(self.inter_core_analysis)
+        if self.schedule is not None:
+            result["schedule"] = asdict(self.schedule)
         return result
 
 
 
+class ProcessedCircuitMemo:
+    """
+    Process-wide LRU of processed circuits.
+
+    Bounded by the total number of instructions of the memoized circuits
+    rather than by entry count, since entry sizes grow with circuit size.
+    Entries are copied in and out, so callers may modify what they get.
+    """
+
+    def __init__(self, max_operations: int = 5_000_000):
+        self.max_operations = max_operations
+        self._entries: OrderedDict[str, tuple[CircuitVisualizationData, int]] = OrderedDict()
+        self._operations = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CircuitVisualizationData | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(entry[0])
+
+    def put(self, key: str, data: CircuitVisualizationData, operations: int) -> None:
+        data = copy.deepcopy(data)
+        with self._lock:
+            if key in self._entries:
+                self._operations -= self._entries.pop(key)[1]
+            self._entries[key] = (data, operations)
+            self._operations += operations
+            while self._operations > self.max_operations and len(self._entries) > 1:
+                self._operations -= self._entries.popitem(last=False)[1][1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._operations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by all Visualizers, so notebook cells that rebuild a Visualizer
+# still reuse earlier results
+processed_circuit_memo = ProcessedCircuitMemo()
+
+
 class Visualizer:
     """
     Main Quvis visualization class for multiple quantum circuits.
@@ -95,6 +169,9 @@ class Visualizer:
         auto_open_browser: bool = True,
         port: int = 5173,
         verbose: bool = False,
+        memoize: bool = True,
+        cache_dir: str | Path | None = None,
+        cache_dir_max_bytes: int | None = None,
     ):
         """
         Initialize the Quvis visualizer.
@@ -103,10 +180,24 @@ class Visualizer:
             auto_open_browser: Whether to automatically open the browser
             port: Port for the development server (default: 5173)
             verbose: Whether to enable verbose logging
+            memoize: Reuse processed data of structurally equal circuits
+                added before, in this or any other Visualizer
+            cache_dir: Directory to also persist processed circuits in, so
+                they survive interpreter restarts (default: the
+                QUVIS_CACHE_DIR environment variable, if set)
+            cache_dir_max_bytes: Total size of the cache directory entries,
+                beyond which the least recently used are deleted (default:
+                QUVIS_CACHE_DIR_MB megabytes, or 1 GB)
         """
         self.auto_open_browser = auto_open_browser
         self.port = port
         self.verbose = verbose
+        self.memoize = memoize
+        cache_dir = cache_dir or os.environ.get("QUVIS_CACHE_DIR")
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        if cache_dir_max_bytes is None:
+            cache_dir_max_bytes = int(float(os.environ.get("QUVIS_CACHE_DIR_MB", 1024)) * 1024 * 1024)
+        self.cache_dir_max_bytes = cache_dir_max_bytes
         self.circuits: list[CircuitVisualizationData] = []
         
         # Configure logging based on verbose setting
@@ -150,7 +241,15 @@ class Visualizer:
             config = VisualizationConfig(
                 algorithm_name=kwargs.get("algorithm_name"),
                 topology_type=kwargs.get("topology_type", TopologyType.CUSTOM.value),
-                transpile_params={k: v for k, v in kwargs.items() if k not in ["algorithm_name", "topology_type"]}
+                transpile_params={
+                    k: v for k, v in kwargs.items()
+                    if k not in [
+                        "algorithm_name", "topology_type", "gate_durations", "precompute_layout", "timeline_pyramid"
+                    ]
+                },
+                gate_durations=kwargs.get("gate_durations"),
+                precompute_layout=kwargs.get("precompute_layout", True),
+                timeline_pyramid=kwargs.get("timeline_pyramid", False),
             )
             
         if config.algorithm_name is None:
@@ -158,12 +257,104 @@ class Visualizer:
             config.algorithm_name = f"{circuit_type} Circuit {len(self.circuits) + 1}"
 
         logger.info(f"📊 Processing circuit: '{config.algorithm_name}'")
-        
-        circuit_data = self._process_circuit(
-            circuit, config, coupling_map
-        )
+
+        if not self.memoize:
+            self.circuits.append(self._process_circuit(circuit, config, coupling_map))
+            return
+
+        key = self._memo_key(circuit, config, coupling_map)
+        circuit_data = processed_circuit_memo.get(key)
+        if circuit_data is None:
+            circuit_data = self._load_cached(key)
+        if circuit_data is None:
+            circuit_data = self._process_circuit(
+                circuit, config, coupling_map
+            )
+            self._save_cached(key, circuit_data)
+        else:
+            logger.info("   ✓ Reusing processed data of an identical circuit")
+        processed_circuit_memo.put(key, circuit_data, len(circuit.data) + 1)
+        if circuit_data.algorithm_name != config.algorithm_name:
+            circuit_data = replace(circuit_data, algorithm_name=config.algorithm_name)
         self.circuits.append(circuit_data)
 
+    def _memo_key(
+        self,
+        circuit: QuantumCircuit,
+        config: VisualizationConfig,
+        coupling_map: list[list[int]] | CouplingMap | dict[str, Any] | None,
+    ) -> str:
+        """
+        Key of the processed data of a circuit with the given inputs.
+
+        The display name is left out, so renamed circuits still match.
+        """
+        from .. import __version__
+
+        if isinstance(coupling_map, CouplingMap):
+            coupling_map = [coupling_map.size(), list(coupling_map.get_edges())]
+        inputs = asdict(config)
+        inputs.pop("algorithm_name")
+        return "-".join([
+            __version__,
+            circuit_fingerprint(circuit),
+            hashlib.blake2b(repr((inputs, coupling_map)).encode(), digest_size=16).hexdigest(),
+        ])
+
+    def _load_cached(self, key: str) -> CircuitVisualizationData | None:
+        """Read processed data from the cache directory, if there."""
+        if self.cache_dir is None:
+            return None
+        path = self.cache_dir / f"{key}.pkl"
+        try:
+            with open(path, "rb") as f:
+                circuit_data = pickle.load(f)
+            # The modification time orders entries for pruning
+            os.utime(path)
+            return circuit_data
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️  Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def _save_cached(self, key: str, circuit_data: CircuitVisualizationData) -> None:
+        """Write processed data to the cache directory, if one is set."""
+        if self.cache_dir is None:
+            return
+        path = self.cache_dir / f"{key}.pkl"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(circuit_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️  Could not write cache entry {path}: {e}")
+            return
+        self._prune_cache_dir(keep=path)
+
+    def _prune_cache_dir(self, keep: Path) -> None:
+        """Delete the least recently used cache entries beyond the size budget."""
+        entries = []
+        for path in keep.parent.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # Pruned by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.cache_dir_max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
     def visualize(self) -> dict[str, Any]:
         """
         Visualize all added circuits with Quvis.
@@ -249,6 +440,12 @@ class Visualizer:
 
         operations_per_slice = extract_operations_per_slice(circuit)
 
+        schedule = None
+        if config.gate_durations is not None:
+            schedule = schedule_operations(
+                operations_per_slice, circuit.num_qubits, config.gate_durations
+            )
+
         if coupling_map is None:
             circuit_info: LogicalCircuitInfo | CompiledCircuitInfo = LogicalCircuitInfo(
                 num_qubits=circuit.num_qubits,
@@ -267,6 +464,15 @@ class Visualizer:
                 qubits=circuit.num_qubits,
             )
 
+            qubit_statistics = compute_qubit_statistics(
+                operations_per_slice, circuit.num_qubits
+            )
+            timeline_pyramid = None
+            if config.timeline_pyramid:
+                timeline_pyramid = build_timeline_pyramid(
+                    operations_per_slice, circuit.num_qubits
+                )
+
             return CircuitVisualizationData(
                 circuit_info=circuit_info,
                 device_info=device_info,
@@ -274,6 +480,9 @@ class Visualizer:
                 circuit_type="logical",
                 algorithm_params=config.transpile_params,
                 circuit_stats=circuit_stats,
+                qubit_statistics=qubit_statistics,
+                timeline_pyramid=timeline_pyramid,
+                schedule=schedule,
             )
         else:
             compiled_operations_per_slice = extract_operations_per_slice(circuit)
@@ -292,12 +501,35 @@ class Visualizer:
                 routing_depth=routing_result.routing_depth,
             )
 
+            layout_positions = None
+            if modular_info is None and config.precompute_layout:
+                layout_positions = TopologyFactory.layout_for_coupling_map(
+                    num_device_qubits, coupling_map_list
+                ).tolist()
+
             device_info = DeviceInfo(
                 num_qubits_on_device=num_device_qubits,
                 connectivity_graph_coupling_map=list(coupling_map_list),
                 modular_info=modular_info,
+                layout_positions=layout_positions,
+                layout_parameters=asdict(LayoutParameters()) if layout_positions is not None else None,
             )
 
+            qubit_statistics = compute_qubit_statistics(
+                compiled_operations_per_slice, circuit.num_qubits, device_info.connectivity_graph_coupling_map
+            )
+            timeline_pyramid = None
+            if config.timeline_pyramid:
+                timeline_pyramid = build_timeline_pyramid(
+                    compiled_operations_per_slice, circuit.num_qubits, device_info.connectivity_graph_coupling_map
+                )
+
+            inter_core_analysis = None
+            if modular_info is not None:
+                inter_core_analysis = analyze_inter_core_traffic(
+                    compiled_operations_per_slice, modular_info, circuit.num_qubits
+                )
+
             circuit_stats = CircuitStats(
                 original_gates=len(circuit.data),
                 depth=len(compiled_operations_per_slice),
@@ -314,8 +546,66 @@ class Visualizer:
                 algorithm_params=config.transpile_params,
                 circuit_stats=circuit_stats,
                 routing_info=routing_info,
+                qubit_statistics=qubit_statistics,
+                timeline_pyramid=timeline_pyramid,
+                inter_core_analysis=inter_core_analysis,
+                schedule=schedule,
             )
 
+    def summarize_circuit(
+        self,
+        circuit: QuantumCircuit,
+        coupling_map: list[list[int]] | CouplingMap | dict[str, Any] | None = None,
+        algorithm_name: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Statistics of a circuit as add_circuit would report them, counted
+        without building per-slice data. The circuit is not added.
+
+        Args:
+            circuit: The quantum circuit
+            coupling_map: Device coupling map (optional - if None, treated as logical)
+            algorithm_name: Name for the circuit
+
+        Returns:
+            Dictionary with circuit_stats and, for compiled circuits, SWAP
+            and routing depth counts
+        """
+        metrics = count_circuit_metrics(circuit)
+        circuit_type = "logical" if coupling_map is None else "compiled"
+        result: dict[str, Any] = {
+            "algorithm_name": algorithm_name or f"{circuit_type.capitalize()} Circuit",
+            "circuit_type": circuit_type,
+            "detail": DetailLevel.SUMMARY.value,
+        }
+
+        if coupling_map is None:
+            result["device_info"] = {"num_qubits_on_device": circuit.num_qubits}
+            result["circuit_stats"] = CircuitStats(
+                original_gates=len(circuit.data),
+                depth=metrics.depth,
+                qubits=circuit.num_qubits,
+            ).to_dict()
+            return result
+
+        _, num_device_qubits = self._normalize_coupling_map(
+            coupling_map, circuit.num_qubits, VisualizationConfig()
+        )
+        result["device_info"] = {"num_qubits_on_device": num_device_qubits}
+        result["routing_info"] = {
+            "num_qubits": circuit.num_qubits,
+            "swaps": metrics.swaps,
+            "routing_depth": metrics.routing_depth,
+        }
+        result["circuit_stats"] = CircuitStats(
+            original_gates=len(circuit.data),
+            depth=metrics.depth,
+            qubits=circuit.num_qubits,
+            transpiled_gates=len(circuit.data),
+            swap_count=metrics.swaps,
+        ).to_dict()
+        return result
+
     def clear_circuits(self) -> None:
         """Clear all processed circuits from the visualizer."""
         self.circuits.clear()
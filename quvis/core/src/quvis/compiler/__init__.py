@@ -9,10 +9,32 @@ from .utils import (
     CompiledCircuitInfo, 
     RoutingCircuitInfo, 
     DeviceInfo, 
+    ModularInfo,
+    InterCoreAnalysis,
+    QubitStatistics,
     VisualizationData,
     extract_operations_per_slice,
     extract_routing_operations_per_slice,
-    analyze_routing_overhead
+    analyze_routing_overhead,
+    analyze_inter_core_traffic,
+    build_core_assignment,
+    compute_qubit_statistics
+)
+from .scheduling import (
+    DEFAULT_GATE_DURATIONS,
+    GateDurations,
+    CircuitSchedule,
+    schedule_operations
+)
+from .layout import (
+    LayoutParameters,
+    compute_device_layout
+)
+from .timeline import (
+    TimelinePyramid,
+    TimelinePyramidLevel,
+    build_timeline_pyramid,
+    query_timeline_window
 )
 
 __all__ = [
@@ -20,8 +42,24 @@ __all__ = [
     "CompiledCircuitInfo", 
     "RoutingCircuitInfo",
     "DeviceInfo",
+    "ModularInfo",
+    "InterCoreAnalysis",
+    "QubitStatistics",
     "VisualizationData",
     "extract_operations_per_slice",
     "extract_routing_operations_per_slice", 
-    "analyze_routing_overhead"
+    "analyze_routing_overhead",
+    "analyze_inter_core_traffic",
+    "build_core_assignment",
+    "compute_qubit_statistics",
+    "DEFAULT_GATE_DURATIONS",
+    "GateDurations",
+    "CircuitSchedule",
+    "schedule_operations",
+    "TimelinePyramid",
+    "TimelinePyramidLevel",
+    "build_timeline_pyramid",
+    "query_timeline_window",
+    "LayoutParameters",
+    "compute_device_layout"
 ] 
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Structural fingerprints of quantum circuits.
+
+A fingerprint identifies a circuit by its structure (register sizes, and the
+name, qubits, clbits and parameters of every instruction in order, plus the
+definition of every custom operation), so that results derived from a circuit
+can be reused for any equal circuit, even a different object, e.g. one rebuilt
+by rerunning a notebook cell.
+"""
+
+import hashlib
+from typing import Any
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit import ParameterExpression
+
+DIGEST_SIZE = 16
+
+# Non-standard-gate instructions whose behaviour is fixed by their name
+_BUILTIN_INSTRUCTIONS = frozenset({"barrier", "delay", "measure", "reset"})
+
+
+def _param_token(param: Any) -> str:
+    if isinstance(param, float):
+        return repr(param)
+    if isinstance(param, ParameterExpression):
+        return f"e:{param}"
+    if isinstance(param, QuantumCircuit):
+        # Control flow blocks
+        return f"c:{circuit_fingerprint(param)}"
+    if isinstance(param, np.ndarray):
+        # repr() of large arrays is abbreviated, so hash the contents
+        return f"a:{param.dtype}:{param.shape}:{hashlib.blake2b(param.tobytes(), digest_size=DIGEST_SIZE).hexdigest()}"
+    return repr(param)
+
+
+def _has_custom_definition(instruction: Any) -> bool:
+    """Whether the instruction's definition is not implied by its name and parameters."""
+    if instruction.is_standard_gate() or instruction.is_control_flow():
+        return False
+    if instruction.name in _BUILTIN_INSTRUCTIONS:
+        return False
+    # Library operations (UnitaryGate, QFTGate, ...) derive their definition
+    # from their parameters; user gates such as QASM `gate` declarations or
+    # QuantumCircuit.to_gate() results do not
+    return not type(instruction.operation).__module__.startswith("qiskit.circuit.library")
+
+
+def _definition_token(operation: Any) -> str:
+    definition = operation.definition
+    if definition is None:
+        # Opaque gate
+        return "|d-"
+    return f"|d{circuit_fingerprint(definition)}"
+
+
+def circuit_fingerprint(circuit: QuantumCircuit) -> str:
+    """
+    Compute the structural fingerprint of a circuit in one pass over its data.
+
+    Args:
+        circuit: Circuit to fingerprint
+
+    Returns:
+        Hex digest that is equal for circuits with the same qubit and clbit
+        counts and the same instructions (name, qubit and clbit indices,
+        parameters and, for custom operations, the fingerprint of their
+        definition) in the same order
+    """
+    # Instruction names and params are read from the circuit data directly;
+    # going through instruction.operation would build a gate object each time
+    qubit_token = {qubit: str(i) for i, qubit in enumerate(circuit.qubits)}.__getitem__
+    clbit_token = {clbit: str(i) for i, clbit in enumerate(circuit.clbits)}.__getitem__
+
+    # Applications of one custom gate usually share the operation object
+    definition_tokens: dict = {}
+
+    tokens = [f"{circuit.num_qubits},{circuit.num_clbits}"]
+    append = tokens.append
+    for instruction in circuit.data:
+        token = f"{instruction.name}|{','.join(map(qubit_token, instruction.qubits))}"
+        if instruction.clbits:
+            token += "|c" + ",".join(map(clbit_token, instruction.clbits))
+        if instruction.params:
+            token += "|p" + ",".join(map(_param_token, instruction.params))
+        if instruction.is_control_flow():
+            token += f"|f{getattr(instruction.operation, 'condition', None)!r}"
+        elif _has_custom_definition(instruction):
+            operation = instruction.operation
+            cached = definition_tokens.get(id(operation))
+            if cached is None:
+                # Keeping the operation alive keeps its id from being reused
+                cached = (operation, _definition_token(operation))
+                definition_tokens[id(operation)] = cached
+            token += cached[1]
+        append(token)
+
+    return hashlib.blake2b("\n".join(tokens).encode(), digest_size=DIGEST_SIZE).hexdigest()
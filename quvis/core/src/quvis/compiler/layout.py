@@ -0,0 +1,143 @@
+"""
+Precomputed device layouts.
+
+Device coupling maps are fixed per (topology, physical_qubits), yet every
+client used to run its own force-directed simulation for them. This module
+computes the layout once on the server: a spectral embedding of the graph
+Laplacian as the starting point, refined by a vectorized force simulation
+that uses the same force model and default parameters as the web client.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+# Above this many qubits the dense eigendecomposition gets too slow and the
+# refinement starts from seeded random positions instead
+SPECTRAL_MAX_QUBITS = 2048
+_REPULSION_CHUNK = 1024
+_MIN_REPEL_DIST = 0.1
+
+
+@dataclass
+class LayoutParameters:
+    """
+    Force model parameters; the defaults mirror the web client's LayoutManager.
+
+    Payloads ship the parameters next to the positions, so the client only
+    reuses a layout computed with its own force parameters.
+    """
+    k_repel: float = 0.3
+    ideal_dist: float = 5.0
+    k_attract: float = 0.1
+    iterations: int = 300
+    cooling_factor: float = 0.95
+    depth_factor: float = 0.5
+    seed: int = 0
+
+
+def _undirected_edges(coupling_map, num_qubits: int) -> np.ndarray:
+    """Unique (i < j) edges, dropping self-loops and out-of-range qubits."""
+    edges = np.asarray(coupling_map, dtype=np.int64).reshape(-1, 2)
+    edges = np.sort(edges, axis=1)
+    edges = edges[(edges[:, 0] != edges[:, 1]) & (edges[:, 0] >= 0) & (edges[:, 1] < num_qubits)]
+    return np.unique(edges, axis=0)
+
+
+def _spectral_positions(edges: np.ndarray, num_qubits: int, rng: np.random.Generator) -> np.ndarray:
+    """Embeds the qubits with the first non-trivial Laplacian eigenvectors."""
+    laplacian = np.zeros((num_qubits, num_qubits))
+    laplacian[edges[:, 0], edges[:, 1]] = -1.0
+    laplacian[edges[:, 1], edges[:, 0]] = -1.0
+    laplacian[np.diag_indices(num_qubits)] = -laplacian.sum(axis=1)
+
+    _, eigenvectors = np.linalg.eigh(laplacian)
+    positions = np.zeros((num_qubits, 3))
+    dims = min(3, num_qubits - 1)
+    positions[:, :dims] = eigenvectors[:, 1:1 + dims]
+
+    # Break ties between qubits that share an embedding (e.g. symmetric leaves)
+    positions += rng.normal(scale=1e-3, size=positions.shape)
+    return positions
+
+
+def _repulsive_forces(positions: np.ndarray, k_repel_sq: float) -> np.ndarray:
+    """
+    Exact all-pairs repulsion.
+
+    Writing the force on ``i`` as ``p_i * sum_j w_ij - sum_j w_ij p_j`` keeps
+    the work in a few (rows, n) matrices and one matrix product per chunk,
+    with distances from the Gram identity.
+    """
+    forces = np.empty_like(positions)
+    sq_norms = (positions ** 2).sum(axis=1)
+    for start in range(0, len(positions), _REPULSION_CHUNK):
+        block = positions[start:start + _REPULSION_CHUNK]
+        sq_dist = sq_norms[start:start + len(block), None] + sq_norms[None, :] - 2.0 * (block @ positions.T)
+        length = np.sqrt(np.maximum(sq_dist, 1e-18, out=sq_dist), out=sq_dist)
+        weight = np.maximum(length, _MIN_REPEL_DIST) * length
+        np.divide(k_repel_sq, weight, out=weight)
+        # Coincident qubits (including each qubit with itself) exert no force
+        weight[length < 1e-9] = 0.0
+        forces[start:start + len(block)] = block * weight.sum(axis=1)[:, None] - weight @ positions
+    return forces
+
+
+def compute_device_layout(
+    num_qubits: int,
+    coupling_map,
+    params: LayoutParameters | None = None,
+) -> np.ndarray:
+    """
+    Computes a 3D force-directed layout of a device coupling map.
+
+    Args:
+        num_qubits: Number of physical qubits on the device
+        coupling_map: Iterable of [q1, q2] edges; direction and duplicates are ignored
+        params: Force model parameters (defaults mirror the web client)
+
+    Returns:
+        np.ndarray: (num_qubits, 3) positions centred on the origin with the
+        longest axis spanning [-0.5, 0.5]; clients scale them to their scene
+    """
+    params = params or LayoutParameters()
+    positions = np.zeros((num_qubits, 3))
+    if num_qubits <= 1:
+        return positions
+
+    rng = np.random.default_rng(params.seed)
+    edges = _undirected_edges(coupling_map, num_qubits)
+    area = max(5.0, np.sqrt(num_qubits) * 2.5 * params.ideal_dist / 5.0)
+    extents = np.array([area, area, area * params.depth_factor])
+
+    if num_qubits <= SPECTRAL_MAX_QUBITS and len(edges):
+        positions = _spectral_positions(edges, num_qubits, rng)
+        span = np.ptp(positions, axis=0).max()
+        positions *= (0.1 * area / span) if span > 0 else 1.0
+    else:
+        positions = (rng.random((num_qubits, 3)) - 0.5) * extents * 0.1
+
+    k_repel_sq = params.k_repel ** 2
+    temperature = extents.max() / 10
+    for _ in range(params.iterations):
+        forces = _repulsive_forces(positions, k_repel_sq)
+
+        if len(edges):
+            delta = positions[edges[:, 1]] - positions[edges[:, 0]]
+            length = np.sqrt((delta ** 2).sum(axis=1))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scale = np.where(length > 0, params.k_attract * (length - params.ideal_dist) / length, 0.0)
+            pull = delta * scale[:, None]
+            np.add.at(forces, edges[:, 0], pull)
+            np.add.at(forces, edges[:, 1], -pull)
+
+        magnitude = np.sqrt((forces ** 2).sum(axis=1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(magnitude > 0, np.minimum(magnitude, temperature) / magnitude, 0.0)
+        positions += forces * step[:, None]
+        temperature *= params.cooling_factor
+
+    positions -= (positions.min(axis=0) + positions.max(axis=0)) / 2
+    span = np.ptp(positions, axis=0).max()
+    if span > 0:
+        positions /= span
+    return positions
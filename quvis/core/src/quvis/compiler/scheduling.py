@@ -0,0 +1,216 @@
+"""
+Duration-aware scheduling of sliced circuits.
+
+Layer-based slices treat every gate as taking one time step. This module
+assigns real gate durations and computes ASAP/ALAP start times, per-gate
+slack and the critical path, so views can be animated in hardware time.
+"""
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+# Typical superconducting-device gate durations in nanoseconds
+DEFAULT_GATE_DURATIONS: dict[str, float] = {
+    "id": 35.0,
+    "rz": 0.0,
+    "sx": 35.0,
+    "x": 35.0,
+    "cx": 300.0,
+    "cz": 300.0,
+    "ecr": 300.0,
+    "swap": 900.0,
+    "measure": 1000.0,
+    "reset": 1000.0,
+    "barrier": 0.0,
+    "delay": 0.0,
+}
+
+
+@dataclass
+class GateDurations:
+    """Gate duration table with optional per-qubit and per-edge overrides."""
+    defaults: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_GATE_DURATIONS))
+    qubit_overrides: dict[tuple[str, int], float] = field(default_factory=dict)
+    edge_overrides: dict[tuple[str, int, int], float] = field(default_factory=dict)
+    single_qubit_default: float = 35.0
+    multi_qubit_default: float = 300.0
+    unit: str = "ns"
+
+    @classmethod
+    def from_dict(cls, durations: Mapping[str, Any]) -> "GateDurations":
+        """
+        Create a table from the defaults updated with per-gate-name durations.
+
+        The optional "qubit_overrides" and "edge_overrides" entries map
+        "gate|qubit" and "gate|qubit|qubit" keys to durations, the form
+        config_to_dict writes them in, e.g. {"x|2": 50.0, "cx|0|1": 250.0}.
+
+        Raises:
+            ValueError: If an override table or key is malformed
+        """
+        durations = dict(durations)
+        qubit_overrides = _parse_overrides(durations.pop("qubit_overrides", None) or {}, "qubit_overrides", 1)
+        edge_overrides = _parse_overrides(durations.pop("edge_overrides", None) or {}, "edge_overrides", 2)
+        tables = sorted(name for name, duration in durations.items() if isinstance(duration, Mapping))
+        if tables:
+            raise ValueError(
+                f"Unknown override tables: {', '.join(tables)}; expected qubit_overrides or edge_overrides"
+            )
+        return cls(
+            defaults={**DEFAULT_GATE_DURATIONS, **durations},
+            qubit_overrides=qubit_overrides,
+            edge_overrides=edge_overrides,
+        )
+
+
+def _parse_overrides(overrides: Any, table: str, num_qubits: int) -> dict[tuple, float]:
+    """Parses "gate|qubit[|qubit]" override keys into (gate, qubit, ...) tuples."""
+    if not isinstance(overrides, Mapping):
+        raise ValueError(f"{table} must map 'gate|qubit' keys to durations")
+    parsed: dict[tuple, float] = {}
+    for key, duration in overrides.items():
+        name, *qubits = str(key).split("|")
+        if len(qubits) != num_qubits or not all(q.strip().isdigit() for q in qubits):
+            expected = "|".join(["gate"] + ["qubit"] * num_qubits)
+            raise ValueError(f"Invalid {table} key '{key}'; expected '{expected}'")
+        parsed[(name.strip().lower(), *map(int, qubits))] = float(duration)
+    return parsed
+
+
+@dataclass
+class CircuitSchedule:
+    """
+    Stores the ASAP/ALAP schedule of a sliced circuit.
+
+    Gates are indexed in slice order: gate ``i`` is operation
+    ``i - slice_offsets[s]`` of slice ``s`` where
+    ``slice_offsets[s] <= i < slice_offsets[s + 1]``.
+    """
+    unit: str
+    total_duration: float
+    slice_offsets: list[int]
+    durations: list[float]
+    asap_start: list[float]
+    alap_start: list[float]
+    slack: list[float]
+    critical_path: list[int]
+
+
+def _flatten_gates(operations_per_slice):
+    """Flattens operations into per-gate and per-operand arrays in slice order."""
+    names, arities, slice_offsets = [], [], [0]
+    operand_gates, operand_qubits = [], []
+    for slice_ops in operations_per_slice:
+        for op in slice_ops:
+            gate_idx = len(names)
+            qubits = op["qubits"]
+            names.append(op["name"].lower())
+            arities.append(len(qubits))
+            operand_gates.extend([gate_idx] * len(qubits))
+            operand_qubits.extend(qubits)
+        slice_offsets.append(len(names))
+
+    return (
+        names,
+        np.asarray(arities, dtype=np.int64),
+        np.asarray(slice_offsets, dtype=np.int64),
+        np.asarray(operand_gates, dtype=np.int64),
+        np.asarray(operand_qubits, dtype=np.int64),
+    )
+
+
+def _gate_durations(names, arities, operand_gates, operand_qubits, durations: GateDurations) -> np.ndarray:
+    """Resolves the duration of every gate, applying qubit and edge overrides."""
+    unique_names, name_idx = np.unique(np.asarray(names, dtype=object), return_inverse=True)
+    table = np.asarray([durations.defaults.get(name, np.nan) for name in unique_names], dtype=np.float64)
+    gate_durations = table[name_idx.reshape(-1)] if len(names) else np.zeros(0)
+
+    unknown = np.isnan(gate_durations)
+    gate_durations[unknown & (arities <= 1)] = durations.single_qubit_default
+    gate_durations[unknown & (arities > 1)] = durations.multi_qubit_default
+
+    if (durations.qubit_overrides or durations.edge_overrides) and len(operand_qubits):
+        gate_names = np.asarray(names, dtype=object)
+        first_operand = np.searchsorted(operand_gates, np.arange(len(names)))
+        first_qubit = operand_qubits[np.minimum(first_operand, len(operand_qubits) - 1)]
+
+        for (name, qubit), duration in durations.qubit_overrides.items():
+            gate_durations[(gate_names == name) & (arities == 1) & (first_qubit == qubit)] = duration
+
+        two_qubit = arities == 2
+        second_qubit = np.where(two_qubit, operand_qubits[np.minimum(first_operand + 1, len(operand_qubits) - 1)], -1)
+        for (name, q1, q2), duration in durations.edge_overrides.items():
+            on_edge = ((first_qubit == q1) & (second_qubit == q2)) | ((first_qubit == q2) & (second_qubit == q1))
+            gate_durations[(gate_names == name) & two_qubit & on_edge] = duration
+
+    return gate_durations
+
+
+def schedule_operations(operations_per_slice, num_qubits: int, durations: GateDurations | None = None) -> CircuitSchedule:
+    """
+    Computes ASAP and ALAP start times for a sliced circuit.
+
+    Slices are a topological order of the circuit DAG and the gates of a slice
+    act on disjoint qubits, so the longest-path relaxation runs as one
+    vectorized step per slice over per-qubit ready/deadline arrays.
+
+    Args:
+        operations_per_slice: Operations per slice, as returned by extract_operations_per_slice
+        num_qubits: Number of qubits addressed by the operations
+        durations: Gate duration table (defaults to DEFAULT_GATE_DURATIONS in ns)
+
+    Returns:
+        CircuitSchedule: Start times, slack and critical path per gate
+    """
+    durations = durations or GateDurations()
+    names, arities, slice_offsets, operand_gates, operand_qubits = _flatten_gates(operations_per_slice)
+    num_gates = len(names)
+    gate_durations = _gate_durations(names, arities, operand_gates, operand_qubits, durations)
+
+    operand_offsets = np.searchsorted(operand_gates, slice_offsets)
+    asap = np.zeros(num_gates, dtype=np.float64)
+    predecessor = np.full(num_gates, -1, dtype=np.int64)
+    ready = np.zeros(num_qubits, dtype=np.float64)
+    last_gate = np.full(num_qubits, -1, dtype=np.int64)
+
+    # Forward pass: earliest start is the latest finish among the gate's qubits
+    for start, end in zip(operand_offsets[:-1], operand_offsets[1:]):
+        gates, qubits = operand_gates[start:end], operand_qubits[start:end]
+        np.maximum.at(asap, gates, ready[qubits])
+        on_critical_wire = ready[qubits] == asap[gates]
+        predecessor[gates[on_critical_wire]] = last_gate[qubits[on_critical_wire]]
+        ready[qubits] = asap[gates] + gate_durations[gates]
+        last_gate[qubits] = gates
+
+    finish = asap + gate_durations
+    total_duration = float(finish.max()) if num_gates else 0.0
+
+    # Backward pass: latest finish is the earliest ALAP start among successors
+    alap_finish = np.full(num_gates, total_duration, dtype=np.float64)
+    deadline = np.full(num_qubits, total_duration, dtype=np.float64)
+    for start, end in zip(operand_offsets[-2::-1], operand_offsets[:0:-1]):
+        gates, qubits = operand_gates[start:end], operand_qubits[start:end]
+        np.minimum.at(alap_finish, gates, deadline[qubits])
+        deadline[qubits] = alap_finish[gates] - gate_durations[gates]
+    alap = alap_finish - gate_durations
+
+    critical_path = []
+    if num_gates:
+        gate = int(np.argmax(finish))
+        while gate != -1:
+            critical_path.append(gate)
+            gate = int(predecessor[gate])
+        critical_path.reverse()
+
+    return CircuitSchedule(
+        unit=durations.unit,
+        total_duration=total_duration,
+        slice_offsets=slice_offsets.tolist(),
+        durations=gate_durations.tolist(),
+        asap_start=asap.tolist(),
+        alap_start=alap.tolist(),
+        slack=np.maximum(alap - asap, 0.0).tolist(),
+        critical_path=critical_path,
+    )
@@ -0,0 +1,176 @@
+"""
+Multi-resolution timeline aggregates.
+
+Very deep circuits make whole-range heatmaps and timeline overviews scan
+every slice. This module builds a mipmap-style pyramid of per-qubit activity
+and per-edge interaction counts (1, 8, 64, 512 ... slices per bucket) so a
+zoomed-out view reads a handful of buckets and window aggregates take
+O(log n) bucket lookups.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .utils import _flatten_qubit_operations
+
+
+@dataclass
+class TimelinePyramidLevel:
+    """
+    Aggregated counts for one resolution of the timeline.
+
+    Counts are flattened row-major: bucket ``b`` of qubit ``q`` is
+    ``qubit_activity[b * num_qubits + q]``.
+    """
+    slices_per_bucket: int
+    num_buckets: int
+    gate_counts: list[int]
+    qubit_activity: list[int]
+    edge_interactions: list[int]
+
+
+@dataclass
+class TimelinePyramid:
+    """Mipmap-style pyramid of timeline aggregates, finest level first."""
+    num_slices: int
+    num_qubits: int
+    branching_factor: int
+    edges: list[list[int]]
+    levels: list[TimelinePyramidLevel]
+
+
+def _coarsen(counts: np.ndarray, factor: int) -> np.ndarray:
+    """Sums groups of ``factor`` consecutive buckets (rows)."""
+    num_buckets = -(-counts.shape[0] // factor)
+    padded = np.zeros((num_buckets * factor,) + counts.shape[1:], dtype=counts.dtype)
+    padded[:counts.shape[0]] = counts
+    return padded.reshape((num_buckets, factor) + counts.shape[1:]).sum(axis=1)
+
+
+def build_timeline_pyramid(
+    operations_per_slice,
+    num_qubits: int,
+    coupling_map=None,
+    branching_factor: int = 8,
+    max_cells_per_level: int = 1 << 20,
+) -> TimelinePyramid:
+    """
+    Builds the timeline pyramid from the per-slice operations.
+
+    Args:
+        operations_per_slice: Operations per slice, as returned by extract_operations_per_slice
+        num_qubits: Number of qubits addressed by the operations
+        coupling_map: Device edges to aggregate; defaults to the interacting pairs
+        branching_factor: Number of buckets merged per level
+        max_cells_per_level: Levels with more cells than this are omitted; the
+            client reads raw slices at those resolutions instead
+
+    Returns:
+        TimelinePyramid: Levels from the finest that fits the budget up to a single bucket
+    """
+    num_slices = len(operations_per_slice)
+    slices, qubits, arities, _ = _flatten_qubit_operations(operations_per_slice)
+
+    pair_rows = np.flatnonzero(arities == 2)[::2]
+    q0, q1 = qubits[pair_rows], qubits[pair_rows + 1]
+    pair_keys = np.minimum(q0, q1) * num_qubits + np.maximum(q0, q1)
+    if coupling_map is not None and len(coupling_map):
+        edges = np.asarray(coupling_map, dtype=np.int64).reshape(-1, 2)
+        edge_keys = np.unique(edges.min(axis=1) * num_qubits + edges.max(axis=1))
+    else:
+        edge_keys = np.unique(pair_keys)
+    num_edges = len(edge_keys)
+
+    positions = np.minimum(np.searchsorted(edge_keys, pair_keys), max(0, num_edges - 1))
+    on_edge = (edge_keys[positions] == pair_keys) if num_edges else np.zeros(len(pair_keys), dtype=bool)
+
+    # Start at the finest level that fits the cell budget
+    slices_per_bucket = 1
+    cells_per_bucket = num_qubits + num_edges + 1
+    while slices_per_bucket < num_slices and (
+        -(-num_slices // slices_per_bucket) * cells_per_bucket > max_cells_per_level
+    ):
+        slices_per_bucket *= branching_factor
+
+    num_buckets = max(1, -(-num_slices // slices_per_bucket))
+    slice_gate_counts = np.fromiter(map(len, operations_per_slice), dtype=np.int64, count=num_slices)
+    gate_counts = _coarsen(slice_gate_counts, slices_per_bucket) if num_slices else np.zeros(1, dtype=np.int64)
+
+    active_keys = np.unique(slices * num_qubits + qubits)
+    active_buckets = (active_keys // max(1, num_qubits)) // slices_per_bucket
+    qubit_activity = np.bincount(
+        active_buckets * num_qubits + active_keys % max(1, num_qubits),
+        minlength=num_buckets * num_qubits,
+    ).reshape(num_buckets, num_qubits)
+
+    edge_interactions = np.bincount(
+        (slices[pair_rows][on_edge] // slices_per_bucket) * num_edges + positions[on_edge],
+        minlength=num_buckets * num_edges,
+    ).reshape(num_buckets, num_edges)
+
+    levels = []
+    while True:
+        levels.append(TimelinePyramidLevel(
+            slices_per_bucket=slices_per_bucket,
+            num_buckets=num_buckets,
+            gate_counts=gate_counts.tolist(),
+            qubit_activity=qubit_activity.ravel().tolist(),
+            edge_interactions=edge_interactions.ravel().tolist(),
+        ))
+        if num_buckets <= 1:
+            break
+        gate_counts = _coarsen(gate_counts, branching_factor)
+        qubit_activity = _coarsen(qubit_activity, branching_factor)
+        edge_interactions = _coarsen(edge_interactions, branching_factor)
+        slices_per_bucket *= branching_factor
+        num_buckets = len(gate_counts)
+
+    return TimelinePyramid(
+        num_slices=num_slices,
+        num_qubits=num_qubits,
+        branching_factor=branching_factor,
+        edges=np.stack((edge_keys // max(1, num_qubits), edge_keys % max(1, num_qubits)), axis=1).tolist(),
+        levels=levels,
+    )
+
+
+def query_timeline_window(pyramid: TimelinePyramid, start: int, end: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregates qubit activity and edge interactions over slices [start, end).
+
+    The window is decomposed into aligned buckets, climbing one level while
+    the boundaries are aligned, so at most ``2 * branching_factor`` buckets
+    are read per level. Boundaries are rounded outwards to the finest level.
+
+    Returns:
+        Tuple of (per-qubit activity, per-edge interactions) arrays
+    """
+    num_edges = len(pyramid.edges)
+    qubit_totals = np.zeros(pyramid.num_qubits, dtype=np.int64)
+    edge_totals = np.zeros(num_edges, dtype=np.int64)
+    if not pyramid.levels:
+        return qubit_totals, edge_totals
+
+    finest = pyramid.levels[0].slices_per_bucket
+    start = max(0, start) // finest
+    end = -(-min(end, pyramid.num_slices) // finest)
+
+    def add_bucket(level: TimelinePyramidLevel, bucket: int):
+        qubit_totals[:] += level.qubit_activity[bucket * pyramid.num_qubits:(bucket + 1) * pyramid.num_qubits]
+        edge_totals[:] += level.edge_interactions[bucket * num_edges:(bucket + 1) * num_edges]
+
+    factor = pyramid.branching_factor
+    for level_idx, level in enumerate(pyramid.levels):
+        is_top = level_idx == len(pyramid.levels) - 1
+        while start < end and (is_top or start % factor):
+            add_bucket(level, start)
+            start += 1
+        while start < end and end % factor:
+            end -= 1
+            add_bucket(level, end)
+        if start >= end:
+            break
+        start //= factor
+        end //= factor
+
+    return qubit_totals, edge_totals
@@ -1,4 +1,5 @@
 import json
+import numpy as np
 from qiskit.converters import circuit_to_dag
 from dataclasses import dataclass, asdict
 
@@ -41,12 +42,51 @@ class RoutingAnalysisResult:
     swaps: int
     routing_depth: int
 
+@dataclass
+class CircuitMetrics:
+    """Stores counts of a circuit that do not need its slices."""
+    depth: int
+    op_count: int
+    routing_op_count: int
+    swaps: int
+    routing_depth: int
+
+@dataclass
+class InterCoreAnalysis:
+    """Stores inter-core communication metrics for a modular architecture."""
+    intra_core_ops: int
+    inter_core_ops: int
+    inter_core_swaps: int
+    inter_core_ops_per_slice: list[int]
+    inter_core_swaps_per_slice: list[int]
+    cumulative_inter_core_ops: list[int]
+    link_usage: list[int]
+    link_utilization: list[float]
+    core_traffic_matrix: list[list[int]]
+    critical_path_length: int
+    critical_path: list[list[int]]
+
+@dataclass
+class QubitStatistics:
+    """Stores per-qubit and per-coupling-edge aggregate statistics of a sliced circuit."""
+    one_qubit_gates: list[int]
+    two_qubit_gates: list[int]
+    multi_qubit_gates: list[int]
+    swap_participation: list[int]
+    active_slices: list[int]
+    idle_slices: list[int]
+    first_active_slice: list[int]
+    last_active_slice: list[int]
+    edge_usage: list[int]
+
 @dataclass
 class DeviceInfo:
     """Stores information about the target device."""
     num_qubits_on_device: int
     connectivity_graph_coupling_map: list
     modular_info: ModularInfo | None = None
+    layout_positions: list[list[float]] | None = None  # Precomputed (x, y, z) per qubit, normalized to a unit box
+    layout_parameters: dict[str, Any] | None = None  # LayoutParameters the positions were computed with
 
 @dataclass
 class VisualizationData:
@@ -61,6 +101,9 @@ class VisualizationData:
         with open(filepath, 'w') as f:
             json.dump(asdict(self), f, separators=(',', ':'))
 
+# Operations that are typically inserted for routing
+ROUTING_OP_NAMES = {'swap', 'bridge', 'iswap'}  # Can be extended
+
 def extract_operations_per_slice(qc):
     """Extracts operations per slice from a quantum circuit."""
     dag = circuit_to_dag(qc)
@@ -97,9 +140,6 @@ def extract_routing_operations_per_slice(qc):
     swaps = 0
     routing_depth = 0
 
-    # Operations that are typically inserted for routing
-    routing_op_names = {'swap', 'bridge', 'iswap'}  # Can be extended
-
     for layer_idx, layer in enumerate(dag.multigraph_layers()):
         slice_routing_ops = []
         has_routing_ops = False
@@ -109,7 +149,7 @@ def extract_routing_operations_per_slice(qc):
                 op = node.op
                 op_name = op.name.lower()
 
-                if op_name in routing_op_names:
+                if op_name in ROUTING_OP_NAMES:
                     op_qubit_indices = [qubit_indices[q] for q in node.qargs]
                     slice_routing_ops.append({
                         "name": op.name,
@@ -170,4 +210,296 @@ def analyze_routing_overhead(logical_circuit, compiled_circuit):
         "swap_count": routing_result.swaps,
         "routing_depth": routing_result.routing_depth,
         "routing_overhead_percentage": (routing_op_count / compiled_op_count * 100) if compiled_op_count > 0 else 0
-    }
\ No newline at end of file
+    }
+
+def count_circuit_metrics(qc) -> CircuitMetrics:
+    """
+    Counts the metrics of a circuit in one pass over its instructions.
+
+    Gives the same depth, swap count and routing depth as the slice
+    extraction functions, without building the DAG or per-operation dicts:
+    each instruction's slice is one past the latest slice on any of its
+    qubits and clbits.
+
+    Args:
+        qc: Quantum circuit
+
+    Returns:
+        CircuitMetrics of the circuit
+    """
+    wire_slices: dict[Any, int] = {}
+    depth = 0
+    routing_op_count = 0
+    swaps = 0
+    last_routing_slice = 0
+
+    for instruction in qc.data:
+        wires = instruction.qubits + instruction.clbits
+        current = 1 + max((wire_slices.get(wire, 0) for wire in wires), default=0)
+        for wire in wires:
+            wire_slices[wire] = current
+        depth = max(depth, current)
+
+        op_name = instruction.name.lower()
+        if op_name in ROUTING_OP_NAMES:
+            routing_op_count += 1
+            last_routing_slice = max(last_routing_slice, current)
+            if op_name == "swap":
+                swaps += 1
+
+    return CircuitMetrics(
+        depth=depth,
+        op_count=len(qc.data),
+        routing_op_count=routing_op_count,
+        swaps=swaps,
+        # extract_routing_operations_per_slice counts DAG layers including
+        # the input layer
+        routing_depth=last_routing_slice + 1 if last_routing_slice else 0,
+    )
+
+def summarize_routing_overhead(logical: CircuitMetrics, compiled: CircuitMetrics):
+    """
+    Same result as analyze_routing_overhead, from counted metrics.
+
+    Args:
+        logical: Metrics of the original decomposed circuit
+        compiled: Metrics of the transpiled circuit
+
+    Returns:
+        dict: Analysis results including routing metrics
+    """
+    return {
+        "logical_depth": logical.depth,
+        "compiled_depth": compiled.depth,
+        "routing_overhead_depth": max(0, compiled.depth - logical.depth),
+        "logical_op_count": logical.op_count,
+        "compiled_op_count": compiled.op_count,
+        "routing_op_count": compiled.routing_op_count,
+        "swap_count": compiled.swaps,
+        "routing_depth": compiled.routing_depth,
+        "routing_overhead_percentage": (
+            compiled.routing_op_count / compiled.op_count * 100 if compiled.op_count > 0 else 0
+        ),
+    }
+
+def build_core_assignment(modular_info: ModularInfo, num_qubits: int) -> np.ndarray:
+    """
+    Builds the qubit -> core lookup array for a modular architecture.
+
+    Qubits are assigned to cores in contiguous blocks of ``qubits_per_core``.
+    Qubits that fall outside every core are marked with -1.
+    """
+    qubits_per_core = max(1, modular_info.qubits_per_core)
+    core_of_qubit = np.arange(num_qubits, dtype=np.int64) // qubits_per_core
+    core_of_qubit[core_of_qubit >= modular_info.num_cores] = -1
+    return core_of_qubit
+
+
+def _flatten_two_qubit_ops(operations_per_slice):
+    """Flattens two-qubit operations into (slice, q0, q1, is_swap) arrays."""
+    slice_indices, first_qubits, second_qubits, is_swap = [], [], [], []
+    for slice_idx, slice_ops in enumerate(operations_per_slice):
+        for op in slice_ops:
+            qubits = op["qubits"]
+            if len(qubits) == 2:
+                slice_indices.append(slice_idx)
+                first_qubits.append(qubits[0])
+                second_qubits.append(qubits[1])
+                is_swap.append(op["name"].lower() == "swap")
+
+    return (
+        np.asarray(slice_indices, dtype=np.int64),
+        np.asarray(first_qubits, dtype=np.int64),
+        np.asarray(second_qubits, dtype=np.int64),
+        np.asarray(is_swap, dtype=bool),
+    )
+
+
+def _count_edge_usage(edges: np.ndarray, q0: np.ndarray, q1: np.ndarray, num_qubits: int) -> np.ndarray:
+    """
+    Counts the operations acting on each edge, ignoring edge direction.
+
+    Every entry of ``edges`` receives the count of its undirected pair, so
+    coupling maps listing both directions report the same count twice.
+    """
+    usage = np.zeros(len(edges), dtype=np.int64)
+    if not len(edges) or not len(q0):
+        return usage
+
+    edge_keys = edges.min(axis=1) * num_qubits + edges.max(axis=1)
+    op_keys = np.minimum(q0, q1) * num_qubits + np.maximum(q0, q1)
+    unique_keys, edge_slot = np.unique(edge_keys, return_inverse=True)
+    edge_slot = edge_slot.reshape(-1)
+    positions = np.minimum(np.searchsorted(unique_keys, op_keys), len(unique_keys) - 1)
+    matched = unique_keys[positions] == op_keys
+    slot_usage = np.bincount(positions[matched], minlength=len(unique_keys))
+    return slot_usage[edge_slot]
+
+
+def _critical_inter_core_path(slices, q0, q1, is_inter, num_qubits):
+    """
+    Finds the dependency chain containing the most inter-core operations.
+
+    Operations inside a slice act on disjoint qubits, so each slice is
+    relaxed as a single vectorized step over the per-qubit chain lengths.
+    """
+    num_ops = len(slices)
+    chain = np.zeros(num_qubits, dtype=np.int64)
+    last_op = np.full(num_qubits, -1, dtype=np.int64)
+    predecessor = np.full(num_ops, -1, dtype=np.int64)
+    depth = np.zeros(num_ops, dtype=np.int64)
+
+    boundaries = np.flatnonzero(np.diff(slices)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [num_ops]))
+
+    for start, end in zip(starts, ends):
+        a, b = q0[start:end], q1[start:end]
+        chain_a, chain_b = chain[a], chain[b]
+        predecessor[start:end] = np.where(chain_a >= chain_b, last_op[a], last_op[b])
+        depth[start:end] = np.maximum(chain_a, chain_b) + is_inter[start:end]
+
+        op_ids = np.arange(start, end)
+        chain[a] = depth[start:end]
+        chain[b] = depth[start:end]
+        last_op[a] = op_ids
+        last_op[b] = op_ids
+
+    path = []
+    op_idx = int(np.argmax(depth))
+    length = int(depth[op_idx])
+    if length == 0:
+        return 0, path
+
+    while op_idx != -1:
+        if is_inter[op_idx]:
+            path.append([int(slices[op_idx]), int(q0[op_idx]), int(q1[op_idx])])
+        op_idx = int(predecessor[op_idx])
+    path.reverse()
+
+    return length, path
+
+
+def analyze_inter_core_traffic(operations_per_slice, modular_info: ModularInfo, num_qubits: int) -> InterCoreAnalysis:
+    """
+    Classify two-qubit operations of a sliced circuit as intra- or inter-core.
+
+    Args:
+        operations_per_slice: Operations per slice, as returned by extract_operations_per_slice
+        modular_info: Description of the modular architecture
+        num_qubits: Number of qubits addressed by the operations
+
+    Returns:
+        InterCoreAnalysis: Per-slice and cumulative inter-core traffic, per-link
+        usage and the critical inter-core path
+    """
+    num_slices = len(operations_per_slice)
+    num_cores = modular_info.num_cores
+    core_of_qubit = build_core_assignment(modular_info, num_qubits)
+    slices, q0, q1, is_swap = _flatten_two_qubit_ops(operations_per_slice)
+
+    core_a, core_b = core_of_qubit[q0], core_of_qubit[q1]
+    in_cores = (core_a >= 0) & (core_b >= 0)
+    is_inter = in_cores & (core_a != core_b)
+    is_intra = in_cores & (core_a == core_b)
+
+    inter_ops_per_slice = np.bincount(slices[is_inter], minlength=num_slices)
+    inter_swaps_per_slice = np.bincount(slices[is_inter & is_swap], minlength=num_slices)
+
+    core_traffic = np.zeros((num_cores, num_cores), dtype=np.int64)
+    np.add.at(core_traffic, (core_a[in_cores], core_b[in_cores]), 1)
+    core_traffic = core_traffic + core_traffic.T - np.diag(np.diag(core_traffic))
+
+    links = np.asarray(modular_info.inter_core_links, dtype=np.int64).reshape(-1, 2)
+    link_usage = _count_edge_usage(links, q0[is_inter], q1[is_inter], num_qubits)
+
+    link_utilization = link_usage / num_slices if num_slices else np.zeros(len(links))
+
+    critical_path_length, critical_path = _critical_inter_core_path(
+        slices, q0, q1, is_inter.astype(np.int64), num_qubits
+    ) if len(slices) else (0, [])
+
+    return InterCoreAnalysis(
+        intra_core_ops=int(is_intra.sum()),
+        inter_core_ops=int(is_inter.sum()),
+        inter_core_swaps=int((is_inter & is_swap).sum()),
+        inter_core_ops_per_slice=inter_ops_per_slice.tolist(),
+        inter_core_swaps_per_slice=inter_swaps_per_slice.tolist(),
+        cumulative_inter_core_ops=np.cumsum(inter_ops_per_slice).tolist(),
+        link_usage=link_usage.tolist(),
+        link_utilization=link_utilization.tolist(),
+        core_traffic_matrix=core_traffic.tolist(),
+        critical_path_length=critical_path_length,
+        critical_path=critical_path,
+    )
+
+
+def _flatten_qubit_operations(operations_per_slice):
+    """Flattens operations into one (slice, qubit, arity, is_swap) entry per qubit operand."""
+    slice_indices, qubit_indices, arities, is_swap = [], [], [], []
+    for slice_idx, slice_ops in enumerate(operations_per_slice):
+        for op in slice_ops:
+            name = op["name"].lower()
+            if name == "barrier":
+                continue
+            qubits = op["qubits"]
+            arity = len(qubits)
+            slice_indices.extend([slice_idx] * arity)
+            qubit_indices.extend(qubits)
+            arities.extend([arity] * arity)
+            is_swap.extend([name == "swap"] * arity)
+
+    return (
+        np.asarray(slice_indices, dtype=np.int64),
+        np.asarray(qubit_indices, dtype=np.int64),
+        np.asarray(arities, dtype=np.int64),
+        np.asarray(is_swap, dtype=bool),
+    )
+
+
+def compute_qubit_statistics(operations_per_slice, num_qubits: int, coupling_map=None) -> QubitStatistics:
+    """
+    Computes per-qubit and per-edge aggregate statistics in one vectorized pass.
+
+    Args:
+        operations_per_slice: Operations per slice, as returned by extract_operations_per_slice
+        num_qubits: Number of qubits addressed by the operations
+        coupling_map: Optional list of device edges to report usage for
+
+    Returns:
+        QubitStatistics: Gate counts by arity, activity span and SWAP
+        participation per qubit, plus two-qubit gate counts per coupling edge
+        (aligned with the order of ``coupling_map``)
+    """
+    num_slices = len(operations_per_slice)
+    slices, qubits, arities, is_swap = _flatten_qubit_operations(operations_per_slice)
+
+    one_qubit_gates = np.bincount(qubits[arities == 1], minlength=num_qubits)
+    two_qubit_gates = np.bincount(qubits[arities == 2], minlength=num_qubits)
+    multi_qubit_gates = np.bincount(qubits[arities > 2], minlength=num_qubits)
+    swap_participation = np.bincount(qubits[is_swap], minlength=num_qubits)
+
+    active_keys = np.unique(slices * num_qubits + qubits)
+    active_slices = np.bincount(active_keys % max(1, num_qubits), minlength=num_qubits)
+
+    first_active = np.full(num_qubits, num_slices, dtype=np.int64)
+    last_active = np.full(num_qubits, -1, dtype=np.int64)
+    np.minimum.at(first_active, qubits, slices)
+    np.maximum.at(last_active, qubits, slices)
+    first_active[last_active < 0] = -1
+
+    edges = np.asarray(coupling_map if coupling_map is not None else [], dtype=np.int64).reshape(-1, 2)
+    pair_rows = np.flatnonzero(arities == 2)[::2]
+    edge_usage = _count_edge_usage(edges, qubits[pair_rows], qubits[pair_rows + 1], num_qubits)
+
+    return QubitStatistics(
+        one_qubit_gates=one_qubit_gates.tolist(),
+        two_qubit_gates=two_qubit_gates.tolist(),
+        multi_qubit_gates=multi_qubit_gates.tolist(),
+        swap_participation=swap_participation.tolist(),
+        active_slices=active_slices.tolist(),
+        idle_slices=(num_slices - active_slices).tolist(),
+        first_active_slice=first_active.tolist(),
+        last_active_slice=last_active.tolist(),
+        edge_usage=edge_usage.tolist(),
+    )
@@ -6,16 +6,20 @@ This module defines configuration dataclasses to standardize inputs across the a
 from dataclasses import dataclass, field
 from typing import Any
 from .enums import AlgorithmType, TopologyType
+from .compiler.scheduling import GateDurations
 
 @dataclass
 class CircuitGenerationConfig:
     """Configuration for generating and compiling quantum circuits."""
-    algorithm: AlgorithmType
+    algorithm: AlgorithmType | None  # None when the circuit is supplied by the user
     num_qubits: int
     physical_qubits: int
     topology: TopologyType
     optimization_level: int = 1
     algorithm_params: dict[str, Any] = field(default_factory=dict)
+    topology_params: dict[str, Any] = field(default_factory=dict)
+    gate_durations: GateDurations | None = None  # When set, an ASAP/ALAP schedule is computed
+    timeline_pyramid: bool = False  # Ship a multi-resolution timeline pyramid of per-slice aggregates
 
     def __post_init__(self):
         """Validate configuration."""
@@ -33,4 +37,7 @@ class VisualizationConfig:
     algorithm_name: str | None = "Circuit"
     topology_type: str = TopologyType.CUSTOM.value
     transpile_params: dict[str, Any] = field(default_factory=dict)
+    gate_durations: GateDurations | None = None  # When set, an ASAP/ALAP schedule is computed
+    precompute_layout: bool = True  # Ship a force-directed device layout with compiled circuits
+    timeline_pyramid: bool = False  # Ship a multi-resolution timeline pyramid of per-slice aggregates
 
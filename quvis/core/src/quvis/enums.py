@@ -20,4 +20,26 @@ class TopologyType(str, Enum):
     HEAVY_SQUARE = "heavy_square"
     HEXAGONAL = "hexagonal"
     FULL = "full"
+    MODULAR = "modular"
     CUSTOM = "custom"
+
+class LinkPolicy(str, Enum):
+    """Strategies for choosing the qubits that host inter-core links."""
+    BOUNDARY = "boundary"
+    DISTRIBUTED = "distributed"
+
+class CircuitFormat(str, Enum):
+    """Serialization formats accepted for user circuit uploads."""
+    QASM2 = "qasm2"
+    QASM3 = "qasm3"
+    QPY = "qpy"
+
+class DetailLevel(str, Enum):
+    """How much visualization data to generate."""
+    FULL = "full"  # Per-slice operations for rendering
+    SUMMARY = "summary"  # Circuit statistics and routing metrics only
+
+class BestOfMetric(str, Enum):
+    """Metric that picks the best of several compilations of a circuit."""
+    SWAPS = "swaps"  # Fewest SWAPs, then lowest depth
+    DEPTH = "depth"  # Lowest depth, then fewest SWAPs
@@ -4,14 +4,24 @@ Factories for creating quantum circuits and coupling maps.
 This module implements the Factory pattern to decouple object creation logic 
 from the main application flow.
 """
+import copy
 import math
+import threading
+from collections import OrderedDict
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any
+from functools import lru_cache
+import numpy as np
 from qiskit import QuantumCircuit
 from qiskit.circuit.library import QFT
 from qiskit.transpiler import CouplingMap
 
-from .enums import AlgorithmType, TopologyType
+from .enums import AlgorithmType, TopologyType, LinkPolicy
 from .config import CircuitGenerationConfig
+from .compiler.utils import ModularInfo
+from .compiler.layout import compute_device_layout, _undirected_edges
 
 class CircuitFactory:
     """Factory for creating quantum circuits based on AlgorithmType."""
@@ -26,6 +36,8 @@ class CircuitFactory:
     @classmethod
     def create(cls, config: CircuitGenerationConfig) -> QuantumCircuit:
         """Create a quantum circuit from configuration."""
+        if config.algorithm is None:
+            raise ValueError("An algorithm is required to create a circuit")
         creator = cls._creators.get(config.algorithm)
         if not creator:
              raise ValueError(f"Unsupported algorithm: {config.algorithm}")
@@ -62,6 +74,30 @@ CircuitFactory.register(AlgorithmType.GHZ, _create_ghz)
 CircuitFactory.register(AlgorithmType.QAOA, _create_qaoa)
 
 
+@dataclass(frozen=True)
+class ModularTopology:
+    """Coupling map and core layout of a modular device."""
+    coupling_map: CouplingMap
+    edges: np.ndarray
+    modular_info: ModularInfo
+    core_assignment: np.ndarray
+
+    def to_coupling_map_dict(self) -> dict:
+        """Convert to the coupling map dictionary accepted by Visualizer.add_circuit."""
+        return {
+            "coupling_map": self.edges.tolist(),
+            "num_qubits": len(self.core_assignment),
+            "num_cores": self.modular_info.num_cores,
+            "qubits_per_core": self.modular_info.qubits_per_core,
+            "global_topology": self.modular_info.global_topology,
+            "inter_core_links": self.modular_info.inter_core_links,
+            "topology_type": TopologyType.MODULAR.value,
+        }
+
+
+MODULAR_TOPOLOGY_PARAMS = ("num_cores", "intra_core_topology", "global_topology", "link_policy")
+
+
 class TopologyFactory:
     """Factory for creating coupling maps based on TopologyType."""
 
@@ -71,14 +107,176 @@ class TopologyFactory:
     def register(cls, topology_type: TopologyType, creator: Callable[[int], CouplingMap]):
         """Register a new topology creator."""
         cls._creators[topology_type] = creator
+        cls.clear_cache()
 
     @classmethod
     def create(cls, topology: TopologyType, physical_qubits: int) -> CouplingMap:
-        """Create a coupling map."""
-        creator = cls._creators.get(topology)
-        if not creator:
+        """
+        Create a coupling map.
+
+        Coupling maps are memoized per (topology, physical_qubits); each call
+        returns a copy, so callers may modify it.
+        """
+        if topology not in cls._creators:
             raise ValueError(f"Unsupported topology: {topology}")
-        return creator(physical_qubits)
+        return copy.deepcopy(_create_cached(topology, physical_qubits))
+
+    @classmethod
+    def create_modular(
+        cls,
+        physical_qubits: int,
+        num_cores: int = 4,
+        intra_core_topology: TopologyType = TopologyType.GRID,
+        global_topology: TopologyType = TopologyType.RING,
+        link_policy: LinkPolicy = LinkPolicy.BOUNDARY,
+    ) -> ModularTopology:
+        """
+        Create a modular device made of identical cores.
+
+        Args:
+            physical_qubits: Minimum total number of physical qubits
+            num_cores: Number of cores
+            intra_core_topology: Connectivity inside each core
+            global_topology: Connectivity between cores
+            link_policy: Which qubits of each core host the inter-core links
+
+        Returns:
+            ModularTopology: Memoized per parameter combination; the coupling
+            map and modular info are copies, the arrays are read-only
+
+        Raises:
+            ValueError: If a parameter is invalid
+        """
+        if not isinstance(num_cores, int) or isinstance(num_cores, bool):
+            raise ValueError(f"num_cores must be an integer, got {num_cores!r}")
+        cached = _create_modular_cached(
+            physical_qubits,
+            num_cores,
+            TopologyType(intra_core_topology),
+            TopologyType(global_topology),
+            LinkPolicy(link_policy),
+        )
+        return replace(
+            cached,
+            coupling_map=copy.deepcopy(cached.coupling_map),
+            modular_info=copy.deepcopy(cached.modular_info),
+        )
+
+    @classmethod
+    def create_modular_from_params(cls, physical_qubits: int, topology_params: dict[str, Any]) -> ModularTopology:
+        """
+        Create a modular device from user supplied topology parameters.
+
+        Raises:
+            ValueError: If a parameter is unknown or invalid
+        """
+        unknown = sorted(set(topology_params) - set(MODULAR_TOPOLOGY_PARAMS))
+        if unknown:
+            raise ValueError(
+                f"Unknown modular topology parameters: {', '.join(unknown)}; "
+                f"expected any of {', '.join(MODULAR_TOPOLOGY_PARAMS)}"
+            )
+        return cls.create_modular(physical_qubits, **topology_params)
+
+    @classmethod
+    def create_layout(cls, topology: TopologyType, physical_qubits: int, **topology_params) -> np.ndarray:
+        """
+        Create the precomputed force-directed layout of a device.
+
+        Args:
+            topology: Device topology
+            physical_qubits: Minimum number of physical qubits
+            **topology_params: Extra parameters for create_modular
+
+        Returns:
+            np.ndarray: Read-only (num_qubits, 3) normalized positions, memoized per coupling map
+
+        Raises:
+            ValueError: If a topology parameter is unknown or invalid
+        """
+        if topology == TopologyType.MODULAR:
+            coupling_map = cls.create_modular_from_params(physical_qubits, topology_params).coupling_map
+        else:
+            coupling_map = cls.create(topology, physical_qubits)
+        return cls.layout_for_coupling_map(coupling_map.size(), coupling_map.get_edges())
+
+    @classmethod
+    def layout_for_coupling_map(cls, num_qubits: int, coupling_map) -> np.ndarray:
+        """Layout of an arbitrary edge list, memoized per (num_qubits, undirected edges)."""
+        key = _layout_key(num_qubits, coupling_map)
+        positions = _memoized_layout(key)
+        return positions if positions is not None else _compute_layout(key)
+
+    @classmethod
+    def layout_for_coupling_map_nowait(cls, num_qubits: int, coupling_map) -> np.ndarray | None:
+        """
+        Layout of an arbitrary edge list, if it can be had without waiting.
+
+        Layouts of devices above SYNC_LAYOUT_MAX_QUBITS that are not memoized
+        yet are computed in a background thread instead, for later calls;
+        until then this returns None and clients lay the device out themselves.
+        """
+        key = _layout_key(num_qubits, coupling_map)
+        positions = _memoized_layout(key)
+        if positions is not None or num_qubits <= SYNC_LAYOUT_MAX_QUBITS:
+            return positions if positions is not None else _compute_layout(key)
+        global _layout_executor
+        with _layout_lock:
+            if key not in _pending_layouts:
+                if _layout_executor is None:
+                    _layout_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quvis-layout")
+                _pending_layouts[key] = _layout_executor.submit(_compute_layout, key)
+        return None
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all memoized topologies and layouts."""
+        _create_cached.cache_clear()
+        _create_modular_cached.cache_clear()
+        with _layout_lock:
+            _layouts.clear()
+
+
+@lru_cache(maxsize=64)
+def _create_cached(topology: TopologyType, physical_qubits: int) -> CouplingMap:
+    return TopologyFactory._creators[topology](physical_qubits)
+
+# Exact layouts of devices up to this size take at most a few hundred
+# milliseconds; larger ones take seconds and are computed off the request path
+SYNC_LAYOUT_MAX_QUBITS = 256
+_LAYOUT_MEMO_SIZE = 64
+
+_LayoutKey = tuple[int, tuple[tuple[int, int], ...]]
+_layouts: OrderedDict[_LayoutKey, np.ndarray] = OrderedDict()
+_pending_layouts: dict[_LayoutKey, Future] = {}
+_layout_lock = threading.Lock()
+_layout_executor: ThreadPoolExecutor | None = None
+
+def _layout_key(num_qubits: int, coupling_map) -> _LayoutKey:
+    edges = _undirected_edges(coupling_map, num_qubits)
+    return num_qubits, tuple(map(tuple, edges.tolist()))
+
+def _memoized_layout(key: _LayoutKey) -> np.ndarray | None:
+    with _layout_lock:
+        positions = _layouts.get(key)
+        if positions is not None:
+            _layouts.move_to_end(key)
+        return positions
+
+def _compute_layout(key: _LayoutKey) -> np.ndarray:
+    num_qubits, edges = key
+    try:
+        positions = compute_device_layout(num_qubits, list(edges))
+        positions.flags.writeable = False
+        with _layout_lock:
+            _layouts[key] = positions
+            _layouts.move_to_end(key)
+            while len(_layouts) > _LAYOUT_MEMO_SIZE:
+                _layouts.popitem(last=False)
+        return positions
+    finally:
+        with _layout_lock:
+            _pending_layouts.pop(key, None)
 
 def _create_grid(physical_qubits: int) -> CouplingMap:
     n = int(physical_qubits**0.5)
@@ -103,6 +301,100 @@ def _create_hexagonal(physical_qubits: int) -> CouplingMap:
     cols = max(2, physical_qubits // rows)
     return CouplingMap.from_hexagonal_lattice(rows, cols)
 
+def _local_edges(topology: TopologyType, num_nodes: int) -> np.ndarray:
+    """Undirected (i < j) edge array for a simple topology on num_nodes nodes."""
+    nodes = np.arange(num_nodes)
+    if num_nodes < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    if topology in (TopologyType.LINE, TopologyType.RING):
+        edges = np.stack((nodes[:-1], nodes[1:]), axis=1)
+        if topology == TopologyType.RING and num_nodes > 2:
+            edges = np.vstack((edges, [[0, num_nodes - 1]]))
+    elif topology == TopologyType.GRID:
+        rows = int(math.sqrt(num_nodes))
+        cols = math.ceil(num_nodes / rows)
+        right = nodes[(nodes % cols + 1 < cols) & (nodes + 1 < num_nodes)]
+        down = nodes[nodes + cols < num_nodes]
+        edges = np.vstack((
+            np.stack((right, right + 1), axis=1),
+            np.stack((down, down + cols), axis=1),
+        ))
+    elif topology == TopologyType.FULL:
+        edges = np.stack(np.triu_indices(num_nodes, k=1), axis=1)
+    else:
+        raise ValueError(f"Unsupported modular sub-topology: {topology}")
+
+    return edges.astype(np.int64)
+
+
+def _link_local_qubits(core_pairs: np.ndarray, num_cores: int, qubits_per_core: int, link_policy: LinkPolicy) -> np.ndarray:
+    """Local qubit index hosting each endpoint of each core pair."""
+    if link_policy == LinkPolicy.BOUNDARY:
+        # Last qubit of the lower core links to the first qubit of the higher core
+        local = np.zeros_like(core_pairs)
+        local[:, 0] = qubits_per_core - 1
+        return local
+
+    # Spread the links of every core evenly over its qubits
+    endpoint_cores = core_pairs.ravel()
+    order = np.argsort(endpoint_cores, kind="stable")
+    degree = np.bincount(endpoint_cores, minlength=num_cores)
+    first_slot = np.cumsum(degree) - degree
+    rank = np.empty_like(endpoint_cores)
+    rank[order] = np.arange(len(endpoint_cores)) - first_slot[endpoint_cores[order]]
+    local = (rank * qubits_per_core) // degree[endpoint_cores]
+    return local.reshape(core_pairs.shape)
+
+
+@lru_cache(maxsize=32)
+def _create_modular_cached(
+    physical_qubits: int,
+    num_cores: int,
+    intra_core_topology: TopologyType,
+    global_topology: TopologyType,
+    link_policy: LinkPolicy,
+) -> ModularTopology:
+    if num_cores < 1:
+        raise ValueError(f"num_cores must be positive, got {num_cores}")
+    qubits_per_core = math.ceil(physical_qubits / num_cores)
+    num_qubits = num_cores * qubits_per_core
+    offsets = np.arange(num_cores) * qubits_per_core
+
+    local_edges = _local_edges(intra_core_topology, qubits_per_core)
+    intra_edges = (local_edges[None, :, :] + offsets[:, None, None]).reshape(-1, 2)
+
+    core_pairs = np.sort(_local_edges(global_topology, num_cores), axis=1)
+    link_qubits = _link_local_qubits(core_pairs, num_cores, qubits_per_core, link_policy)
+    inter_core_links = link_qubits + offsets[core_pairs]
+
+    undirected = np.vstack((intra_edges, inter_core_links))
+    edges = np.vstack((undirected, undirected[:, ::-1]))
+    core_assignment = np.repeat(np.arange(num_cores), qubits_per_core)
+    edges.flags.writeable = False
+    core_assignment.flags.writeable = False
+
+    modular_info = ModularInfo(
+        num_cores=num_cores,
+        qubits_per_core=qubits_per_core,
+        global_topology=global_topology.value,
+        inter_core_links=inter_core_links.tolist(),
+    )
+
+    coupling_map = CouplingMap(edges.tolist())
+    for qubit in range(coupling_map.size(), num_qubits):
+        coupling_map.add_physical_qubit(qubit)
+
+    return ModularTopology(
+        coupling_map=coupling_map,
+        edges=edges,
+        modular_info=modular_info,
+        core_assignment=core_assignment,
+    )
+
+def _create_modular(physical_qubits: int) -> CouplingMap:
+    return TopologyFactory.create_modular(physical_qubits).coupling_map
+
 # Register default topologies
 TopologyFactory.register(TopologyType.LINE, CouplingMap.from_line)
 TopologyFactory.register(TopologyType.RING, CouplingMap.from_ring)
@@ -111,3 +403,4 @@ TopologyFactory.register(TopologyType.HEAVY_HEX, _create_heavy_hex)
 TopologyFactory.register(TopologyType.HEAVY_SQUARE, _create_heavy_square)
 TopologyFactory.register(TopologyType.HEXAGONAL, _create_hexagonal)
 TopologyFactory.register(TopologyType.FULL, CouplingMap.from_full)
+TopologyFactory.register(TopologyType.MODULAR, _create_modular)
@@ -0,0 +1,382 @@
+"""
+Parallel, resumable parameter sweeps.
+
+Runs PlaygroundAPI.generate_visualization_data over a grid of
+CircuitGenerationConfigs in a process pool and appends one JSON line per
+finished configuration to a results file. The file doubles as the
+checkpoint: rerunning a sweep against the same file skips every
+configuration that already completed, so an interrupted sweep resumes where
+it stopped.
+
+## Usage
+
+```bash
+python -m quvis.sweep --algorithms qft --sizes 24 48 72 96 \\
+    --topologies grid heavy_hex line --optimization-levels 0 \\
+    --results qft_sweep.jsonl
+```
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+from .api.playground import PlaygroundAPI
+from .config import CircuitGenerationConfig
+from .enums import AlgorithmType, DetailLevel, TopologyType
+
+# Create module logger
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SweepSummary:
+    """Outcome of one run_sweep call."""
+    total: int
+    skipped: int
+    completed: int
+    failed: int
+    results_path: Path
+    errors: list[str] = field(default_factory=list)
+
+
+def sweep_grid(
+    algorithms: Iterable[AlgorithmType | str],
+    num_qubits: Iterable[int],
+    topologies: Iterable[TopologyType | str],
+    optimization_levels: Iterable[int] = (1,),
+    physical_qubits: int | None = None,
+    algorithm_params: dict[str, Any] | None = None,
+    topology_params: dict[str, Any] | None = None,
+) -> list[CircuitGenerationConfig]:
+    """
+    Build the cartesian product of the given parameters.
+
+    Args:
+        algorithms: Algorithms to sweep
+        num_qubits: Logical qubit counts to sweep
+        topologies: Device topologies to sweep
+        optimization_levels: Transpiler optimization levels to sweep
+        physical_qubits: Device size; defaults to each logical qubit count
+        algorithm_params: Passed to every configuration
+        topology_params: Passed to every configuration
+
+    Returns:
+        One configuration per grid point
+    """
+    return [
+        CircuitGenerationConfig(
+            algorithm=AlgorithmType(algorithm),
+            num_qubits=n,
+            physical_qubits=physical_qubits or n,
+            topology=TopologyType(topology),
+            optimization_level=level,
+            algorithm_params=dict(algorithm_params or {}),
+            topology_params=dict(topology_params or {}),
+        )
+        for algorithm, n, topology, level in itertools.product(
+            algorithms, num_qubits, topologies, optimization_levels
+        )
+    ]
+
+
+def config_to_dict(config: CircuitGenerationConfig) -> dict[str, Any]:
+    """JSON-compatible form of a configuration."""
+    data = asdict(config)
+    data["algorithm"] = config.algorithm.value if config.algorithm is not None else None
+    data["topology"] = config.topology.value
+    if config.gate_durations is not None:
+        # Override tables are keyed by tuples
+        data["gate_durations"] = {
+            key: (
+                {"|".join(map(str, k)): v for k, v in value.items()}
+                if key.endswith("_overrides") else value
+            )
+            for key, value in data["gate_durations"].items()
+        }
+    return data
+
+
+def config_key(config: CircuitGenerationConfig, detail: DetailLevel = DetailLevel.SUMMARY) -> str:
+    """Stable identifier of a configuration, used to skip completed points."""
+    canonical = json.dumps(config_to_dict(config), sort_keys=True, separators=(",", ":"))
+    key = hashlib.sha256(canonical.encode()).hexdigest()[:16]
+    # Summary keys predate the detail level
+    return key if detail == DetailLevel.SUMMARY else f"{key}-{detail.value}"
+
+
+def load_completed(results_path: Path) -> set[str]:
+    """
+    Keys of the successful results already in a results file.
+
+    Lines that are not valid JSON, such as one cut off by an interruption,
+    are ignored.
+    """
+    completed: set[str] = set()
+    if not results_path.exists():
+        return completed
+    with open(results_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok":
+                completed.add(record["key"])
+    return completed
+
+
+def _peak_rss_mb() -> float | None:
+    """Peak resident set size of this process."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _summarize(payload: dict[str, Any]) -> dict[str, Any]:
+    """The metrics of a playground payload (full or summary) that a sweep keeps."""
+    logical, compiled = payload["circuits"]
+    routing = compiled["routing_analysis"]
+    return {
+        "logical_depth": logical["circuit_stats"]["depth"],
+        "compiled_depth": compiled["circuit_stats"]["depth"],
+        "original_gates": compiled["circuit_stats"]["original_gates"],
+        "transpiled_gates": compiled["circuit_stats"]["transpiled_gates"],
+        "swap_count": compiled["circuit_stats"]["swap_count"],
+        "device_qubits": compiled["device_info"]["num_qubits_on_device"],
+        "routing_depth": routing["routing_depth"],
+        "routing_overhead_percentage": routing["routing_overhead_percentage"],
+    }
+
+
+def run_point(
+    config: CircuitGenerationConfig, detail: DetailLevel = DetailLevel.SUMMARY
+) -> dict[str, Any]:
+    """
+    Generate one configuration and return its result record.
+
+    Errors are recorded rather than raised, so one failing point does not
+    stop the sweep.
+    """
+    record: dict[str, Any] = {
+        "key": config_key(config, detail),
+        "config": config_to_dict(config),
+        "detail": detail.value,
+        "pid": os.getpid(),
+        # With a fresh worker per point, the memory taken before generating
+        "start_rss_mb": _peak_rss_mb(),
+    }
+    start = time.perf_counter()
+    try:
+        payload = PlaygroundAPI().generate_visualization_data(config, detail=detail)
+        record["status"] = "ok"
+        record["metrics"] = _summarize(payload)
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+        record["traceback"] = traceback.format_exc()
+    record["wall_time_s"] = time.perf_counter() - start
+    record["peak_rss_mb"] = _peak_rss_mb()
+    record["completed_at"] = datetime.now(timezone.utc).isoformat()
+    return record
+
+
+def _terminate_last_line(results_path: Path) -> None:
+    """End a line cut off by an interruption, so appends start on a new line."""
+    if not results_path.exists() or results_path.stat().st_size == 0:
+        return
+    with open(results_path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def _append(results_path: Path, record: dict[str, Any]) -> None:
+    """Append a record as one line and make sure it reaches the disk."""
+    with open(results_path, "a") as f:
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def run_sweep(
+    configs: Iterable[CircuitGenerationConfig],
+    results_path: str | Path,
+    workers: int | None = None,
+    fresh_worker_per_point: bool = True,
+    detail: DetailLevel | str = DetailLevel.SUMMARY,
+) -> SweepSummary:
+    """
+    Run every configuration not yet completed in results_path.
+
+    Args:
+        configs: Configurations to run; duplicates are run once
+        results_path: Append-only JSON lines file of results
+        workers: Worker processes (default: CPU count); 1 runs the sweep in
+            this process
+        fresh_worker_per_point: Start a new worker process per
+            configuration, so that peak_rss_mb belongs to that
+            configuration alone
+        detail: Detail level to generate; "full" measures the cost of
+            renderable playground data
+
+    Returns:
+        Counts of skipped, completed and failed configurations
+    """
+    detail = DetailLevel(detail)
+    results_path = Path(results_path)
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    completed = load_completed(results_path)
+
+    _terminate_last_line(results_path)
+
+    seen: set[str] = set()
+    pending: dict[str, CircuitGenerationConfig] = {}
+    for config in configs:
+        key = config_key(config, detail)
+        if key in seen:
+            continue
+        seen.add(key)
+        if key not in completed:
+            pending[key] = config
+    total = len(seen)
+    summary = SweepSummary(
+        total=total,
+        skipped=total - len(pending),
+        completed=0,
+        failed=0,
+        results_path=results_path,
+    )
+    logger.info(
+        f"Sweep: {total} configurations, {summary.skipped} already done, "
+        f"{len(pending)} to run"
+    )
+
+    def record_result(record: dict[str, Any]) -> None:
+        _append(results_path, record)
+        label = _label(record["config"])
+        if record["status"] == "ok":
+            summary.completed += 1
+            logger.info(f"   ✓ {label} ({record['wall_time_s']:.1f}s)")
+        else:
+            summary.failed += 1
+            summary.errors.append(f"{label}: {record['error']}")
+            logger.warning(f"   ✗ {label}: {record['error']}")
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for config in pending.values():
+            record_result(run_point(config, detail))
+        return summary
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, max(1, len(pending))),
+        max_tasks_per_child=1 if fresh_worker_per_point else None,
+    ) as executor:
+        futures = {executor.submit(run_point, config, detail) for config in pending.values()}
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                record_result(future.result())
+    return summary
+
+
+def _label(config: dict[str, Any]) -> str:
+    return (
+        f"{config['algorithm']} n={config['num_qubits']} {config['topology']} "
+        f"opt={config['optimization_level']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a resumable sweep of circuit generation configurations."
+    )
+    parser.add_argument(
+        "--algorithms", nargs="+", required=True,
+        choices=[a.value for a in AlgorithmType], help="Algorithms to sweep.",
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, required=True, help="Logical qubit counts to sweep."
+    )
+    parser.add_argument(
+        "--topologies", nargs="+", required=True,
+        choices=[t.value for t in TopologyType if t != TopologyType.CUSTOM],
+        help="Device topologies to sweep.",
+    )
+    parser.add_argument(
+        "--optimization-levels", nargs="+", type=int, default=[1],
+        help="Transpiler optimization levels to sweep.",
+    )
+    parser.add_argument(
+        "--physical-qubits", type=int, help="Device size (default: the logical qubit count)."
+    )
+    parser.add_argument(
+        "--results", type=Path, required=True,
+        help="Append-only JSON lines results file; completed points in it are skipped.",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes (default: CPU count)."
+    )
+    parser.add_argument(
+        "--detail", choices=[d.value for d in DetailLevel], default=DetailLevel.SUMMARY.value,
+        help="Generate summary metrics only (default), or full playground data to measure its cost.",
+    )
+    parser.add_argument(
+        "--reuse-workers", action="store_true",
+        help="Keep worker processes across points; faster, but peak_rss_mb becomes a per-worker high-water mark.",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Enable verbose logging."
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(message)s',
+        stream=sys.stderr,
+    )
+    # Per-point progress is useful even without --verbose
+    logger.setLevel(logging.INFO)
+
+    configs = sweep_grid(
+        args.algorithms,
+        args.sizes,
+        args.topologies,
+        args.optimization_levels,
+        physical_qubits=args.physical_qubits,
+    )
+    summary = run_sweep(
+        configs,
+        args.results,
+        workers=args.workers,
+        fresh_worker_per_point=not args.reuse_workers,
+        detail=args.detail,
+    )
+    print(
+        f"{summary.completed} completed, {summary.failed} failed, "
+        f"{summary.skipped} skipped; results in {summary.results_path}"
+    )
+    sys.exit(1 if summary.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+/**
+ * Browser-side cache of /api/generate-circuit results in IndexedDB.
+ *
+ * Entries are keyed by the normalized request body plus the backend version
+ * reported by /api/health, so a backend upgrade never serves stale
+ * circuits. Results are stored as parsed objects (structured clone), which
+ * skips JSON parsing on a hit. The cache is bounded by an approximate byte
+ * size and entry count and evicts least recently used entries first. When
+ * IndexedDB is unavailable every lookup misses and writes are dropped.
+ */
+
+interface CacheEntry {
+    key: string;
+    result: unknown;
+    sizeBytes: number;
+    lastAccess: number;
+}
+
+export interface CircuitCacheOptions {
+    dbName?: string;
+    maxBytes?: number;
+    maxEntries?: number;
+}
+
+export class CircuitCache {
+    static readonly DEFAULT_MAX_BYTES = 200 * 1024 * 1024;
+    static readonly DEFAULT_MAX_ENTRIES = 50;
+    private static readonly DB_VERSION = 1;
+    private static readonly ENTRY_STORE = 'circuits';
+    private static readonly META_STORE = 'meta';
+    private static readonly LAST_ACCESS_INDEX = 'lastAccess';
+    private static readonly BACKEND_VERSION_KEY = 'backendVersion';
+
+    private readonly dbName: string;
+    private readonly maxBytes: number;
+    private readonly maxEntries: number;
+    private dbPromise: Promise<IDBDatabase | null> | null = null;
+
+    constructor(options: CircuitCacheOptions = {}) {
+        this.dbName = options.dbName ?? 'quvis-circuit-cache';
+        this.maxBytes = options.maxBytes ?? CircuitCache.DEFAULT_MAX_BYTES;
+        this.maxEntries =
+            options.maxEntries ?? CircuitCache.DEFAULT_MAX_ENTRIES;
+    }
+
+    /**
+     * Serializes a request body with object keys sorted at every level, so
+     * equivalent configurations map to the same key
+     */
+    static normalizeRequest(body: unknown): string {
+        return JSON.stringify(body, (_key, value) => {
+            if (value && typeof value === 'object' && !Array.isArray(value)) {
+                const sorted: Record<string, unknown> = {};
+                for (const k of Object.keys(value).sort()) {
+                    sorted[k] = value[k];
+                }
+                return sorted;
+            }
+            return value;
+        });
+    }
+
+    static cacheKey(body: unknown, backendVersion: string): string {
+        return `${backendVersion}|${CircuitCache.normalizeRequest(body)}`;
+    }
+
+    /**
+     * Returns the backend version from the health endpoint and remembers it;
+     * falls back to the last remembered version when the backend cannot be
+     * reached, so cached circuits stay available offline
+     */
+    async resolveBackendVersion(
+        healthUrl: string,
+        timeoutMs = 3000
+    ): Promise<string | null> {
+        try {
+            const response = await fetch(healthUrl, {
+                method: 'GET',
+                signal: AbortSignal.timeout(timeoutMs),
+            });
+            if (response.ok) {
+                const health = await response.json();
+                if (typeof health.version === 'string') {
+                    await this.putMeta(
+                        CircuitCache.BACKEND_VERSION_KEY,
+                        health.version
+                    );
+                    return health.version;
+                }
+            }
+        } catch {
+            // Backend unreachable; use the last known version below
+        }
+        const lastKnown = await this.getMeta(CircuitCache.BACKEND_VERSION_KEY);
+        return typeof lastKnown === 'string' ? lastKnown : null;
+    }
+
+    /**
+     * Returns the cached result for the request, or null on a miss
+     */
+    async get<T>(body: unknown, backendVersion: string): Promise<T | null> {
+        const db = await this.open();
+        if (!db) return null;
+        const key = CircuitCache.cacheKey(body, backendVersion);
+
+        try {
+            const tx = db.transaction(CircuitCache.ENTRY_STORE, 'readwrite');
+            const store = tx.objectStore(CircuitCache.ENTRY_STORE);
+            const entry = (await CircuitCache.request(store.get(key))) as
+                | CacheEntry
+                | undefined;
+            if (!entry) return null;
+            entry.lastAccess = Date.now();
+            store.put(entry);
+            await CircuitCache.complete(tx);
+            return entry.result as T;
+        } catch (error) {
+            console.warn('Circuit cache read failed:', error);
+            return null;
+        }
+    }
+
+    /**
+     * Stores a result, then evicts least recently used entries until the
+     * cache fits its size and entry limits. `sizeBytes` should be the size
+     * of the serialized result (e.g. the response body length).
+     */
+    async put(
+        body: unknown,
+        backendVersion: string,
+        result: unknown,
+        sizeBytes: number
+    ): Promise<void> {
+        if (sizeBytes > this.maxBytes) return;
+        const db = await this.open();
+        if (!db) return;
+
+        const entry: CacheEntry = {
+            key: CircuitCache.cacheKey(body, backendVersion),
+            result,
+            sizeBytes,
+            lastAccess: Date.now(),
+        };
+        try {
+            const tx = db.transaction(CircuitCache.ENTRY_STORE, 'readwrite');
+            tx.objectStore(CircuitCache.ENTRY_STORE).put(entry);
+            await CircuitCache.complete(tx);
+            await this.evict();
+        } catch (error) {
+            console.warn('Circuit cache write failed:', error);
+        }
+    }
+
+    /**
+     * Removes every cached circuit
+     */
+    async clear(): Promise<void> {
+        const db = await this.open();
+        if (!db) return;
+        const tx = db.transaction(CircuitCache.ENTRY_STORE, 'readwrite');
+        tx.objectStore(CircuitCache.ENTRY_STORE).clear();
+        await CircuitCache.complete(tx);
+    }
+
+    private async evict(): Promise<void> {
+        const db = await this.open();
+        if (!db) return;
+
+        const tx = db.transaction(CircuitCache.ENTRY_STORE, 'readwrite');
+        const store = tx.objectStore(CircuitCache.ENTRY_STORE);
+        const index = store.index(CircuitCache.LAST_ACCESS_INDEX);
+
+        // Walk from most to least recently used, keeping entries while they
+        // fit and deleting the rest
+        let keptBytes = 0;
+        let keptEntries = 0;
+        await new Promise<void>((resolve, reject) => {
+            const cursorRequest = index.openCursor(null, 'prev');
+            cursorRequest.onerror = () => reject(cursorRequest.error);
+            cursorRequest.onsuccess = () => {
+                const cursor = cursorRequest.result;
+                if (!cursor) {
+                    resolve();
+                    return;
+                }
+                const entry = cursor.value as CacheEntry;
+                if (
+                    keptEntries < this.maxEntries &&
+                    keptBytes + entry.sizeBytes <= this.maxBytes
+                ) {
+                    keptEntries++;
+                    keptBytes += entry.sizeBytes;
+                } else {
+                    cursor.delete();
+                }
+                cursor.continue();
+            };
+        });
+        await CircuitCache.complete(tx);
+    }
+
+    private async getMeta(key: string): Promise<unknown> {
+        const db = await this.open();
+        if (!db) return undefined;
+        try {
+            const tx = db.transaction(CircuitCache.META_STORE, 'readonly');
+            return await CircuitCache.request(
+                tx.objectStore(CircuitCache.META_STORE).get(key)
+            );
+        } catch {
+            return undefined;
+        }
+    }
+
+    private async putMeta(key: string, value: unknown): Promise<void> {
+        const db = await this.open();
+        if (!db) return;
+        try {
+            const tx = db.transaction(CircuitCache.META_STORE, 'readwrite');
+            tx.objectStore(CircuitCache.META_STORE).put(value, key);
+            await CircuitCache.complete(tx);
+        } catch {
+            // Metadata is best effort
+        }
+    }
+
+    private open(): Promise<IDBDatabase | null> {
+        if (!this.dbPromise) {
+            this.dbPromise = new Promise((resolve) => {
+                if (typeof indexedDB === 'undefined') {
+                    resolve(null);
+                    return;
+                }
+                const openRequest = indexedDB.open(
+                    this.dbName,
+                    CircuitCache.DB_VERSION
+                );
+                openRequest.onupgradeneeded = () => {
+                    const db = openRequest.result;
+                    const entries = db.createObjectStore(
+                        CircuitCache.ENTRY_STORE,
+                        { keyPath: 'key' }
+                    );
+                    entries.createIndex(
+                        CircuitCache.LAST_ACCESS_INDEX,
+                        'lastAccess'
+                    );
+                    db.createObjectStore(CircuitCache.META_STORE);
+                };
+                openRequest.onsuccess = () => resolve(openRequest.result);
+                openRequest.onerror = () => {
+                    console.warn(
+                        'Circuit cache unavailable:',
+                        openRequest.error
+                    );
+                    resolve(null);
+                };
+                openRequest.onblocked = () => resolve(null);
+            });
+        }
+        return this.dbPromise;
+    }
+
+    private static request<T>(request: IDBRequest<T>): Promise<T> {
+        return new Promise((resolve, reject) => {
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
+    }
+
+    private static complete(tx: IDBTransaction): Promise<void> {
+        return new Promise((resolve, reject) => {
+            tx.oncomplete = () => resolve();
+            tx.onerror = () => reject(tx.error);
+            tx.onabort = () => reject(tx.error);
+        });
+    }
+}
@@ -1,3 +1,23 @@
+import { CumulativeCounts } from '../models/CumulativeCounts.js';
+import {
+    buildGateCounts,
+    buildInteractionPairs,
+    copySliceOperations,
+    createInteractionCounts,
+    edgeIndexOf,
+    edgesFromQubits,
+    encodeSliceOperations,
+    indexCouplingMapEdges,
+    InteractionAccumulator,
+    sliceCountOf,
+    sliceOperationTransferables,
+} from '../models/CircuitIngestion.js';
+import type {
+    CouplingEdges,
+    IngestedCircuitData,
+    SliceOperationColumns,
+} from '../models/CircuitIngestion.js';
+
 interface QubitOperation {
     name: string;
     qubits: number[];
@@ -5,12 +25,14 @@ interface QubitOperation {
 
 interface LogicalCircuitInfo {
     num_qubits: number;
-    interaction_graph_ops_per_slice: QubitOperation[][];
+    // Absent from circuits loaded by the ingestion worker
+    interaction_graph_ops_per_slice?: QubitOperation[][];
 }
 
 interface CompiledCircuitInfo {
     num_qubits: number;
-    compiled_interaction_graph_ops_per_slice: QubitOperation[][];
+    // Absent from circuits loaded by the ingestion worker
+    compiled_interaction_graph_ops_per_slice?: QubitOperation[][];
 }
 
 interface ModularInfo {
@@ -24,6 +46,29 @@ interface DeviceInfo {
     num_qubits_on_device: number;
     connectivity_graph_coupling_map: number[][];
     modular_info?: ModularInfo;
+    layout_positions?: number[][] | null;
+    layout_parameters?: LayoutParameters | null;
+}
+
+// Force parameters of the precomputed layout
+interface LayoutParameters {
+    k_repel: number;
+    ideal_dist: number;
+    k_attract: number;
+    iterations: number;
+    cooling_factor: number;
+}
+
+interface QubitStatistics {
+    one_qubit_gates: number[];
+    two_qubit_gates: number[];
+    multi_qubit_gates: number[];
+    swap_participation: number[];
+    active_slices: number[];
+    idle_slices: number[];
+    first_active_slice: number[];
+    last_active_slice: number[];
+    edge_usage: number[];
 }
 
 interface Circuit {
@@ -40,6 +85,8 @@ interface Circuit {
     };
     routing_info?: any;
     routing_analysis?: any;
+    inter_core_analysis?: any;
+    qubit_statistics?: QubitStatistics;
     algorithm_params?: any;
 }
 
@@ -47,24 +94,63 @@ export class CircuitDataManager {
     private circuits: Circuit[] | null = null;
     private _currentCircuitIndex: number = 0;
 
+    // Operations of each circuit as columns, encoded on first use or
+    // received from the ingestion worker, which strips them from circuits
+    private circuitOperations: Array<SliceOperationColumns | undefined> = [];
+
     // Active data based on current circuit
-    private allOperationsPerSlice: QubitOperation[][] = [];
-    private _interactionPairsPerSlice: Array<
-        Array<{ q1: number; q2: number }>
-    > = [];
+    private operations: SliceOperationColumns = encodeSliceOperations([]);
+    // Interaction pairs of slice s are the (q1, q2) entries
+    // [interactionPairOffsets[s], interactionPairOffsets[s + 1]) of
+    // interactionPairQubits, stored interleaved
+    private interactionPairOffsets: Int32Array = new Int32Array(1);
+    private interactionPairQubits: Int32Array = new Int32Array(0);
     private _qubit_count: number = 0;
     private _visualizationMode: 'compiled' | 'logical' = 'compiled';
 
     // Cumulative data for performance calculations
-    private cumulativeQubitInteractions: number[][] = [];
-    private cumulativePairInteractions: Map<string, number[]> = new Map();
+    private cumulativeQubitInteractions = new CumulativeCounts(0, 0);
+    private cumulativeEdgeInteractions = new CumulativeCounts(0, 0);
+    private edges: CouplingEdges = indexCouplingMapEdges([], 0);
     private slicesProcessedForHeatmap = 0;
     public isFullyLoaded = false;
 
+    // Per-qubit cumulative counts of one- and two-qubit gates; a qubit has
+    // at most one gate per slice
+    private oneQubitGateCounts: CumulativeCounts | null = null;
+    private twoQubitGateCounts: CumulativeCounts | null = null;
+
     private readonly heatmapWeightBase = 1.3;
 
-    constructor() {
+    // Memory budget for each set of cumulative counts; deeper circuits keep
+    // sparser keyframes and rebuild the rows in between on demand
+    public static readonly DEFAULT_CUMULATIVE_MEMORY_BUDGET_BYTES =
+        64 * 1024 * 1024;
+    private readonly cumulativeMemoryBudgetBytes: number;
+
+    // Interaction pairs and cumulative counts are built by a Web Worker when
+    // one is available; otherwise on this thread, in timer-driven chunks
+    private useIngestionWorker: boolean;
+    private ingestionWorker: Worker | null = null;
+    private ingestionRequestId = 0;
+    private pendingFileLoad: {
+        resolve: (loaded: {
+            circuits: Circuit[];
+            operations: SliceOperationColumns[];
+        }) => void;
+        reject: (error: Error) => void;
+    } | null = null;
+
+    // Called when the cumulative data of the current circuit is complete
+    public onIngestionComplete: (() => void) | null = null;
+
+    constructor(
+        cumulativeMemoryBudgetBytes: number = CircuitDataManager.DEFAULT_CUMULATIVE_MEMORY_BUDGET_BYTES,
+        useIngestionWorker: boolean = typeof Worker !== 'undefined'
+    ) {
         // Default values will be set when data is loaded
+        this.cumulativeMemoryBudgetBytes = cumulativeMemoryBudgetBytes;
+        this.useIngestionWorker = useIngestionWorker;
     }
 
     get qubitCount(): number {
@@ -75,12 +161,62 @@ export class CircuitDataManager {
         return this._visualizationMode;
     }
 
-    get operationsPerSlice(): QubitOperation[][] {
-        return this.allOperationsPerSlice;
+    get operationColumns(): SliceOperationColumns {
+        return this.operations;
     }
 
-    get interactionPairsPerSlice(): Array<Array<{ q1: number; q2: number }>> {
-        return this._interactionPairsPerSlice;
+    /**
+     * Largest number of two-qubit operations in one slice
+     */
+    get maxTwoQubitOperationsPerSlice(): number {
+        const { sliceOffsets, qubitOffsets } = this.operations;
+        let max = 0;
+        for (let s = 0; s < sliceOffsets.length - 1; s++) {
+            let count = 0;
+            for (let o = sliceOffsets[s]; o < sliceOffsets[s + 1]; o++) {
+                if (qubitOffsets[o + 1] - qubitOffsets[o] === 2) count++;
+            }
+            if (count > max) max = count;
+        }
+        return max;
+    }
+
+    get interactionPairCount(): number {
+        return this.interactionPairQubits.length / 2;
+    }
+
+    getInteractionPairsForSlice(
+        sliceIndex: number
+    ): Array<{ q1: number; q2: number }> {
+        const pairs: Array<{ q1: number; q2: number }> = [];
+        if (sliceIndex < 0 || sliceIndex >= this.getSliceCount()) {
+            return pairs;
+        }
+        if (!this.hasInteractionPairs) {
+            // Still being built by the ingestion worker
+            const { sliceOffsets, qubitOffsets, qubits } = this.operations;
+            for (
+                let o = sliceOffsets[sliceIndex];
+                o < sliceOffsets[sliceIndex + 1];
+                o++
+            ) {
+                const end = qubitOffsets[o + 1];
+                for (let i = qubitOffsets[o]; i < end; i++) {
+                    for (let j = i + 1; j < end; j++) {
+                        pairs.push({ q1: qubits[i], q2: qubits[j] });
+                    }
+                }
+            }
+            return pairs;
+        }
+        const end = this.interactionPairOffsets[sliceIndex + 1];
+        for (let i = this.interactionPairOffsets[sliceIndex]; i < end; i++) {
+            pairs.push({
+                q1: this.interactionPairQubits[2 * i],
+                q2: this.interactionPairQubits[2 * i + 1],
+            });
+        }
+        return pairs;
     }
 
     get couplingMap(): number[][] {
@@ -110,6 +246,30 @@ export class CircuitDataManager {
         return undefined;
     }
 
+    get layoutPositions(): number[][] | undefined {
+        if (this.circuits) {
+            const currentCircuit = this.circuits[this._currentCircuitIndex];
+            return currentCircuit?.device_info?.layout_positions ?? undefined;
+        }
+        return undefined;
+    }
+
+    get layoutParameters(): LayoutParameters | undefined {
+        if (this.circuits) {
+            const currentCircuit = this.circuits[this._currentCircuitIndex];
+            return currentCircuit?.device_info?.layout_parameters ?? undefined;
+        }
+        return undefined;
+    }
+
+    get qubitStatistics(): QubitStatistics | undefined {
+        if (this.circuits) {
+            const currentCircuit = this.circuits[this._currentCircuitIndex];
+            return currentCircuit?.qubit_statistics;
+        }
+        return undefined;
+    }
+
     get isMultiCircuit(): boolean {
         return true; // Always multi-circuit mode now
     }
@@ -135,17 +295,51 @@ export class CircuitDataManager {
         return this.slicesProcessedForHeatmap;
     }
 
-    get cumulativeQubitInteractionData(): number[][] {
+    get cumulativeQubitInteractionData(): CumulativeCounts {
         return this.cumulativeQubitInteractions;
     }
 
-    get cumulativeWeightedPairInteractionData(): Map<string, number[]> {
-        return this.cumulativePairInteractions;
+    get cumulativeEdgeInteractionData(): CumulativeCounts {
+        return this.cumulativeEdgeInteractions;
+    }
+
+    /**
+     * Index of the coupling map edge between q1 and q2 (in either order)
+     * in the cumulative edge data, or -1 if there is none
+     */
+    getEdgeIndex(q1: number, q2: number): number {
+        return edgeIndexOf(this.edges, q1, q2);
+    }
+
+    private get hasInteractionPairs(): boolean {
+        return (
+            this.interactionPairOffsets.length === this.getSliceCount() + 1
+        );
     }
 
     async loadDataFile(filePath: string): Promise<void> {
         try {
             console.log(`Loading data file: ${filePath}`);
+            const worker = this.getIngestionWorker();
+            if (worker) {
+                // Fetch and parse off the main thread; the operations
+                // arrive as columns instead of inside the circuits
+                this.pendingFileLoad?.reject(
+                    new Error('Superseded by another data file')
+                );
+                const { circuits, operations } = await new Promise<{
+                    circuits: Circuit[];
+                    operations: SliceOperationColumns[];
+                }>((resolve, reject) => {
+                    this.pendingFileLoad = { resolve, reject };
+                    worker.postMessage({
+                        type: 'load',
+                        url: new URL(filePath, location.href).href,
+                    });
+                });
+                this.processCircuitData(circuits, operations);
+                return;
+            }
             const response = await fetch(filePath);
             if (!response.ok) {
                 throw new Error(
@@ -164,11 +358,15 @@ export class CircuitDataManager {
         this.processCircuitData(data);
     }
 
-    private processCircuitData(data: Circuit[]): void {
+    private processCircuitData(
+        data: Circuit[],
+        operations: SliceOperationColumns[] = []
+    ): void {
         this.clearData();
 
         console.log('data:', data);
         this.circuits = data;
+        this.circuitOperations = operations;
         this._currentCircuitIndex = 0;
 
         // Load the first circuit
@@ -180,184 +378,243 @@ export class CircuitDataManager {
         const circuit = this.circuits[circuitIndex];
 
         console.log('circuit:', circuit);
-        if (circuit.circuit_type === 'logical') {
-            this._qubit_count = (
-                circuit.circuit_info as LogicalCircuitInfo
-            ).num_qubits;
-            this.allOperationsPerSlice =
-                (circuit.circuit_info as LogicalCircuitInfo)
-                    .interaction_graph_ops_per_slice || [];
-        } else {
-            this._qubit_count = (
-                circuit.circuit_info as CompiledCircuitInfo
-            ).num_qubits;
-            this.allOperationsPerSlice =
-                (circuit.circuit_info as CompiledCircuitInfo)
-                    .compiled_interaction_graph_ops_per_slice || [];
-        }
+        this._qubit_count = circuit.circuit_info.num_qubits;
+        this.operations = this.operationsOfCircuit(circuitIndex);
 
         // Set visualization mode based on circuit type
         this._visualizationMode = circuit.circuit_type;
+        this.oneQubitGateCounts = null;
+        this.twoQubitGateCounts = null;
 
-        this.processInteractionPairs();
         this.initializeCumulativeData();
-        this.calculateCumulativeDataInBackground();
+        const worker = this.getIngestionWorker();
+        if (worker) {
+            // Pairs are answered from the operations until the worker's
+            // arrive
+            this.interactionPairOffsets = new Int32Array(0);
+            this.interactionPairQubits = new Int32Array(0);
+            const operations = copySliceOperations(this.operations);
+            worker.postMessage(
+                {
+                    type: 'ingest',
+                    requestId: ++this.ingestionRequestId,
+                    operations,
+                    numQubits: this._qubit_count,
+                    couplingMap: this.couplingMap,
+                    memoryBudgetBytes: this.cumulativeMemoryBudgetBytes,
+                },
+                { transfer: sliceOperationTransferables(operations) }
+            );
+        } else {
+            this.processInteractionPairs();
+            this.calculateCumulativeDataInBackground();
+        }
     }
 
-    private processInteractionPairs(): void {
-        this._interactionPairsPerSlice = [];
-        this.allOperationsPerSlice.forEach((ops_in_slice) => {
-            const pairs: Array<{ q1: number; q2: number }> = [];
-            ops_in_slice.forEach((op) => {
-                if (op.qubits.length >= 2) {
-                    for (let i = 0; i < op.qubits.length; i++) {
-                        for (let j = i + 1; j < op.qubits.length; j++) {
-                            pairs.push({ q1: op.qubits[i], q2: op.qubits[j] });
-                        }
-                    }
-                }
-            });
-            this._interactionPairsPerSlice.push(pairs);
-        });
+    /**
+     * Operations of a circuit as columns, encoded from the circuit on
+     * first use unless the ingestion worker already sent them
+     */
+    private operationsOfCircuit(circuitIndex: number): SliceOperationColumns {
+        let operations = this.circuitOperations[circuitIndex];
+        if (!operations) {
+            const circuit = this.circuits![circuitIndex];
+            const operationsPerSlice =
+                circuit.circuit_type === 'logical'
+                    ? (circuit.circuit_info as LogicalCircuitInfo)
+                          .interaction_graph_ops_per_slice
+                    : (circuit.circuit_info as CompiledCircuitInfo)
+                          .compiled_interaction_graph_ops_per_slice;
+            operations = encodeSliceOperations(operationsPerSlice || []);
+            this.circuitOperations[circuitIndex] = operations;
+        }
+        return operations;
     }
 
     /**
-     * Initializes cumulative interaction data storage
+     * The ingestion worker, created on first use; null when workers are
+     * disabled or unavailable
      */
-    private initializeCumulativeData(): void {
-        // Initialize cumulative heatmap data structures
-        // Each qubit gets an empty array to store cumulative interaction counts over time slices
-        this.cumulativeQubitInteractions = Array.from(
-            { length: this._qubit_count },
-            () => []
-        );
+    private getIngestionWorker(): Worker | null {
+        if (!this.useIngestionWorker) return null;
+        if (!this.ingestionWorker) {
+            this.ingestionWorker = new Worker(
+                new URL('../workers/ingestionWorker.ts', import.meta.url),
+                { type: 'module' }
+            );
+            this.ingestionWorker.onmessage = (event) =>
+                this.handleIngestionMessage(event.data);
+            this.ingestionWorker.onerror = (event) => {
+                console.error('Ingestion worker failed:', event.message);
+                this.disableIngestionWorker();
+            };
+        }
+        return this.ingestionWorker;
+    }
 
-        this.cumulativePairInteractions.clear();
+    /**
+     * Stops using the worker and finishes any pending work on this thread
+     */
+    private disableIngestionWorker(): void {
+        this.ingestionWorker?.terminate();
+        this.ingestionWorker = null;
+        this.useIngestionWorker = false;
+        this.pendingFileLoad?.reject(new Error('Ingestion worker failed'));
+        this.pendingFileLoad = null;
+        if (this.circuits && !this.hasInteractionPairs) {
+            this.processInteractionPairs();
+            this.calculateCumulativeDataInBackground();
+        }
+    }
 
-        const couplingMap = this.couplingMap;
-        if (couplingMap && couplingMap.length > 0) {
-            for (const pair of couplingMap) {
-                const q1 = Math.min(pair[0], pair[1]);
-                const q2 = Math.max(pair[0], pair[1]);
-                const key = `${q1}-${q2}`;
-                this.cumulativePairInteractions.set(key, []);
+    private handleIngestionMessage(message: any): void {
+        if (message.type === 'loaded') {
+            this.pendingFileLoad?.resolve(message);
+            this.pendingFileLoad = null;
+        } else if (message.type === 'ingested') {
+            if (message.requestId === this.ingestionRequestId) {
+                this.applyIngestedData(message.data);
+            }
+        } else if (message.type === 'error') {
+            console.error('Circuit ingestion failed:', message.message);
+            if (message.requestId === undefined) {
+                this.pendingFileLoad?.reject(new Error(message.message));
+                this.pendingFileLoad = null;
+            } else if (message.requestId === this.ingestionRequestId) {
+                // Fall back to building the data on this thread
+                this.processInteractionPairs();
+                this.calculateCumulativeDataInBackground();
             }
         }
+    }
+
+    private applyIngestedData(data: IngestedCircuitData): void {
+        this.interactionPairOffsets = data.interactionPairOffsets;
+        this.interactionPairQubits = data.interactionPairQubits;
+        this.edges = edgesFromQubits(data.edgeQubits, data.edgeKeyStride);
+        this.cumulativeQubitInteractions = CumulativeCounts.fromState(
+            data.qubitInteractions
+        );
+        this.cumulativeEdgeInteractions = CumulativeCounts.fromState(
+            data.edgeInteractions
+        );
+        this.oneQubitGateCounts = CumulativeCounts.fromState(
+            data.oneQubitGateCounts
+        );
+        this.twoQubitGateCounts = CumulativeCounts.fromState(
+            data.twoQubitGateCounts
+        );
+        this.slicesProcessedForHeatmap = this.getSliceCount();
+        this.isFullyLoaded = true;
+        this.onIngestionComplete?.();
+    }
+
+    private processInteractionPairs(): void {
+        const pairs = buildInteractionPairs(this.operations);
+        this.interactionPairOffsets = pairs.offsets;
+        this.interactionPairQubits = pairs.qubits;
+    }
+
+    /**
+     * Initializes cumulative interaction data storage
+     */
+    private initializeCumulativeData(): void {
+        this.edges = indexCouplingMapEdges(this.couplingMap, this._qubit_count);
+        [this.cumulativeQubitInteractions, this.cumulativeEdgeInteractions] =
+            createInteractionCounts(
+                this.operations,
+                this._qubit_count,
+                this.edges.edgeQubits.length / 2,
+                this.cumulativeMemoryBudgetBytes
+            );
 
         this.slicesProcessedForHeatmap = 0;
         this.isFullyLoaded = false;
     }
 
     private calculateCumulativeDataInBackground(): void {
-        const totalSlices = this.allOperationsPerSlice.length;
+        const totalSlices = this.getSliceCount();
         if (totalSlices === 0) {
             this.isFullyLoaded = true;
             return;
         }
 
         const chunkSize = 500;
-        let startIndex = 0;
+        const accumulator = new InteractionAccumulator(
+            this.operations,
+            {
+                offsets: this.interactionPairOffsets,
+                qubits: this.interactionPairQubits,
+            },
+            this.edges,
+            this.cumulativeQubitInteractions,
+            this.cumulativeEdgeInteractions
+        );
 
         const processChunk = () => {
-            const endIndex = Math.min(startIndex + chunkSize, totalSlices);
-
-            for (let i = startIndex; i < endIndex; i++) {
-                const interactingQubits = new Set<number>();
-                this.allOperationsPerSlice[i].forEach((op) => {
-                    op.qubits.forEach((qid) => interactingQubits.add(qid));
-                });
-
-                for (let qid = 0; qid < this._qubit_count; qid++) {
-                    const hadInteraction = interactingQubits.has(qid) ? 1 : 0;
-                    const prevSum =
-                        i === 0
-                            ? 0
-                            : this.cumulativeQubitInteractions[qid][i - 1];
-                    this.cumulativeQubitInteractions[qid].push(
-                        prevSum + hadInteraction
-                    );
-                }
+            // Stop if another circuit was loaded in the meantime
+            if (accumulator.qubitCounts !== this.cumulativeQubitInteractions) {
+                return;
             }
-
-            if (this.couplingMap) {
-                this.processCouplingMapInteractions(startIndex, endIndex);
-            }
-
+            const endIndex = Math.min(
+                accumulator.qubitCounts.processedSlices + chunkSize,
+                totalSlices
+            );
+            accumulator.appendSlicesUntil(endIndex);
             this.slicesProcessedForHeatmap = endIndex;
 
-            startIndex = endIndex;
-            if (startIndex < totalSlices) {
+            if (endIndex < totalSlices) {
                 setTimeout(processChunk, 0); // Yield to main thread
             } else {
                 console.log('Fully loaded all slice data in background.');
                 this.isFullyLoaded = true;
+                this.onIngestionComplete?.();
             }
         };
 
         setTimeout(processChunk, 0);
     }
 
-    private processCouplingMapInteractions(
-        startIndex: number,
-        endIndex: number
-    ): void {
-        for (let i = startIndex; i < endIndex; i++) {
-            const sliceInteractionPairs = this._interactionPairsPerSlice[i];
-            const interactionsInSlice = new Set<string>();
-            for (const interaction of sliceInteractionPairs) {
-                const q1 = Math.min(interaction.q1, interaction.q2);
-                const q2 = Math.max(interaction.q1, interaction.q2);
-                interactionsInSlice.add(`${q1}-${q2}`);
-            }
-
-            for (const [
-                key,
-                scaledCumulativeWeights,
-            ] of this.cumulativePairInteractions.entries()) {
-                const hadInteraction = interactionsInSlice.has(key) ? 1 : 0;
-                const prevScaledSum =
-                    i === 0 ? 0 : scaledCumulativeWeights[i - 1];
-                scaledCumulativeWeights.push(prevScaledSum + hadInteraction);
-            }
-        }
-    }
-
     getSliceCount(): number {
-        return this.allOperationsPerSlice.length;
+        return sliceCountOf(this.operations);
     }
 
     getInteractingQubitsForSlice(sliceIndex: number): Set<number> {
         const interactingQubits = new Set<number>();
-        if (sliceIndex >= 0 && sliceIndex < this.allOperationsPerSlice.length) {
-            this.allOperationsPerSlice[sliceIndex].forEach((op) => {
-                op.qubits.forEach((qid) => interactingQubits.add(qid));
-            });
+        if (sliceIndex >= 0 && sliceIndex < this.getSliceCount()) {
+            const { sliceOffsets, qubitOffsets, qubits } = this.operations;
+            const end = qubitOffsets[sliceOffsets[sliceIndex + 1]];
+            for (let i = qubitOffsets[sliceOffsets[sliceIndex]]; i < end; i++) {
+                interactingQubits.add(qubits[i]);
+            }
         }
         return interactingQubits;
     }
 
+    /**
+     * Builds the per-qubit gate counts in one pass over the circuit, on
+     * first use
+     */
+    private buildGateCounts(): void {
+        [this.oneQubitGateCounts, this.twoQubitGateCounts] = buildGateCounts(
+            this.operations,
+            this._qubit_count,
+            this.cumulativeMemoryBudgetBytes
+        );
+    }
+
     private countGatesInRange(
         startIndex: number,
         endIndex: number,
         qubitId: number
     ): [number, number] {
-        let oneQubitCount = 0;
-        let twoQubitCount = 0;
-
-        for (let i = startIndex; i <= endIndex; i++) {
-            const sliceOps = this.allOperationsPerSlice[i];
-            for (const op of sliceOps) {
-                if (op.qubits.indexOf(qubitId) !== -1) {
-                    if (op.qubits.length === 1) {
-                        oneQubitCount++;
-                    } else if (op.qubits.length === 2) {
-                        twoQubitCount++;
-                    }
-                }
-            }
+        if (!this.oneQubitGateCounts || !this.twoQubitGateCounts) {
+            this.buildGateCounts();
         }
-
-        return [oneQubitCount, twoQubitCount];
+        return [
+            this.oneQubitGateCounts!.countInRange(qubitId, startIndex, endIndex),
+            this.twoQubitGateCounts!.countInRange(qubitId, startIndex, endIndex),
+        ];
     }
 
     getGateCountForQubit(
@@ -378,7 +635,7 @@ export class CircuitDataManager {
 
         const windowForCountsInWindow = Math.max(0, effectiveSlicesForHeatmap);
 
-        if (this.allOperationsPerSlice.length === 0 || currentSliceIndex < 0) {
+        if (this.getSliceCount() === 0 || currentSliceIndex < 0) {
             return {
                 oneQubitGatesInWindow: 0,
                 twoQubitGatesInWindow: 0,
@@ -424,8 +681,35 @@ export class CircuitDataManager {
         };
     }
 
+    /**
+     * Whole-circuit activity of a qubit from the precomputed statistics, or
+     * undefined when the payload has none for it
+     */
+    getQubitActivity(qubitId: number):
+        | {
+              activeSlices: number;
+              idleSlices: number;
+              firstActiveSlice: number;
+              lastActiveSlice: number;
+              swapParticipation: number;
+          }
+        | undefined {
+        const statistics = this.qubitStatistics;
+        if (!statistics || qubitId >= statistics.active_slices.length) {
+            return undefined;
+        }
+        return {
+            activeSlices: statistics.active_slices[qubitId],
+            idleSlices: statistics.idle_slices[qubitId],
+            firstActiveSlice: statistics.first_active_slice[qubitId],
+            lastActiveSlice: statistics.last_active_slice[qubitId],
+            swapParticipation: statistics.swap_participation[qubitId],
+        };
+    }
+
     getInteractionCountForPair(
-        pairKey: string, // e.g. "0-1"
+        q1: number,
+        q2: number,
         currentSliceIndex: number,
         maxSlicesForHeatmap: number
     ): {
@@ -433,9 +717,9 @@ export class CircuitDataManager {
         totalInteractions: number;
         windowForCountsInWindow: number;
     } {
-        const cumulativeData = this.cumulativePairInteractions.get(pairKey);
+        const edge = this.getEdgeIndex(q1, q2);
 
-        if (!cumulativeData || currentSliceIndex < 0) {
+        if (edge === -1 || currentSliceIndex < 0) {
             return {
                 interactionsInWindow: 0,
                 totalInteractions: 0,
@@ -443,7 +727,10 @@ export class CircuitDataManager {
             };
         }
 
-        const totalInteractions = cumulativeData[currentSliceIndex] || 0;
+        const totalInteractions = this.cumulativeEdgeInteractions.totalThrough(
+            edge,
+            currentSliceIndex
+        );
 
         let windowStartSliceIndex;
         let windowForCountsInWindow;
@@ -469,12 +756,12 @@ export class CircuitDataManager {
                 windowForCountsInWindow === 0 ? 1 : windowForCountsInWindow;
         }
 
-        const interactionsBeforeWindow =
-            windowStartSliceIndex > 0
-                ? cumulativeData[windowStartSliceIndex - 1] || 0
-                : 0;
         const interactionsInWindow =
-            totalInteractions - interactionsBeforeWindow;
+            this.cumulativeEdgeInteractions.countInRange(
+                edge,
+                windowStartSliceIndex,
+                currentSliceIndex
+            );
 
         return {
             interactionsInWindow,
@@ -484,14 +771,32 @@ export class CircuitDataManager {
     }
 
     clearData(): void {
+        // Results of in-flight ingestion requests are dropped
+        this.ingestionRequestId++;
         this.circuits = null;
         this._currentCircuitIndex = 0;
-        this.allOperationsPerSlice = [];
-        this._interactionPairsPerSlice = [];
+        this.circuitOperations = [];
+        this.operations = encodeSliceOperations([]);
+        this.interactionPairOffsets = new Int32Array(1);
+        this.interactionPairQubits = new Int32Array(0);
         this._qubit_count = 0;
-        this.cumulativeQubitInteractions = [];
-        this.cumulativePairInteractions.clear();
+        this.cumulativeQubitInteractions = new CumulativeCounts(0, 0);
+        this.cumulativeEdgeInteractions = new CumulativeCounts(0, 0);
+        this.edges = indexCouplingMapEdges([], 0);
         this.slicesProcessedForHeatmap = 0;
         this.isFullyLoaded = false;
+        this.oneQubitGateCounts = null;
+        this.twoQubitGateCounts = null;
+    }
+
+    /**
+     * Clears all data and stops the ingestion worker
+     */
+    dispose(): void {
+        this.clearData();
+        this.pendingFileLoad?.reject(new Error('Data manager disposed'));
+        this.pendingFileLoad = null;
+        this.ingestionWorker?.terminate();
+        this.ingestionWorker = null;
     }
 }
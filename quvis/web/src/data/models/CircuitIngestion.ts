@@ -0,0 +1,444 @@
+import { CumulativeCounts } from './CumulativeCounts.js';
+import type { CumulativeCountsState } from './CumulativeCounts.js';
+
+/**
+ * Builds the typed per-slice structures of a circuit: interaction pairs,
+ * the coupling map edge index and the cumulative qubit, edge and gate
+ * counts. Shared by CircuitDataManager and the ingestion worker, so the
+ * same code runs on either thread.
+ */
+
+export interface SliceOperation {
+    name: string;
+    qubits: number[];
+}
+
+/**
+ * The operations of a circuit as flat columns, which move between threads
+ * as transferred buffers instead of being cloned object by object
+ */
+export interface SliceOperationColumns {
+    // Operations of slice s are [sliceOffsets[s], sliceOffsets[s + 1]);
+    // the qubits of operation o are the entries
+    // [qubitOffsets[o], qubitOffsets[o + 1]) of qubits
+    sliceOffsets: Int32Array;
+    qubitOffsets: Int32Array;
+    qubits: Int32Array;
+    // Operation o is a names[nameIds[o]] gate
+    nameIds: Int32Array;
+    names: string[];
+}
+
+export interface InteractionPairs {
+    // Pairs of slice s are the interleaved (q1, q2) entries
+    // [offsets[s], offsets[s + 1]) of qubits
+    offsets: Int32Array;
+    qubits: Int32Array;
+}
+
+export interface CouplingEdges {
+    // Edges as (min, max) qubit pairs, looked up by min * stride + max
+    edgeQubits: Int32Array;
+    edgeIndex: Map<number, number>;
+    stride: number;
+}
+
+/**
+ * Everything the ingestion worker sends back for one circuit, as plain
+ * typed arrays
+ */
+export interface IngestedCircuitData {
+    interactionPairOffsets: Int32Array;
+    interactionPairQubits: Int32Array;
+    edgeQubits: Int32Array;
+    edgeKeyStride: number;
+    qubitInteractions: CumulativeCountsState;
+    edgeInteractions: CumulativeCountsState;
+    oneQubitGateCounts: CumulativeCountsState;
+    twoQubitGateCounts: CumulativeCountsState;
+}
+
+export function encodeSliceOperations(
+    operationsPerSlice: SliceOperation[][]
+): SliceOperationColumns {
+    const numSlices = operationsPerSlice.length;
+    const sliceOffsets = new Int32Array(numSlices + 1);
+    let numOperations = 0;
+    let numQubitEntries = 0;
+    for (let s = 0; s < numSlices; s++) {
+        for (const op of operationsPerSlice[s]) {
+            numQubitEntries += op.qubits.length;
+        }
+        numOperations += operationsPerSlice[s].length;
+        sliceOffsets[s + 1] = numOperations;
+    }
+
+    const qubitOffsets = new Int32Array(numOperations + 1);
+    const qubits = new Int32Array(numQubitEntries);
+    const nameIds = new Int32Array(numOperations);
+    const names: string[] = [];
+    const nameIndex = new Map<string, number>();
+    let o = 0;
+    let next = 0;
+    for (const sliceOps of operationsPerSlice) {
+        for (const op of sliceOps) {
+            let nameId = nameIndex.get(op.name);
+            if (nameId === undefined) {
+                nameId = names.length;
+                names.push(op.name);
+                nameIndex.set(op.name, nameId);
+            }
+            nameIds[o] = nameId;
+            for (const qid of op.qubits) qubits[next++] = qid;
+            qubitOffsets[++o] = next;
+        }
+    }
+
+    return { sliceOffsets, qubitOffsets, qubits, nameIds, names };
+}
+
+/**
+ * Copy of the columns, e.g. to transfer one while keeping the other
+ */
+export function copySliceOperations(
+    operations: SliceOperationColumns
+): SliceOperationColumns {
+    return {
+        sliceOffsets: operations.sliceOffsets.slice(),
+        qubitOffsets: operations.qubitOffsets.slice(),
+        qubits: operations.qubits.slice(),
+        nameIds: operations.nameIds.slice(),
+        names: operations.names.slice(),
+    };
+}
+
+export function sliceOperationTransferables(
+    operations: SliceOperationColumns
+): ArrayBuffer[] {
+    return [
+        operations.sliceOffsets.buffer as ArrayBuffer,
+        operations.qubitOffsets.buffer as ArrayBuffer,
+        operations.qubits.buffer as ArrayBuffer,
+        operations.nameIds.buffer as ArrayBuffer,
+    ];
+}
+
+export function sliceCountOf(operations: SliceOperationColumns): number {
+    return operations.sliceOffsets.length - 1;
+}
+
+export function buildInteractionPairs(
+    operations: SliceOperationColumns
+): InteractionPairs {
+    const { sliceOffsets, qubitOffsets } = operations;
+    const numSlices = sliceCountOf(operations);
+    const offsets = new Int32Array(numSlices + 1);
+
+    let numPairs = 0;
+    for (let s = 0; s < numSlices; s++) {
+        for (let o = sliceOffsets[s]; o < sliceOffsets[s + 1]; o++) {
+            const k = qubitOffsets[o + 1] - qubitOffsets[o];
+            if (k >= 2) numPairs += (k * (k - 1)) / 2;
+        }
+        offsets[s + 1] = numPairs;
+    }
+
+    // Operations are stored in slice order
+    const qubits = new Int32Array(2 * numPairs);
+    const opQubits = operations.qubits;
+    let next = 0;
+    for (let o = 0; o < operations.nameIds.length; o++) {
+        const end = qubitOffsets[o + 1];
+        for (let i = qubitOffsets[o]; i < end; i++) {
+            for (let j = i + 1; j < end; j++) {
+                qubits[next++] = opQubits[i];
+                qubits[next++] = opQubits[j];
+            }
+        }
+    }
+
+    return { offsets, qubits };
+}
+
+/**
+ * Assigns every undirected coupling map edge an integer index
+ */
+export function indexCouplingMapEdges(
+    couplingMap: number[][],
+    numQubits: number
+): CouplingEdges {
+    let stride = numQubits;
+    for (const pair of couplingMap) {
+        stride = Math.max(stride, pair[0] + 1, pair[1] + 1);
+    }
+
+    const edgeIndex = new Map<number, number>();
+    const edgeQubits: number[] = [];
+    for (const pair of couplingMap) {
+        const q1 = Math.min(pair[0], pair[1]);
+        const q2 = Math.max(pair[0], pair[1]);
+        const key = q1 * stride + q2;
+        if (!edgeIndex.has(key)) {
+            edgeIndex.set(key, edgeQubits.length / 2);
+            edgeQubits.push(q1, q2);
+        }
+    }
+
+    return { edgeQubits: Int32Array.from(edgeQubits), edgeIndex, stride };
+}
+
+/**
+ * Rebuilds the edge lookup from the edge list of indexCouplingMapEdges
+ */
+export function edgesFromQubits(
+    edgeQubits: Int32Array,
+    stride: number
+): CouplingEdges {
+    const edgeIndex = new Map<number, number>();
+    for (let e = 0; e < edgeQubits.length / 2; e++) {
+        edgeIndex.set(edgeQubits[2 * e] * stride + edgeQubits[2 * e + 1], e);
+    }
+    return { edgeQubits, edgeIndex, stride };
+}
+
+export function edgeIndexOf(edges: CouplingEdges, q1: number, q2: number): number {
+    const low = Math.min(q1, q2);
+    const high = Math.max(q1, q2);
+    if (low < 0 || high >= edges.stride) return -1;
+    return edges.edgeIndex.get(low * edges.stride + high) ?? -1;
+}
+
+/**
+ * Appends slices to the cumulative qubit and edge interaction counts, in
+ * order and in as many calls as the caller likes
+ */
+export class InteractionAccumulator {
+    private readonly operations: SliceOperationColumns;
+    private readonly pairs: InteractionPairs;
+    private readonly edges: CouplingEdges;
+    readonly qubitCounts: CumulativeCounts;
+    readonly edgeCounts: CumulativeCounts;
+    private activeEdges: Int32Array;
+
+    constructor(
+        operations: SliceOperationColumns,
+        pairs: InteractionPairs,
+        edges: CouplingEdges,
+        qubitCounts: CumulativeCounts,
+        edgeCounts: CumulativeCounts
+    ) {
+        this.operations = operations;
+        this.pairs = pairs;
+        this.edges = edges;
+        this.qubitCounts = qubitCounts;
+        this.edgeCounts = edgeCounts;
+        this.activeEdges = new Int32Array(Math.max(1, edgeCounts.width));
+    }
+
+    /**
+     * Appends slices up to (excluding) `endSlice`
+     */
+    appendSlicesUntil(endSlice: number): void {
+        const { sliceOffsets, qubitOffsets, qubits } = this.operations;
+        const end = Math.min(endSlice, sliceCountOf(this.operations));
+        for (let i = this.qubitCounts.processedSlices; i < end; i++) {
+            // The qubits of a slice are contiguous
+            const qubitStart = qubitOffsets[sliceOffsets[i]];
+            const numActiveQubits = Math.min(
+                qubitOffsets[sliceOffsets[i + 1]] - qubitStart,
+                this.qubitCounts.width
+            );
+            this.qubitCounts.appendSlice(
+                qubits.subarray(qubitStart),
+                numActiveQubits
+            );
+
+            const pairStart = this.pairs.offsets[i];
+            const pairEnd = this.pairs.offsets[i + 1];
+            if (pairEnd - pairStart > this.activeEdges.length) {
+                this.activeEdges = new Int32Array(pairEnd - pairStart);
+            }
+            let numActiveEdges = 0;
+            for (let p = pairStart; p < pairEnd; p++) {
+                const edge = edgeIndexOf(
+                    this.edges,
+                    this.pairs.qubits[2 * p],
+                    this.pairs.qubits[2 * p + 1]
+                );
+                if (edge !== -1) this.activeEdges[numActiveEdges++] = edge;
+            }
+            this.edgeCounts.appendSlice(this.activeEdges, numActiveEdges);
+        }
+    }
+}
+
+/**
+ * Empty cumulative qubit and edge counts sized for the circuit, with one
+ * keyframe interval chosen so both, deltas included, fit the memory budget
+ * together
+ */
+export function createInteractionCounts(
+    operations: SliceOperationColumns,
+    numQubits: number,
+    numEdges: number,
+    memoryBudgetBytes: number
+): [CumulativeCounts, CumulativeCounts] {
+    const numSlices = sliceCountOf(operations);
+    const { qubitOffsets } = operations;
+    // Every gate qubit is one qubit entry; every qubit pair is at most one
+    // edge entry
+    let numQubitEntries = operations.qubits.length;
+    let numEdgeEntries = 0;
+    for (let o = 0; o < operations.nameIds.length; o++) {
+        const k = qubitOffsets[o + 1] - qubitOffsets[o];
+        if (k >= 2) numEdgeEntries += (k * (k - 1)) / 2;
+    }
+    numQubitEntries = Math.min(numQubitEntries, numSlices * numQubits);
+    numEdgeEntries = Math.min(numEdgeEntries, numSlices * numEdges);
+
+    const keyframeInterval = CumulativeCounts.keyframeIntervalFor(
+        numSlices,
+        numQubits + numEdges,
+        memoryBudgetBytes,
+        numQubitEntries + numEdgeEntries,
+        2
+    );
+    return [
+        new CumulativeCounts(
+            numSlices,
+            numQubits,
+            keyframeInterval,
+            numQubitEntries
+        ),
+        new CumulativeCounts(
+            numSlices,
+            numEdges,
+            keyframeInterval,
+            numEdgeEntries
+        ),
+    ];
+}
+
+/**
+ * Per-qubit cumulative counts of one- and two-qubit gates, in one pass over
+ * the circuit; a qubit has at most one gate per slice
+ */
+export function buildGateCounts(
+    operations: SliceOperationColumns,
+    numQubits: number,
+    memoryBudgetBytes: number
+): [CumulativeCounts, CumulativeCounts] {
+    const numSlices = sliceCountOf(operations);
+    const { sliceOffsets, qubitOffsets, qubits } = operations;
+    let numOneQubitEntries = 0;
+    let numTwoQubitEntries = 0;
+    for (let o = 0; o < operations.nameIds.length; o++) {
+        const k = qubitOffsets[o + 1] - qubitOffsets[o];
+        if (k === 1) numOneQubitEntries++;
+        else if (k === 2) numTwoQubitEntries += 2;
+    }
+    const keyframeInterval = CumulativeCounts.keyframeIntervalFor(
+        numSlices,
+        2 * numQubits,
+        memoryBudgetBytes,
+        numOneQubitEntries + numTwoQubitEntries,
+        2
+    );
+    const oneQubit = new CumulativeCounts(
+        numSlices,
+        numQubits,
+        keyframeInterval,
+        numOneQubitEntries
+    );
+    const twoQubit = new CumulativeCounts(
+        numSlices,
+        numQubits,
+        keyframeInterval,
+        numTwoQubitEntries
+    );
+    const oneQubitActive = new Int32Array(Math.max(1, numQubits));
+    const twoQubitActive = new Int32Array(Math.max(1, 2 * numQubits));
+
+    for (let s = 0; s < numSlices; s++) {
+        let numOneQubit = 0;
+        let numTwoQubit = 0;
+        for (let o = sliceOffsets[s]; o < sliceOffsets[s + 1]; o++) {
+            const first = qubitOffsets[o];
+            const k = qubitOffsets[o + 1] - first;
+            if (k === 1) {
+                if (numOneQubit < oneQubitActive.length) {
+                    oneQubitActive[numOneQubit++] = qubits[first];
+                }
+            } else if (k === 2) {
+                if (numTwoQubit + 2 <= twoQubitActive.length) {
+                    twoQubitActive[numTwoQubit++] = qubits[first];
+                    twoQubitActive[numTwoQubit++] = qubits[first + 1];
+                }
+            }
+        }
+        oneQubit.appendSlice(oneQubitActive, numOneQubit);
+        twoQubit.appendSlice(twoQubitActive, numTwoQubit);
+    }
+
+    return [oneQubit, twoQubit];
+}
+
+/**
+ * Runs the full ingestion of one circuit and returns it as plain typed
+ * arrays, ready to be transferred
+ */
+export function ingestCircuit(
+    operations: SliceOperationColumns,
+    numQubits: number,
+    couplingMap: number[][],
+    memoryBudgetBytes: number
+): IngestedCircuitData {
+    const pairs = buildInteractionPairs(operations);
+    const edges = indexCouplingMapEdges(couplingMap, numQubits);
+    const [qubitCounts, edgeCounts] = createInteractionCounts(
+        operations,
+        numQubits,
+        edges.edgeQubits.length / 2,
+        memoryBudgetBytes
+    );
+    new InteractionAccumulator(
+        operations,
+        pairs,
+        edges,
+        qubitCounts,
+        edgeCounts
+    ).appendSlicesUntil(sliceCountOf(operations));
+    const [oneQubit, twoQubit] = buildGateCounts(
+        operations,
+        numQubits,
+        memoryBudgetBytes
+    );
+
+    return {
+        interactionPairOffsets: pairs.offsets,
+        interactionPairQubits: pairs.qubits,
+        edgeQubits: edges.edgeQubits,
+        edgeKeyStride: edges.stride,
+        qubitInteractions: qubitCounts.toState(),
+        edgeInteractions: edgeCounts.toState(),
+        oneQubitGateCounts: oneQubit.toState(),
+        twoQubitGateCounts: twoQubit.toState(),
+    };
+}
+
+/**
+ * Buffers of an ingestion result to pass as the transfer list
+ */
+export function ingestedCircuitTransferables(
+    data: IngestedCircuitData
+): ArrayBuffer[] {
+    return [
+        data.interactionPairOffsets.buffer as ArrayBuffer,
+        data.interactionPairQubits.buffer as ArrayBuffer,
+        data.edgeQubits.buffer as ArrayBuffer,
+        ...CumulativeCounts.transferables(data.qubitInteractions),
+        ...CumulativeCounts.transferables(data.edgeInteractions),
+        ...CumulativeCounts.transferables(data.oneQubitGateCounts),
+        ...CumulativeCounts.transferables(data.twoQubitGateCounts),
+    ];
+}
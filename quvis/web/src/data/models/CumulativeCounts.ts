@@ -0,0 +1,309 @@
+/**
+ * Plain-data form of CumulativeCounts that can be posted between threads
+ */
+export interface CumulativeCountsState {
+    numSlices: number;
+    width: number;
+    keyframeInterval: number;
+    processedSlices: number;
+    keyframes: Uint32Array;
+    running: Uint32Array;
+    activeOffsets: Int32Array | null;
+    activeColumns: Int32Array;
+}
+
+/**
+ * Per-slice cumulative counts for a fixed set of columns (qubits or edges).
+ *
+ * Row r holds, for every column, the number of slices in [0, r) in which
+ * that column was active, so the count over any window is the difference of
+ * two rows. Only every `keyframeInterval`-th row is stored densely, in one
+ * flat Uint32Array; other rows are rebuilt from the nearest keyframe plus
+ * the active columns of at most `keyframeInterval - 1` slices, and the last
+ * few rebuilt rows are kept in a small snapshot cache whose buffers are
+ * reused.
+ */
+export class CumulativeCounts {
+    static readonly BYTES_PER_COUNT = Uint32Array.BYTES_PER_ELEMENT;
+    private static readonly SNAPSHOT_CACHE_SIZE = 4;
+
+    readonly width: number;
+    readonly numSlices: number;
+    readonly keyframeInterval: number;
+    private readonly keyframes: Uint32Array;
+    private readonly running: Uint32Array;
+    private readonly lastActiveSlice: Int32Array;
+    private _processedSlices = 0;
+
+    // Active columns of slice s are activeColumns[activeOffsets[s] ..
+    // activeOffsets[s + 1]); only recorded when rows are not all keyframes
+    private readonly activeOffsets: Int32Array | null;
+    private activeColumns: Int32Array;
+    private readonly snapshots: Map<number, Uint32Array> = new Map();
+
+    /**
+     * @param activeCapacity Expected number of active columns over all
+     *     slices; sizes the delta storage up front so it does not have to
+     *     grow
+     */
+    constructor(
+        numSlices: number,
+        width: number,
+        keyframeInterval = 1,
+        activeCapacity = width
+    ) {
+        this.numSlices = numSlices;
+        this.width = width;
+        this.keyframeInterval = Math.max(1, Math.floor(keyframeInterval));
+        const numKeyframes =
+            Math.floor(numSlices / this.keyframeInterval) + 1;
+        this.keyframes = new Uint32Array(numKeyframes * width);
+        this.running = new Uint32Array(width);
+        this.lastActiveSlice = new Int32Array(width).fill(-1);
+        this.activeOffsets =
+            this.keyframeInterval > 1 ? new Int32Array(numSlices + 1) : null;
+        this.activeColumns = new Int32Array(
+            this.keyframeInterval > 1 ? Math.max(16, activeCapacity) : 0
+        );
+    }
+
+    /**
+     * Smallest keyframe interval at which the counts take at most
+     * `budgetBytes`; 1 (every row stored) when the dense layout fits.
+     *
+     * Sparser keyframes also store per-slice deltas, so the budget covers
+     * the keyframes plus the slice offsets of each instance, the recorded
+     * active columns and the per-column running, last-active and snapshot
+     * rows. When those alone exceed the budget, only the first keyframe is
+     * kept.
+     *
+     * @param width Total number of columns of the instances sharing the budget
+     * @param numActive Active columns recorded over all slices and
+     *     instances (at most the number of qubits touched by gates)
+     * @param numInstances Number of instances sharing the budget
+     */
+    static keyframeIntervalFor(
+        numSlices: number,
+        width: number,
+        budgetBytes: number,
+        numActive: number = numSlices * width,
+        numInstances = 1
+    ): number {
+        const bytes = CumulativeCounts.BYTES_PER_COUNT;
+        const rowBytes = width * bytes;
+        const denseBytes = (numSlices + 1) * rowBytes;
+        if (budgetBytes <= 0 || denseBytes <= budgetBytes) return 1;
+
+        const deltaBytes =
+            (numInstances * (numSlices + 1) + numActive) * bytes +
+            (2 + CumulativeCounts.SNAPSHOT_CACHE_SIZE) * rowBytes;
+        // Keyframes are rows 0, k, 2k, ..., so floor(numSlices / k) + 1 of
+        // them must fit in what the deltas leave
+        const extraKeyframes =
+            Math.floor((budgetBytes - deltaBytes) / rowBytes) - 1;
+        if (extraKeyframes < 0) return numSlices + 1;
+        return Math.floor(numSlices / (extraKeyframes + 1)) + 1;
+    }
+
+    /**
+     * Builds counts from per-column inclusive cumulative series, where
+     * series[c][s] is the count for column c over slices [0, s]. Shorter
+     * series are extended with their last value.
+     */
+    static fromSeries(series: number[][]): CumulativeCounts {
+        const numSlices = series.reduce(
+            (longest, column) => Math.max(longest, column.length),
+            0
+        );
+        const counts = new CumulativeCounts(numSlices, series.length);
+        series.forEach((column, c) => {
+            let last = 0;
+            for (let s = 0; s < numSlices; s++) {
+                if (s < column.length) last = column[s];
+                counts.keyframes[(s + 1) * counts.width + c] = last;
+            }
+            counts.running[c] = last;
+        });
+        counts._processedSlices = numSlices;
+        return counts;
+    }
+
+    /**
+     * Rebuilds counts from a state produced by toState(), taking ownership
+     * of its buffers
+     */
+    static fromState(state: CumulativeCountsState): CumulativeCounts {
+        const counts = new CumulativeCounts(0, state.width);
+        // The readonly fields are only ever set once, here or in the
+        // constructor
+        return Object.assign(counts, {
+            numSlices: state.numSlices,
+            keyframeInterval: state.keyframeInterval,
+            keyframes: state.keyframes,
+            running: state.running,
+            lastActiveSlice: new Int32Array(state.width).fill(-1),
+            activeOffsets: state.activeOffsets,
+            activeColumns: state.activeColumns,
+            _processedSlices: state.processedSlices,
+        });
+    }
+
+    /**
+     * Exports the stored counts as plain typed arrays (shared, not copied).
+     * Pass `CumulativeCounts.transferables(state)` as the transfer list when
+     * posting it to another thread; this instance must not be used after.
+     */
+    toState(): CumulativeCountsState {
+        const numRecorded = this.activeOffsets
+            ? this.activeOffsets[this._processedSlices]
+            : 0;
+        return {
+            numSlices: this.numSlices,
+            width: this.width,
+            keyframeInterval: this.keyframeInterval,
+            processedSlices: this._processedSlices,
+            keyframes: this.keyframes,
+            running: this.running,
+            activeOffsets: this.activeOffsets,
+            activeColumns: this.activeColumns.slice(0, numRecorded),
+        };
+    }
+
+    static transferables(state: CumulativeCountsState): ArrayBuffer[] {
+        const buffers = [
+            state.keyframes.buffer,
+            state.running.buffer,
+            state.activeColumns.buffer,
+        ];
+        if (state.activeOffsets) buffers.push(state.activeOffsets.buffer);
+        return buffers as ArrayBuffer[];
+    }
+
+    get processedSlices(): number {
+        return this._processedSlices;
+    }
+
+    /**
+     * Bytes held by keyframes, per-slice deltas and per-column rows
+     */
+    get byteLength(): number {
+        let snapshotBytes = 0;
+        for (const snapshot of this.snapshots.values()) {
+            snapshotBytes += snapshot.byteLength;
+        }
+        return (
+            this.keyframes.byteLength +
+            (this.activeOffsets?.byteLength ?? 0) +
+            this.activeColumns.byteLength +
+            this.running.byteLength +
+            this.lastActiveSlice.byteLength +
+            snapshotBytes
+        );
+    }
+
+    /**
+     * Appends the next slice. `active` holds the columns that were active in
+     * it; `activeCount` limits how many entries of `active` are read.
+     * Repeated columns are counted once.
+     */
+    appendSlice(active: ArrayLike<number>, activeCount = active.length): void {
+        const slice = this._processedSlices;
+        if (slice >= this.numSlices) return;
+
+        let numRecorded = this.activeOffsets ? this.activeOffsets[slice] : 0;
+        for (let i = 0; i < activeCount; i++) {
+            const column = active[i];
+            if (
+                column < 0 ||
+                column >= this.width ||
+                this.lastActiveSlice[column] === slice
+            ) {
+                continue;
+            }
+            this.lastActiveSlice[column] = slice;
+            this.running[column]++;
+            if (this.activeOffsets) {
+                if (numRecorded >= this.activeColumns.length) {
+                    const grown = new Int32Array(this.activeColumns.length * 2);
+                    grown.set(this.activeColumns);
+                    this.activeColumns = grown;
+                }
+                this.activeColumns[numRecorded++] = column;
+            }
+        }
+
+        this._processedSlices = slice + 1;
+        if (this.activeOffsets) {
+            this.activeOffsets[slice + 1] = numRecorded;
+        }
+        if (this._processedSlices % this.keyframeInterval === 0) {
+            const keyframe = this._processedSlices / this.keyframeInterval;
+            this.keyframes.set(this.running, keyframe * this.width);
+        }
+    }
+
+    /**
+     * Returns row r (counts over slices [0, r)), clamped to the processed
+     * slices. The returned array must not be modified, and a rebuilt row is
+     * only valid until SNAPSHOT_CACHE_SIZE other rows have been rebuilt.
+     */
+    row(r: number): Uint32Array {
+        r = Math.max(0, Math.min(r, this._processedSlices));
+        if (r === this._processedSlices) return this.running;
+
+        const keyframe = Math.floor(r / this.keyframeInterval);
+        const keyframeRow = this.keyframes.subarray(
+            keyframe * this.width,
+            (keyframe + 1) * this.width
+        );
+        if (r % this.keyframeInterval === 0) return keyframeRow;
+
+        const cached = this.snapshots.get(r);
+        if (cached) {
+            // Refresh its position in the LRU order
+            this.snapshots.delete(r);
+            this.snapshots.set(r, cached);
+            return cached;
+        }
+
+        // Reuse the least recently used snapshot's buffer once the cache is full
+        let snapshot: Uint32Array;
+        if (this.snapshots.size >= CumulativeCounts.SNAPSHOT_CACHE_SIZE) {
+            const [oldest, buffer] = this.snapshots.entries().next()
+                .value as [number, Uint32Array];
+            this.snapshots.delete(oldest);
+            snapshot = buffer;
+            snapshot.set(keyframeRow);
+        } else {
+            snapshot = Uint32Array.from(keyframeRow);
+        }
+        const offsets = this.activeOffsets!;
+        const end = offsets[r];
+        for (let i = offsets[keyframe * this.keyframeInterval]; i < end; i++) {
+            snapshot[this.activeColumns[i]]++;
+        }
+
+        this.snapshots.set(r, snapshot);
+        return snapshot;
+    }
+
+    /**
+     * Number of slices in [startSlice, endSlice] (inclusive) in which the
+     * column was active, clamped to the slices processed so far
+     */
+    countInRange(column: number, startSlice: number, endSlice: number): number {
+        if (column < 0 || column >= this.width) return 0;
+        const end = Math.min(endSlice + 1, this._processedSlices);
+        const start = Math.max(0, Math.min(startSlice, this._processedSlices));
+        if (end <= start) return 0;
+        const countAtEnd = this.row(end)[column];
+        return countAtEnd - this.row(start)[column];
+    }
+
+    /**
+     * Number of slices in [0, slice] in which the column was active
+     */
+    totalThrough(column: number, slice: number): number {
+        return this.countInRange(column, 0, slice);
+    }
+}
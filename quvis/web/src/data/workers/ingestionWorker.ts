@@ -0,0 +1,96 @@
+/**
+ * Circuit ingestion worker.
+ *
+ * Fetches and parses data files and, per circuit, builds the interaction
+ * pairs, coupling map edge index and cumulative counts off the main thread.
+ * Operations travel in both directions as SliceOperationColumns and results
+ * as plain typed arrays, all in transferred buffers, so neither thread
+ * clones per-operation objects.
+ *
+ * Messages in:
+ *   { type: "load", url }                       fetch and parse a data file
+ *   { type: "ingest", requestId, operations, numQubits, couplingMap,
+ *     memoryBudgetBytes }
+ * Messages out:
+ *   { type: "loaded", circuits, operations }    circuits without their
+ *                                               operations, which come as
+ *                                               columns, one per circuit
+ *   { type: "ingested", requestId, data }
+ *   { type: "error", requestId?, message }
+ */
+
+import {
+    encodeSliceOperations,
+    ingestCircuit,
+    ingestedCircuitTransferables,
+    sliceOperationTransferables,
+} from "../models/CircuitIngestion.js";
+import type {
+    SliceOperation,
+    SliceOperationColumns,
+} from "../models/CircuitIngestion.js";
+
+interface WorkerCircuit {
+    circuit_type: "logical" | "compiled";
+    circuit_info: {
+        interaction_graph_ops_per_slice?: SliceOperation[][];
+        compiled_interaction_graph_ops_per_slice?: SliceOperation[][];
+    };
+}
+
+/**
+ * Encodes the operations of a circuit and removes them from it
+ */
+function takeOperations(circuit: WorkerCircuit): SliceOperationColumns {
+    const info = circuit.circuit_info;
+    const operations =
+        circuit.circuit_type === "logical"
+            ? info.interaction_graph_ops_per_slice
+            : info.compiled_interaction_graph_ops_per_slice;
+    delete info.interaction_graph_ops_per_slice;
+    delete info.compiled_interaction_graph_ops_per_slice;
+    return encodeSliceOperations(operations || []);
+}
+
+async function load(url: string): Promise<void> {
+    const response = await fetch(url);
+    if (!response.ok) {
+        throw new Error(`Failed to fetch ${url}: ${response.statusText}`);
+    }
+    const data = await response.json();
+    const circuits: WorkerCircuit[] = Array.isArray(data)
+        ? data
+        : data.circuits;
+    const operations = circuits.map(takeOperations);
+    const transfer: ArrayBuffer[] = [];
+    for (const columns of operations) {
+        transfer.push(...sliceOperationTransferables(columns));
+    }
+    postMessage({ type: "loaded", circuits, operations }, { transfer });
+}
+
+self.onmessage = async (event) => {
+    const message = event.data;
+    try {
+        if (message.type === "load") {
+            await load(message.url);
+        } else if (message.type === "ingest") {
+            const data = ingestCircuit(
+                message.operations,
+                message.numQubits,
+                message.couplingMap,
+                message.memoryBudgetBytes,
+            );
+            postMessage(
+                { type: "ingested", requestId: message.requestId, data },
+                { transfer: ingestedCircuitTransferables(data) },
+            );
+        }
+    } catch (error) {
+        postMessage({
+            type: "error",
+            requestId: message.requestId,
+            message: error instanceof Error ? error.message : String(error),
+        });
+    }
+};
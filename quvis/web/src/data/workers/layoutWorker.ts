@@ -1,137 +1,272 @@
-import * as THREE from "three";
+/**
+ * Force-directed layout worker.
+ *
+ * Positions and forces live in flat typed arrays (x, y, z per qubit) and the
+ * Barnes-Hut octree is a pool of array-backed nodes that is reset, not
+ * reallocated, every iteration. The final positions are posted back as a
+ * transferable Float32Array, so neither side allocates per-qubit objects.
+ */
 
-class OctreeNode {
-    box: THREE.Box3;
-    centerOfMass: THREE.Vector3 = new THREE.Vector3();
-    mass: number = 0;
-    qubitId: number | null = null;
-    children: (OctreeNode | null)[] = [];
+const MAX_OCTREE_DEPTH = 32;
+const MIN_REPEL_DIST = 0.1;
 
-    constructor(box: THREE.Box3) {
-        this.box = box;
+/**
+ * Array-backed octree. Node `n` owns a cube centered at
+ * (centerX[n], centerY[n], centerZ[n]) with half-width halfSize[n]; its eight
+ * children, if any, are the consecutive nodes starting at firstChild[n].
+ */
+class OctreePool {
+    capacity = 0;
+    size = 0;
+    centerX = new Float64Array(0);
+    centerY = new Float64Array(0);
+    centerZ = new Float64Array(0);
+    halfSize = new Float64Array(0);
+    massX = new Float64Array(0);
+    massY = new Float64Array(0);
+    massZ = new Float64Array(0);
+    mass = new Float64Array(0);
+    body = new Int32Array(0);
+    firstChild = new Int32Array(0);
+    stack = new Int32Array(8 * MAX_OCTREE_DEPTH + 8);
+
+    constructor(initialCapacity: number) {
+        this.grow(Math.max(64, initialCapacity));
     }
 
-    insert(
-        qubitId: number,
-        position: THREE.Vector3,
-        qubitPositions: Map<number, THREE.Vector3>,
-    ): void {
-        if (!this.box.containsPoint(position)) {
-            return;
-        }
+    private grow(capacity: number): void {
+        const resizeF64 = (source: Float64Array) => {
+            const target = new Float64Array(capacity);
+            target.set(source.subarray(0, this.size));
+            return target;
+        };
+        const resizeI32 = (source: Int32Array) => {
+            const target = new Int32Array(capacity);
+            target.set(source.subarray(0, this.size));
+            return target;
+        };
+        this.centerX = resizeF64(this.centerX);
+        this.centerY = resizeF64(this.centerY);
+        this.centerZ = resizeF64(this.centerZ);
+        this.halfSize = resizeF64(this.halfSize);
+        this.massX = resizeF64(this.massX);
+        this.massY = resizeF64(this.massY);
+        this.massZ = resizeF64(this.massZ);
+        this.mass = resizeF64(this.mass);
+        this.body = resizeI32(this.body);
+        this.firstChild = resizeI32(this.firstChild);
+        this.capacity = capacity;
+    }
 
-        if (this.mass === 0) {
-            this.qubitId = qubitId;
-            this.centerOfMass.copy(position);
-            this.mass = 1;
-            return;
+    private allocate(cx: number, cy: number, cz: number, half: number): number {
+        if (this.size >= this.capacity) {
+            this.grow(this.capacity * 2);
         }
+        const node = this.size++;
+        this.centerX[node] = cx;
+        this.centerY[node] = cy;
+        this.centerZ[node] = cz;
+        this.halfSize[node] = half;
+        this.massX[node] = 0;
+        this.massY[node] = 0;
+        this.massZ[node] = 0;
+        this.mass[node] = 0;
+        this.body[node] = -1;
+        this.firstChild[node] = -1;
+        return node;
+    }
 
-        if (this.isLeaf()) {
-            this.subdivide();
-            // Re-insert existing qubit into the correct child
-            const existingQubitPos = qubitPositions.get(this.qubitId!);
-            if (existingQubitPos) {
-                const existingQubitIndex = this.getOctant(existingQubitPos);
-                this.children[existingQubitIndex]!.insert(
-                    this.qubitId!,
-                    existingQubitPos,
-                    qubitPositions,
-                );
-            }
+    private subdivide(node: number): void {
+        const quarter = this.halfSize[node] / 2;
+        const cx = this.centerX[node];
+        const cy = this.centerY[node];
+        const cz = this.centerZ[node];
+        if (this.size + 8 > this.capacity) {
+            this.grow(Math.max(this.capacity * 2, this.size + 8));
+        }
+        this.firstChild[node] = this.size;
+        for (let octant = 0; octant < 8; octant++) {
+            this.allocate(
+                cx + (octant & 1 ? quarter : -quarter),
+                cy + (octant & 2 ? quarter : -quarter),
+                cz + (octant & 4 ? quarter : -quarter),
+                quarter,
+            );
         }
-
-        // Insert new qubit into the correct child
-        const newQubitIndex = this.getOctant(position);
-        this.children[newQubitIndex]!.insert(qubitId, position, qubitPositions);
-
-        // Update center of mass
-        this.centerOfMass
-            .multiplyScalar(this.mass)
-            .add(position)
-            .divideScalar(this.mass + 1);
-        this.mass++;
-        this.qubitId = null; // Internal node
     }
 
-    isLeaf(): boolean {
-        return this.children.length === 0;
+    private childFor(node: number, x: number, y: number, z: number): number {
+        let octant = 0;
+        if (x > this.centerX[node]) octant |= 1;
+        if (y > this.centerY[node]) octant |= 2;
+        if (z > this.centerZ[node]) octant |= 4;
+        return this.firstChild[node] + octant;
     }
 
-    private getOctant(point: THREE.Vector3): number {
-        const center = this.box.getCenter(new THREE.Vector3());
-        let index = 0;
-        if (point.x > center.x) index |= 1;
-        if (point.y > center.y) index |= 2;
-        if (point.z > center.z) index |= 4;
-        return index;
+    private addMass(node: number, x: number, y: number, z: number): void {
+        this.massX[node] += x;
+        this.massY[node] += y;
+        this.massZ[node] += z;
+        this.mass[node] += 1;
     }
 
-    private subdivide(): void {
-        const size = this.box.getSize(new THREE.Vector3()).multiplyScalar(0.5);
-        for (let i = 0; i < 8; i++) {
-            const min = new THREE.Vector3(
-                this.box.min.x + (i & 1 ? size.x : 0),
-                this.box.min.y + (i & 2 ? size.y : 0),
-                this.box.min.z + (i & 4 ? size.z : 0),
+    build(positions: Float32Array, count: number): void {
+        let minX = Infinity,
+            minY = Infinity,
+            minZ = Infinity;
+        let maxX = -Infinity,
+            maxY = -Infinity,
+            maxZ = -Infinity;
+        for (let i = 0; i < count; i++) {
+            const x = positions[3 * i];
+            const y = positions[3 * i + 1];
+            const z = positions[3 * i + 2];
+            if (x < minX) minX = x;
+            if (y < minY) minY = y;
+            if (z < minZ) minZ = z;
+            if (x > maxX) maxX = x;
+            if (y > maxY) maxY = y;
+            if (z > maxZ) maxZ = z;
+        }
+
+        this.size = 0;
+        const half =
+            Math.max(maxX - minX, maxY - minY, maxZ - minZ, 1e-6) / 2 + 1e-6;
+        this.allocate(
+            (minX + maxX) / 2,
+            (minY + maxY) / 2,
+            (minZ + maxZ) / 2,
+            half,
+        );
+
+        for (let i = 0; i < count; i++) {
+            this.insert(
+                i,
+                positions[3 * i],
+                positions[3 * i + 1],
+                positions[3 * i + 2],
+                positions,
             );
-            const max = new THREE.Vector3().addVectors(min, size);
-            this.children[i] = new OctreeNode(new THREE.Box3(min, max));
         }
     }
-}
 
-function calculateRepulsiveForce(
-    node: OctreeNode,
-    qubitPos: THREE.Vector3,
-    qubitId: number,
-    force: THREE.Vector3,
-    kRepel: number,
-    barnesHutTheta: number,
-) {
-    if (node.mass === 0 || node.qubitId === qubitId) {
-        return;
-    }
+    private insert(
+        bodyId: number,
+        x: number,
+        y: number,
+        z: number,
+        positions: Float32Array,
+    ): void {
+        let node = 0;
+        for (let depth = 0; ; depth++) {
+            if (this.firstChild[node] === -1) {
+                if (this.mass[node] === 0) {
+                    this.body[node] = bodyId;
+                    this.addMass(node, x, y, z);
+                    return;
+                }
+                if (depth >= MAX_OCTREE_DEPTH) {
+                    // Coincident bodies: aggregate them in this leaf
+                    this.addMass(node, x, y, z);
+                    return;
+                }
 
-    const distance = qubitPos.distanceTo(node.centerOfMass);
+                // Push the resident body down into its child
+                const resident = this.body[node];
+                this.subdivide(node);
+                this.body[node] = -1;
+                const rx = positions[3 * resident];
+                const ry = positions[3 * resident + 1];
+                const rz = positions[3 * resident + 2];
+                const residentChild = this.childFor(node, rx, ry, rz);
+                this.body[residentChild] = resident;
+                this.addMass(residentChild, rx, ry, rz);
+            }
 
-    if (node.isLeaf()) {
-        if (node.qubitId !== null) {
-            const delta = new THREE.Vector3().subVectors(
-                qubitPos,
-                node.centerOfMass,
-            );
-            const dist = Math.max(delta.length(), 0.1);
-            const forceMag = (kRepel * kRepel) / dist;
-            force.add(delta.normalize().multiplyScalar(forceMag));
+            this.addMass(node, x, y, z);
+            node = this.childFor(node, x, y, z);
         }
-    } else {
-        const size = node.box.getSize(new THREE.Vector3()).x; // Assuming cube-like nodes
-        if (size / distance < barnesHutTheta) {
-            const delta = new THREE.Vector3().subVectors(
-                qubitPos,
-                node.centerOfMass,
-            );
-            const dist = Math.max(delta.length(), 0.1);
-            const forceMag = ((kRepel * kRepel) / dist) * node.mass;
-            force.add(delta.normalize().multiplyScalar(forceMag));
-        } else {
-            for (const child of node.children) {
-                if (child) {
-                    calculateRepulsiveForce(
-                        child,
-                        qubitPos,
-                        qubitId,
-                        force,
-                        kRepel,
-                        barnesHutTheta,
-                    );
+    }
+
+    /**
+     * Accumulates the Barnes-Hut repulsive force on `bodyId` into `forces`.
+     */
+    accumulateRepulsion(
+        bodyId: number,
+        positions: Float32Array,
+        forces: Float32Array,
+        kRepelSq: number,
+        theta: number,
+    ): void {
+        const px = positions[3 * bodyId];
+        const py = positions[3 * bodyId + 1];
+        const pz = positions[3 * bodyId + 2];
+        let fx = 0,
+            fy = 0,
+            fz = 0;
+
+        let stack = this.stack;
+        let top = 0;
+        stack[top++] = 0;
+
+        while (top > 0) {
+            const node = stack[--top];
+            const nodeMass = this.mass[node];
+            if (nodeMass === 0 || this.body[node] === bodyId) continue;
+
+            const dx = px - this.massX[node] / nodeMass;
+            const dy = py - this.massY[node] / nodeMass;
+            const dz = pz - this.massZ[node] / nodeMass;
+            const length = Math.sqrt(dx * dx + dy * dy + dz * dz);
+            const isLeaf = this.firstChild[node] === -1;
+
+            if (isLeaf || (2 * this.halfSize[node]) / length < theta) {
+                if (length > 0) {
+                    const dist = Math.max(length, MIN_REPEL_DIST);
+                    const scale = ((kRepelSq / dist) * nodeMass) / length;
+                    fx += dx * scale;
+                    fy += dy * scale;
+                    fz += dz * scale;
+                }
+            } else {
+                if (top + 8 > stack.length) {
+                    const larger = new Int32Array(stack.length * 2);
+                    larger.set(stack);
+                    this.stack = stack = larger;
+                }
+                const first = this.firstChild[node];
+                for (let c = 0; c < 8; c++) {
+                    stack[top++] = first + c;
                 }
             }
         }
+
+        forces[3 * bodyId] += fx;
+        forces[3 * bodyId + 1] += fy;
+        forces[3 * bodyId + 2] += fz;
     }
 }
 
+function gridPositions(count: number, spacing: number): Float32Array {
+    const positions = new Float32Array(count * 3);
+    const cols = Math.ceil(Math.sqrt(count));
+    const rows = Math.ceil(count / cols);
+    const offsetX = ((cols - 1) * spacing) / 2;
+    const offsetY = ((rows - 1) * spacing) / 2;
+    for (let i = 0; i < count; i++) {
+        positions[3 * i] = (i % cols) * spacing - offsetX;
+        positions[3 * i + 1] = Math.floor(i / cols) * spacing - offsetY;
+    }
+    return positions;
+}
+
+function postPositions(positions: Float32Array): void {
+    postMessage(
+        { positions, numQubits: positions.length / 3 },
+        { transfer: [positions.buffer] },
+    );
+}
+
 self.onmessage = (event) => {
     const {
         numDeviceQubits,
@@ -147,115 +282,83 @@ self.onmessage = (event) => {
         barnesHutTheta,
     } = event.data;
 
-    const qubitPositions = new Map<number, THREE.Vector3>();
+    const n: number = numDeviceQubits;
 
-    if (numDeviceQubits === 0) {
-        postMessage({ qubitPositions: [] });
+    if (n === 0) {
+        postPositions(new Float32Array(0));
         return;
     }
 
-    if (!couplingMap || numDeviceQubits <= 1) {
-        const cols = Math.ceil(Math.sqrt(numDeviceQubits));
-        const rows = Math.ceil(numDeviceQubits / cols);
-        const spacing = idealDist;
-        const offsetX = ((cols - 1) * spacing) / 2;
-        const offsetY = ((rows - 1) * spacing) / 2;
-        let count = 0;
-        for (let i = 0; i < rows; i++) {
-            for (let j = 0; j < cols; j++) {
-                if (count < numDeviceQubits) {
-                    qubitPositions.set(
-                        count,
-                        new THREE.Vector3(
-                            j * spacing - offsetX,
-                            i * spacing - offsetY,
-                            0,
-                        ),
-                    );
-                    count++;
-                }
-            }
-        }
-        if (numDeviceQubits <= 1 || !couplingMap) {
-            postMessage({
-                qubitPositions: Array.from(qubitPositions.entries()),
-            });
-            return;
-        }
+    if (!couplingMap || n <= 1) {
+        postPositions(gridPositions(n, idealDist));
+        return;
     }
 
-    for (let i = 0; i < numDeviceQubits; i++) {
-        if (!qubitPositions.has(i)) {
-            qubitPositions.set(
-                i,
-                new THREE.Vector3(
-                    (Math.random() - 0.5) * areaWidth * 0.1,
-                    (Math.random() - 0.5) * areaHeight * 0.1,
-                    (Math.random() - 0.5) * areaDepth * 0.1,
-                ),
-            );
+    // Edge endpoints as flat arrays, dropping malformed or out-of-range pairs
+    const edgeU = new Int32Array(couplingMap.length);
+    const edgeV = new Int32Array(couplingMap.length);
+    let numEdges = 0;
+    for (const pair of couplingMap as number[][]) {
+        if (pair.length === 2 && pair[0] < n && pair[1] < n) {
+            edgeU[numEdges] = pair[0];
+            edgeV[numEdges] = pair[1];
+            numEdges++;
         }
     }
 
+    const positions = new Float32Array(n * 3);
+    const forces = new Float32Array(n * 3);
+    for (let i = 0; i < n; i++) {
+        positions[3 * i] = (Math.random() - 0.5) * areaWidth * 0.1;
+        positions[3 * i + 1] = (Math.random() - 0.5) * areaHeight * 0.1;
+        positions[3 * i + 2] = (Math.random() - 0.5) * areaDepth * 0.1;
+    }
+
+    const octree = new OctreePool(n * 4);
+    const kRepelSq = kRepel * kRepel;
     let temperature = Math.max(areaWidth, areaHeight, areaDepth) / 10;
+
     for (let iter = 0; iter < iterations; iter++) {
-        const forces = new Map<number, THREE.Vector3>();
-        for (let i = 0; i < numDeviceQubits; i++)
-            forces.set(i, new THREE.Vector3(0, 0, 0));
-
-        const boundingBox = new THREE.Box3();
-        qubitPositions.forEach((pos) => boundingBox.expandByPoint(pos));
-        const octree = new OctreeNode(boundingBox);
-        qubitPositions.forEach((pos, id) =>
-            octree.insert(id, pos, qubitPositions),
-        );
+        forces.fill(0);
 
-        for (let i = 0; i < numDeviceQubits; i++) {
-            const posI = qubitPositions.get(i)!;
-            const force = new THREE.Vector3();
-            calculateRepulsiveForce(
-                octree,
-                posI,
+        octree.build(positions, n);
+        for (let i = 0; i < n; i++) {
+            octree.accumulateRepulsion(
                 i,
-                force,
-                kRepel,
+                positions,
+                forces,
+                kRepelSq,
                 barnesHutTheta,
             );
-            forces.get(i)!.add(force);
         }
 
-        if (couplingMap) {
-            couplingMap.forEach((pair: number[]) => {
-                if (pair.length === 2) {
-                    const u = pair[0];
-                    const v = pair[1];
-                    const posU = qubitPositions.get(u)!;
-                    const posV = qubitPositions.get(v)!;
-                    if (posU && posV) {
-                        const delta = new THREE.Vector3().subVectors(
-                            posV,
-                            posU,
-                        );
-                        const dist = delta.length() || 1e-6;
-                        const forceMag = kAttract * (dist - idealDist);
-                        const forceVec = delta
-                            .normalize()
-                            .multiplyScalar(forceMag);
-                        forces.get(u)!.add(forceVec);
-                        forces.get(v)!.sub(forceVec);
-                    }
-                }
-            });
+        for (let e = 0; e < numEdges; e++) {
+            const u = 3 * edgeU[e];
+            const v = 3 * edgeV[e];
+            const dx = positions[v] - positions[u];
+            const dy = positions[v + 1] - positions[u + 1];
+            const dz = positions[v + 2] - positions[u + 2];
+            const length = Math.sqrt(dx * dx + dy * dy + dz * dz);
+            if (length === 0) continue;
+            const scale = (kAttract * (length - idealDist)) / length;
+            forces[u] += dx * scale;
+            forces[u + 1] += dy * scale;
+            forces[u + 2] += dz * scale;
+            forces[v] -= dx * scale;
+            forces[v + 1] -= dy * scale;
+            forces[v + 2] -= dz * scale;
         }
 
-        for (let i = 0; i < numDeviceQubits; i++) {
-            const pos = qubitPositions.get(i)!;
-            const force = forces.get(i)!;
-            const displacement = force
-                .clone()
-                .normalize()
-                .multiplyScalar(Math.min(force.length(), temperature));
-            pos.add(displacement);
+        for (let i = 0; i < 3 * n; i += 3) {
+            const fx = forces[i];
+            const fy = forces[i + 1];
+            const fz = forces[i + 2];
+            const magnitude = Math.sqrt(fx * fx + fy * fy + fz * fz);
+            if (magnitude === 0) continue;
+            const step = Math.min(magnitude, temperature) / magnitude;
+            positions[i] += fx * step;
+            positions[i + 1] += fy * step;
+            positions[i + 2] += fz * step;
         }
         temperature *= coolingFactor;
     }
@@ -266,14 +369,14 @@ self.onmessage = (event) => {
     let maxX = -Infinity,
         maxY = -Infinity,
         maxZ = -Infinity;
-    qubitPositions.forEach((pos) => {
-        minX = Math.min(minX, pos.x);
-        minY = Math.min(minY, pos.y);
-        minZ = Math.min(minZ, pos.z);
-        maxX = Math.max(maxX, pos.x);
-        maxY = Math.max(maxY, pos.y);
-        maxZ = Math.max(maxZ, pos.z);
-    });
+    for (let i = 0; i < 3 * n; i += 3) {
+        minX = Math.min(minX, positions[i]);
+        minY = Math.min(minY, positions[i + 1]);
+        minZ = Math.min(minZ, positions[i + 2]);
+        maxX = Math.max(maxX, positions[i]);
+        maxY = Math.max(maxY, positions[i + 1]);
+        maxZ = Math.max(maxZ, positions[i + 2]);
+    }
     const currentWidth = maxX - minX;
     const currentHeight = maxY - minY;
     const currentDepth = maxZ - minZ;
@@ -283,11 +386,11 @@ self.onmessage = (event) => {
             areaHeight / (currentHeight || 1),
             areaDepth / (currentDepth || 1),
         ) * 0.8;
-    qubitPositions.forEach((pos) => {
-        pos.x = (pos.x - (minX + currentWidth / 2)) * scale;
-        pos.y = (pos.y - (minY + currentHeight / 2)) * scale;
-        pos.z = (pos.z - (minZ + currentDepth / 2)) * scale;
-    });
+    for (let i = 0; i < 3 * n; i += 3) {
+        positions[i] = (positions[i] - (minX + currentWidth / 2)) * scale;
+        positions[i + 1] = (positions[i + 1] - (minY + currentHeight / 2)) * scale;
+        positions[i + 2] = (positions[i + 2] - (minZ + currentDepth / 2)) * scale;
+    }
 
-    postMessage({ qubitPositions: Array.from(qubitPositions.entries()) });
+    postPositions(positions);
 };
@@ -0,0 +1,154 @@
+/**
+ * Lightweight per-subsystem timing of the render path.
+ *
+ * Call sites wrap work in `begin(span)` / `end(span, start)`. Each span keeps
+ * its last SAMPLE_WINDOW durations in a ring buffer, from which rolling
+ * percentiles are computed only when a snapshot is requested. Every sample
+ * is also emitted as a `quvis:<span>` User Timing measure (and cleared right
+ * away so the entry buffer does not grow), so the spans line up with the
+ * browser's performance timeline when a trace is recorded.
+ */
+
+export interface SpanStats {
+    span: string;
+    samples: number;
+    p50: number;
+    p95: number;
+    mean: number;
+    max: number;
+    last: number;
+}
+
+export interface FrameProfile {
+    capturedAt: string;
+    userAgent: string;
+    windowSize: number;
+    spans: SpanStats[];
+    context: Record<string, unknown>;
+}
+
+class SpanSamples {
+    readonly durations: Float64Array;
+    count = 0;
+    next = 0;
+    last = 0;
+
+    constructor(windowSize: number) {
+        this.durations = new Float64Array(windowSize);
+    }
+
+    add(duration: number): void {
+        this.durations[this.next] = duration;
+        this.next = (this.next + 1) % this.durations.length;
+        if (this.count < this.durations.length) this.count++;
+        this.last = duration;
+    }
+}
+
+export class FrameProfiler {
+    static readonly SAMPLE_WINDOW = 240;
+
+    private readonly spans: Map<string, SpanSamples> = new Map();
+    private readonly windowSize: number;
+    private readonly userTiming: boolean;
+    enabled = true;
+
+    constructor(windowSize = FrameProfiler.SAMPLE_WINDOW) {
+        this.windowSize = windowSize;
+        this.userTiming =
+            typeof performance !== "undefined" &&
+            typeof performance.measure === "function" &&
+            typeof performance.clearMeasures === "function";
+    }
+
+    /**
+     * Starts a span; pass the returned value to end(). Returns -1 while the
+     * profiler is disabled.
+     */
+    begin(): number {
+        return this.enabled ? performance.now() : -1;
+    }
+
+    /**
+     * Records the time since `start` (from begin()) under `span`
+     */
+    end(span: string, start: number): void {
+        if (start < 0) return;
+        const end = performance.now();
+        this.record(span, end - start);
+        if (this.userTiming) {
+            const name = `quvis:${span}`;
+            try {
+                performance.measure(name, { start, end });
+                performance.clearMeasures(name);
+            } catch {
+                // User Timing Level 3 options are not supported everywhere
+            }
+        }
+    }
+
+    /**
+     * Adds a duration (ms) measured elsewhere, e.g. across a worker round trip
+     */
+    record(span: string, duration: number): void {
+        if (!this.enabled) return;
+        let samples = this.spans.get(span);
+        if (!samples) {
+            samples = new SpanSamples(this.windowSize);
+            this.spans.set(span, samples);
+        }
+        samples.add(duration);
+    }
+
+    /**
+     * Rolling statistics of every span, sorted by name
+     */
+    snapshot(): SpanStats[] {
+        const stats: SpanStats[] = [];
+        for (const [span, samples] of this.spans) {
+            if (samples.count === 0) continue;
+            const sorted = samples.durations.slice(0, samples.count).sort();
+            let sum = 0;
+            for (let i = 0; i < sorted.length; i++) sum += sorted[i];
+            stats.push({
+                span,
+                samples: samples.count,
+                p50: FrameProfiler.percentile(sorted, 0.5),
+                p95: FrameProfiler.percentile(sorted, 0.95),
+                mean: sum / sorted.length,
+                max: sorted[sorted.length - 1],
+                last: samples.last,
+            });
+        }
+        return stats.sort((a, b) => a.span.localeCompare(b.span));
+    }
+
+    /**
+     * Snapshot plus environment details, for attaching to bug reports
+     */
+    exportProfile(context: Record<string, unknown> = {}): FrameProfile {
+        return {
+            capturedAt: new Date().toISOString(),
+            userAgent:
+                typeof navigator !== "undefined" ? navigator.userAgent : "",
+            windowSize: this.windowSize,
+            spans: this.snapshot(),
+            context,
+        };
+    }
+
+    reset(): void {
+        this.spans.clear();
+    }
+
+    /**
+     * Nearest-rank percentile of ascending samples
+     */
+    private static percentile(sorted: Float64Array, q: number): number {
+        const rank = Math.ceil(q * sorted.length) - 1;
+        return sorted[Math.min(sorted.length - 1, Math.max(0, rank))];
+    }
+}
+
+// Shared by all render-path subsystems
+export const frameProfiler = new FrameProfiler();
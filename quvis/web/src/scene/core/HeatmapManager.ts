@@ -1,6 +1,8 @@
 import * as THREE from "three";
 import { Heatmap } from "../objects/Heatmap.js";
 import { HeatmapLegend } from "../objects/Legend.js";
+import { CumulativeCounts } from "../../data/models/CumulativeCounts.js";
+import { frameProfiler } from "./FrameProfiler.js";
 
 export class HeatmapManager {
     private heatmap: Heatmap;
@@ -66,7 +68,7 @@ export class HeatmapManager {
     updateHeatmap(
         qubitPositions: Map<number, THREE.Vector3>,
         effectiveSliceIndex: number,
-        cumulativeQubitInteractions: number[][],
+        cumulativeQubitInteractions: CumulativeCounts,
     ): {
         maxObservedRawWeightedSum: number;
         numSlicesEffectivelyUsed: number;
@@ -81,11 +83,13 @@ export class HeatmapManager {
             return result;
         }
 
+        const start = frameProfiler.begin();
         const result = this.heatmap.updatePoints(
             qubitPositions,
             effectiveSliceIndex,
             cumulativeQubitInteractions,
         );
+        frameProfiler.end("heatmap.update", start);
 
         this.updateHeatmapResults(
             result.maxObservedRawWeightedSum,
@@ -171,11 +175,17 @@ export class HeatmapManager {
     }
 
     /**
-     * Update heatmap Level of Detail
+     * Update heatmap Level of Detail. With a camera distance, coarser
+     * cluster levels are shown the further the camera is beyond
+     * `lowDetailDistance`.
      */
-    setLOD(level: "high" | "low"): void {
+    setLOD(
+        level: "high" | "low",
+        cameraDistance?: number,
+        lowDetailDistance?: number,
+    ): void {
         if (this.heatmap) {
-            this.heatmap.setLOD(level);
+            this.heatmap.setLOD(level, cameraDistance, lowDetailDistance);
         }
     }
 
@@ -250,7 +260,7 @@ export class HeatmapManager {
         this.recreateHeatmap(camera, fallbackQubitCount);
 
         // Update with empty data
-        this.updateHeatmap(new Map(), -1, []);
+        this.updateHeatmap(new Map(), -1, new CumulativeCounts(0, 0));
 
         console.log("HeatmapManager: Created fallback heatmap for error state");
     }
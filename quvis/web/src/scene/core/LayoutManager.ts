@@ -1,4 +1,17 @@
 import * as THREE from "three";
+import { frameProfiler } from "./FrameProfiler.js";
+
+/**
+ * Force parameters the backend computed its precomputed layout with, as
+ * shipped in device_info.layout_parameters
+ */
+export interface PrecomputedLayoutParameters {
+    k_repel: number;
+    ideal_dist: number;
+    k_attract: number;
+    iterations: number;
+    cooling_factor: number;
+}
 
 interface LayoutParameters {
     kRepel: number;
@@ -143,12 +156,62 @@ export class LayoutManager {
     }
 
     /**
-     * Calculate force-directed layout using web worker
+     * Whether the current force parameters are the ones the backend
+     * computed its precomputed layout with
+     */
+    private matchesForceParameters(
+        parameters: PrecomputedLayoutParameters,
+    ): boolean {
+        return (
+            this.layoutParams.kRepel === parameters.k_repel &&
+            this.layoutParams.idealDist === parameters.ideal_dist &&
+            this.layoutParams.iterations === parameters.iterations &&
+            this.layoutParams.coolingFactor === parameters.cooling_factor &&
+            this.layoutParams.kAttract === parameters.k_attract
+        );
+    }
+
+    /**
+     * Scale normalized backend positions into the layout area, the same way
+     * the worker rescales its final positions
+     */
+    private applyPrecomputedLayout(positions: number[][]): void {
+        const extent = [0, 1, 2].map((axis) => {
+            let min = Infinity;
+            let max = -Infinity;
+            for (const position of positions) {
+                min = Math.min(min, position[axis]);
+                max = Math.max(max, position[axis]);
+            }
+            return max - min;
+        });
+        const scale =
+            Math.min(
+                this.layoutAreaSide / (extent[0] || 1),
+                this.layoutAreaSide / (extent[1] || 1),
+                (this.layoutAreaSide * LayoutManager.LAYOUT_DEPTH_FACTOR) /
+                    (extent[2] || 1),
+            ) * 0.8;
+
+        this.qubitPositions = new Map(
+            positions.map(([x, y, z], id) => [
+                id,
+                new THREE.Vector3(x * scale, y * scale, z * scale),
+            ]),
+        );
+    }
+
+    /**
+     * Calculate force-directed layout using web worker. Positions precomputed
+     * by the backend are used instead while the force parameters match the
+     * ones they were computed with.
      */
     async calculateForceDirectedLayout(
         numDeviceQubits: number,
         couplingMap: number[][] | null,
         onLayoutComplete: (positions: Map<number, THREE.Vector3>) => void,
+        precomputedPositions?: number[][],
+        precomputedParameters?: PrecomputedLayoutParameters,
     ): Promise<void> {
         if (numDeviceQubits === 0) {
             this.qubitPositions.clear();
@@ -166,20 +229,39 @@ export class LayoutManager {
 
         const startTime = performance.now();
 
+        if (
+            precomputedPositions?.length === numDeviceQubits &&
+            precomputedParameters &&
+            this.matchesForceParameters(precomputedParameters)
+        ) {
+            this.applyPrecomputedLayout(precomputedPositions);
+            this.lastLayoutCalculationTime = performance.now() - startTime;
+            onLayoutComplete(this.qubitPositions);
+            return;
+        }
+
         this.layoutWorker.onmessage = (event) => {
             this.lastLayoutCalculationTime = performance.now() - startTime;
-            const { qubitPositions } = event.data;
-
-            this.qubitPositions = new Map(
-                qubitPositions.map(
-                    ([id, pos]: [
-                        number,
-                        { x: number; y: number; z: number },
-                    ]) => {
-                        return [id, new THREE.Vector3(pos.x, pos.y, pos.z)];
-                    },
-                ),
+            frameProfiler.record(
+                "layout.worker",
+                this.lastLayoutCalculationTime,
             );
+            const applyStart = frameProfiler.begin();
+            const { positions } = event.data as { positions: Float32Array };
+
+            const layout = new Map<number, THREE.Vector3>();
+            for (let i = 0; i < positions.length / 3; i++) {
+                layout.set(
+                    i,
+                    new THREE.Vector3(
+                        positions[3 * i],
+                        positions[3 * i + 1],
+                        positions[3 * i + 2],
+                    ),
+                );
+            }
+            this.qubitPositions = layout;
+            frameProfiler.end("layout.apply", applyStart);
 
             onLayoutComplete(this.qubitPositions);
         };
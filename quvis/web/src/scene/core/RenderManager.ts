@@ -3,6 +3,8 @@ import { Qubit } from '../../data/models/Qubit.js';
 import { State } from '../../data/models/State.js';
 import { BlochSphere } from '../objects/BlochSphere.js';
 import { CircuitDataManager } from '../../data/managers/CircuitDataManager.js';
+import { CumulativeCounts } from '../../data/models/CumulativeCounts.js';
+import { frameProfiler } from './FrameProfiler.js';
 
 const CYLINDER_VERTEX_SHADER = `
     varying vec3 vNormal;
@@ -392,6 +394,7 @@ export class RenderManager {
             return;
         }
 
+        const start = frameProfiler.begin();
         if (visualizationMode === 'logical') {
             this.drawLogicalConnections(
                 currentSliceInteractionPairs,
@@ -421,6 +424,7 @@ export class RenderManager {
                 this.logicalConnectionMesh.instanceMatrix.needsUpdate = true;
             }
         }
+        frameProfiler.end('connections.update', start);
     }
 
     /**
@@ -521,7 +525,7 @@ export class RenderManager {
                 processedSlicesCount: ${dataManager.processedSlicesCount}
                 lastLoadedSlice: ${lastLoadedSlice}
                 effectiveSliceIndex: ${effectiveSliceIndex}
-                cumulativeData available pairs: ${dataManager.cumulativeWeightedPairInteractionData.size}`);
+                cumulativeData available pairs: ${dataManager.cumulativeEdgeInteractionData.width}`);
         }
 
         const weight_base = this.heatmapWeightBase;
@@ -536,7 +540,8 @@ export class RenderManager {
 
             const { interactionsInWindow } =
                 dataManager.getInteractionCountForPair(
-                    key,
+                    q1,
+                    q2,
                     effectiveSliceIndex,
                     maxSlicesForHeatmap
                 );
@@ -649,19 +654,37 @@ export class RenderManager {
     }
 
     /**
-     * Update qubit opacities based on interaction intensity
+     * Update qubit opacities based on interaction intensity. When the
+     * cumulative qubit counts cover the current slice, window counts are
+     * read from them instead of scanning the per-slice sets.
      */
     updateQubitOpacities(
         lastCalculatedSlicesChangeIDs: Array<Set<number>>,
-        maxSlicesForHeatmap: number
+        maxSlicesForHeatmap: number,
+        qubitCounts?: CumulativeCounts,
+        currentSliceIndex: number = -1
     ): void {
+        const useCounts =
+            qubitCounts !== undefined &&
+            currentSliceIndex >= 0 &&
+            qubitCounts.processedSlices > currentSliceIndex;
+
+        const start = frameProfiler.begin();
         this.qubitInstances.forEach((qubit, qubitId) => {
             if (qubit.blochSphere) {
-                const intensity = this.getQubitInteractionIntensity(
-                    qubitId,
-                    lastCalculatedSlicesChangeIDs,
-                    maxSlicesForHeatmap
-                );
+                const intensity = useCounts
+                    ? this.getQubitInteractionIntensityFromCounts(
+                          qubitId,
+                          qubitCounts!,
+                          currentSliceIndex,
+                          lastCalculatedSlicesChangeIDs.length,
+                          maxSlicesForHeatmap
+                      )
+                    : this.getQubitInteractionIntensity(
+                          qubitId,
+                          lastCalculatedSlicesChangeIDs,
+                          maxSlicesForHeatmap
+                      );
                 if (intensity <= 0.001) {
                     qubit.blochSphere.setOpacity(
                         this.renderParams.inactiveElementAlpha
@@ -671,6 +694,33 @@ export class RenderManager {
                 }
             }
         });
+        frameProfiler.end('qubits.opacity', start);
+    }
+
+    /**
+     * Same intensity as getQubitInteractionIntensity, over the window of
+     * consecutive slices ending at currentSliceIndex that it would consider
+     */
+    private getQubitInteractionIntensityFromCounts(
+        qubitId: number,
+        qubitCounts: CumulativeCounts,
+        currentSliceIndex: number,
+        numSlicesInChangeData: number,
+        maxSlicesForHeatmap: number
+    ): number {
+        // Matches slicesChangeData.slice(0, maxSlicesForHeatmap).length
+        const windowLength =
+            maxSlicesForHeatmap >= 0
+                ? Math.min(numSlicesInChangeData, maxSlicesForHeatmap)
+                : Math.max(0, numSlicesInChangeData + maxSlicesForHeatmap);
+        if (windowLength === 0) return 0;
+
+        const interactionCount = qubitCounts.countInRange(
+            qubitId,
+            currentSliceIndex - windowLength + 1,
+            currentSliceIndex
+        );
+        return interactionCount / windowLength;
     }
 
     /**
@@ -712,6 +762,7 @@ export class RenderManager {
      * Update qubit states based on slice data
      */
     updateQubitStates(interactingQubits: Set<number>): void {
+        const start = frameProfiler.begin();
         this.qubitInstances.forEach((qubit, id) => {
             const targetState = interactingQubits.has(id)
                 ? State.ONE
@@ -721,6 +772,7 @@ export class RenderManager {
                 qubit.blochSphere.blochSphere.userData.qubitState = targetState;
             }
         });
+        frameProfiler.end('qubits.state', start);
     }
 
     /**
@@ -1,5 +1,6 @@
 import { Timeline } from "../../data/models/Timeline.js";
 import { Slice } from "../../data/models/Slice.js";
+import type { SliceOperationColumns } from "../../data/models/CircuitIngestion.js";
 
 export class VisualizationStateManager {
     private timeline: Timeline;
@@ -64,16 +65,18 @@ export class VisualizationStateManager {
     /**
      * Initialize slices from operations data
      */
-    initializeSlices(
-        allOperationsPerSlice: Array<Array<{ name: string; qubits: number[] }>>,
-    ): void {
-        this.slices = allOperationsPerSlice.map((ops_in_slice, sliceIdx) => {
+    initializeSlices(operations: SliceOperationColumns): void {
+        const { sliceOffsets, qubitOffsets, qubits } = operations;
+        this.slices = [];
+        for (let sliceIdx = 0; sliceIdx < sliceOffsets.length - 1; sliceIdx++) {
             const slice = new Slice(sliceIdx);
-            ops_in_slice.forEach((op) => {
-                op.qubits.forEach((qid) => slice.interacting_qubits.add(qid));
-            });
-            return slice;
-        });
+            // The qubits of a slice are contiguous
+            const end = qubitOffsets[sliceOffsets[sliceIdx + 1]];
+            for (let i = qubitOffsets[sliceOffsets[sliceIdx]]; i < end; i++) {
+                slice.interacting_qubits.add(qubits[i]);
+            }
+            this.slices.push(slice);
+        }
 
         // Reset current slice
         this.currentSliceIndex = this.slices.length > 0 ? 0 : -1;
@@ -250,15 +253,11 @@ export class VisualizationStateManager {
      * Get current interaction pairs for the current slice (for logical mode)
      */
     getCurrentSliceInteractionPairs(
-        interactionPairsPerSlice: Array<Array<{ q1: number; q2: number }>>,
+        getInteractionPairsForSlice: (
+            sliceIndex: number,
+        ) => Array<{ q1: number; q2: number }>,
     ): Array<{ q1: number; q2: number }> {
-        if (
-            this.currentSliceIndex >= 0 &&
-            this.currentSliceIndex < interactionPairsPerSlice.length
-        ) {
-            return interactionPairsPerSlice[this.currentSliceIndex];
-        }
-        return [];
+        return getInteractionPairsForSlice(this.currentSliceIndex);
     }
 
     /**
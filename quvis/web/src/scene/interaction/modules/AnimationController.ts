@@ -1,6 +1,7 @@
 import * as THREE from "three";
 import { OrbitControls } from "three/addons/controls/OrbitControls.js";
 import { QubitGridController } from "../../objects/QubitGridController.js";
+import { frameProfiler } from "../../core/FrameProfiler.js";
 
 export class AnimationController {
     private animationFrameId: number | null = null;
@@ -54,11 +55,13 @@ export class AnimationController {
         if (!this.isRunning) return;
 
         this.animationFrameId = requestAnimationFrame(() => this.animate());
+        const frameStart = frameProfiler.begin();
 
         // Update FPS counter
         this.updateFPS();
 
         // Update controls
+        const controlsStart = frameProfiler.begin();
         this.controls.update();
 
         // LOD update based on camera distance
@@ -66,6 +69,7 @@ export class AnimationController {
             const distance = this.controls.getDistance();
             this.grid.updateLOD(distance);
         }
+        frameProfiler.end("controls.lod", controlsStart);
 
         // Update camera position uniform for heatmap shader
         if (this.grid && this.grid.heatmap) {
@@ -84,10 +88,14 @@ export class AnimationController {
             }
             
             // Render the main scene without heatmap
+            const sceneStart = frameProfiler.begin();
             this.renderer.render(this.scene, this.camera);
+            frameProfiler.end("scene.render", sceneStart);
             
             // Render heatmap with two-pass system over the main scene
+            const heatmapStart = frameProfiler.begin();
             this.grid.heatmap.render(this.renderer, this.scene);
+            frameProfiler.end("heatmap.render", heatmapStart);
             
             // Restore heatmap mesh to scene for other operations
             if (wasInScene) {
@@ -95,8 +103,12 @@ export class AnimationController {
             }
         } else {
             // Standard single-pass rendering when no heatmap
+            const sceneStart = frameProfiler.begin();
             this.renderer.render(this.scene, this.camera);
+            frameProfiler.end("scene.render", sceneStart);
         }
+
+        frameProfiler.end("frame", frameStart);
     }
 
     private updateFPS(): void {
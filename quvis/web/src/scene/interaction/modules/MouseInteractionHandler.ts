@@ -10,6 +10,11 @@ export interface TooltipData {
     twoQubitGatesInWindow?: number;
     sliceWindowForGateCount?: number;
     fidelity?: number;
+    activeSlices?: number;
+    idleSlices?: number;
+    firstActiveSlice?: number;
+    lastActiveSlice?: number;
+    swapParticipation?: number;
 }
 
 export class MouseInteractionHandler {
@@ -185,6 +190,7 @@ export class MouseInteractionHandler {
                     twoQubitGatesInWindow: gateInfo.twoQubitGatesInWindow,
                     sliceWindowForGateCount: gateInfo.windowForCountsInWindow,
                     fidelity: finalFidelity,
+                    ...this.grid?.getQubitActivity(qubitId),
                 };
             }
         }
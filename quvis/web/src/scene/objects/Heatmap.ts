@@ -1,4 +1,6 @@
 import * as THREE from "three";
+import { CumulativeCounts } from "../../data/models/CumulativeCounts.js";
+import { HeatmapClusters } from "./HeatmapClusters.js";
 
 export class Heatmap {
     mesh: THREE.Points<THREE.BufferGeometry, THREE.ShaderMaterial>;
@@ -20,8 +22,12 @@ export class Heatmap {
         THREE.BufferGeometry,
         THREE.ShaderMaterial
     > | null = null;
-    private clusters: { position: THREE.Vector3; qubitIds: number[] }[] = [];
+    private static readonly QUBITS_PER_CLUSTER = 4;
+    private clusters: HeatmapClusters | null = null;
     private clusteredIntensities: Float32Array | null = null;
+    private clusterLevel = 1;
+    // Largest normalized intensity written by the last updatePoints call
+    private maxIntensity = 0;
 
     constructor(
         camera: THREE.PerspectiveCamera,
@@ -248,81 +254,39 @@ export class Heatmap {
             this.clusteredMesh.material.dispose();
             this.clusteredMesh = null;
         }
+        this.clusters = null;
+        this.clusteredIntensities = null;
 
-        const bbox = new THREE.Box3();
-        for (const pos of qubitPositions.values()) {
-            bbox.expandByPoint(pos);
-        }
-        if (bbox.isEmpty() || numDeviceQubits === 0) {
-            this.clusters = [];
-            return;
-        }
+        if (qubitPositions.size === 0 || numDeviceQubits === 0) return;
 
-        const numClustersTarget = Math.ceil(numDeviceQubits / 4);
-        const gridDivisions = Math.ceil(Math.pow(numClustersTarget, 1 / 3));
-
-        const gridSize = new THREE.Vector3();
-        bbox.getSize(gridSize);
-        const cellSize = new THREE.Vector3(
-            gridSize.x / gridDivisions,
-            gridSize.y / gridDivisions,
-            gridSize.z / gridDivisions,
-        );
-        if (cellSize.x === 0) cellSize.x = 1;
-        if (cellSize.y === 0) cellSize.y = 1;
-        if (cellSize.z === 0) cellSize.z = 1;
-
-        const grid: Map<
-            string,
-            { positionSum: THREE.Vector3; qubitIds: number[] }
-        > = new Map();
-
-        for (const [id, pos] of qubitPositions.entries()) {
-            const gridIndexX = Math.floor((pos.x - bbox.min.x) / cellSize.x);
-            const gridIndexY = Math.floor((pos.y - bbox.min.y) / cellSize.y);
-            const gridIndexZ = Math.floor((pos.z - bbox.min.z) / cellSize.z);
-            const key = `${gridIndexX},${gridIndexY},${gridIndexZ}`;
-
-            if (!grid.has(key)) {
-                grid.set(key, {
-                    positionSum: new THREE.Vector3(),
-                    qubitIds: [],
-                });
-            }
-            const cell = grid.get(key)!;
-            cell.positionSum.add(pos);
-            cell.qubitIds.push(id);
+        let numIds = 0;
+        for (const id of qubitPositions.keys()) {
+            if (id >= numIds) numIds = id + 1;
         }
-
-        this.clusters = [];
-        for (const cell of grid.values()) {
-            if (cell.qubitIds.length > 0) {
-                const avgPos = cell.positionSum.divideScalar(
-                    cell.qubitIds.length,
-                );
-                this.clusters.push({
-                    position: avgPos,
-                    qubitIds: cell.qubitIds,
-                });
-            }
+        const flatPositions = new Float32Array(numIds * 3);
+        const present = new Uint8Array(numIds);
+        for (const [id, pos] of qubitPositions) {
+            if (id < 0) continue;
+            flatPositions[id * 3] = pos.x;
+            flatPositions[id * 3 + 1] = pos.y;
+            flatPositions[id * 3 + 2] = pos.z;
+            present[id] = 1;
         }
 
-        if (this.clusters.length === 0) return;
-
-        const numClusters = this.clusters.length;
-        const clusteredPositions = new Float32Array(numClusters * 3);
-        this.clusteredIntensities = new Float32Array(numClusters);
-
-        for (let i = 0; i < numClusters; i++) {
-            clusteredPositions[i * 3] = this.clusters[i].position.x;
-            clusteredPositions[i * 3 + 1] = this.clusters[i].position.y;
-            clusteredPositions[i * 3 + 2] = this.clusters[i].position.z;
-        }
+        this.clusters = HeatmapClusters.build(
+            flatPositions,
+            present,
+            Heatmap.QUBITS_PER_CLUSTER,
+        );
+        if (!this.clusters) return;
 
+        this.clusteredIntensities = new Float32Array(
+            this.clusters.clusterCount,
+        );
         const geometry = new THREE.BufferGeometry();
         geometry.setAttribute(
             "position",
-            new THREE.BufferAttribute(clusteredPositions, 3),
+            new THREE.BufferAttribute(this.clusters.positions, 3),
         );
         geometry.setAttribute(
             "intensity",
@@ -336,6 +300,7 @@ export class Heatmap {
         this.clusteredMesh = new THREE.Points(geometry, clusteredMaterial);
         this.clusteredMesh.visible = false;
         this.mesh.parent?.add(this.clusteredMesh);
+        this.showClusterLevel(this.clusterLevel);
     }
 
     public updateBaseSize(newSize: number) {
@@ -345,10 +310,31 @@ export class Heatmap {
         }
     }
 
-    public setLOD(level: "high" | "low") {
+    /**
+     * Switches between per-qubit points ("high") and clusters ("low"). With
+     * a camera distance, the cluster level grows by one for every doubling
+     * of the distance beyond `lowDetailDistance`.
+     */
+    public setLOD(
+        level: "high" | "low",
+        cameraDistance?: number,
+        lowDetailDistance?: number,
+    ) {
         if (level === "low" && this.clusteredMesh) {
             this.mesh.visible = false;
             this.clusteredMesh.visible = true;
+            if (
+                this.clusters &&
+                cameraDistance !== undefined &&
+                lowDetailDistance !== undefined
+            ) {
+                this.showClusterLevel(
+                    this.clusters.levelForDistance(
+                        cameraDistance,
+                        lowDetailDistance,
+                    ),
+                );
+            }
         } else {
             this.mesh.visible = true;
             if (this.clusteredMesh) {
@@ -357,6 +343,23 @@ export class Heatmap {
         }
     }
 
+    /**
+     * Draws only the clusters of `level` (1 = finest), scaling the point
+     * size with the cell size of that level
+     */
+    private showClusterLevel(level: number) {
+        if (!this.clusters || !this.clusteredMesh) return;
+        this.clusterLevel = Math.max(
+            1,
+            Math.min(level, this.clusters.levelCount),
+        );
+        const start = this.clusters.levelOffsets[this.clusterLevel - 1];
+        const end = this.clusters.levelOffsets[this.clusterLevel];
+        this.clusteredMesh.geometry.setDrawRange(start, end - start);
+        this.clusteredMesh.material.uniforms.scaleFactor.value =
+            2 ** (this.clusterLevel - 1);
+    }
+
     public clearPositionsCache() {
         this.qubitPositions = []; // Reset the internal cache
     }
@@ -364,10 +367,15 @@ export class Heatmap {
     updatePoints(
         qubitPositions: Map<number, THREE.Vector3>,
         currentSliceIndex: number,
-        cumulativeInteractions: number[][],
+        cumulativeInteractions: CumulativeCounts | number[][],
     ): { maxObservedRawWeightedSum: number; numSlicesEffectivelyUsed: number } {
+        const counts = Array.isArray(cumulativeInteractions)
+            ? CumulativeCounts.fromSeries(cumulativeInteractions)
+            : cumulativeInteractions;
+
         if (qubitPositions.size === 0) {
             this.intensities.fill(0);
+            this.maxIntensity = 0;
             this.mesh.geometry.attributes.intensity.needsUpdate = true;
             if (this.clusteredIntensities) {
                 this.clusteredIntensities.fill(0);
@@ -395,14 +403,47 @@ export class Heatmap {
             );
         }
 
-        qubitPositions.forEach((pos, id) => {
-            this.positions[id * 3] = pos.x;
-            this.positions[id * 3 + 1] = pos.y;
-            this.positions[id * 3 + 2] = pos.z;
-        });
-        this.mesh.geometry.attributes.position.needsUpdate = true;
+        const positions = this.positions;
+        const intensities = this.intensities;
+        const numHeatmapPoints = positions.length / 3;
+
+        // Positions are cached per qubit until clearPositionsCache(); the
+        // GPU buffer is only re-uploaded when a coordinate actually changes
+        let positionsChanged = false;
+        for (const [id, pos] of qubitPositions) {
+            if (id < 0 || id >= numHeatmapPoints) continue;
+            let cached = this.qubitPositions[id];
+            if (
+                !cached &&
+                Number.isFinite(pos.x) &&
+                Number.isFinite(pos.y) &&
+                Number.isFinite(pos.z)
+            ) {
+                cached = this.qubitPositions[id] = new THREE.Vector3(
+                    pos.x,
+                    pos.y,
+                    pos.z,
+                );
+            }
+            const x = cached ? cached.x : 0;
+            const y = cached ? cached.y : 0;
+            const z = cached ? cached.z : 0;
+            const offset = id * 3;
+            if (
+                positions[offset] !== x ||
+                positions[offset + 1] !== y ||
+                positions[offset + 2] !== z
+            ) {
+                positions[offset] = x;
+                positions[offset + 1] = y;
+                positions[offset + 2] = z;
+                positionsChanged = true;
+            }
+        }
+        if (positionsChanged) {
+            this.mesh.geometry.attributes.position.needsUpdate = true;
+        }
 
-        let maxObservedRawWeightedSum = 0;
         const windowEndSlice = currentSliceIndex + 1;
         let windowStartSlice: number;
         if (this.maxSlices === -1) {
@@ -414,98 +455,25 @@ export class Heatmap {
         }
         const numSlicesInWindow = windowEndSlice - windowStartSlice;
 
-        const rawInteractionCounts: number[] = [];
+        // Raw window counts are written straight into the intensity buffer
+        // and normalized in place
         let maxObservedRawInteractionCount = 0;
-
-        const numHeatmapPoints = this.positions.length / 3;
-
         if (
-            cumulativeInteractions.length === 0 ||
-            (cumulativeInteractions[0] &&
-                cumulativeInteractions[0].length === 0) ||
-            currentSliceIndex < 0
+            counts.width === 0 ||
+            counts.processedSlices === 0 ||
+            currentSliceIndex < 0 ||
+            numSlicesInWindow <= 0
         ) {
-            // Handle case with no data
-            for (let i = 0; i < numHeatmapPoints; i++) {
-                this.intensities[i] = 0;
-                const pos = this.positions.slice(i * 3, i * 3 + 3);
-                if (!this.qubitPositions[i] && pos.every(Number.isFinite)) {
-                    this.qubitPositions[i] = new THREE.Vector3(
-                        pos[0],
-                        pos[1],
-                        pos[2],
-                    );
-                }
-                const posVec = this.qubitPositions[i];
-                if (posVec) {
-                    this.positions[i * 3] = posVec.x;
-                    this.positions[i * 3 + 1] = posVec.y;
-                    this.positions[i * 3 + 2] = posVec.z;
-                } else {
-                    this.positions[i * 3] = 0;
-                    this.positions[i * 3 + 1] = 0;
-                    this.positions[i * 3 + 2] = 0;
-                }
-            }
+            intensities.fill(0);
         } else {
-            for (
-                let heatmapQubitId = 0;
-                heatmapQubitId < numHeatmapPoints;
-                heatmapQubitId++
-            ) {
-                const pos = this.positions.slice(
-                    heatmapQubitId * 3,
-                    heatmapQubitId * 3 + 3,
+            for (let i = 0; i < numHeatmapPoints; i++) {
+                // Window counts are clamped to the slices processed so far
+                const interactionCount = counts.countInRange(
+                    i,
+                    windowStartSlice,
+                    windowEndSlice - 1,
                 );
-                if (
-                    !this.qubitPositions[heatmapQubitId] &&
-                    pos.every(Number.isFinite)
-                ) {
-                    this.qubitPositions[heatmapQubitId] = new THREE.Vector3(
-                        pos[0],
-                        pos[1],
-                        pos[2],
-                    );
-                }
-                const posVec = this.qubitPositions[heatmapQubitId];
-
-                if (posVec) {
-                    this.positions[heatmapQubitId * 3] = posVec.x;
-                    this.positions[heatmapQubitId * 3 + 1] = posVec.y;
-                    this.positions[heatmapQubitId * 3 + 2] = posVec.z;
-                } else {
-                    this.positions[heatmapQubitId * 3] = 0;
-                    this.positions[heatmapQubitId * 3 + 1] = 0;
-                    this.positions[heatmapQubitId * 3 + 2] = 0;
-                }
-
-                let interactionCount = 0;
-                if (
-                    numSlicesInWindow > 0 &&
-                    heatmapQubitId < cumulativeInteractions.length &&
-                    cumulativeInteractions[heatmapQubitId] && 
-                    cumulativeInteractions[heatmapQubitId].length > 0
-                ) {
-                    // Check if we have enough data for the requested window
-                    const qubitCumulativeData = cumulativeInteractions[heatmapQubitId];
-                    const maxAvailableSlice = qubitCumulativeData.length - 1;
-                    
-                    if (maxAvailableSlice >= 0) {
-                        // Use the available data, clamping indices to what we have
-                        const effectiveEndSlice = Math.min(windowEndSlice - 1, maxAvailableSlice);
-                        const effectiveStartSlice = Math.max(0, Math.min(windowStartSlice - 1, maxAvailableSlice));
-                        
-                        if (effectiveEndSlice >= 0) {
-                            const cumulativeAtEnd = qubitCumulativeData[effectiveEndSlice];
-                            const cumulativeAtStart = windowStartSlice > 0 && effectiveStartSlice >= 0
-                                ? qubitCumulativeData[effectiveStartSlice]
-                                : 0;
-                            interactionCount = Math.max(0, cumulativeAtEnd - cumulativeAtStart);
-                        }
-                    }
-                }
-
-                rawInteractionCounts.push(interactionCount);
+                intensities[i] = interactionCount;
                 if (interactionCount > maxObservedRawInteractionCount) {
                     maxObservedRawInteractionCount = interactionCount;
                 }
@@ -513,75 +481,37 @@ export class Heatmap {
         }
 
         // Normalize intensities based on the maximum observed interaction count in the current window.
-        const denominator =
-            maxObservedRawInteractionCount > 0
-                ? maxObservedRawInteractionCount
-                : 1.0;
-
-        for (let i = 0; i < rawInteractionCounts.length; i++) {
-            const currentRawCount = rawInteractionCounts[i];
-            if (maxObservedRawInteractionCount === 0) {
-                // If no interactions anywhere, all intensities are 0
-                this.intensities[i] = 0.0;
-            } else {
-                // Normalize intensity based on the max observed in the current set of slices.
-                const normalizedIntensity = currentRawCount / denominator;
-                // Ensure intensity is strictly within [0,1]
-                this.intensities[i] = Math.max(
-                    0.0,
-                    Math.min(1.0, normalizedIntensity),
+        if (maxObservedRawInteractionCount > 0) {
+            for (let i = 0; i < numHeatmapPoints; i++) {
+                intensities[i] = Math.min(
+                    1.0,
+                    intensities[i] / maxObservedRawInteractionCount,
                 );
             }
+            this.maxIntensity = 1.0;
+        } else {
+            this.maxIntensity = 0;
         }
 
         this.mesh.geometry.attributes.intensity.needsUpdate = true;
 
-        if (
-            this.clusteredMesh &&
-            this.clusteredIntensities &&
-            this.clusters.length > 0
-        ) {
-            const perQubitNormalizedIntensities = this.intensities;
-
-            for (let i = 0; i < this.clusters.length; i++) {
-                const cluster = this.clusters[i];
-                let totalIntensity = 0;
-                for (const qubitId of cluster.qubitIds) {
-                    if (qubitId < perQubitNormalizedIntensities.length) {
-                        totalIntensity +=
-                            perQubitNormalizedIntensities[qubitId];
-                    }
-                }
-                const avgIntensity =
-                    cluster.qubitIds.length > 0
-                        ? totalIntensity / cluster.qubitIds.length
-                        : 0;
-                this.clusteredIntensities[i] = avgIntensity;
-            }
-
+        if (this.clusteredMesh && this.clusteredIntensities && this.clusters) {
+            this.clusters.aggregate(intensities, this.clusteredIntensities);
             (
                 this.clusteredMesh.geometry.attributes
                     .intensity as THREE.BufferAttribute
             ).needsUpdate = true;
         }
 
-        maxObservedRawWeightedSum = maxObservedRawInteractionCount;
-
         return {
-            maxObservedRawWeightedSum,
+            maxObservedRawWeightedSum: maxObservedRawInteractionCount,
             numSlicesEffectivelyUsed: numSlicesInWindow,
         };
     }
 
     public render(renderer: THREE.WebGLRenderer, targetScene?: THREE.Scene): void {
         // Update max intensity for proper normalization
-        let maxIntensity = 0;
-        for (let i = 0; i < this.intensities.length; i++) {
-            if (this.intensities[i] > maxIntensity) {
-                maxIntensity = this.intensities[i];
-            }
-        }
-        this.colorMappingMaterial.uniforms.maxIntensity.value = Math.max(maxIntensity, 0.1);
+        this.colorMappingMaterial.uniforms.maxIntensity.value = Math.max(this.maxIntensity, 0.1);
         
         // First pass: Render intensity accumulation to render target
         renderer.setRenderTarget(this.renderTarget);
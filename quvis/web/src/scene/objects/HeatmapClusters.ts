@@ -0,0 +1,275 @@
+/**
+ * Hierarchical spatial clusters of heatmap points.
+ *
+ * Level 1 groups qubits by an integer spatial hash over their positions;
+ * every further level hashes the centroids of the level below with twice
+ * the cell size, so each cluster has exactly one parent. All levels share
+ * flat buffers: cluster c of level l lives at index
+ * `levelOffsets[l - 1] + c` of `positions` and of the intensity arrays.
+ */
+export class HeatmapClusters {
+    static readonly MAX_LEVELS = 6;
+
+    readonly positions: Float32Array;
+    // levelOffsets[l - 1] .. levelOffsets[l] are the clusters of level l
+    readonly levelOffsets: Int32Array;
+    // Level 1 cluster of every qubit id, -1 for ids without a position
+    private readonly clusterOfQubit: Int32Array;
+    // Parent cluster of every cluster, -1 on the top level
+    private readonly parentOfCluster: Int32Array;
+    private readonly qubitCounts: Uint32Array;
+    private readonly intensitySums: Float32Array;
+
+    private constructor(
+        positions: Float32Array,
+        levelOffsets: Int32Array,
+        clusterOfQubit: Int32Array,
+        parentOfCluster: Int32Array,
+        qubitCounts: Uint32Array,
+    ) {
+        this.positions = positions;
+        this.levelOffsets = levelOffsets;
+        this.clusterOfQubit = clusterOfQubit;
+        this.parentOfCluster = parentOfCluster;
+        this.qubitCounts = qubitCounts;
+        this.intensitySums = new Float32Array(qubitCounts.length);
+    }
+
+    get levelCount(): number {
+        return this.levelOffsets.length - 1;
+    }
+
+    get clusterCount(): number {
+        return this.levelOffsets[this.levelOffsets.length - 1];
+    }
+
+    /**
+     * Builds the hierarchy from `qubitPositions`, a flat xyz buffer indexed
+     * by qubit id in which `present[id]` marks the ids that have a position.
+     * Level 1 targets about one cluster per `qubitsPerCluster` qubits.
+     */
+    static build(
+        qubitPositions: Float32Array,
+        present: Uint8Array,
+        qubitsPerCluster = 4,
+    ): HeatmapClusters | null {
+        const numIds = present.length;
+        let numPresent = 0;
+        let minX = Infinity, minY = Infinity, minZ = Infinity;
+        let maxX = -Infinity, maxY = -Infinity, maxZ = -Infinity;
+        for (let id = 0; id < numIds; id++) {
+            if (!present[id]) continue;
+            numPresent++;
+            const x = qubitPositions[id * 3];
+            const y = qubitPositions[id * 3 + 1];
+            const z = qubitPositions[id * 3 + 2];
+            if (x < minX) minX = x;
+            if (y < minY) minY = y;
+            if (z < minZ) minZ = z;
+            if (x > maxX) maxX = x;
+            if (y > maxY) maxY = y;
+            if (z > maxZ) maxZ = z;
+        }
+        if (numPresent === 0) return null;
+
+        const numClustersTarget = Math.ceil(numPresent / qubitsPerCluster);
+        const gridDivisions = Math.ceil(Math.pow(numClustersTarget, 1 / 3));
+        let cellX = (maxX - minX) / gridDivisions || 1;
+        let cellY = (maxY - minY) / gridDivisions || 1;
+        let cellZ = (maxZ - minZ) / gridDivisions || 1;
+
+        const hash = new SpatialHash(numPresent);
+        const clusterOfQubit = new Int32Array(numIds).fill(-1);
+
+        // Level 1: qubits into cells
+        hash.reset(numPresent);
+        for (let id = 0; id < numIds; id++) {
+            if (!present[id]) continue;
+            clusterOfQubit[id] = hash.insert(
+                Math.floor((qubitPositions[id * 3] - minX) / cellX),
+                Math.floor((qubitPositions[id * 3 + 1] - minY) / cellY),
+                Math.floor((qubitPositions[id * 3 + 2] - minZ) / cellZ),
+            );
+        }
+
+        // Clusters of all levels are appended to growable flat buffers
+        let capacity = Math.max(16, hash.size * 2);
+        let sums = new Float64Array(capacity * 3);
+        let counts = new Uint32Array(capacity);
+        let parents = new Int32Array(capacity).fill(-1);
+        const offsets = [0, hash.size];
+
+        for (let id = 0; id < numIds; id++) {
+            const c = clusterOfQubit[id];
+            if (c < 0) continue;
+            sums[c * 3] += qubitPositions[id * 3];
+            sums[c * 3 + 1] += qubitPositions[id * 3 + 1];
+            sums[c * 3 + 2] += qubitPositions[id * 3 + 2];
+            counts[c]++;
+        }
+
+        while (offsets.length - 1 < HeatmapClusters.MAX_LEVELS) {
+            const start = offsets[offsets.length - 2];
+            const end = offsets[offsets.length - 1];
+            if (end - start <= 1) break;
+
+            cellX *= 2;
+            cellY *= 2;
+            cellZ *= 2;
+            hash.reset(end - start);
+            for (let c = start; c < end; c++) {
+                parents[c] = end + hash.insert(
+                    Math.floor((sums[c * 3] / counts[c] - minX) / cellX),
+                    Math.floor((sums[c * 3 + 1] / counts[c] - minY) / cellY),
+                    Math.floor((sums[c * 3 + 2] / counts[c] - minZ) / cellZ),
+                );
+            }
+            if (hash.size === end - start) {
+                // Cells too small to merge anything; stop at this level
+                parents.fill(-1, start, end);
+                break;
+            }
+
+            const newEnd = end + hash.size;
+            if (newEnd > capacity) {
+                capacity = Math.max(capacity * 2, newEnd);
+                const grownSums = new Float64Array(capacity * 3);
+                grownSums.set(sums);
+                sums = grownSums;
+                const grownCounts = new Uint32Array(capacity);
+                grownCounts.set(counts);
+                counts = grownCounts;
+                const grownParents = new Int32Array(capacity).fill(-1);
+                grownParents.set(parents);
+                parents = grownParents;
+            }
+            for (let c = start; c < end; c++) {
+                const p = parents[c];
+                sums[p * 3] += sums[c * 3];
+                sums[p * 3 + 1] += sums[c * 3 + 1];
+                sums[p * 3 + 2] += sums[c * 3 + 2];
+                counts[p] += counts[c];
+            }
+            offsets.push(newEnd);
+        }
+
+        const numClusters = offsets[offsets.length - 1];
+        const positions = new Float32Array(numClusters * 3);
+        for (let c = 0; c < numClusters; c++) {
+            positions[c * 3] = sums[c * 3] / counts[c];
+            positions[c * 3 + 1] = sums[c * 3 + 1] / counts[c];
+            positions[c * 3 + 2] = sums[c * 3 + 2] / counts[c];
+        }
+
+        return new HeatmapClusters(
+            positions,
+            Int32Array.from(offsets),
+            clusterOfQubit,
+            parents.slice(0, numClusters),
+            counts.slice(0, numClusters),
+        );
+    }
+
+    /**
+     * Level whose clusters should be drawn at `cameraDistance`, given the
+     * distance at which the heatmap switches to clusters. Each doubling of
+     * the distance beyond it moves one level up.
+     */
+    levelForDistance(cameraDistance: number, lowDetailDistance: number): number {
+        if (!(lowDetailDistance > 0) || cameraDistance <= lowDetailDistance) {
+            return 1;
+        }
+        const level =
+            1 + Math.floor(Math.log2(cameraDistance / lowDetailDistance));
+        return Math.min(level, this.levelCount);
+    }
+
+    /**
+     * Writes the mean qubit intensity of every cluster into `out`, which
+     * must hold `clusterCount` entries. Does not allocate.
+     */
+    aggregate(qubitIntensities: ArrayLike<number>, out: Float32Array): void {
+        const sums = this.intensitySums;
+        sums.fill(0);
+        const numIds = Math.min(
+            this.clusterOfQubit.length,
+            qubitIntensities.length,
+        );
+        for (let id = 0; id < numIds; id++) {
+            const c = this.clusterOfQubit[id];
+            if (c >= 0) sums[c] += qubitIntensities[id];
+        }
+        // Parents always come after their children, so one pass in order
+        // finishes every cluster before it is propagated upwards
+        const numClusters = this.clusterCount;
+        for (let c = 0; c < numClusters; c++) {
+            const p = this.parentOfCluster[c];
+            if (p >= 0) sums[p] += sums[c];
+            out[c] = sums[c] / this.qubitCounts[c];
+        }
+    }
+}
+
+/**
+ * Open-addressing hash from integer cell coordinates to dense cell indices,
+ * assigned in insertion order
+ */
+class SpatialHash {
+    private keysX: Int32Array = new Int32Array(0);
+    private keysY: Int32Array = new Int32Array(0);
+    private keysZ: Int32Array = new Int32Array(0);
+    private values: Int32Array = new Int32Array(0);
+    private mask = 0;
+    size = 0;
+
+    constructor(maxEntries: number) {
+        this.reset(maxEntries);
+    }
+
+    /**
+     * Empties the table, growing it to hold `maxEntries` at a load of at
+     * most one half
+     */
+    reset(maxEntries: number): void {
+        let tableSize = 16;
+        while (tableSize < maxEntries * 2) tableSize *= 2;
+        if (tableSize > this.values.length) {
+            this.keysX = new Int32Array(tableSize);
+            this.keysY = new Int32Array(tableSize);
+            this.keysZ = new Int32Array(tableSize);
+            this.values = new Int32Array(tableSize);
+            this.mask = tableSize - 1;
+        }
+        this.values.fill(-1);
+        this.size = 0;
+    }
+
+    /**
+     * Returns the index of the cell, adding it if it is new
+     */
+    insert(x: number, y: number, z: number): number {
+        let slot =
+            (Math.imul(x, 73856093) ^
+                Math.imul(y, 19349663) ^
+                Math.imul(z, 83492791)) &
+            this.mask;
+        for (;;) {
+            const value = this.values[slot];
+            if (value < 0) {
+                this.keysX[slot] = x;
+                this.keysY[slot] = y;
+                this.keysZ[slot] = z;
+                this.values[slot] = this.size;
+                return this.size++;
+            }
+            if (
+                this.keysX[slot] === x &&
+                this.keysY[slot] === y &&
+                this.keysZ[slot] === z
+            ) {
+                return value;
+            }
+            slot = (slot + 1) & this.mask;
+        }
+    }
+}
@@ -66,6 +66,13 @@ export class QubitGridController {
 
         // Initialize subsystems
         this.dataManager = new CircuitDataManager();
+        // Refresh heatmap and connection intensities once the cumulative
+        // data has been built in the background
+        this.dataManager.onIngestionComplete = () => {
+            if (this.stateManager?.hasValidData()) {
+                this.updateVisualization();
+            }
+        };
         this.layoutManager = new LayoutManager(
             initialIterations,
             initialCoolingFactor,
@@ -216,7 +223,9 @@ export class QubitGridController {
                     }
 
                     onLayoutComplete?.();
-                }
+                },
+                this.dataManager.layoutPositions,
+                this.dataManager.layoutParameters
             );
         } else {
             onLayoutComplete?.();
@@ -316,7 +325,7 @@ export class QubitGridController {
         );
 
         // Reinitialize slices for new circuit
-        this.stateManager.initializeSlices(this.dataManager.operationsPerSlice);
+        this.stateManager.initializeSlices(this.dataManager.operationColumns);
 
         // Get the new device info and qubit count
         const deviceQubitCount = this.dataManager.deviceQubitCount;
@@ -370,17 +379,8 @@ export class QubitGridController {
 
         // Update connections based on circuit type
         if (this.dataManager.visualizationMode === 'logical') {
-            let maxLogicalConnections = 0;
-            this.dataManager.operationsPerSlice.forEach((ops_in_slice) => {
-                const twoQubitOps = ops_in_slice.filter(
-                    (op) => op.qubits.length === 2
-                ).length;
-                if (twoQubitOps > maxLogicalConnections) {
-                    maxLogicalConnections = twoQubitOps;
-                }
-            });
             this.renderManager.initializeLogicalInstancedConnections(
-                maxLogicalConnections
+                this.dataManager.maxTwoQubitOperationsPerSlice
             );
         } else {
             const couplingMap = this.dataManager.couplingMap;
@@ -522,13 +522,18 @@ export class QubitGridController {
             this.layoutManager.areaSide
         );
 
+        const lowDetailDistance = this.layoutManager.areaSide * 5;
         let heatmapLOD: 'high' | 'low';
-        if (cameraDistance > this.layoutManager.areaSide * 5) {
+        if (cameraDistance > lowDetailDistance) {
             heatmapLOD = 'low';
         } else {
             heatmapLOD = 'high';
         }
-        this.heatmapManager.setLOD(heatmapLOD);
+        this.heatmapManager.setLOD(
+            heatmapLOD,
+            cameraDistance,
+            lowDetailDistance
+        );
     }
 
     public setBlochSpheresVisible(visible: boolean): void {
@@ -556,11 +561,17 @@ export class QubitGridController {
         );
     }
 
+    public getQubitActivity(
+        qubitId: number
+    ): ReturnType<CircuitDataManager['getQubitActivity']> {
+        return this.dataManager.getQubitActivity(qubitId);
+    }
+
     public dispose(): void {
         console.log('QubitGridController dispose called');
 
         // Dispose of all subsystems
-        this.dataManager.clearData();
+        this.dataManager.dispose();
         this.layoutManager.dispose();
         this.renderManager.dispose();
         this.stateManager.dispose();
@@ -611,7 +622,7 @@ export class QubitGridController {
         }
 
         // Initialize slices in state manager
-        this.stateManager.initializeSlices(this.dataManager.operationsPerSlice);
+        this.stateManager.initializeSlices(this.dataManager.operationColumns);
 
         // Create qubits in render manager
         this.renderManager.createGrid(
@@ -678,7 +689,9 @@ export class QubitGridController {
         // Update qubit opacities
         this.renderManager.updateQubitOpacities(
             lastSliceChangeData,
-            maxSlicesForHeatmap
+            maxSlicesForHeatmap,
+            this.dataManager.cumulativeQubitInteractionData,
+            currentSliceIndex
         );
 
         // Update heatmap
@@ -702,8 +715,8 @@ export class QubitGridController {
 
         // Update connections
         const currentSliceInteractionPairs =
-            this.stateManager.getCurrentSliceInteractionPairs(
-                this.dataManager.interactionPairsPerSlice
+            this.stateManager.getCurrentSliceInteractionPairs((sliceIndex) =>
+                this.dataManager.getInteractionPairsForSlice(sliceIndex)
             );
 
         // Identify inter-core connections if modular info exists
@@ -154,6 +154,68 @@ describe("Heatmap LOD Functions", () => {
         });
     });
 
+    describe("Cluster hierarchy", () => {
+        const gridPositions = (side: number) => {
+            const positions = new Map<number, THREE.Vector3>();
+            for (let i = 0; i < side * side * side; i++) {
+                positions.set(
+                    i,
+                    new THREE.Vector3(
+                        i % side,
+                        Math.floor(i / side) % side,
+                        Math.floor(i / (side * side)),
+                    ),
+                );
+            }
+            return positions;
+        };
+
+        it("should draw coarser cluster levels as the camera moves away", () => {
+            // Arrange
+            const positions = gridPositions(8);
+            const largeHeatmap = new Heatmap(mockCamera, positions.size, 10);
+            largeHeatmap.generateClusters(positions, positions.size);
+            const geometry = largeHeatmap.clusteredMesh!.geometry;
+
+            // Act
+            largeHeatmap.setLOD("low", 100, 100);
+            const nearCount = geometry.drawRange.count;
+            largeHeatmap.setLOD("low", 800, 100);
+            const farCount = geometry.drawRange.count;
+
+            // Assert
+            expect(largeHeatmap.clusteredMesh!.visible).toBe(true);
+            expect(farCount).toBeGreaterThan(0);
+            expect(farCount).toBeLessThan(nearCount);
+            expect(
+                largeHeatmap.clusteredMesh!.material.uniforms.scaleFactor
+                    .value,
+            ).toBeGreaterThan(1);
+        });
+
+        it("should average qubit intensities on every level", () => {
+            // Arrange
+            const positions = gridPositions(4);
+            const largeHeatmap = new Heatmap(mockCamera, positions.size, 10);
+            largeHeatmap.generateClusters(positions, positions.size);
+            const series: number[][] = [];
+            for (let i = 0; i < positions.size; i++) {
+                series.push([i % 2]);
+            }
+
+            // Act
+            largeHeatmap.updatePoints(positions, 0, series);
+
+            // Assert: the coarsest level holds every qubit, half of them lit
+            largeHeatmap.setLOD("low", 1e9, 1);
+            const geometry = largeHeatmap.clusteredMesh!.geometry;
+            const intensities = geometry.attributes.intensity
+                .array as Float32Array;
+            expect(geometry.drawRange.count).toBe(1);
+            expect(intensities[geometry.drawRange.start]).toBeCloseTo(0.5);
+        });
+    });
+
     describe("Constructor initialization for LOD", () => {
         it("should initialize main mesh as visible by default", () => {
             // Assert
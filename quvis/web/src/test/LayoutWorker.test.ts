@@ -0,0 +1,136 @@
+import { describe, it, expect, beforeAll, beforeEach, vi } from "vitest";
+
+/**
+ * The layout worker registers self.onmessage on import and answers with
+ * postMessage, so both are stubbed and the handler is called directly.
+ */
+interface LayoutResult {
+    positions: Float32Array;
+    numQubits: number;
+}
+
+const postMessage = vi.fn();
+let handleMessage: (event: { data: unknown }) => void;
+
+const defaultRequest = {
+    areaWidth: 20,
+    areaHeight: 20,
+    areaDepth: 10,
+    iterations: 300,
+    coolingFactor: 0.95,
+    kRepel: 0.3,
+    idealDist: 5.0,
+    kAttract: 0.1,
+    barnesHutTheta: 0.8,
+};
+
+function runLayout(
+    numDeviceQubits: number,
+    couplingMap: number[][] | null,
+): { result: LayoutResult; transfer: ArrayBuffer[] } {
+    postMessage.mockClear();
+    handleMessage({
+        data: { ...defaultRequest, numDeviceQubits, couplingMap },
+    });
+    expect(postMessage.mock.calls.length).toBe(1);
+    const [result, options] = postMessage.mock.calls[0];
+    return { result, transfer: options.transfer };
+}
+
+function distance(positions: Float32Array, a: number, b: number): number {
+    const dx = positions[3 * a] - positions[3 * b];
+    const dy = positions[3 * a + 1] - positions[3 * b + 1];
+    const dz = positions[3 * a + 2] - positions[3 * b + 2];
+    return Math.sqrt(dx * dx + dy * dy + dz * dz);
+}
+
+function lineCouplingMap(numQubits: number): number[][] {
+    const edges: number[][] = [];
+    for (let i = 0; i + 1 < numQubits; i++) {
+        edges.push([i, i + 1], [i + 1, i]);
+    }
+    return edges;
+}
+
+describe("Layout worker", () => {
+    beforeAll(async () => {
+        vi.stubGlobal("self", globalThis);
+        vi.stubGlobal("postMessage", postMessage);
+        await import("../data/workers/layoutWorker.js");
+        handleMessage = (globalThis as unknown as { onmessage: typeof handleMessage })
+            .onmessage;
+    });
+
+    beforeEach(() => {
+        postMessage.mockClear();
+    });
+
+    it("should post an empty layout for a device without qubits", () => {
+        const { result } = runLayout(0, []);
+
+        expect(result.numQubits).toBe(0);
+        expect(result.positions.length).toBe(0);
+    });
+
+    it("should fall back to a grid without a coupling map", () => {
+        const { result } = runLayout(4, null);
+
+        // 2 x 2 grid centered on the origin, idealDist apart
+        expect(Array.from(result.positions)).toEqual([
+            -2.5, -2.5, 0, 2.5, -2.5, 0, -2.5, 2.5, 0, 2.5, 2.5, 0,
+        ]);
+    });
+
+    it("should transfer the positions buffer", () => {
+        const { result, transfer } = runLayout(6, lineCouplingMap(6));
+
+        expect(result.positions).toBeInstanceOf(Float32Array);
+        expect(result.numQubits).toBe(6);
+        expect(transfer.length).toBe(1);
+        expect(transfer[0]).toBe(result.positions.buffer);
+    });
+
+    it("should keep coupled qubits closer than distant ones", () => {
+        const numQubits = 16;
+        const { result } = runLayout(numQubits, lineCouplingMap(numQubits));
+        const positions = result.positions;
+
+        for (const value of positions) {
+            expect(Number.isFinite(value)).toBe(true);
+        }
+        for (let i = 0; i + 1 < numQubits; i++) {
+            expect(distance(positions, i, i + 1)).toBeLessThan(
+                distance(positions, 0, numQubits - 1),
+            );
+        }
+    });
+
+    it("should scale the layout into the requested area", () => {
+        const { result } = runLayout(25, lineCouplingMap(25));
+        const positions = result.positions;
+
+        // Centered and scaled to at most 80% of each side
+        for (let i = 0; i < positions.length; i += 3) {
+            expect(Math.abs(positions[i])).toBeLessThan(
+                defaultRequest.areaWidth * 0.4 + 1e-3,
+            );
+            expect(Math.abs(positions[i + 1])).toBeLessThan(
+                defaultRequest.areaHeight * 0.4 + 1e-3,
+            );
+            expect(Math.abs(positions[i + 2])).toBeLessThan(
+                defaultRequest.areaDepth * 0.4 + 1e-3,
+            );
+        }
+    });
+
+    it("should ignore coupling map pairs outside the device", () => {
+        const couplingMap = [...lineCouplingMap(5), [2, 7], [9, 1], [3]];
+
+        expect(() => runLayout(5, couplingMap)).not.toThrow();
+        const { result } = runLayout(5, couplingMap);
+        expect(result.numQubits).toBe(5);
+        for (const value of result.positions) {
+            expect(Number.isFinite(value)).toBe(true);
+        }
+    });
+});
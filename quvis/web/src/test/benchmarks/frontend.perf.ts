@@ -0,0 +1,285 @@
+/**
+ * Frontend performance benchmarks.
+ *
+ * Drives CircuitDataManager, LayoutManager and HeatmapManager headlessly on
+ * synthetic circuits and writes a JSON report that can be diffed across
+ * commits. Run with `npm run bench:web`; see README.md in this directory
+ * for the environment variables that select scenarios and the output path.
+ */
+
+import { afterAll, beforeAll, describe, expect, it, vi } from "vitest";
+import * as THREE from "three";
+import { execSync } from "node:child_process";
+import { mkdirSync, readFileSync, writeFileSync } from "node:fs";
+import { basename, dirname, resolve } from "node:path";
+import { CircuitDataManager } from "../../data/managers/CircuitDataManager.js";
+import {
+    encodeSliceOperations,
+    ingestCircuit,
+} from "../../data/models/CircuitIngestion.js";
+import { LayoutManager } from "../../scene/core/LayoutManager.js";
+import { HeatmapManager } from "../../scene/core/HeatmapManager.js";
+import {
+    SCENARIOS,
+    generateSyntheticCircuit,
+    seededRandom,
+} from "./syntheticCircuits.js";
+import type { SyntheticCircuit } from "./syntheticCircuits.js";
+import { HeadlessWorker, HeapSampler, latencyStats } from "./headless.js";
+import type { LatencyStats } from "./headless.js";
+
+const SEEK_SAMPLES = 200;
+const REPORT_VERSION = 1;
+
+interface ScenarioResult {
+    name: string;
+    numQubits: number;
+    numSlices: number;
+    numOperations: number;
+    generateMs: number | null;
+    loadMs: number;
+    cumulativeBuildMs: number;
+    workerIngestMs: number;
+    layoutMs: number;
+    heatmapClusterMs: number;
+    seekLatencyMs: {
+        random: LatencyStats;
+        sequential: LatencyStats;
+    };
+    peakHeapMB: number;
+    retainedHeapMB: number;
+}
+
+interface BenchmarkInput {
+    generateMs: number | null;
+    circuit: SyntheticCircuit;
+}
+
+interface BenchmarkCase {
+    name: string;
+    // Circuits are built inside the test, so only one is alive at a time
+    load: () => BenchmarkInput;
+}
+
+function selectedScenarios(): string[] {
+    const requested = process.env.QUVIS_BENCH_SCENARIOS;
+    if (!requested) return SCENARIOS.map((s) => s.name);
+    return requested
+        .split(",")
+        .map((name) => name.trim())
+        .filter((name) => name.length > 0);
+}
+
+function benchmarkCases(): BenchmarkCase[] {
+    const cases: BenchmarkCase[] = selectedScenarios().map((name) => {
+        const spec = SCENARIOS.find((s) => s.name === name);
+        if (!spec) throw new Error(`Unknown benchmark scenario '${name}'`);
+        return {
+            name,
+            load: () => {
+                const start = performance.now();
+                const circuit = generateSyntheticCircuit(spec);
+                return { generateMs: performance.now() - start, circuit };
+            },
+        };
+    });
+
+    // A data file as written by `python -m quvis.api.playground`; the
+    // last circuit is the compiled one
+    const fixture = process.env.QUVIS_BENCH_FIXTURE;
+    if (fixture) {
+        cases.push({
+            name: `fixture:${basename(fixture)}`,
+            load: () => {
+                const data = JSON.parse(readFileSync(fixture, "utf-8"));
+                const circuits = Array.isArray(data) ? data : data.circuits;
+                return {
+                    generateMs: null,
+                    circuit: circuits[circuits.length - 1],
+                };
+            },
+        });
+    }
+    return cases;
+}
+
+function operationsOf(circuit: SyntheticCircuit) {
+    return circuit.circuit_info.compiled_interaction_graph_ops_per_slice;
+}
+
+function gitCommit(): string | null {
+    if (process.env.GITHUB_SHA) return process.env.GITHUB_SHA;
+    try {
+        return execSync("git rev-parse HEAD", {
+            stdio: ["ignore", "pipe", "ignore"],
+        })
+            .toString()
+            .trim();
+    } catch {
+        return null;
+    }
+}
+
+async function runScenario(
+    name: string,
+    input: BenchmarkInput,
+): Promise<ScenarioResult> {
+    const { circuit } = input;
+    const numQubits = circuit.device_info.num_qubits_on_device;
+    const couplingMap = circuit.device_info.connectivity_graph_coupling_map;
+    const operations = operationsOf(circuit);
+    const numSlices = operations.length;
+    let numOperations = 0;
+    for (const slice of operations) numOperations += slice.length;
+
+    const heap = new HeapSampler();
+
+    // Load and cumulative data, on the main-thread path the browser falls
+    // back to without workers
+    const dataManager = new CircuitDataManager(
+        CircuitDataManager.DEFAULT_CUMULATIVE_MEMORY_BUDGET_BYTES,
+        false,
+    );
+    const ingested = new Promise<void>((resolve) => {
+        dataManager.onIngestionComplete = resolve;
+    });
+    const loadStart = performance.now();
+    dataManager.loadData([circuit]);
+    const loadMs = performance.now() - loadStart;
+    heap.sample();
+    if (numSlices > 0) await ingested;
+    const cumulativeBuildMs = performance.now() - loadStart;
+    heap.sample();
+
+    // The same ingestion as the worker runs it, in one go
+    const ingestStart = performance.now();
+    ingestCircuit(
+        encodeSliceOperations(operations),
+        numQubits,
+        couplingMap,
+        CircuitDataManager.DEFAULT_CUMULATIVE_MEMORY_BUDGET_BYTES,
+    );
+    const workerIngestMs = performance.now() - ingestStart;
+    heap.sample();
+
+    const layoutManager = new LayoutManager();
+    const layoutStart = performance.now();
+    const positions = await new Promise<Map<number, THREE.Vector3>>(
+        (resolve) => {
+            void layoutManager.calculateForceDirectedLayout(
+                numQubits,
+                couplingMap,
+                resolve,
+            );
+        },
+    );
+    const layoutMs = performance.now() - layoutStart;
+    heap.sample();
+
+    const heatmapManager = new HeatmapManager(
+        new THREE.PerspectiveCamera(),
+        numQubits,
+    );
+    const clusterStart = performance.now();
+    heatmapManager.generateClusters(positions, numQubits);
+    const heatmapClusterMs = performance.now() - clusterStart;
+
+    // One seek is what a slice change costs outside of drawing: the
+    // slice's qubits plus the heatmap window over the cumulative counts
+    const seek = (sliceIndex: number): number => {
+        const start = performance.now();
+        dataManager.getInteractingQubitsForSlice(sliceIndex);
+        heatmapManager.updateHeatmap(
+            positions,
+            sliceIndex,
+            dataManager.cumulativeQubitInteractionData,
+        );
+        return performance.now() - start;
+    };
+
+    const random = seededRandom(numSlices);
+    const randomSeeks: number[] = [];
+    const sequentialSeeks: number[] = [];
+    if (numSlices > 0) {
+        for (let i = 0; i < SEEK_SAMPLES; i++) {
+            randomSeeks.push(seek(Math.floor(random() * numSlices)));
+        }
+        const first = Math.max(0, Math.floor(numSlices / 2) - SEEK_SAMPLES / 2);
+        const last = Math.min(numSlices, first + SEEK_SAMPLES);
+        for (let s = first; s < last; s++) sequentialSeeks.push(seek(s));
+    }
+    heap.sample();
+
+    layoutManager.dispose();
+    heatmapManager.dispose();
+    dataManager.dispose();
+    const { peakHeapMB, retainedHeapMB } = heap.stop();
+
+    return {
+        name,
+        numQubits,
+        numSlices,
+        numOperations,
+        generateMs: input.generateMs,
+        loadMs,
+        cumulativeBuildMs,
+        workerIngestMs,
+        layoutMs,
+        heatmapClusterMs,
+        seekLatencyMs: {
+            random: latencyStats(randomSeeks),
+            sequential: latencyStats(sequentialSeeks),
+        },
+        peakHeapMB,
+        retainedHeapMB,
+    };
+}
+
+describe("frontend performance", () => {
+    const results: ScenarioResult[] = [];
+    let restoreWorker: () => void;
+
+    beforeAll(() => {
+        restoreWorker = HeadlessWorker.install();
+        vi.spyOn(console, "log").mockImplementation(() => {});
+        vi.spyOn(console, "warn").mockImplementation(() => {});
+    });
+
+    afterAll(() => {
+        restoreWorker();
+        vi.restoreAllMocks();
+
+        const output = resolve(
+            process.env.QUVIS_BENCH_OUTPUT ??
+                "bench-results/frontend-benchmarks.json",
+        );
+        const report = {
+            version: REPORT_VERSION,
+            commit: gitCommit(),
+            createdAt: new Date().toISOString(),
+            node: process.version,
+            platform: `${process.platform}-${process.arch}`,
+            scenarios: results,
+        };
+        mkdirSync(dirname(output), { recursive: true });
+        writeFileSync(output, JSON.stringify(report, null, 2) + "\n");
+        process.stdout.write(`Benchmark report written to ${output}\n`);
+    });
+
+    for (const benchmark of benchmarkCases()) {
+        it(benchmark.name, async () => {
+            const result = await runScenario(benchmark.name, benchmark.load());
+            results.push(result);
+            process.stdout.write(
+                `${result.name}: load ${result.loadMs.toFixed(1)} ms, ` +
+                    `cumulative ${result.cumulativeBuildMs.toFixed(1)} ms, ` +
+                    `layout ${result.layoutMs.toFixed(1)} ms, ` +
+                    `seek p95 ${result.seekLatencyMs.random.p95.toFixed(3)} ms, ` +
+                    `peak heap ${result.peakHeapMB} MB\n`,
+            );
+
+            expect(result.numSlices).toBeGreaterThan(0);
+            expect(result.seekLatencyMs.random.samples).toBe(SEEK_SAMPLES);
+        });
+    }
+});
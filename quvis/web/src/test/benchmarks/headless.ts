@@ -0,0 +1,179 @@
+/**
+ * Helpers to run the scene managers in Node for benchmarking: an
+ * in-process Worker, a heap sampler and latency statistics.
+ */
+
+import { fileURLToPath } from "node:url";
+
+type WorkerHandler = (event: { data: unknown }) => void;
+
+const workerHandlers = new Map<string, Promise<WorkerHandler>>();
+
+/**
+ * Runs a module worker script on the calling thread. The script is loaded
+ * once per URL with a stand-in `self` to capture its onmessage handler;
+ * its postMessage calls are routed back to the worker that is handling
+ * the current message. Replies are delivered asynchronously, like real
+ * worker messages. Handlers must post their replies synchronously.
+ */
+export class HeadlessWorker {
+    onmessage: ((event: { data: unknown }) => void) | null = null;
+    onerror: ((event: { message: string }) => void) | null = null;
+    private readonly handler: Promise<WorkerHandler>;
+    private terminated = false;
+
+    constructor(scriptURL: string | URL) {
+        this.handler = HeadlessWorker.load(String(scriptURL));
+    }
+
+    postMessage(message: unknown): void {
+        void this.handler.then((handler) => {
+            if (this.terminated) return;
+            const scope = globalThis as Record<string, unknown>;
+            const previous = scope.postMessage;
+            scope.postMessage = (reply: unknown) => {
+                setTimeout(() => {
+                    if (!this.terminated) this.onmessage?.({ data: reply });
+                }, 0);
+            };
+            try {
+                handler({ data: structuredClone(message) });
+            } catch (error) {
+                this.onerror?.({
+                    message:
+                        error instanceof Error ? error.message : String(error),
+                });
+            } finally {
+                scope.postMessage = previous;
+            }
+        });
+    }
+
+    terminate(): void {
+        this.terminated = true;
+    }
+
+    /**
+     * Installs HeadlessWorker as the global Worker; returns a function
+     * restoring the previous one
+     */
+    static install(): () => void {
+        const scope = globalThis as Record<string, unknown>;
+        const previous = scope.Worker;
+        scope.Worker = HeadlessWorker;
+        return () => {
+            scope.Worker = previous;
+        };
+    }
+
+    private static load(scriptURL: string): Promise<WorkerHandler> {
+        let handler = workerHandlers.get(scriptURL);
+        if (!handler) {
+            const scope = globalThis as Record<string, unknown>;
+            const workerScope: { onmessage?: WorkerHandler } = {};
+            const previousSelf = scope.self;
+            scope.self = workerScope;
+            const path = scriptURL.startsWith("file:")
+                ? fileURLToPath(scriptURL)
+                : scriptURL;
+            handler = import(/* @vite-ignore */ path)
+                .then(
+                    () => {
+                        scope.self = previousSelf;
+                        if (!workerScope.onmessage) {
+                            throw new Error(
+                                `${scriptURL} set no onmessage handler`,
+                            );
+                        }
+                        return workerScope.onmessage;
+                    },
+                    (error: unknown) => {
+                        scope.self = previousSelf;
+                        throw error;
+                    },
+                );
+            workerHandlers.set(scriptURL, handler);
+        }
+        return handler;
+    }
+}
+
+/**
+ * Tracks the highest heap use above a baseline, by polling on a timer and
+ * at explicit checkpoints (synchronous work blocks the timer)
+ */
+export class HeapSampler {
+    private readonly baseline: number;
+    private peak: number;
+    private timer: ReturnType<typeof setInterval> | null = null;
+
+    constructor(intervalMs = 5) {
+        collectGarbage();
+        this.baseline = process.memoryUsage().heapUsed;
+        this.peak = this.baseline;
+        this.timer = setInterval(() => this.sample(), intervalMs);
+    }
+
+    sample(): void {
+        const used = process.memoryUsage().heapUsed;
+        if (used > this.peak) this.peak = used;
+    }
+
+    /**
+     * Stops sampling; returns the peak and retained heap above the
+     * baseline, in MB
+     */
+    stop(): { peakHeapMB: number; retainedHeapMB: number } {
+        this.sample();
+        if (this.timer) clearInterval(this.timer);
+        this.timer = null;
+        collectGarbage();
+        const retained = process.memoryUsage().heapUsed - this.baseline;
+        return {
+            peakHeapMB: toMB(this.peak - this.baseline),
+            retainedHeapMB: toMB(Math.max(0, retained)),
+        };
+    }
+}
+
+export interface LatencyStats {
+    samples: number;
+    p50: number;
+    p95: number;
+    p99: number;
+    mean: number;
+    max: number;
+}
+
+/**
+ * Nearest-rank percentiles of durations in ms
+ */
+export function latencyStats(durations: number[]): LatencyStats {
+    const sorted = Float64Array.from(durations).sort();
+    const at = (q: number) =>
+        sorted.length === 0
+            ? 0
+            : sorted[Math.min(sorted.length - 1, Math.ceil(q * sorted.length) - 1)];
+    let sum = 0;
+    for (const d of sorted) sum += d;
+    return {
+        samples: sorted.length,
+        p50: at(0.5),
+        p95: at(0.95),
+        p99: at(0.99),
+        mean: sorted.length ? sum / sorted.length : 0,
+        max: sorted.length ? sorted[sorted.length - 1] : 0,
+    };
+}
+
+/**
+ * Runs a full collection when Node was started with --expose-gc
+ */
+export function collectGarbage(): void {
+    const gc = (globalThis as { gc?: () => void }).gc;
+    if (gc) gc();
+}
+
+function toMB(bytes: number): number {
+    return Math.round((bytes / (1024 * 1024)) * 100) / 100;
+}
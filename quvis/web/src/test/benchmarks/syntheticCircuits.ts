@@ -0,0 +1,184 @@
+/**
+ * Deterministic synthetic circuits for the frontend benchmarks.
+ *
+ * Circuits have the shape the playground API returns (see
+ * `extract_operations_per_slice` in quvis.compiler.utils): per-slice lists
+ * of `{ name, qubits }` operations on a square-grid device, where no qubit
+ * is used twice in a slice. Generation is seeded, so every run of a
+ * scenario sees exactly the same circuit.
+ */
+
+export interface SyntheticOperation {
+    name: string;
+    qubits: number[];
+}
+
+export interface SyntheticCircuit {
+    circuit_info: {
+        num_qubits: number;
+        compiled_interaction_graph_ops_per_slice: SyntheticOperation[][];
+    };
+    device_info: {
+        num_qubits_on_device: number;
+        connectivity_graph_coupling_map: number[][];
+    };
+    algorithm_name: string;
+    circuit_type: "compiled";
+    circuit_stats: {
+        depth: number;
+        qubits: number;
+    };
+}
+
+export interface SyntheticCircuitSpec {
+    numQubits: number;
+    numSlices: number;
+    // Gates per slice, capped so that no qubit appears twice in a slice
+    opsPerSlice: number;
+    // Fraction of gates that act on a coupling map edge
+    twoQubitFraction: number;
+    seed: number;
+}
+
+export interface BenchmarkScenario extends SyntheticCircuitSpec {
+    name: string;
+}
+
+// Benchmark scenarios, smallest first
+export const SCENARIOS: BenchmarkScenario[] = [
+    {
+        name: "small",
+        numQubits: 20,
+        numSlices: 500,
+        opsPerSlice: 8,
+        twoQubitFraction: 0.5,
+        seed: 1,
+    },
+    {
+        name: "medium",
+        numQubits: 200,
+        numSlices: 5_000,
+        opsPerSlice: 32,
+        twoQubitFraction: 0.5,
+        seed: 2,
+    },
+    {
+        name: "large",
+        numQubits: 1_000,
+        numSlices: 20_000,
+        opsPerSlice: 48,
+        twoQubitFraction: 0.5,
+        seed: 3,
+    },
+    {
+        name: "xlarge",
+        numQubits: 2_000,
+        numSlices: 100_000,
+        opsPerSlice: 32,
+        twoQubitFraction: 0.5,
+        seed: 4,
+    },
+];
+
+const ONE_QUBIT_GATES = ["h", "rz", "sx", "x"];
+const TWO_QUBIT_GATES = ["cx", "cz", "swap"];
+
+/**
+ * mulberry32; small, fast and good enough to pick gates
+ */
+export function seededRandom(seed: number): () => number {
+    let state = seed >>> 0;
+    return () => {
+        state = (state + 0x6d2b79f5) >>> 0;
+        let t = state;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+}
+
+/**
+ * Nearest-neighbour edges of the smallest square grid holding numQubits
+ */
+export function gridCouplingMap(numQubits: number): number[][] {
+    const cols = Math.ceil(Math.sqrt(numQubits));
+    const edges: number[][] = [];
+    for (let q = 0; q < numQubits; q++) {
+        if ((q + 1) % cols !== 0 && q + 1 < numQubits) edges.push([q, q + 1]);
+        if (q + cols < numQubits) edges.push([q, q + cols]);
+    }
+    return edges;
+}
+
+export function generateSyntheticCircuit(
+    spec: SyntheticCircuitSpec,
+): SyntheticCircuit {
+    const { numQubits, numSlices, twoQubitFraction } = spec;
+    const random = seededRandom(spec.seed);
+    const couplingMap = gridCouplingMap(numQubits);
+
+    const neighbours: number[][] = Array.from({ length: numQubits }, () => []);
+    for (const [a, b] of couplingMap) {
+        neighbours[a].push(b);
+        neighbours[b].push(a);
+    }
+
+    // usedInSlice[q] === s + 1 when qubit q already has a gate in slice s
+    const usedInSlice = new Int32Array(numQubits);
+    const opsPerSlice = Math.min(spec.opsPerSlice, numQubits);
+    const maxAttempts = 4 * opsPerSlice;
+    const slices: SyntheticOperation[][] = new Array(numSlices);
+
+    for (let s = 0; s < numSlices; s++) {
+        const stamp = s + 1;
+        const ops: SyntheticOperation[] = [];
+        for (
+            let attempt = 0;
+            attempt < maxAttempts && ops.length < opsPerSlice;
+            attempt++
+        ) {
+            const q = Math.floor(random() * numQubits);
+            if (usedInSlice[q] === stamp) continue;
+
+            if (random() < twoQubitFraction && neighbours[q].length > 0) {
+                const candidates = neighbours[q];
+                const p = candidates[Math.floor(random() * candidates.length)];
+                if (usedInSlice[p] === stamp) continue;
+                usedInSlice[q] = stamp;
+                usedInSlice[p] = stamp;
+                ops.push({
+                    name: TWO_QUBIT_GATES[
+                        Math.floor(random() * TWO_QUBIT_GATES.length)
+                    ],
+                    qubits: [q, p],
+                });
+            } else {
+                usedInSlice[q] = stamp;
+                ops.push({
+                    name: ONE_QUBIT_GATES[
+                        Math.floor(random() * ONE_QUBIT_GATES.length)
+                    ],
+                    qubits: [q],
+                });
+            }
+        }
+        slices[s] = ops;
+    }
+
+    return {
+        circuit_info: {
+            num_qubits: numQubits,
+            compiled_interaction_graph_ops_per_slice: slices,
+        },
+        device_info: {
+            num_qubits_on_device: numQubits,
+            connectivity_graph_coupling_map: couplingMap,
+        },
+        algorithm_name: `synthetic-${numQubits}x${numSlices}`,
+        circuit_type: "compiled",
+        circuit_stats: {
+            depth: numSlices,
+            qubits: numQubits,
+        },
+    };
+}
@@ -25,24 +25,48 @@ vi.mock("three", () => {
                 return target;
             }),
         })),
-        BufferGeometry: vi.fn().mockImplementation(() => ({
-            setAttribute: vi.fn(),
-            dispose: vi.fn(),
-            attributes: {
-                position: { needsUpdate: false },
-                intensity: { needsUpdate: false },
-            },
-        })),
+        BufferGeometry: vi.fn().mockImplementation(() => {
+            const geometry = {
+                attributes: {
+                    position: { needsUpdate: false },
+                    intensity: { needsUpdate: false },
+                } as Record<string, unknown>,
+                drawRange: { start: 0, count: Infinity },
+                setAttribute: vi.fn((name: string, attribute: unknown) => {
+                    geometry.attributes[name] = attribute;
+                }),
+                setDrawRange: vi.fn((start: number, count: number) => {
+                    geometry.drawRange = { start, count };
+                }),
+                dispose: vi.fn(),
+            };
+            return geometry;
+        }),
         BufferAttribute: vi.fn().mockImplementation((array, itemSize) => ({
             array,
             itemSize,
             needsUpdate: false,
         })),
-        ShaderMaterial: vi.fn().mockImplementation((params) => ({
-            uniforms: params?.uniforms || {},
-            dispose: vi.fn(),
-            clone: vi.fn().mockReturnThis(),
-        })),
+        ShaderMaterial: vi.fn().mockImplementation(function createMaterial(
+            params,
+        ) {
+            const uniforms = params?.uniforms || {};
+            return {
+                uniforms,
+                dispose: vi.fn(),
+                // Like three.js, clones get their own uniform objects
+                clone: vi.fn(() => {
+                    const clonedUniforms: Record<string, { value: unknown }> =
+                        {};
+                    for (const name of Object.keys(uniforms)) {
+                        clonedUniforms[name] = {
+                            value: (uniforms[name] as { value: unknown }).value,
+                        };
+                    }
+                    return createMaterial({ uniforms: clonedUniforms });
+                }),
+            };
+        }),
         Points: vi.fn().mockImplementation((geometry, material) => ({
             geometry,
             material,
@@ -56,7 +80,27 @@ vi.mock("three", () => {
             position: { x: 0, y: 0, z: 0 },
             lookAt: vi.fn(),
         })),
+        Mesh: vi.fn().mockImplementation((geometry, material) => ({
+            geometry,
+            material,
+            visible: true,
+        })),
+        PlaneGeometry: vi.fn().mockImplementation(() => ({
+            dispose: vi.fn(),
+        })),
+        Scene: vi.fn().mockImplementation(() => ({
+            add: vi.fn(),
+            remove: vi.fn(),
+        })),
+        WebGLRenderTarget: vi.fn().mockImplementation(() => ({
+            texture: {},
+            setSize: vi.fn(),
+            dispose: vi.fn(),
+        })),
         AdditiveBlending: 2,
+        LinearFilter: 1006,
+        RGBAFormat: 1023,
+        FloatType: 1015,
     };
 });
 
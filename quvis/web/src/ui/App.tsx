@@ -12,12 +12,15 @@ import CircuitTabSwitcher from './components/CircuitTabSwitcher.js';
 import HeatmapControls from './components/HeatmapControls.js';
 import Tooltip from './components/Tooltip.js';
 import PlaybackControls from './components/PlaybackControls.js';
-import DebugInfo from './components/DebugInfo.js';
+import DebugInfo, { PROFILE_ROW_HEIGHT_PX } from './components/DebugInfo.js';
 import LightBackgroundToggle from './components/LightBackgroundToggle.js';
 import KeyboardShortcutsHelp from './components/KeyboardShortcutsHelp.js';
 import BackendConnectionError from './components/BackendConnectionError.js';
 import { colors } from './theme/colors.js';
-import { getCircuitGenerationUrl } from '../config/api.js';
+import { getCircuitGenerationUrl, getHealthCheckUrl } from '../config/api.js';
+import { CircuitCache } from '../data/managers/CircuitCache.js';
+import { frameProfiler } from '../scene/core/FrameProfiler.js';
+import type { SpanStats } from '../scene/core/FrameProfiler.js';
 
 const BASE_TOP_MARGIN_PX = 20;
 const INTER_PANEL_SPACING_PX = 20;
@@ -53,13 +56,16 @@ const FIDELITY_PANEL_COLLAPSED_HEIGHT_PX =
 // Constants for right-side components
 const PLAYBACK_CONTROLS_EXPANDED_HEIGHT_PX = 143;  // Container padding (30px) + header (24px) + content (70px)
 const PLAYBACK_CONTROLS_COLLAPSED_HEIGHT_PX = 54;  // Container padding (30px) + header (24px) only
-const DEBUG_INFO_HEIGHT_PX = 80;
+const DEBUG_INFO_HEIGHT_PX = 100;
+const DEBUG_PROFILE_HEADER_HEIGHT_PX = 24; // Table header row plus margin
 const LIGHT_TOGGLE_HEIGHT_PX = 48;
 const BASE_BOTTOM_MARGIN_PX = 20;
 
 const App: React.FC = () => {
     const mountRef = useRef<HTMLDivElement>(null);
     const playgroundRef = useRef<Playground | null>(null);
+    const circuitCacheRef = useRef<CircuitCache>(new CircuitCache());
+    const backendVersionRef = useRef<Promise<string | null> | null>(null);
 
     const [isLoading, setIsLoading] = useState(false);
     const [loadingStage, setLoadingStage] = useState<string>('Loading');
@@ -143,6 +149,8 @@ const App: React.FC = () => {
     // State for Debug Info
     const [fps, setFps] = useState(0);
     const [layoutTime, setLayoutTime] = useState(0);
+    const [profile, setProfile] = useState<SpanStats[]>([]);
+    const [isProfileExpanded, setIsProfileExpanded] = useState(false);
 
     // State for UI visibility
     const [isUiVisible, setIsUiVisible] = useState(true);
@@ -316,6 +324,29 @@ const App: React.FC = () => {
         setIsPlaybackCollapsed(!isPlaybackCollapsed);
     };
 
+    const toggleProfileExpanded = () => {
+        setIsProfileExpanded(!isProfileExpanded);
+    };
+
+    const handleExportProfile = () => {
+        const report = frameProfiler.exportProfile({
+            fps,
+            layoutTimeMs: layoutTime,
+            params: currentParams,
+            circuitIndex: currentCircuitIndex,
+            sliceCount: actualSliceCount,
+        });
+        const blob = new Blob([JSON.stringify(report, null, 2)], {
+            type: 'application/json',
+        });
+        const url = URL.createObjectURL(blob);
+        const link = document.createElement('a');
+        link.href = url;
+        link.download = `quvis-profile-${Date.now()}.json`;
+        link.click();
+        URL.revokeObjectURL(url);
+    };
+
     const toggleCircuitTabsCollapse = () => {
         setIsCircuitTabsCollapsed(!isCircuitTabsCollapsed);
     };
@@ -409,6 +440,17 @@ const App: React.FC = () => {
             if (data.fidelity !== undefined) {
                 content += `\nFidelity: ${data.fidelity.toFixed(4)}`;
             }
+
+            if (data.activeSlices !== undefined) {
+                const totalSlices = data.activeSlices + data.idleSlices;
+                content += `\nActive: ${data.activeSlices} / ${totalSlices} slices`;
+                if (data.activeSlices > 0) {
+                    content += ` (${data.firstActiveSlice}–${data.lastActiveSlice})`;
+                }
+                if (data.swapParticipation > 0) {
+                    content += `\n${pluralize(data.swapParticipation, 'SWAP')}: ${data.swapParticipation}`;
+                }
+            }
         } else if (data.stateName) {
             content += `|${data.stateName}⟩`;
         }
@@ -441,32 +483,66 @@ const App: React.FC = () => {
             setLoadingStage('Compiling Circuit');
             setCompilationProgress(['Initializing circuit generation...']);
 
-            // Call the circuit generation API
-            const response = await fetch(getCircuitGenerationUrl(), {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    algorithm: params.algorithm,
-                    num_qubits: params.numQubits,
-                    physical_qubits: params.physicalQubits,
-                    topology: params.topology,
-                    optimization_level: params.optimizationLevel,
-                    custom_params: params.customParams || {},
-                }),
-            });
+            const requestBody = {
+                algorithm: params.algorithm,
+                num_qubits: params.numQubits,
+                physical_qubits: params.physicalQubits,
+                topology: params.topology,
+                optimization_level: params.optimizationLevel,
+                custom_params: params.customParams || {},
+            };
 
-            if (!response.ok) {
-                throw new Error(
-                    `HTTP ${response.status}: ${response.statusText}`
-                );
+            // Revisited configurations are served from the local cache,
+            // keyed by the request and the backend version
+            const circuitCache = circuitCacheRef.current;
+            if (!backendVersionRef.current) {
+                backendVersionRef.current =
+                    circuitCache.resolveBackendVersion(getHealthCheckUrl());
             }
+            const backendVersion = await backendVersionRef.current;
+            if (!backendVersion) {
+                // Retry the health check on the next generation
+                backendVersionRef.current = null;
+            }
+            let result = backendVersion
+                ? await circuitCache.get<any>(requestBody, backendVersion)
+                : null;
+            const loadedFromCache = result !== null;
+
+            if (!result) {
+                // Call the circuit generation API
+                const response = await fetch(getCircuitGenerationUrl(), {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                    body: JSON.stringify(requestBody),
+                });
+
+                if (!response.ok) {
+                    throw new Error(
+                        `HTTP ${response.status}: ${response.statusText}`
+                    );
+                }
 
-            const result = await response.json();
+                const responseText = await response.text();
+                result = JSON.parse(responseText);
 
-            if (!result.generation_successful) {
-                throw new Error(result.error || 'Circuit generation failed');
+                if (!result.generation_successful) {
+                    throw new Error(
+                        result.error || 'Circuit generation failed'
+                    );
+                }
+
+                if (backendVersion) {
+                    // Not awaited: caching must not delay rendering
+                    void circuitCache.put(
+                        requestBody,
+                        backendVersion,
+                        result,
+                        responseText.length
+                    );
+                }
             }
 
             // Add compilation progress info - playground always generates multi-circuit format
@@ -478,7 +554,9 @@ const App: React.FC = () => {
             );
 
             const progress = [
-                'Circuit generation completed',
+                loadedFromCache
+                    ? 'Circuit loaded from local cache'
+                    : 'Circuit generation completed',
                 `Generated ${logicalCircuit?.circuit_stats?.original_gates || 0} logical gates`,
                 `Transpiled to ${compiledCircuit?.circuit_stats?.transpiled_gates || 0} physical gates`,
                 `Added ${compiledCircuit?.circuit_stats?.swap_count || 0} SWAP gates for routing`,
@@ -488,7 +566,9 @@ const App: React.FC = () => {
             setCompilationProgress(progress);
 
             // Small delay to show the compilation results
-            await new Promise((resolve) => setTimeout(resolve, 1000));
+            if (!loadedFromCache) {
+                await new Promise((resolve) => setTimeout(resolve, 1000));
+            }
 
             setLoadingStage('Rendering Visualization');
             setCompilationProgress([
@@ -677,6 +757,9 @@ const App: React.FC = () => {
         const intervalId = setInterval(() => {
             if (playgroundRef.current) {
                 setFps(playgroundRef.current.currentFPS);
+                if (isProfileExpanded) {
+                    setProfile(frameProfiler.snapshot());
+                }
                 const newLayoutTime =
                     playgroundRef.current.lastLayoutCalculationTime;
                 if (newLayoutTime > 0) {
@@ -688,7 +771,7 @@ const App: React.FC = () => {
         }, 500); // Poll for debug info every 500ms
 
         return () => clearInterval(intervalId);
-    }, [isPlaygroundInitialized]); // Rerun when playground is initialized
+    }, [isPlaygroundInitialized, isProfileExpanded]); // Rerun when playground is initialized
 
     const handleTimelineChange = (newSliceIndex: number) => {
         if (isPlaying) {
@@ -740,7 +823,12 @@ const App: React.FC = () => {
         : PLAYBACK_CONTROLS_EXPANDED_HEIGHT_PX;
 
     const debugInfoBottom = `${BASE_BOTTOM_MARGIN_PX + playbackControlsHeight + INTER_PANEL_SPACING_PX}px`;
-    const lightToggleBottom = `${parseInt(debugInfoBottom) + DEBUG_INFO_HEIGHT_PX + INTER_PANEL_SPACING_PX}px`;
+    const debugInfoHeight = isProfileExpanded
+        ? DEBUG_INFO_HEIGHT_PX +
+          DEBUG_PROFILE_HEADER_HEIGHT_PX +
+          profile.length * PROFILE_ROW_HEIGHT_PX
+        : DEBUG_INFO_HEIGHT_PX;
+    const lightToggleBottom = `${parseInt(debugInfoBottom) + debugInfoHeight + INTER_PANEL_SPACING_PX}px`;
 
     return (
         <div className="App">
@@ -819,6 +907,10 @@ const App: React.FC = () => {
                                         fps={fps}
                                         layoutTime={layoutTime}
                                         bottomPosition={debugInfoBottom}
+                                        profile={profile}
+                                        isProfileExpanded={isProfileExpanded}
+                                        onToggleProfile={toggleProfileExpanded}
+                                        onExportProfile={handleExportProfile}
                                     />
                                     <PlaybackControls
                                         isPlaying={isPlaying}
@@ -1,13 +1,29 @@
 import React from "react";
 import { colors } from "../theme/colors.js";
+import type { SpanStats } from "../../scene/core/FrameProfiler.js";
 
 interface DebugInfoProps {
     fps: number;
     layoutTime: number;
     bottomPosition: string;
+    profile: SpanStats[];
+    isProfileExpanded: boolean;
+    onToggleProfile: () => void;
+    onExportProfile: () => void;
 }
 
-const DebugInfo: React.FC<DebugInfoProps> = ({ fps, layoutTime, bottomPosition }) => {
+// Height of one span row in the profile table, used by App for stacking
+export const PROFILE_ROW_HEIGHT_PX = 18;
+
+const DebugInfo: React.FC<DebugInfoProps> = ({
+    fps,
+    layoutTime,
+    bottomPosition,
+    profile,
+    isProfileExpanded,
+    onToggleProfile,
+    onExportProfile,
+}) => {
     const containerStyle: React.CSSProperties = {
         position: "fixed",
         bottom: bottomPosition,
@@ -33,6 +49,38 @@ const DebugInfo: React.FC<DebugInfoProps> = ({ fps, layoutTime, bottomPosition }
         lineHeight: "1.5",
     };
 
+    const profileHeaderStyle: React.CSSProperties = {
+        display: "flex",
+        justifyContent: "space-between",
+        alignItems: "center",
+        marginTop: "6px",
+        fontSize: "0.85em",
+    };
+
+    const linkStyle: React.CSSProperties = {
+        cursor: "pointer",
+        color: colors.primary.accent,
+        background: "none",
+        border: "none",
+        padding: 0,
+        font: "inherit",
+    };
+
+    const tableStyle: React.CSSProperties = {
+        width: "100%",
+        marginTop: "4px",
+        borderCollapse: "collapse",
+        fontSize: "0.75em",
+        fontFamily: "monospace",
+        color: colors.text.muted,
+    };
+
+    const cellStyle: React.CSSProperties = {
+        height: `${PROFILE_ROW_HEIGHT_PX}px`,
+        padding: 0,
+        textAlign: "right",
+    };
+
     return (
         <div style={containerStyle}>
             <div style={titleStyle}>Debug Info</div>
@@ -42,6 +90,50 @@ const DebugInfo: React.FC<DebugInfoProps> = ({ fps, layoutTime, bottomPosition }
                     <div>Last layout time: {layoutTime.toFixed(2)} ms</div>
                 )}
             </div>
+            <div style={profileHeaderStyle}>
+                <button style={linkStyle} onClick={onToggleProfile}>
+                    {isProfileExpanded ? "▼" : "▶"} Frame profile
+                </button>
+                {isProfileExpanded && (
+                    <button
+                        style={linkStyle}
+                        onClick={onExportProfile}
+                        title="Download the span statistics as JSON"
+                    >
+                        Export JSON
+                    </button>
+                )}
+            </div>
+            {isProfileExpanded && (
+                <table style={tableStyle}>
+                    <thead>
+                        <tr>
+                            <th style={{ ...cellStyle, textAlign: "left" }}>
+                                span (ms)
+                            </th>
+                            <th style={cellStyle}>p50</th>
+                            <th style={cellStyle}>p95</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        {profile.map((stats) => (
+                            <tr key={stats.span}>
+                                <td
+                                    style={{ ...cellStyle, textAlign: "left" }}
+                                >
+                                    {stats.span}
+                                </td>
+                                <td style={cellStyle}>
+                                    {stats.p50.toFixed(2)}
+                                </td>
+                                <td style={cellStyle}>
+                                    {stats.p95.toFixed(2)}
+                                </td>
+                            </tr>
+                        ))}
+                    </tbody>
+                </table>
+            )}
         </div>
     );
 };
@@ -1,21 +1,72 @@
 """
 QFT Circuit Regression Test
 
-This test generates a QFT circuit with 144 qubits on a 2D grid topology,
-saves the baseline connection and interaction data, and provides utilities
-for future regression testing to ensure implementation consistency.
+This test generates QFT circuits (by default 144 qubits on a 2D grid
+topology), saves a baseline of their connection and interaction data, and
+provides utilities for future regression testing to ensure implementation
+consistency.
+
+Baselines store digests rather than the data itself: every slice of
+operations is hashed, and the slice hashes are rolled up into a Merkle tree
+whose root identifies the whole circuit. Comparing against a baseline is a
+root comparison, and when roots differ the tree is descended to find the
+first divergent slice in a logarithmic number of steps. Pass --dump-arrays
+to also write the operations as columnar arrays (.npz) next to the baseline,
+so divergent slices can be inspected.
 """
 
+import hashlib
 import json
+from dataclasses import dataclass
 from math import sqrt, ceil
 from pathlib import Path
 from typing import Any
 import argparse
 
+import numpy as np
 from qiskit import transpile
 from qiskit.circuit.library import QFT
 from qiskit.transpiler import CouplingMap
 from quvis import Visualizer
+from quvis.enums import TopologyType
+from quvis.factories import TopologyFactory
+
+DIGEST_FORMAT = "merkle-v1"
+DIGEST_SIZE = 16
+
+# Padding leaf, so trees always have a power-of-two number of leaves and
+# trees over different slice counts share the same shape
+_PAD_DIGEST = hashlib.blake2b(b"quvis-regression-padding", digest_size=DIGEST_SIZE).hexdigest()
+
+
+@dataclass(frozen=True)
+class RegressionCase:
+    """One QFT circuit under regression test."""
+    num_qubits: int
+    topology: str = "grid"
+    optimization_level: int = 0
+
+    @property
+    def name(self) -> str:
+        return f"qft-{self.num_qubits}-{self.topology}"
+
+    @property
+    def baseline_filename(self) -> str:
+        if self == DEFAULT_CASE:
+            return "qft_regression_baseline.json"
+        return f"qft_regression_baseline_{self.num_qubits}_{self.topology}.json"
+
+
+DEFAULT_CASE = RegressionCase(num_qubits=144)
+REGRESSION_CASES = {
+    case.name: case
+    for case in [
+        DEFAULT_CASE,
+        RegressionCase(num_qubits=144, topology="heavy_hex"),
+        RegressionCase(num_qubits=144, topology="line"),
+        RegressionCase(num_qubits=529),
+    ]
+}
 
 
 def create_2d_grid_coupling_map(num_qubits: int) -> CouplingMap:
@@ -24,6 +75,12 @@ def create_2d_grid_coupling_map(num_qubits: int) -> CouplingMap:
     return CouplingMap.from_grid(grid_size, grid_size)
 
 
+def create_coupling_map(case: RegressionCase) -> CouplingMap:
+    if case.topology == "grid":
+        return create_2d_grid_coupling_map(case.num_qubits)
+    return TopologyFactory.create(TopologyType(case.topology), case.num_qubits)
+
+
 def extract_regression_data(visualization_data: dict[str, Any]) -> dict[str, Any]:
     """Extract the key data needed for regression testing."""
     regression_data: dict[str, Any] = {}
@@ -64,12 +121,126 @@ def extract_regression_data(visualization_data: dict[str, Any]) -> dict[str, Any
     return regression_data
 
 
-def generate_qft_regression_baseline():
-    num_qubits = 144
-    optimization_level = 0
+def content_digest(value: Any) -> str:
+    """Hash of the canonical JSON encoding of a value."""
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=DIGEST_SIZE).hexdigest()
+
+
+def slice_digests(operations_per_slice: list[list[dict[str, Any]]]) -> list[str]:
+    """One content hash per slice of operations."""
+    return [content_digest(slice_ops) for slice_ops in operations_per_slice]
+
+
+def merkle_levels(leaves: list[str], num_leaves: int | None = None) -> list[list[str]]:
+    """
+    Build a Merkle tree over slice digests.
+
+    Args:
+        leaves: Slice digests
+        num_leaves: Pad to this many leaves (a power of two, at least
+            len(leaves)); defaults to the next power of two
+
+    Returns:
+        Tree levels from the (padded) leaves up to the single root
+    """
+    if num_leaves is None:
+        num_leaves = 1 << max(0, len(leaves) - 1).bit_length()
+    level = leaves + [_PAD_DIGEST] * (num_leaves - len(leaves))
+    levels = [level]
+    while len(level) > 1:
+        level = [
+            hashlib.blake2b(
+                bytes.fromhex(level[i]) + bytes.fromhex(level[i + 1]), digest_size=DIGEST_SIZE
+            ).hexdigest()
+            for i in range(0, len(level), 2)
+        ]
+        levels.append(level)
+    return levels
+
+
+def merkle_root(leaves: list[str]) -> str:
+    return merkle_levels(leaves)[-1][0]
+
+
+def first_divergent_slice(current_leaves: list[str], baseline_leaves: list[str]) -> int | None:
+    """
+    Locate the first slice whose digest differs between two circuits.
+
+    Both trees are built over the same padded width and descended from the
+    root, following the left child whenever it differs. A circuit that is a
+    prefix of the other diverges at the shorter one's length.
+
+    Returns:
+        Index of the first divergent slice, or None if all slices match
+    """
+    width = 1 << max(0, max(len(current_leaves), len(baseline_leaves)) - 1).bit_length()
+    current = merkle_levels(current_leaves, width)
+    baseline = merkle_levels(baseline_leaves, width)
+    if current[-1] == baseline[-1]:
+        return None
+
+    index = 0
+    for depth in range(len(current) - 2, -1, -1):
+        left = 2 * index
+        index = left if current[depth][left] != baseline[depth][left] else left + 1
+    return index
+
+
+def digest_operations(operations_per_slice: list[list[dict[str, Any]]]) -> dict[str, Any]:
+    leaves = slice_digests(operations_per_slice)
+    return {
+        "num_slices": len(leaves),
+        "num_operations": sum(len(slice_ops) for slice_ops in operations_per_slice),
+        "root": merkle_root(leaves),
+        "slice_digests": leaves,
+    }
+
+
+def digest_regression_data(regression_data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Reduce data from extract_regression_data to a compact digest baseline.
+
+    Scalar fields are kept as they are; per-slice operations, routing data
+    and the coupling map are replaced by their digests.
+    """
+    digested: dict[str, Any] = {"format": DIGEST_FORMAT}
+    for key, circuit in regression_data.items():
+        if key == "metadata":
+            digested[key] = circuit
+            continue
+
+        coupling_map = circuit["device_info"]["connectivity_graph_coupling_map"]
+        entry = {
+            "algorithm_name": circuit["algorithm_name"],
+            "circuit_type": circuit["circuit_type"],
+            "num_qubits": circuit["num_qubits"],
+            "circuit_stats": circuit["circuit_stats"],
+            "operations": digest_operations(circuit["operations_per_slice"]),
+            "device_info": {
+                "num_qubits_on_device": circuit["device_info"]["num_qubits_on_device"],
+                "coupling_map_length": len(coupling_map),
+                "coupling_map_digest": content_digest(coupling_map),
+            },
+        }
+        if "routing_info" in circuit:
+            routing = circuit["routing_info"]
+            entry["routing_info"] = {
+                "routing_depth": routing["routing_depth"],
+                "routing_ops_root": merkle_root(slice_digests(routing["routing_ops_per_slice"])),
+                "swaps_digest": content_digest(routing["swaps"]),
+            }
+        digested[key] = entry
+    return digested
+
+
+def generate_qft_regression_data(case: RegressionCase = DEFAULT_CASE) -> dict[str, Any]:
+    """Generate the full (undigested) regression data of a case."""
+    num_qubits = case.num_qubits
+    optimization_level = case.optimization_level
 
-    coupling_map = create_2d_grid_coupling_map(num_qubits)
-    print(f"📐 Created 2D grid coupling map with {coupling_map.size()} qubits")
+    coupling_map = create_coupling_map(case)
+    print(f"📐 Created {case.topology} coupling map with {coupling_map.size()} qubits")
 
     qft_circuit = QFT(num_qubits).decompose()
     visualizer = Visualizer(auto_open_browser=False, verbose=True)
@@ -99,38 +270,119 @@ def generate_qft_regression_baseline():
 
     regression_data["metadata"] = {
         "num_qubits": num_qubits,
+        "topology": case.topology,
         "optimization_level": optimization_level,
-        "grid_size": int(ceil(sqrt(num_qubits))),
+        "grid_size": int(ceil(sqrt(num_qubits))) if case.topology == "grid" else None,
         "total_circuits": len(visualizer.circuits),
-        "description": f"QFT regression baseline with {num_qubits} qubits on 2D grid, optimization level {optimization_level}",
+        "description": f"QFT regression baseline with {num_qubits} qubits on {case.topology}, optimization level {optimization_level}",
     }
 
     return regression_data
 
 
+def generate_qft_regression_baseline(case: RegressionCase = DEFAULT_CASE) -> dict[str, Any]:
+    """Generate the digest baseline of a case."""
+    return digest_regression_data(generate_qft_regression_data(case))
+
+
 def save_regression_baseline(data: dict[str, Any], filename: str = "qft_regression_baseline.json"):
     baseline_path = Path(__file__).parent / filename
 
     print(f"💾 Saving baseline data to {baseline_path}...")
     with open(baseline_path, "w") as f:
-        json.dump(data, f, indent=2, separators=(",", ": "))
+        json.dump(data, f, separators=(",", ":"))
 
     print(f"✅ Baseline data saved ({baseline_path.stat().st_size} bytes)")
     return baseline_path
 
 
 def load_regression_baseline(filename: str = "qft_regression_baseline.json") -> dict[str, Any]:
+    """Load a baseline, digesting it first if it is in the old full-data format."""
     baseline_path = Path(__file__).parent / filename
 
     if not baseline_path.exists():
         raise FileNotFoundError(f"Baseline file not found: {baseline_path}")
 
     with open(baseline_path, "r") as f:
-        return json.load(f)
+        data = json.load(f)
+
+    if data.get("format") != DIGEST_FORMAT:
+        print(f"ℹ️  {baseline_path.name} holds full data; comparing its digests "
+              "(regenerate with --generate-baseline for a compact baseline)")
+        data = digest_regression_data(data)
+    return data
+
+
+def save_array_dump(regression_data: dict[str, Any], path: Path) -> Path:
+    """
+    Write the operations of every circuit as columnar arrays.
+
+    Per circuit, slice i holds operations slice_offsets[i]:slice_offsets[i+1];
+    operation j is named names[op_names[j]] and acts on
+    qubits[qubit_offsets[j]:qubit_offsets[j+1]].
+    """
+    arrays: dict[str, np.ndarray] = {}
+    for key, circuit in regression_data.items():
+        if key == "metadata":
+            continue
+        operations_per_slice = circuit["operations_per_slice"]
+        names: dict[str, int] = {}
+        op_names: list[int] = []
+        qubits: list[int] = []
+        qubit_offsets = [0]
+        slice_offsets = [0]
+        for slice_ops in operations_per_slice:
+            for op in slice_ops:
+                op_names.append(names.setdefault(op["name"], len(names)))
+                qubits.extend(op["qubits"])
+                qubit_offsets.append(len(qubits))
+            slice_offsets.append(len(op_names))
+
+        arrays[f"{key}.slice_offsets"] = np.asarray(slice_offsets, dtype=np.int64)
+        arrays[f"{key}.op_names"] = np.asarray(op_names, dtype=np.int32)
+        arrays[f"{key}.names"] = np.asarray(list(names), dtype=np.str_)
+        arrays[f"{key}.qubit_offsets"] = np.asarray(qubit_offsets, dtype=np.int64)
+        arrays[f"{key}.qubits"] = np.asarray(qubits, dtype=np.int32)
+
+    np.savez_compressed(path, **arrays)
+    print(f"💾 Array dump saved to {path} ({path.stat().st_size} bytes)")
+    return path
+
+
+def load_slice_from_dump(path: Path, circuit_key: str, slice_index: int) -> list[dict[str, Any]] | None:
+    """Read one slice of operations back from an array dump."""
+    with np.load(path) as arrays:
+        slice_offsets = arrays[f"{circuit_key}.slice_offsets"]
+        if slice_index >= len(slice_offsets) - 1:
+            return None
+        names = arrays[f"{circuit_key}.names"]
+        op_names = arrays[f"{circuit_key}.op_names"]
+        qubit_offsets = arrays[f"{circuit_key}.qubit_offsets"]
+        qubits = arrays[f"{circuit_key}.qubits"]
+        return [
+            {
+                "name": str(names[op_names[j]]),
+                "qubits": qubits[qubit_offsets[j]:qubit_offsets[j + 1]].tolist(),
+            }
+            for j in range(slice_offsets[slice_index], slice_offsets[slice_index + 1])
+        ]
+
+
+def compare_operations(current_ops: dict[str, Any], baseline_ops: dict[str, Any]) -> dict[str, Any] | None:
+    """Compare two operation digests; None if they match."""
+    if current_ops["root"] == baseline_ops["root"]:
+        return None
+    return {
+        "current_length": current_ops["num_slices"],
+        "baseline_length": baseline_ops["num_slices"],
+        "first_divergent_slice": first_divergent_slice(
+            current_ops["slice_digests"], baseline_ops["slice_digests"]
+        ),
+    }
 
 
 def compare_regression_data(current_data: dict[str, Any], baseline_data: dict[str, Any]) -> dict[str, Any]:
-    """Compare current regression data with baseline, accounting for routing stochasticity."""
+    """Compare current digest data with baseline, accounting for routing stochasticity."""
     differences: dict[str, Any] = {}
 
     # Compare metadata (excluding items that may vary due to routing)
@@ -149,7 +401,7 @@ def compare_regression_data(current_data: dict[str, Any], baseline_data: dict[st
 
     # Compare each circuit
     for circuit_key in baseline_data.keys():
-        if circuit_key == "metadata":
+        if circuit_key in ("metadata", "format"):
             continue
 
         if circuit_key not in current_data:
@@ -158,55 +410,35 @@ def compare_regression_data(current_data: dict[str, Any], baseline_data: dict[st
 
         current_circuit = current_data[circuit_key]
         baseline_circuit = baseline_data[circuit_key]
+        circuit_differences: dict[str, Any] = {}
 
         # Compare deterministic fields
         deterministic_fields = ["num_qubits", "algorithm_name", "circuit_type"]
 
         for field in deterministic_fields:
             if current_circuit.get(field) != baseline_circuit.get(field):
-                if f"{circuit_key}_differences" not in differences:
-                    differences[f"{circuit_key}_differences"] = {}
-                differences[f"{circuit_key}_differences"][field] = {
+                circuit_differences[field] = {
                     "current": current_circuit.get(field),
                     "baseline": baseline_circuit.get(field)
                 }
 
-        # Special handling for device_info to ignore minor format differences
-        current_device = current_circuit.get("device_info", {})
-        baseline_device = baseline_circuit.get("device_info", {})
+        current_device = current_circuit["device_info"]
+        baseline_device = baseline_circuit["device_info"]
 
-        device_fields_to_compare = ["num_qubits_on_device"]
+        # Connectivity should have the same structure; edge order may vary
+        device_fields_to_compare = ["num_qubits_on_device", "coupling_map_length"]
         for field in device_fields_to_compare:
             if current_device.get(field) != baseline_device.get(field):
-                if f"{circuit_key}_differences" not in differences:
-                    differences[f"{circuit_key}_differences"] = {}
-                differences[f"{circuit_key}_differences"][f"device_{field}"] = {
+                circuit_differences[f"device_{field}"] = {
                     "current": current_device.get(field),
                     "baseline": baseline_device.get(field)
                 }
 
-        # Compare coupling map length (connectivity should be the same structure)
-        current_coupling = current_device.get("connectivity_graph_coupling_map", [])
-        baseline_coupling = baseline_device.get("connectivity_graph_coupling_map", [])
+        operations_difference = compare_operations(current_circuit["operations"], baseline_circuit["operations"])
 
-        if len(current_coupling) != len(baseline_coupling):
-            if f"{circuit_key}_differences" not in differences:
-                differences[f"{circuit_key}_differences"] = {}
-            differences[f"{circuit_key}_differences"]["coupling_map_length"] = {
-                "current": len(current_coupling),
-                "baseline": len(baseline_coupling)
-            }
-
-        # For logical circuits, compare operations_per_slice exactly
-        if current_circuit.get("circuit_type") == "logical":
-            if current_circuit.get("operations_per_slice") != baseline_circuit.get("operations_per_slice"):
-                if f"{circuit_key}_differences" not in differences:
-                    differences[f"{circuit_key}_differences"] = {}
-                differences[f"{circuit_key}_differences"]["operations_per_slice"] = {
-                    "current_length": len(current_circuit.get("operations_per_slice", [])),
-                    "baseline_length": len(baseline_circuit.get("operations_per_slice", [])),
-                    "note": "Full comparison omitted for readability - check saved files for details"
-                }
+        # For logical circuits, operations_per_slice must match exactly
+        if current_circuit.get("circuit_type") == "logical" and operations_difference:
+            circuit_differences["operations_per_slice"] = operations_difference
 
         # For compiled circuits, only compare basic statistics due to routing stochasticity
         if current_circuit.get("circuit_type") == "compiled":
@@ -217,43 +449,47 @@ def compare_regression_data(current_data: dict[str, Any], baseline_data: dict[st
             stable_stats = ["qubits"]  # original_gates represents the transpiled circuit, not the original
             for stat in stable_stats:
                 if current_stats.get(stat) != baseline_stats.get(stat):
-                    if f"{circuit_key}_differences" not in differences:
-                        differences[f"{circuit_key}_differences"] = {}
-                    if "circuit_stats_differences" not in differences[f"{circuit_key}_differences"]:
-                        differences[f"{circuit_key}_differences"]["circuit_stats_differences"] = {}
-                    differences[f"{circuit_key}_differences"]["circuit_stats_differences"][stat] = {
+                    circuit_differences.setdefault("circuit_stats_differences", {})[stat] = {
                         "current": current_stats.get(stat),
                         "baseline": baseline_stats.get(stat)
                     }
 
             # Report routing stats for information but don't fail on differences
-            current_routing_stats = {
-                "transpiled_gates": current_stats.get("transpiled_gates"),
-                "depth": current_stats.get("depth"),
-                "swap_count": current_stats.get("swap_count"),
-            }
-            baseline_routing_stats = {
-                "transpiled_gates": baseline_stats.get("transpiled_gates"),
-                "depth": baseline_stats.get("depth"),
-                "swap_count": baseline_stats.get("swap_count"),
-            }
-
+            routing_stats = ["transpiled_gates", "depth", "swap_count"]
             differences[f"{circuit_key}_routing_info"] = {
-                "current": current_routing_stats,
-                "baseline": baseline_routing_stats,
+                "current": {stat: current_stats.get(stat) for stat in routing_stats},
+                "baseline": {stat: baseline_stats.get(stat) for stat in routing_stats},
+                "operations_difference": operations_difference,
                 "note": "Routing results may vary due to stochastic optimization - this is informational only"
             }
 
+        if circuit_differences:
+            differences[f"{circuit_key}_differences"] = circuit_differences
+
     return differences
 
 
-def run_regression_test() -> bool:
+def print_divergent_slices(critical_differences: dict[str, Any], baseline_dump: Path, current_dump: Path) -> None:
+    """Print the first divergent slice of each circuit from the array dumps."""
+    for key, diff in critical_differences.items():
+        if not isinstance(diff, dict) or "operations_per_slice" not in diff:
+            continue
+        circuit_key = key.removesuffix("_differences")
+        index = diff["operations_per_slice"]["first_divergent_slice"]
+        print(f"   {circuit_key} slice {index}:")
+        print(f"      baseline: {load_slice_from_dump(baseline_dump, circuit_key, index)}")
+        print(f"      current:  {load_slice_from_dump(current_dump, circuit_key, index)}")
+
+
+def run_regression_test(case: RegressionCase = DEFAULT_CASE, dump_arrays: bool = False) -> bool:
     """Run the regression test comparing current implementation with baseline."""
-    print("🧪 Running QFT regression test...")
+    print(f"🧪 Running QFT regression test ({case.name})...")
+    baseline_dump = (Path(__file__).parent / case.baseline_filename).with_suffix(".npz")
 
     try:
-        baseline_data = load_regression_baseline()
-        current_data = generate_qft_regression_baseline()
+        baseline_data = load_regression_baseline(case.baseline_filename)
+        current_full = generate_qft_regression_data(case)
+        current_data = digest_regression_data(current_full)
         differences = compare_regression_data(current_data, baseline_data)
 
         critical_differences = {k: v for k, v in differences.items() if not k.endswith("_routing_info")}
@@ -278,15 +514,25 @@ def run_regression_test() -> bool:
                     print(f"   {key}: {info['note']}")
 
             # Save current data for analysis
-            save_regression_baseline(current_data, "qft_regression_current.json")
-            print("💾 Current data saved as qft_regression_current.json for analysis")
+            current_filename = case.baseline_filename.replace("baseline", "current")
+            save_regression_baseline(current_data, current_filename)
+            print(f"💾 Current data saved as {current_filename} for analysis")
+
+            if dump_arrays:
+                current_dump = save_array_dump(
+                    current_full, (Path(__file__).parent / current_filename).with_suffix(".npz")
+                )
+                if baseline_dump.exists():
+                    print_divergent_slices(critical_differences, baseline_dump, current_dump)
 
             return False
 
     except FileNotFoundError:
         print("⚠️  No baseline found - generating new baseline...")
-        baseline_data = generate_qft_regression_baseline()
-        save_regression_baseline(baseline_data)
+        baseline_full = generate_qft_regression_data(case)
+        save_regression_baseline(digest_regression_data(baseline_full), case.baseline_filename)
+        if dump_arrays:
+            save_array_dump(baseline_full, baseline_dump)
         print("✅ Baseline generated successfully")
         return True
     except Exception as e:
@@ -300,16 +546,27 @@ if __name__ == "__main__":
                        help="Generate new baseline data")
     parser.add_argument("--test", action="store_true",
                        help="Run regression test")
+    parser.add_argument("--case", action="append", choices=sorted(REGRESSION_CASES),
+                       help=f"Case to run; repeatable (default: {DEFAULT_CASE.name})")
+    parser.add_argument("--all-cases", action="store_true",
+                       help="Run every case, including the 529-qubit one")
+    parser.add_argument("--dump-arrays", action="store_true",
+                       help="Also write operations as columnar .npz arrays, and print divergent slices on failure")
 
     args = parser.parse_args()
 
+    if args.all_cases:
+        cases = list(REGRESSION_CASES.values())
+    else:
+        cases = [REGRESSION_CASES[name] for name in args.case or [DEFAULT_CASE.name]]
+
     if args.generate_baseline:
-        baseline_data = generate_qft_regression_baseline()
-        baseline_path = save_regression_baseline(baseline_data)
-        print(f"🎯 Baseline generated and saved to {baseline_path}")
-    elif args.test:
-        success = run_regression_test()
-        exit(0 if success else 1)
+        for case in cases:
+            baseline_full = generate_qft_regression_data(case)
+            baseline_path = save_regression_baseline(digest_regression_data(baseline_full), case.baseline_filename)
+            if args.dump_arrays:
+                save_array_dump(baseline_full, baseline_path.with_suffix(".npz"))
+            print(f"🎯 Baseline generated and saved to {baseline_path}")
     else:
-        success = run_regression_test()
-        exit(0 if success else 1)
\ No newline at end of file
+        results = [run_regression_test(case, args.dump_arrays) for case in cases]
+        exit(0 if all(results) else 1)
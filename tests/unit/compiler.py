@@ -1,9 +1,22 @@
 import unittest
 from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
 from qiskit.converters import circuit_to_dag
 
 
-from quvis.compiler.utils import extract_operations_per_slice, extract_routing_operations_per_slice
+from quvis.compiler.utils import (
+    ModularInfo,
+    extract_operations_per_slice,
+    extract_routing_operations_per_slice,
+    analyze_inter_core_traffic,
+    analyze_routing_overhead,
+    compute_qubit_statistics,
+    count_circuit_metrics,
+    summarize_routing_overhead,
+)
+from quvis.compiler.fingerprint import circuit_fingerprint
+from quvis.compiler.scheduling import GateDurations, schedule_operations
+from quvis.compiler.timeline import build_timeline_pyramid, query_timeline_window
 
 class TestExtractOperationsPerSlice(unittest.TestCase):
     
@@ -36,10 +49,253 @@ class TestExtractOperationsPerSlice(unittest.TestCase):
         routing_result = extract_routing_operations_per_slice(circuit)
 
         self.assertEqual(routing_result.swaps, 1)
-    
-    
-        
 
 
+class TestAnalyzeInterCoreTraffic(unittest.TestCase):
+
+    def setUp(self):
+        # Two cores of two qubits each, linked through qubits 1 and 2
+        self.modular_info = ModularInfo(
+            num_cores=2,
+            qubits_per_core=2,
+            global_topology="line",
+            inter_core_links=[[1, 2]],
+        )
+
+    def test_classifies_intra_and_inter_core_ops(self):
+        circuit = QuantumCircuit(4)
+        circuit.cx(0, 1)
+        circuit.cx(2, 3)
+        circuit.swap(1, 2)
+        circuit.cx(0, 1)
+        circuit.cx(1, 2)
+
+        ops_per_slice = extract_operations_per_slice(circuit)
+        analysis = analyze_inter_core_traffic(ops_per_slice, self.modular_info, 4)
+
+        self.assertEqual(analysis.intra_core_ops, 3)
+        self.assertEqual(analysis.inter_core_ops, 2)
+        self.assertEqual(analysis.inter_core_swaps, 1)
+        self.assertEqual(analysis.inter_core_ops_per_slice, [0, 1, 0, 1])
+        self.assertEqual(analysis.cumulative_inter_core_ops, [0, 1, 1, 2])
+        self.assertEqual(analysis.link_usage, [2])
+        self.assertEqual(analysis.core_traffic_matrix, [[2, 2], [2, 1]])
+        self.assertEqual(analysis.critical_path_length, 2)
+        self.assertEqual(analysis.critical_path, [[1, 1, 2], [3, 1, 2]])
+
+    def test_no_inter_core_ops(self):
+        circuit = QuantumCircuit(4)
+        circuit.h(0)
+        circuit.cx(0, 1)
+
+        ops_per_slice = extract_operations_per_slice(circuit)
+        analysis = analyze_inter_core_traffic(ops_per_slice, self.modular_info, 4)
+
+        self.assertEqual(analysis.inter_core_ops, 0)
+        self.assertEqual(analysis.link_usage, [0])
+        self.assertEqual(analysis.critical_path_length, 0)
+        self.assertEqual(analysis.critical_path, [])
+
+
+class TestComputeQubitStatistics(unittest.TestCase):
+
+    def test_compute_qubit_statistics(self):
+        circuit = QuantumCircuit(4)
+        circuit.h(0)
+        circuit.cx(0, 1)
+        circuit.swap(1, 2)
+        circuit.x(0)
+
+        ops_per_slice = extract_operations_per_slice(circuit)
+        coupling_map = [[0, 1], [1, 0], [1, 2], [2, 3]]
+        stats = compute_qubit_statistics(ops_per_slice, 4, coupling_map)
+
+        self.assertEqual(stats.one_qubit_gates, [2, 0, 0, 0])
+        self.assertEqual(stats.two_qubit_gates, [1, 2, 1, 0])
+        self.assertEqual(stats.swap_participation, [0, 1, 1, 0])
+        self.assertEqual(stats.active_slices, [3, 2, 1, 0])
+        self.assertEqual(stats.idle_slices, [0, 1, 2, 3])
+        self.assertEqual(stats.first_active_slice, [0, 1, 2, -1])
+        self.assertEqual(stats.last_active_slice, [2, 2, 2, -1])
+        self.assertEqual(stats.edge_usage, [1, 1, 1, 0])
+
+
+
+class TestScheduleOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.circuit = QuantumCircuit(3)
+        self.circuit.rz(0.1, 0)
+        self.circuit.sx(1)
+        self.circuit.x(2)
+        self.circuit.cx(0, 1)
+        self.circuit.cx(1, 2)
+        self.ops_per_slice = extract_operations_per_slice(self.circuit)
+
+    def test_asap_alap_and_critical_path(self):
+        schedule = schedule_operations(self.ops_per_slice, 3)
+
+        self.assertEqual(schedule.slice_offsets, [0, 3, 4, 5])
+        self.assertEqual(schedule.durations, [0.0, 35.0, 35.0, 300.0, 300.0])
+        self.assertEqual(schedule.asap_start, [0.0, 0.0, 0.0, 35.0, 335.0])
+        self.assertEqual(schedule.alap_start, [35.0, 0.0, 300.0, 35.0, 335.0])
+        self.assertEqual(schedule.slack, [35.0, 0.0, 300.0, 0.0, 0.0])
+        self.assertEqual(schedule.total_duration, 635.0)
+        self.assertEqual(schedule.critical_path, [1, 3, 4])
+
+    def test_qubit_and_edge_overrides(self):
+        durations = GateDurations(
+            qubit_overrides={("x", 2): 500.0},
+            edge_overrides={("cx", 1, 0): 100.0},
+        )
+        schedule = schedule_operations(self.ops_per_slice, 3, durations)
+
+        self.assertEqual(schedule.durations, [0.0, 35.0, 500.0, 100.0, 300.0])
+        self.assertEqual(schedule.total_duration, 800.0)
+        self.assertEqual(schedule.critical_path, [2, 4])
+
+    def test_from_dict_overrides(self):
+        durations = GateDurations.from_dict({
+            "cx": 250.0,
+            "qubit_overrides": {"X|2": 500.0},
+            "edge_overrides": {"cx|1|0": 100.0},
+        })
+        self.assertEqual(durations.defaults["cx"], 250.0)
+        self.assertEqual(durations.qubit_overrides, {("x", 2): 500.0})
+        self.assertEqual(durations.edge_overrides, {("cx", 1, 0): 100.0})
+        self.assertNotIn("qubit_overrides", durations.defaults)
+
+        for invalid in ({"edge_overrides": {"cx|1": 100.0}}, {"qubit_overrides": {"x|q2": 1.0}}, {"x": {"2": 1.0}}):
+            with self.assertRaises(ValueError):
+                GateDurations.from_dict(invalid)
+
+
+class TestTimelinePyramid(unittest.TestCase):
+
+    def setUp(self):
+        QUBITS = 4
+        self.circuit = QuantumCircuit(QUBITS)
+        for _ in range(10):
+            for i in range(QUBITS - 1):
+                self.circuit.cx(i, i + 1)
+            self.circuit.h(0)
+        self.ops_per_slice = extract_operations_per_slice(self.circuit)
+
+    def test_levels_aggregate_all_slices(self):
+        pyramid = build_timeline_pyramid(self.ops_per_slice, 4, branching_factor=2)
+
+        self.assertEqual(pyramid.levels[0].slices_per_bucket, 1)
+        self.assertEqual(pyramid.levels[-1].num_buckets, 1)
+        total_gates = sum(len(slice_ops) for slice_ops in self.ops_per_slice)
+        for level in pyramid.levels:
+            self.assertEqual(sum(level.gate_counts), total_gates)
+
+    def test_query_window_matches_direct_count(self):
+        pyramid = build_timeline_pyramid(self.ops_per_slice, 4, branching_factor=2)
+
+        for start, end in [(0, len(self.ops_per_slice)), (3, 17), (5, 6)]:
+            qubit_activity, _ = query_timeline_window(pyramid, start, end)
+            expected = [0] * 4
+            for slice_ops in self.ops_per_slice[start:end]:
+                for qubit in {q for op in slice_ops for q in op["qubits"]}:
+                    expected[qubit] += 1
+            self.assertEqual(qubit_activity.tolist(), expected)
+
+    def test_cell_budget_skips_fine_levels(self):
+        pyramid = build_timeline_pyramid(
+            self.ops_per_slice, 4, branching_factor=2, max_cells_per_level=40
+        )
+        self.assertGreater(pyramid.levels[0].slices_per_bucket, 1)
+
+class TestCircuitFingerprint(unittest.TestCase):
+
+    def build(self, angle=0.5, target=1):
+        qc = QuantumCircuit(3, 1)
+        qc.h(0)
+        qc.rz(angle, 0)
+        qc.cx(0, target)
+        qc.rx(Parameter("theta"), 2)
+        qc.measure(2, 0)
+        return qc
+
+    def test_equal_circuits_match(self):
+        self.assertEqual(circuit_fingerprint(self.build()), circuit_fingerprint(self.build()))
+        self.assertEqual(circuit_fingerprint(self.build()), circuit_fingerprint(self.build().copy()))
+
+    def test_structural_changes_differ(self):
+        reference = circuit_fingerprint(self.build())
+        self.assertNotEqual(circuit_fingerprint(self.build(angle=0.25)), reference)
+        self.assertNotEqual(circuit_fingerprint(self.build(target=2)), reference)
+        extended = self.build()
+        extended.x(1)
+        self.assertNotEqual(circuit_fingerprint(extended), reference)
+        self.assertNotEqual(circuit_fingerprint(QuantumCircuit(2)), circuit_fingerprint(QuantumCircuit(3)))
+
+    def test_custom_gate_definitions_differ(self):
+        def with_foo(body):
+            return QuantumCircuit.from_qasm_str(
+                'OPENQASM 2.0; include "qelib1.inc"; '
+                f"gate foo a, b {{ {body} }} qreg q[2]; foo q[0], q[1];"
+            )
+
+        reference = circuit_fingerprint(with_foo("cx a, b;"))
+        self.assertEqual(circuit_fingerprint(with_foo("cx a, b;")), reference)
+        self.assertNotEqual(circuit_fingerprint(with_foo("cx a, b; h a; cx b, a; h b;")), reference)
+
+    def test_nested_definitions_differ(self):
+        def wrapped(inner_gate):
+            inner = QuantumCircuit(1, name="inner")
+            getattr(inner, inner_gate)(0)
+            outer = QuantumCircuit(1, name="outer")
+            outer.append(inner.to_gate(), [0])
+            qc = QuantumCircuit(1)
+            qc.append(outer.to_gate(), [0])
+            return qc
+
+        self.assertEqual(circuit_fingerprint(wrapped("h")), circuit_fingerprint(wrapped("h")))
+        self.assertNotEqual(circuit_fingerprint(wrapped("h")), circuit_fingerprint(wrapped("x")))
+
+class TestCountCircuitMetrics(unittest.TestCase):
+
+    def build(self):
+        qc = QuantumCircuit(4, 2)
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.swap(1, 2)
+        qc.barrier()
+        qc.rz(0.3, 3)
+        qc.swap(2, 3)
+        qc.measure(3, 0)
+        qc.measure(0, 1)
+        qc.cx(2, 3)
+        return qc
+
+    def test_matches_slicing(self):
+        qc = self.build()
+        metrics = count_circuit_metrics(qc)
+        routing = extract_routing_operations_per_slice(qc)
+        self.assertEqual(metrics.depth, len(extract_operations_per_slice(qc)))
+        self.assertEqual(metrics.op_count, len(qc.data))
+        self.assertEqual(metrics.swaps, routing.swaps)
+        self.assertEqual(metrics.routing_depth, routing.routing_depth)
+
+    def test_no_routing_ops(self):
+        qc = QuantumCircuit(2)
+        qc.h(0)
+        qc.cx(0, 1)
+        metrics = count_circuit_metrics(qc)
+        self.assertEqual((metrics.swaps, metrics.routing_depth), (0, 0))
+        self.assertEqual(metrics.depth, 2)
+
+    def test_routing_overhead_matches(self):
+        logical = QuantumCircuit(4)
+        logical.h(0)
+        logical.cx(0, 3)
+        compiled = self.build()
+        self.assertEqual(
+            summarize_routing_overhead(count_circuit_metrics(logical), count_circuit_metrics(compiled)),
+            analyze_routing_overhead(logical, compiled),
+        )
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,6 +1,33 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
 import unittest
+from unittest import mock
+from pathlib import Path
+import numpy as np
+from fastapi.testclient import TestClient
+from qiskit import QuantumCircuit, qpy
+from quvis.api.admission import (
+    AdmissionController,
+    AdmissionPolicy,
+    AdmissionRejected,
+    CostEstimate,
+    CostModel,
+    CostRecord,
+    load_cost_records,
+)
+from quvis.api import fastapi_app
 from quvis.api.playground import PlaygroundAPI
+from quvis.api.visualizer import Visualizer, processed_circuit_memo
+from quvis.api.uploads import ResultCache, detect_circuit_format, load_circuit, upload_cache_key
+from quvis import factories
+from quvis.compiler.layout import LayoutParameters, compute_device_layout
 from quvis.config import CircuitGenerationConfig
+from quvis.enums import AlgorithmType, BestOfMetric, CircuitFormat, DetailLevel, TopologyType
+from quvis.factories import SYNC_LAYOUT_MAX_QUBITS, CircuitFactory, TopologyFactory
+from quvis.sweep import config_key, run_sweep, sweep_grid
 
 class TestPlaygroundAPI(unittest.TestCase):
 
@@ -55,8 +82,641 @@ class TestPlaygroundAPI(unittest.TestCase):
         grid_map = self.api._create_coupling_map("grid", 9)
         self.assertGreaterEqual(grid_map.size(), 9)
 
+        # Cached maps are copied, so modifying one does not leak into the cache
+        line_map.add_physical_qubit(5)
+        self.assertEqual(self.api._create_coupling_map("line", 5).size(), 5)
+
         with self.assertRaises(ValueError):
             self.api._create_coupling_map("invalid", 4)
 
+    def test_create_modular_topology(self):
+        modular = TopologyFactory.create_modular(
+            20, num_cores=4, intra_core_topology="full", global_topology="grid"
+        )
+        self.assertEqual(modular.coupling_map.size(), 20)
+        self.assertEqual(modular.modular_info.qubits_per_core, 5)
+        self.assertEqual(
+            sorted(modular.modular_info.inter_core_links),
+            [[4, 5], [4, 10], [9, 15], [14, 15]],
+        )
+        # 4 cores * 10 all-to-all edges + 4 links, both directions
+        self.assertEqual(len(modular.edges), 2 * (4 * 10 + 4))
+        self.assertEqual(modular.core_assignment.tolist(), [c for c in range(4) for _ in range(5)])
+
+        # Memoized, but callers get their own coupling map to modify
+        again = TopologyFactory.create_modular(
+            20, num_cores=4, intra_core_topology="full", global_topology="grid"
+        )
+        self.assertIs(again.edges, modular.edges)
+        self.assertIsNot(again.coupling_map, modular.coupling_map)
+        modular.coupling_map.add_physical_qubit(20)
+        self.assertEqual(again.coupling_map.size(), 20)
+
+        distributed = TopologyFactory.create_modular(
+            16, num_cores=4, intra_core_topology="line", global_topology="full", link_policy="distributed"
+        )
+        link_qubits = [q for link in distributed.modular_info.inter_core_links for q in link]
+        self.assertEqual(len(set(link_qubits)), len(link_qubits))
+
+        with self.assertRaises(ValueError):
+            TopologyFactory.create_modular(16, num_cores=4, intra_core_topology="heavy_hex")
+        with self.assertRaises(ValueError):
+            TopologyFactory.create_modular_from_params(16, {"cores": 4})
+        with self.assertRaises(ValueError):
+            TopologyFactory.create_modular_from_params(16, {"num_cores": "4"})
+
+    def test_generate_modular_visualization_data(self):
+        result = self.api.generate_visualization_data(CircuitGenerationConfig(
+            algorithm=AlgorithmType.GHZ,
+            num_qubits=8,
+            topology=TopologyType.MODULAR,
+            physical_qubits=8,
+            topology_params={"num_cores": 2, "intra_core_topology": "line"},
+            ))
+        compiled = result["circuits"][1]
+        self.assertEqual(compiled["device_info"]["modular_info"]["num_cores"], 2)
+        self.assertIn("inter_core_analysis", compiled)
+        self.assertGreater(compiled["inter_core_analysis"]["inter_core_ops"], 0)
+
+    def test_create_layout(self):
+        layout = TopologyFactory.create_layout(TopologyType.GRID, 9)
+        self.assertEqual(layout.shape, (9, 3))
+        self.assertAlmostEqual(float(np.ptp(layout, axis=0).max()), 1.0)
+        self.assertIs(layout, TopologyFactory.create_layout(TopologyType.GRID, 9))
+        self.assertIs(
+            layout,
+            TopologyFactory.layout_for_coupling_map(9, TopologyFactory.create(TopologyType.GRID, 9).get_edges()),
+        )
+
+        # Adjacent qubits end up closer than opposite corners of the grid
+        distance = lambda a, b: np.linalg.norm(layout[a] - layout[b])
+        self.assertLess(distance(0, 1), distance(0, 8))
+
+        result = self.api.generate_visualization_data(CircuitGenerationConfig(
+            algorithm=AlgorithmType.GHZ,
+            num_qubits=4,
+            topology=TopologyType.GRID,
+            physical_qubits=9,
+        ))
+        self.assertEqual(result["circuits"][1]["device_info"]["layout_positions"], layout.tolist())
+        self.assertIsNone(result["circuits"][0]["device_info"]["layout_positions"])
+        # Shipped with the force parameters it was computed with, for the client to compare
+        self.assertEqual(
+            result["circuits"][1]["device_info"]["layout_parameters"]["iterations"],
+            LayoutParameters().iterations,
+        )
+
+    def test_large_layouts_computed_in_background(self):
+        TopologyFactory.clear_cache()
+        num_qubits = SYNC_LAYOUT_MAX_QUBITS + 1
+        edges = [[q, q + 1] for q in range(num_qubits - 1)]
+        with mock.patch("quvis.factories.compute_device_layout", wraps=compute_device_layout) as compute:
+            self.assertIsNone(TopologyFactory.layout_for_coupling_map_nowait(num_qubits, edges))
+            for future in list(factories._pending_layouts.values()):
+                future.result()
+            layout = TopologyFactory.layout_for_coupling_map_nowait(num_qubits, edges)
+        self.assertEqual(layout.shape, (num_qubits, 3))
+        self.assertEqual(compute.call_count, 1)
+
+        api = PlaygroundAPI(cache_entries=0, background_layouts=True)
+        config = CircuitGenerationConfig(
+            algorithm=AlgorithmType.GHZ, num_qubits=4, topology=TopologyType.LINE, physical_qubits=num_qubits,
+        )
+        device_info = api.generate_visualization_data(config)["circuits"][1]["device_info"]
+        self.assertEqual(device_info["layout_positions"], layout.tolist())
+
+class TestUploads(unittest.TestCase):
+
+    QASM2 = b"""// GHZ
+OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[3];
+creg c[3];
+h q[0];
+cx q[0], q[1];
+cx q[1], q[2];
+measure q -> c;
+"""
+
+    def test_detect_circuit_format(self):
+        self.assertEqual(detect_circuit_format(self.QASM2), CircuitFormat.QASM2)
+        self.assertEqual(detect_circuit_format(b"/* header */\nOPENQASM 3.0;\nqubit[2] q;"), CircuitFormat.QASM3)
+        buffer = io.BytesIO()
+        qpy.dump(QuantumCircuit(2), buffer)
+        self.assertEqual(detect_circuit_format(buffer.getvalue()), CircuitFormat.QPY)
+        with self.assertRaises(ValueError):
+            detect_circuit_format(b"h q[0];")
+
+    def test_load_circuit(self):
+        circuit = load_circuit(self.QASM2)
+        self.assertEqual(circuit.num_qubits, 3)
+        self.assertEqual(circuit.count_ops()["cx"], 2)
+
+        original = QuantumCircuit(2, name="bell")
+        original.h(0)
+        original.cx(0, 1)
+        buffer = io.BytesIO()
+        qpy.dump(original, buffer)
+        self.assertEqual(load_circuit(buffer.getvalue(), CircuitFormat.QPY), original)
+
+        with self.assertRaises(ValueError):
+            load_circuit(b"OPENQASM 2.0;\nqreg q[2];\nnot_a_gate q[0];")
+
+    def test_generate_visualization_data_for_circuit(self):
+        circuit = load_circuit(self.QASM2)
+        circuit.name = "uploaded"
+        result = PlaygroundAPI().generate_visualization_data(CircuitGenerationConfig(
+            algorithm=None,
+            num_qubits=circuit.num_qubits,
+            physical_qubits=4,
+            topology=TopologyType.LINE,
+        ), circuit)
+        logical, compiled = result["circuits"]
+        self.assertEqual(logical["algorithm_name"], "uploaded (Logical)")
+        self.assertEqual(compiled["circuit_type"], "compiled")
+        self.assertEqual(compiled["device_info"]["num_qubits_on_device"], 4)
+        self.assertEqual(compiled["circuit_stats"]["original_gates"], 6)
+
+    def test_upload_cache(self):
+        content_hash, key = upload_cache_key(self.QASM2, {"topology": "line"})
+        self.assertEqual(upload_cache_key(self.QASM2, {"topology": "line"}), (content_hash, key))
+        self.assertNotEqual(upload_cache_key(self.QASM2, {"topology": "grid"})[1], key)
+
+        cache = ResultCache(max_entries=2)
+        cache.put("a", {"n": 1})
+        cache.put("b", {"n": 2})
+        cache.get("a")
+        cache.put("c", {"n": 3})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {"n": 1})
+        self.assertEqual(len(cache), 2)
+
+    def test_result_cache_byte_budget(self):
+        small = {"ops": list(range(10))}
+        large = {"ops": list(range(1000))}
+        budget = ResultCache.estimate_bytes(large) + ResultCache.estimate_bytes(small)
+        cache = ResultCache(max_entries=10, max_bytes=budget)
+        cache.put("a", small)
+        cache.put("b", large)
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.total_bytes, budget)
+        # A second large result evicts the least recently used entries
+        cache.put("c", large)
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), large)
+        # Results over the whole budget are not cached
+        cache.put("d", {"ops": list(range(5000))})
+        self.assertIsNone(cache.get("d"))
+        self.assertEqual(cache.get("c"), large)
+        cache.clear()
+        self.assertEqual(cache.total_bytes, 0)
+
+class TestVisualizerMemo(unittest.TestCase):
+
+    def setUp(self):
+        processed_circuit_memo.clear()
+
+    def build(self):
+        qc = QuantumCircuit(3)
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.cx(1, 2)
+        return qc
+
+    def test_memoizes_equal_circuits(self):
+        visualizer = Visualizer(auto_open_browser=False)
+        visualizer.add_circuit(self.build(), [[0, 1], [1, 2]], algorithm_name="first")
+        visualizer.add_circuit(self.build(), [[0, 1], [1, 2]], algorithm_name="second")
+        visualizer.add_circuit(self.build(), [[0, 1], [1, 2], [2, 0]], algorithm_name="other device")
+        self.assertEqual(len(processed_circuit_memo), 2)
+
+        first, second, _ = (c.to_dict() for c in visualizer.circuits)
+        self.assertEqual(second["algorithm_name"], "second")
+        second["algorithm_name"] = "first"
+        self.assertEqual(first, second)
+
+    def test_cache_dir_survives_memo_clear(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Visualizer(auto_open_browser=False, cache_dir=tmp).add_circuit(self.build())
+            self.assertEqual(len(list(Path(tmp).glob("*.pkl"))), 1)
+
+            processed_circuit_memo.clear()
+            visualizer = Visualizer(auto_open_browser=False, cache_dir=tmp)
+            with mock.patch.object(Visualizer, "_process_circuit", side_effect=AssertionError):
+                visualizer.add_circuit(self.build())
+            self.assertEqual(visualizer.circuits[0].circuit_stats.original_gates, 3)
+
+    def test_memo_returns_copies(self):
+        first = Visualizer(auto_open_browser=False)
+        first.add_circuit(self.build(), [[0, 1], [1, 2]])
+        first.circuits[0].circuit_stats.original_gates = -1
+        second = Visualizer(auto_open_browser=False)
+        second.add_circuit(self.build(), [[0, 1], [1, 2]])
+        self.assertEqual(second.circuits[0].circuit_stats.original_gates, 3)
+
+    def test_cache_dir_prunes_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Visualizer(auto_open_browser=False, cache_dir=tmp).add_circuit(self.build())
+            (entry,) = Path(tmp).glob("*.pkl")
+            size = entry.stat().st_size
+            os.utime(entry, (0, 0))
+
+            other = self.build()
+            other.x(2)
+            visualizer = Visualizer(auto_open_browser=False, cache_dir=tmp, cache_dir_max_bytes=size + size // 2)
+            visualizer.add_circuit(other)
+            remaining = list(Path(tmp).glob("*.pkl"))
+            self.assertEqual(len(remaining), 1)
+            self.assertNotEqual(remaining[0], entry)
+
+class TestSummaryDetail(unittest.TestCase):
+
+    def config(self):
+        return CircuitGenerationConfig(
+            algorithm=AlgorithmType.GHZ,
+            num_qubits=5,
+            physical_qubits=5,
+            topology=TopologyType.LINE,
+            optimization_level=0,
+        )
+
+    def test_summary_matches_full_logical_stats(self):
+        api = PlaygroundAPI()
+        full = api.generate_visualization_data(self.config())
+        summary = api.generate_visualization_data(self.config(), detail=DetailLevel.SUMMARY)
+
+        self.assertEqual(summary["detail"], "summary")
+        self.assertEqual(summary["circuits"][0]["circuit_stats"], full["circuits"][0]["circuit_stats"])
+        compiled = summary["circuits"][1]
+        self.assertNotIn("operations_per_slice", compiled)
+        self.assertEqual(set(compiled["routing_analysis"]), set(full["circuits"][1]["routing_analysis"]))
+        self.assertEqual(compiled["device_info"]["num_qubits_on_device"], 5)
+
+    def test_invalid_detail(self):
+        with self.assertRaises(ValueError):
+            PlaygroundAPI().generate_visualization_data(self.config(), detail="verbose")
+
+    def test_visualizer_summarize_circuit(self):
+        qc = QuantumCircuit(3)
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.swap(1, 2)
+        summary = Visualizer(auto_open_browser=False).summarize_circuit(qc, [[0, 1], [1, 2]])
+        self.assertEqual(summary["circuit_stats"]["swap_count"], 1)
+        self.assertEqual(summary["circuit_stats"]["depth"], 3)
+        self.assertEqual(summary["routing_info"]["swaps"], 1)
+
+class TestStageCache(unittest.TestCase):
+
+    def config(self, **changes):
+        config = CircuitGenerationConfig(
+            algorithm=AlgorithmType.QAOA,
+            num_qubits=4,
+            physical_qubits=4,
+            topology=TopologyType.LINE,
+            algorithm_params={"optimization_level": 1, "reps": 1},
+        )
+        for key, value in changes.items():
+            setattr(config, key, value)
+        return config
+
+    def test_device_change_reuses_logical_view(self):
+        api = PlaygroundAPI()
+        with mock.patch.object(CircuitFactory, "create", wraps=CircuitFactory.create) as create, \
+                mock.patch.object(api, "_process_logical_circuit", wraps=api._process_logical_circuit) as logical, \
+                mock.patch.object(api, "_transpile", wraps=api._transpile) as transpile:
+            first = api.generate_visualization_data(self.config())
+            api.generate_visualization_data(self.config(topology=TopologyType.RING))
+            changed = api.generate_visualization_data(self.config(
+                optimization_level=2, algorithm_params={"optimization_level": 2, "reps": 1}
+            ))
+            self.assertEqual((create.call_count, logical.call_count, transpile.call_count), (1, 1, 3))
+
+            repeated = api.generate_visualization_data(self.config())
+            self.assertEqual(transpile.call_count, 3)
+            self.assertEqual(repeated, first)
+
+            api.generate_visualization_data(self.config(algorithm_params={"optimization_level": 1, "reps": 2}))
+            self.assertEqual((create.call_count, logical.call_count), (2, 2))
+
+        self.assertEqual(changed["circuits"][0]["algorithm_params"]["optimization_level"], 2)
+        self.assertEqual(
+            changed["circuits"][0]["circuit_info"], first["circuits"][0]["circuit_info"]
+        )
+
+    def test_caches_are_not_shared_with_callers(self):
+        api = PlaygroundAPI()
+        first = api.generate_visualization_data(self.config())
+        first["circuits"][1]["algorithm_name"] = "changed"
+        first["circuits"][0]["circuit_stats"]["depth"] = -1
+        first["circuits"][1]["circuit_info"]["compiled_interaction_graph_ops_per_slice"].clear()
+        result = api.generate_visualization_data(self.config())
+        self.assertEqual(result["circuits"][1]["algorithm_name"], "QAOA (Compiled)")
+        self.assertGreater(result["circuits"][0]["circuit_stats"]["depth"], 0)
+        self.assertTrue(result["circuits"][1]["circuit_info"]["compiled_interaction_graph_ops_per_slice"])
+
+    def test_custom_gate_definitions_are_separate_entries(self):
+        def with_foo(body):
+            return load_circuit(
+                'OPENQASM 2.0;\ninclude "qelib1.inc";\n'
+                f"gate foo a, b {{ {body} }}\nqreg q[2];\nfoo q[0], q[1];".encode()
+            )
+
+        api = PlaygroundAPI()
+        config = CircuitGenerationConfig(
+            algorithm=None, num_qubits=2, physical_qubits=2, topology=TopologyType.LINE
+        )
+        shallow = api.generate_visualization_data(config, with_foo("cx a, b;"))
+        deep = api.generate_visualization_data(config, with_foo("cx a, b; h a; cx b, a; h b;"))
+        self.assertEqual(shallow["circuits"][0]["circuit_stats"]["depth"], 1)
+        self.assertEqual(deep["circuits"][0]["circuit_stats"]["depth"], 4)
+
+    def test_timeline_pyramid_is_opt_in(self):
+        api = PlaygroundAPI()
+        default = api.generate_visualization_data(self.config())
+        requested = api.generate_visualization_data(self.config(timeline_pyramid=True))
+        for view in default["circuits"]:
+            self.assertNotIn("timeline_pyramid", view)
+        for view in requested["circuits"]:
+            self.assertEqual(view["timeline_pyramid"]["num_slices"], view["circuit_stats"]["depth"])
+
+    def test_disabled(self):
+        api = PlaygroundAPI(cache_entries=0)
+        with mock.patch.object(api, "_transpile", wraps=api._transpile) as transpile:
+            api.generate_visualization_data(self.config())
+            api.generate_visualization_data(self.config())
+        self.assertEqual(transpile.call_count, 2)
+
+class TestCompareCompilations(unittest.TestCase):
+
+    def config(self):
+        return CircuitGenerationConfig(
+            algorithm=AlgorithmType.QFT,
+            num_qubits=5,
+            physical_qubits=6,
+            topology=TopologyType.GRID,
+            algorithm_params={"optimization_level": 1},
+        )
+
+    def test_one_logical_view_per_comparison(self):
+        result = PlaygroundAPI().compare_compilations(
+            self.config(), optimization_levels=[0, 2], seeds=[7], workers=1
+        )
+        logical, *compiled = result["circuits"]
+        self.assertEqual(result["total_circuits"], 3)
+        self.assertEqual(logical["circuit_type"], "logical")
+        self.assertEqual([c["optimization_level"] for c in compiled], [0, 2])
+        self.assertEqual(compiled[1]["algorithm_params"], {"optimization_level": 2})
+        self.assertEqual(compiled[1]["algorithm_name"], "QFT (Compiled, opt 2, seed 7)")
+        for view, variant in zip(compiled, result["variants"]):
+            self.assertEqual(view["circuit_stats"]["swap_count"], variant["swap_count"])
+            self.assertEqual(view["circuit_stats"]["depth"], variant["depth"])
+
+    def test_best_of(self):
+        result = PlaygroundAPI().compare_compilations(
+            self.config(), optimization_levels=[0, 3], seeds=[1, 2], best_of=BestOfMetric.SWAPS,
+            detail=DetailLevel.SUMMARY, workers=1,
+        )
+        self.assertEqual(result["total_circuits"], 2)
+        self.assertEqual(len(result["variants"]), 4)
+        best = result["best"]["index"]
+        fewest = min(v["swap_count"] for v in result["variants"])
+        self.assertEqual(result["variants"][best]["swap_count"], fewest)
+        self.assertEqual(result["circuits"][1]["circuit_stats"]["swap_count"], fewest)
+
+    def test_process_pool_matches_in_process(self):
+        kwargs = dict(optimization_levels=[1, 2], seeds=[3], detail=DetailLevel.SUMMARY)
+        api = PlaygroundAPI(workers=2)
+        self.addCleanup(api.close)
+        pooled = api.compare_compilations(self.config(), **kwargs)
+        pool = api._pool
+        self.assertIsNotNone(pool)
+        # Later comparisons reuse the pool instead of starting new workers
+        api.compare_compilations(self.config(), **kwargs)
+        self.assertIs(api._pool, pool)
+        serial = PlaygroundAPI().compare_compilations(self.config(), workers=1, **kwargs)
+        self.assertEqual(pooled["circuits"], serial["circuits"])
+
+    def test_invalid_variants(self):
+        with self.assertRaises(ValueError):
+            PlaygroundAPI().compare_compilations(self.config(), optimization_levels=[4], workers=1)
+        with self.assertRaises(ValueError):
+            PlaygroundAPI().compare_compilations(self.config(), seeds=range(5), workers=1)
+
+class TestSweep(unittest.TestCase):
+
+    def test_sweep_grid(self):
+        configs = sweep_grid(["ghz", "qft"], [4, 6], ["line"], [0, 1])
+        self.assertEqual(len(configs), 8)
+        self.assertEqual(configs[0].algorithm, AlgorithmType.GHZ)
+        self.assertEqual(configs[0].physical_qubits, 4)
+        self.assertEqual(len({config_key(c) for c in configs}), 8)
+        self.assertEqual(config_key(configs[0]), config_key(sweep_grid(["ghz"], [4], ["line"], [0])[0]))
+
+    def test_run_sweep_resumes(self):
+        configs = sweep_grid(["ghz"], [3, 4], ["line"])
+        with tempfile.TemporaryDirectory() as tmp:
+            results = Path(tmp) / "sweep.jsonl"
+
+            summary = run_sweep(configs[:1], results, workers=1)
+            self.assertEqual((summary.completed, summary.skipped), (1, 0))
+
+            # An interrupted write leaves a partial last line behind
+            with open(results, "a") as f:
+                f.write('{"key": "trunc')
+
+            summary = run_sweep(configs + configs, results, workers=1)
+            self.assertEqual((summary.total, summary.completed, summary.skipped), (2, 1, 1))
+
+            records = []
+            for line in results.read_text().splitlines():
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass
+            self.assertEqual([r["status"] for r in records], ["ok", "ok"])
+            self.assertEqual(records[1]["config"]["num_qubits"], 4)
+            self.assertEqual(records[1]["metrics"]["device_qubits"], 4)
+            self.assertGreater(records[1]["wall_time_s"], 0)
+
+    def test_detail_levels_are_separate_points(self):
+        configs = sweep_grid(["ghz"], [3], ["line"])
+        with tempfile.TemporaryDirectory() as tmp:
+            results = Path(tmp) / "sweep.jsonl"
+            run_sweep(configs, results, workers=1)
+            summary = run_sweep(configs, results, workers=1, detail=DetailLevel.FULL)
+            self.assertEqual((summary.completed, summary.skipped), (1, 0))
+            records = [json.loads(line) for line in results.read_text().splitlines()]
+            self.assertEqual([r["detail"] for r in records], ["summary", "full"])
+            self.assertIsNotNone(records[1]["start_rss_mb"])
+
+class TestCostModel(unittest.TestCase):
+
+    def records(self):
+        # QFT runtime grows quadratically, GHZ linearly; level 3 costs 4x
+        return [
+            CostRecord(
+                algorithm, n, topology, level, "full",
+                runtime_s=(1e-4 * n ** 2 if algorithm == "qft" else 1e-3 * n) * (4 if level == 3 else 1),
+                memory_mb=0.5 * n,
+            )
+            for algorithm in ("qft", "ghz")
+            for n in (8, 16, 32, 64, 128)
+            for topology in ("line", "grid")
+            for level in (1, 3)
+        ]
+
+    def config(self, algorithm, num_qubits, level=1):
+        return CircuitGenerationConfig(
+            algorithm=AlgorithmType(algorithm) if algorithm else None,
+            num_qubits=num_qubits,
+            physical_qubits=num_qubits,
+            topology=TopologyType.GRID,
+            optimization_level=level,
+        )
+
+    def test_fit_extrapolates(self):
+        model = CostModel.fit(self.records(), quantile=0.5)
+        estimate = model.estimate(self.config("qft", 512, level=3))
+        self.assertAlmostEqual(estimate.runtime_s, 4e-4 * 512 ** 2, delta=0.05 * 4e-4 * 512 ** 2)
+        self.assertAlmostEqual(estimate.memory_mb, 256, delta=0.05 * 256)
+
+    def test_unknown_categories_are_conservative(self):
+        model = CostModel.fit(self.records(), quantile=0.5)
+        uploaded = model.estimate(self.config(None, 64))
+        self.assertGreaterEqual(uploaded.runtime_s, model.estimate(self.config("qft", 64)).runtime_s)
+        self.assertGreaterEqual(
+            model.estimate(self.config("qft", 64, level=2)).runtime_s,
+            model.estimate(self.config("qft", 64, level=3)).runtime_s,
+        )
+
+    def test_save_and_load(self):
+        model = CostModel.fit(self.records())
+        with tempfile.TemporaryDirectory() as tmp:
+            model.save(Path(tmp) / "model.json")
+            loaded = CostModel.load(Path(tmp) / "model.json")
+        self.assertEqual(loaded, model)
+        self.assertGreater(CostModel.load().estimate(self.config("qft", 64)).runtime_s, 0)
+
+    def test_load_cost_records(self):
+        config = {"algorithm": "qft", "num_qubits": 8, "topology": "grid", "optimization_level": 1}
+        with tempfile.TemporaryDirectory() as tmp:
+            sweep = Path(tmp) / "sweep.jsonl"
+            sweep.write_text("\n".join([
+                json.dumps({"status": "ok", "config": config, "detail": "full", "wall_time_s": 0.5,
+                            "start_rss_mb": 100.0, "peak_rss_mb": 130.0}),
+                json.dumps({"status": "error", "config": config, "wall_time_s": 0.1}),
+                json.dumps({"status": "ok", "config": config, "wall_time_s": 0.2, "peak_rss_mb": 120.0}),
+                '{"status": "ok", "conf',
+            ]))
+            report = Path(tmp) / "bench.json"
+            report.write_text(json.dumps({"results": [{
+                **config,
+                "stages": {"playground_generate_visualization_data": {"wall_time_s": 0.3, "peak_memory_mb": 2.0}},
+            }]}))
+            records = load_cost_records(sweep) + load_cost_records(report)
+        self.assertEqual([(r.detail, r.runtime_s, r.memory_mb) for r in records], [
+            ("full", 0.5, 30.0), ("summary", 0.2, None), ("full", 0.3, 2.0),
+        ])
+
+class TestAdmissionController(unittest.TestCase):
+
+    def controller(self, **policy):
+        return AdmissionController(None, AdmissionPolicy(**{
+            "slots": 1, "memory_budget_mb": 1000.0, "fast_lane_slots": 1, "max_queue": 2, **policy,
+        }))
+
+    def test_fast_lane_is_not_blocked_by_heavy_requests(self):
+        async def scenario():
+            controller = self.controller()
+            async with controller.admit(CostEstimate(60.0, 500.0)) as heavy:
+                async with controller.admit(CostEstimate(0.1, 10.0)) as fast:
+                    return heavy.lane, fast.lane, fast.waited_s
+
+        heavy_lane, fast_lane, waited_s = asyncio.run(scenario())
+        self.assertEqual((heavy_lane, fast_lane), ("heavy", "fast"))
+        self.assertLess(waited_s, 1.0)
+
+    def test_queue_runs_shortest_first_and_rejects_when_full(self):
+        async def scenario():
+            controller = self.controller()
+            order = []
+            release = asyncio.Event()
+
+            async def request(name, runtime_s):
+                async with controller.admit(CostEstimate(runtime_s, 100.0)):
+                    order.append(name)
+                    await release.wait()
+
+            first = asyncio.create_task(request("first", 10.0))
+            await asyncio.sleep(0)
+            queued = [asyncio.create_task(request("long", 50.0)), asyncio.create_task(request("short", 20.0))]
+            await asyncio.sleep(0)
+            self.assertEqual(controller.status()["queued"], 2)
+
+            with self.assertRaises(AdmissionRejected) as rejected:
+                await controller._acquire(CostEstimate(5.0, 100.0))
+            release.set()
+            await asyncio.gather(first, *queued)
+            return order, rejected.exception
+
+        order, rejected = asyncio.run(scenario())
+        self.assertEqual(order, ["first", "short", "long"])
+        self.assertEqual(rejected.status_code, 429)
+        self.assertEqual(rejected.headers(), {"Retry-After": "10"})
+
+    def test_rejects_requests_over_capacity(self):
+        controller = self.controller(max_runtime_s=100.0)
+        for estimate in (CostEstimate(5.0, 2000.0), CostEstimate(500.0, 10.0)):
+            with self.assertRaises(AdmissionRejected) as rejected:
+                asyncio.run(controller._acquire(estimate))
+            self.assertEqual(rejected.exception.status_code, 503)
+            self.assertEqual(rejected.exception.headers(), {})
+
+    def test_memory_budget_queues(self):
+        async def scenario():
+            controller = self.controller(slots=4, memory_budget_mb=1000.0, max_queue_wait_s=5.0)
+            async with controller.admit(CostEstimate(10.0, 800.0)):
+                with self.assertRaises(AdmissionRejected) as rejected:
+                    await controller._acquire(CostEstimate(10.0, 400.0))
+                return rejected.exception
+
+        rejected = asyncio.run(scenario())
+        self.assertEqual(rejected.status_code, 429)
+        self.assertEqual(rejected.headers(), {"Retry-After": "10"})
+
+class TestGenerateCircuitEndpoint(unittest.TestCase):
+
+    def request(self, gate_durations):
+        return {
+            "algorithm": AlgorithmType.GHZ.value,
+            "num_qubits": 3,
+            "physical_qubits": 3,
+            "topology": TopologyType.LINE.value,
+            "optimization_level": 0,
+            "gate_durations": gate_durations,
+        }
+
+    def test_gate_duration_overrides(self):
+        client = TestClient(fastapi_app.app)
+        response = client.post("/api/generate-circuit", json=self.request({
+            "cx": 200.0,
+            "qubit_overrides": {"u|0": 500.0},
+            "edge_overrides": {"cx|2|0": 100.0},
+        }))
+        self.assertEqual(response.status_code, 200, response.text)
+        # The decomposed logical circuit is u(0), cx(0, 1), cx(0, 2)
+        schedule = response.json()["circuits"][0]["schedule"]
+        self.assertEqual(schedule["durations"], [500.0, 200.0, 100.0])
+        self.assertEqual(schedule["total_duration"], 800.0)
+
+    def test_invalid_override_key(self):
+        client = TestClient(fastapi_app.app)
+        response = client.post("/api/generate-circuit", json=self.request({"qubit_overrides": {"u": 500.0}}))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("gate|qubit", response.json()["detail"])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -43,6 +43,20 @@ const circuitGeneratorMiddleware = async (req, res, next) => {
                 args.push('--physical-qubits', params.physical_qubits.toString());
             }
 
+            // Add modular topology parameters if provided
+            if (params.num_cores) {
+                args.push('--num-cores', params.num_cores.toString());
+            }
+            if (params.intra_core_topology) {
+                args.push('--intra-core-topology', params.intra_core_topology);
+            }
+            if (params.global_topology) {
+                args.push('--global-topology', params.global_topology);
+            }
+            if (params.link_policy) {
+                args.push('--link-policy', params.link_policy);
+            }
+
             const workingDir = isCI ? path.join(process.cwd(), 'quvis/core') : process.cwd();
             const pythonPath = isCI ? undefined : path.join(process.cwd(), 'quvis/core/src');
 
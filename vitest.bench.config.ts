@@ -0,0 +1,22 @@
+import { defineConfig } from 'vitest/config';
+
+// Frontend performance benchmarks (quvis/web/src/test/benchmarks); kept out
+// of the default test run. Usage: npm run bench:web
+export default defineConfig({
+    root: 'quvis/web',
+    test: {
+        include: ['src/test/benchmarks/**/*.perf.ts'],
+        environment: 'jsdom',
+        testTimeout: 30 * 60 * 1000,
+        hookTimeout: 60 * 1000,
+        // One process, so scenarios run one after another and heap
+        // figures are not skewed by other test files
+        pool: 'forks',
+        poolOptions: {
+            forks: {
+                singleFork: true,
+                execArgv: ['--expose-gc', '--max-old-space-size=8192'],
+            },
+        },
+    },
+});